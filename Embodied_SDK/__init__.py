@@ -35,7 +35,7 @@ from .io import IOSDK
 from .digital_twin import DigitalTwinSDK
 from .horizon_sdk import HorizonArmSDK
 from .ai import AISDK, DepthEstimationSDK
-from .motion import MotionSDK, create_motor_controller, setup_logging, close_all_shared_interfaces, get_shared_interface_info, get_function_codes
+from .motion import MotionSDK, create_motor_controller, setup_logging, close_all_shared_interfaces, get_shared_interface_info, get_function_codes, read_many
 
 __all__ = [
     "VisualGraspSDK",
@@ -53,4 +53,5 @@ __all__ = [
     "close_all_shared_interfaces",
     "get_shared_interface_info",
     "get_function_codes",
+    "read_many",
 ]
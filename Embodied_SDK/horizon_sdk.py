@@ -96,6 +96,7 @@ class HorizonArmSDK:
 
         # 运动控制子 SDK（基础版）
         self.motion = MotionSDK()
+        self.motion.camera_id = camera_id
         self.motion.bind_motors(motors)
 
         # 具身智能 SDK（高层自然语言控制）
@@ -150,6 +151,8 @@ class HorizonArmSDK:
         """
         self.camera_id = camera_id
 
+        if self.motion is not None:
+            self.motion.camera_id = camera_id
         if self.vision is not None:
             self.vision.camera_id = camera_id
         if self.follow is not None:
@@ -13,6 +13,7 @@ from __future__ import annotations
 
 from typing import Dict, Any, Tuple, Optional, List
 
+from Horizon_Core import gateway as horizon_gateway
 from Horizon_Core.core.joycon_arm_controller import JoyConArmController, ControlMode
 from Horizon_Core.core.arm_core.kinematics import RobotKinematics
 
@@ -63,6 +64,8 @@ class JoyconSDK:
 
     def __init__(self) -> None:
         self._controller = JoyConArmController()
+        # 关节状态缓存（bind_arm 时按需启用）
+        self._state_cache = None
 
     # ------------------------------------------------------------------
     # 机械臂绑定
@@ -75,6 +78,7 @@ class JoyconSDK:
         use_motor_config: bool = True,
         kinematics: Optional[RobotKinematics] = None,
         mujoco_controller: Optional[Any] = None,
+        state_cache_hz: Optional[float] = None,
     ) -> None:
         """
         绑定真实机械臂对象到 Joy-Con 控制器。
@@ -84,7 +88,14 @@ class JoyconSDK:
             use_motor_config: 是否使用全局 motor_config.json 里的减速比/方向
             kinematics: 可选，若不传则自动创建一个默认 RobotKinematics
             mujoco_controller: 可选，用于同时驱动 MuJoCo 数字孪生
+            state_cache_hz: 可选，启用关节状态缓存的轮询频率(Hz)；控制线程读取关节角度时
+                直接使用后台快照，不再逐个电机查询
         """
+        Control_Core = horizon_gateway.get_control_core()
+        motors, self._state_cache = Control_Core.bind_joint_state_cache(
+            motors, state_cache_hz, self._state_cache, owner="JoyconSDK"
+        )
+
         mcm = None
         if use_motor_config:
             # 这里的 _load_motor_config 会被后续 controller 使用
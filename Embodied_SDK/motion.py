@@ -12,14 +12,31 @@
 - `c_a_j`  关节角度运动
 - `c_a_p`  末端位置/姿态运动（自动 IK）
 - `e_p_a`  预设动作（从 preset_actions.json 读取）
+
+另外提供 `stream_trajectory`：以固定控制频率逐点下发关节轨迹（Y42 直通位置帧），
+多路点运动不再在每个路点处停顿；预设动作可通过 `execute_preset_action(..., use_cache=True)`
+使用预编译轨迹缓存（见 `core.arm_core.trajectory_cache`）。
+`start_velocity_control` / `set_cartesian_velocity` 提供 100 Hz 速度级笛卡尔控制（微分逆解，
+见 `core.arm_core.resolved_rate`），适合手柄遥操作等连续输入。
 """
 
 from __future__ import annotations
 
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
 import logging
+import time
+
+import numpy as np
 
 from Horizon_Core import gateway as horizon_gateway
+from Horizon_Core.core.arm_core.trajectory_streamer import TrajectoryStreamer
+from Horizon_Core.core.arm_core.camera_service import get_camera_service
+
+# 规划 / 碰撞检测 / 可达性等模块只在对应接口首次调用时导入
+if TYPE_CHECKING:
+    from Horizon_Core.core.arm_core.mesh_collision import MeshCollisionChecker
+    from Horizon_Core.core.arm_core.resolved_rate import ResolvedRateServo
+    from Horizon_Core.core.arm_core.trajectory_cache import CompiledTrajectory, TrajectoryCompiler
 
 def _load_motor_config():
     """从 config/motor_config.json 加载电机配置"""
@@ -88,6 +105,23 @@ def setup_logging(level=logging.INFO):
         datefmt='%Y-%m-%d %H:%M:%S'
     )
 
+def read_many(controllers, fields=("position", "speed", "status"), timeout: Optional[float] = None):
+    """
+    批量读取一组电机（同一总线）的状态，转发 Control_Core.read_many。
+
+    Args:
+        controllers: 控制器序列，或 {motor_id: 控制器}（按 motor_id 排序）
+        fields: 需要读取的字段，可选 position / speed / status / temperature
+        timeout: 单个回复的超时时间(秒)，None 使用默认值
+
+    Returns:
+        np.ndarray: 结构化数组（每个电机一行，含 position / valid 等字段）
+    """
+    Control_Core = horizon_gateway.get_control_core()
+    if timeout is None:
+        return Control_Core.read_many(controllers, fields=fields)
+    return Control_Core.read_many(controllers, fields=fields, timeout=timeout)
+
 def close_all_shared_interfaces():
     """关闭所有共享的 CAN 接口连接"""
     Control_Core = horizon_gateway.get_control_core()
@@ -108,6 +142,21 @@ class MotionSDK:
     def __init__(self) -> None:
         # 缓存底层命令构建器类
         self._command_builder_cls = None
+        # 关节状态缓存（bind_motors 时按需启用）
+        self._state_cache = None
+        # 已绑定的电机与关节映射（供流式轨迹下发使用）
+        self._motors: Dict[int, Any] = {}
+        self._joint_map = None
+        self._streamer: Optional[TrajectoryStreamer] = None
+        # 预设动作 / 作业轨迹编译器（按控制频率缓存）
+        self._trajectory_compilers: Dict[float, TrajectoryCompiler] = {}
+        # 速度级笛卡尔控制线程
+        self._velocity_servo: Optional[ResolvedRateServo] = None
+        # 连杆网格碰撞检测（首次使用时构建）
+        self._collision_checker: Optional[MeshCollisionChecker] = None
+        # 摄像头 ID（set_camera_id 设置，start_camera_stream 默认使用）
+        self.camera_id = 0
+        self._camera_stream = None
 
     # ------------------------------------------------------------------
     # 电机 & 运动参数绑定
@@ -120,13 +169,23 @@ class MotionSDK:
         use_motor_config: bool = True,
         reducer_ratios: Optional[Dict[int, float]] = None,
         directions: Optional[Dict[int, int]] = None,
+        state_cache_hz: Optional[float] = None,
     ) -> None:
         """
         绑定真实机械臂电机实例。
         
         与 VisualGraspSDK 的 bind_motors 行为一致，最终都调用
         `embodied_internal._set_real_motors`。
+
+        Args:
+            state_cache_hz: 可选，启用关节状态缓存的轮询频率(Hz)。启用后位置/状态读取
+                改为读取共享接口上的后台快照，不再为每次查询占用总线。
         """
+        Control_Core = horizon_gateway.get_control_core()
+        motors, self._state_cache = Control_Core.bind_joint_state_cache(
+            motors, state_cache_hz, self._state_cache, owner="MotionSDK"
+        )
+
         if use_motor_config:
             config = _load_motor_config()
             all_ratios = {int(k): v for k, v in config["motor_reducer_ratios"].items()}
@@ -140,6 +199,10 @@ class MotionSDK:
         embodied_internal = horizon_gateway.get_embodied_internal_module()
         embodied_internal._set_real_motors(motors, rr, dd)
 
+        self._motors = dict(motors)
+        self._joint_map = Control_Core.JointMap.from_dicts(rr, dd, motor_ids=sorted(motors))
+        self._trajectory_compilers = {}
+
     def unbind_motors(self) -> None:
         """
         解绑 / 清空真实机械臂电机绑定。
@@ -147,8 +210,30 @@ class MotionSDK:
         本质上是调用 `embodied_internal._set_real_motors(None, None, None)`，
         用于在停止系统或断开机械臂时清理全局状态。
         """
+        self.stop_stream()
+        self.stop_velocity_control()
         embodied_internal = horizon_gateway.get_embodied_internal_module()
         embodied_internal._set_real_motors(None, None, None)
+        self._release_state_cache()
+        self._motors = {}
+        self._joint_map = None
+        self._trajectory_compilers = {}
+
+    def get_joint_state_cache(self) -> Any:
+        """
+        获取当前启用的关节状态缓存（JointStateCache），未启用时返回 None。
+
+        可用于无总线开销地读取最新关节状态，例如::
+
+            snap = motion.get_joint_state_cache().latest()
+            print(snap.state["position"])
+        """
+        return self._state_cache
+
+    def _release_state_cache(self) -> None:
+        if self._state_cache is not None:
+            self._state_cache.release()
+            self._state_cache = None
 
     def set_motion_params(
         self,
@@ -186,8 +271,9 @@ class MotionSDK:
         """
         设置用于具身智能 / 视觉抓取的摄像头 ID。
 
-        对应 `embodied_internal._set_camera_id`。
+        对应 `embodied_internal._set_camera_id`；同时作为 start_camera_stream 的默认摄像头。
         """
+        self.camera_id = camera_id
         embodied_internal = horizon_gateway.get_embodied_internal_module()
         embodied_internal._set_camera_id(camera_id)
 
@@ -201,6 +287,34 @@ class MotionSDK:
         embodied_internal = horizon_gateway.get_embodied_internal_module()
         embodied_internal._set_current_camera_frame(frame)
 
+    def start_camera_stream(self, camera_id: Optional[int] = None) -> None:
+        """
+        订阅共享采集服务，把每一帧自动传给底层具身智能模块（替代各处自行打开摄像头再手动传帧）。
+
+        Args:
+            camera_id: 摄像头 ID，None 时使用 set_camera_id 设置的 ID（默认 0）
+        """
+        self.stop_camera_stream()
+        embodied_internal = horizon_gateway.get_embodied_internal_module()
+        if camera_id is not None:
+            self.camera_id = camera_id
+            embodied_internal._set_camera_id(camera_id)
+
+        def _forward(frame) -> None:
+            # 回调中的图像是采集缓冲区视图，底层模块可能长期持有，需复制
+            embodied_internal._set_current_camera_frame(frame.image.copy())
+
+        service = get_camera_service(self.camera_id)
+        service.subscribe(_forward)
+        self._camera_stream = (service, _forward)
+
+    def stop_camera_stream(self) -> None:
+        """取消 start_camera_stream 的订阅"""
+        stream = self._camera_stream
+        if stream is not None:
+            stream[0].unsubscribe(stream[1])
+            self._camera_stream = None
+
     # ------------------------------------------------------------------
     # 抓取参数（姿态 / TCP / 深度）封装
     # ------------------------------------------------------------------
@@ -269,6 +383,437 @@ class MotionSDK:
         embodied_func = horizon_gateway.get_embodied_module()
         return bool(embodied_func.c_a_j(joint_angles, duration))
 
+    # ------------------------------------------------------------------
+    # 关节轨迹流式下发
+    # ------------------------------------------------------------------
+
+    def stream_trajectory(
+        self,
+        points: Any,
+        rate_hz: float = 100.0,
+        *,
+        blocking: bool = True,
+        approach_first: bool = True,
+        approach_tolerance: float = 2.0,
+    ) -> Dict[str, Any]:
+        """
+        以固定控制频率流式下发关节轨迹。
+
+        每个控制周期发送一帧 Y42 直通限速位置命令（所有关节同帧），发送时刻按
+        `time.perf_counter_ns()` 绝对截止时刻调度，适合平滑的多路点连续运动。
+
+        Args:
+            points: (N, 6) 关节角度序列（度），按 rate_hz 等间隔采样，
+                例如 JointSpaceTrajectoryExecutor / 插补器生成的逐周期角度
+            rate_hz: 控制频率 (Hz)，建议 50~200
+            blocking: True 则阻塞直到下发结束并返回统计；False 则后台下发立即返回
+            approach_first: 首点与当前位置偏差较大时，先用 move_joints 运动到首点
+            approach_tolerance: 判定需要先靠近首点的偏差阈值（度）
+
+        Returns:
+            dict: 阻塞模式下为统计信息（sent / deadline_misses / jitter_p99_us 等）；
+                非阻塞模式下为 {"started": True}，可稍后调用 get_stream_stats()
+        """
+        if not self._motors or self._joint_map is None:
+            raise RuntimeError("请先调用 bind_motors 绑定电机")
+        if self._streamer is not None and self._streamer.is_running():
+            raise RuntimeError("已有轨迹正在下发，请先调用 stop_stream()")
+
+        points = np.asarray(points, dtype=np.float64)
+
+        if approach_first:
+            state = read_many(self._motors, fields=("position",))
+            if state["valid"].all():
+                current = self._joint_map.motor_to_joint_degrees(state["position"])
+                if np.max(np.abs(points[0] - current)) > approach_tolerance:
+                    if not self.move_joints(points[0].tolist()):
+                        print(" ⚠️ [MotionSDK] 运动到轨迹首点失败，取消流式下发")
+                        return {"started": False}
+            else:
+                print(" ⚠️ [MotionSDK] 读取当前关节位置失败，跳过首点靠近检查")
+
+        self._streamer = self._create_streamer()
+
+        if blocking:
+            return self._streamer.stream(points, rate_hz).to_dict()
+        self._streamer.start(points, rate_hz)
+        return {"started": True}
+
+    def stream_time_optimal(
+        self,
+        path: Any,
+        rate_hz: float = 100.0,
+        *,
+        max_motor_rpm: Optional[float] = None,
+        max_motor_acceleration: Optional[float] = None,
+        max_jerk: Optional[float] = None,
+        blocking: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        以时间最优的时间律执行一条关节路径。
+
+        路径只描述几何形状（不含时间），各关节速度/加速度限制由电机端限制按当前绑定的
+        减速比换算，求得满足限制的最快时间律后流式下发。
+
+        Args:
+            path: (N, 6) 关节角度序列（度），应足够平滑（如插补器输出）
+            rate_hz: 控制频率 (Hz)
+            max_motor_rpm: 电机最大转速 (RPM)，None 时使用 time_optimal.DEFAULT_MOTOR_MAX_RPM
+            max_motor_acceleration: 电机最大加速度 (RPM/s)，None 时使用 time_optimal.DEFAULT_MOTOR_MAX_ACCELERATION
+            max_jerk: 可选，关节最大加加速度 (度/秒³)
+            blocking: 同 stream_trajectory
+
+        Returns:
+            dict: stream_trajectory 的返回值，并附带 planned_duration（规划总时长，秒）
+        """
+        if self._joint_map is None:
+            raise RuntimeError("请先调用 bind_motors 绑定电机")
+        from Horizon_Core.core.arm_core.time_optimal import (
+            DEFAULT_MOTOR_MAX_ACCELERATION, DEFAULT_MOTOR_MAX_RPM, TimeOptimalParameterizer,
+        )
+        parameterizer = TimeOptimalParameterizer.from_motor_config(
+            reducer_ratios=self._joint_map.reducer_ratios,
+            max_motor_rpm=DEFAULT_MOTOR_MAX_RPM if max_motor_rpm is None else max_motor_rpm,
+            max_motor_acceleration=(DEFAULT_MOTOR_MAX_ACCELERATION if max_motor_acceleration is None
+                                    else max_motor_acceleration),
+            max_jerk=max_jerk,
+        )
+        trajectory = parameterizer.parameterize(path)
+        _, points, _ = trajectory.sample(rate_hz)
+        result = self.stream_trajectory(points, rate_hz, blocking=blocking)
+        result["planned_duration"] = trajectory.duration
+        return result
+
+    def move_joints_planned(
+        self,
+        joint_angles: List[float],
+        collision_fn: Any = None,
+        rate_hz: float = 100.0,
+        *,
+        timeout: float = 1.0,
+        max_jerk: Optional[float] = None,
+        blocking: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        避障运动到目标关节角：RRT-Connect 规划无碰撞路径，再按时间最优时间律流式执行。
+
+        Args:
+            joint_angles: 目标关节角（度）
+            collision_fn: 批量碰撞检测函数 (N, 6) → (N,) bool，例如
+                `core.arm_core.rrt_connect.PrimitiveCollisionChecker`；None 时使用
+                get_collision_checker()（连杆网格自碰撞 + 桌面）
+            rate_hz: 控制频率 (Hz)
+            timeout: 最长规划时间 (秒)
+            max_jerk: 可选，关节最大加加速度 (度/秒³)
+            blocking: 同 stream_trajectory
+
+        Returns:
+            dict: stream_time_optimal 的返回值，并附带 plan（规划统计）；规划失败时 started 为 False
+        """
+        if not self._motors or self._joint_map is None:
+            raise RuntimeError("请先调用 bind_motors 绑定电机")
+        state = read_many(self._motors, fields=("position",))
+        if not state["valid"].all():
+            print(" ⚠️ [MotionSDK] 读取当前关节位置失败，无法规划")
+            return {"started": False}
+        current = self._joint_map.motor_to_joint_degrees(state["position"])
+
+        if collision_fn is None:
+            collision_fn = self.get_collision_checker()
+        from Horizon_Core.core.arm_core.rrt_connect import RRTConnectPlanner
+        planner = RRTConnectPlanner(collision_fn, timeout=timeout)
+        path = planner.plan(current, np.asarray(joint_angles, dtype=np.float64))
+        if path is None:
+            return {"started": False, "plan": planner.last_stats}
+        result = self.stream_time_optimal(path, rate_hz, max_jerk=max_jerk, blocking=blocking)
+        result["plan"] = planner.last_stats
+        return result
+
+    def get_collision_checker(self, table_height: Optional[float] = 0.0) -> MeshCollisionChecker:
+        """
+        获取基于 URDF 连杆网格的碰撞检测器（自碰撞 + 桌面，可再添加球体/长方体障碍）。
+
+        首次调用时从 config/urdf 构建，包围球层次与允许碰撞矩阵缓存在 config/collision_cache。
+
+        Args:
+            table_height: 桌面高度 (mm)，None 表示不检测桌面
+
+        Returns:
+            MeshCollisionChecker: 可直接作为 move_joints_planned 的 collision_fn
+        """
+        if self._collision_checker is None:
+            from Horizon_Core.core.arm_core.mesh_collision import MeshCollisionChecker
+            self._collision_checker = MeshCollisionChecker.from_config()
+        self._collision_checker.table_height = None if table_height is None else float(table_height)
+        return self._collision_checker
+
+    def run_teaching_program(
+        self,
+        program: Any,
+        rate_hz: float = 100.0,
+        *,
+        stop_at: Optional[List[int]] = None,
+        blocking: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        以前瞻混合方式连续执行整个示教程序。
+
+        相邻示教点之间不再完全停顿：同向运动的中间点以穿越速度通过，各段速度/加速度
+        限制取自示教点的插补参数（电机端 RPM 按减速比换算到关节端）。
+        interpolation_type 为 "cartesian" 的示教点，到该点的一段保持末端直线运动（按线/角速度
+        梯形规划后批量逆解），该段两端停下；插补点无逆解或构型与示教点不一致时抛出 ValueError。
+
+        Args:
+            program: 示教程序 JSON 路径（config/teaching_program/*.json）或示教点列表
+            rate_hz: 控制频率 (Hz)
+            stop_at: 需要完全停下的示教点下标（例如夹爪动作点），首尾总是停下
+            blocking: 同 stream_trajectory
+
+        Returns:
+            dict: stream_trajectory 的返回值，并附带 planned_duration（规划总时长，秒）
+        """
+        if self._joint_map is None:
+            raise RuntimeError("请先调用 bind_motors 绑定电机")
+        from Horizon_Core.core.arm_core.lookahead_planner import plan_teaching_program
+        trajectory = plan_teaching_program(
+            program, reducer_ratios=self._joint_map.reducer_ratios, stop_at=stop_at
+        )
+        _, points, _ = trajectory.sample(rate_hz)
+        result = self.stream_trajectory(points, rate_hz, blocking=blocking)
+        result["planned_duration"] = trajectory.duration
+        return result
+
+    def run_compiled_motion(
+        self,
+        compiled: CompiledTrajectory,
+        step: Optional[Dict[str, Any]] = None,
+        *,
+        approach_tolerance: float = 2.0,
+    ) -> Dict[str, Any]:
+        """
+        执行预编译轨迹中的一个运动步骤（阻塞）。
+
+        先检查当前位置，与步骤首点偏差较大时用 move_joints 运动到首点（用时 approach_duration），
+        再把缓存中的逐周期帧直接下发；缓存没有帧（或电机组不一致）时按关节角重新编码。
+
+        Args:
+            compiled: TrajectoryCompiler 的编译结果
+            step: compiled.steps 中 type 为 "trajectory" 的步骤，默认取第一个
+            approach_tolerance: 判定需要先靠近首点的偏差阈值（度）
+
+        Returns:
+            dict: 下发统计信息；靠近首点失败时为 {"started": False}
+        """
+        if not self._motors or self._joint_map is None:
+            raise RuntimeError("请先调用 bind_motors 绑定电机")
+        if self._streamer is not None and self._streamer.is_running():
+            raise RuntimeError("已有轨迹正在下发，请先调用 stop_stream()")
+        if step is None:
+            step = next(s for s in compiled.steps if s["type"] == "trajectory")
+        positions, frames = compiled.motion(step)
+
+        state = read_many(self._motors, fields=("position",))
+        current = self._joint_map.motor_to_joint_degrees(state["position"]) if state["valid"].all() else None
+        if current is None or np.max(np.abs(positions[0] - current)) > approach_tolerance:
+            duration = step.get("approach_duration") or None
+            if not self.move_joints(positions[0].tolist(), duration):
+                print(" ⚠️ [MotionSDK] 运动到轨迹首点失败，取消执行")
+                return {"started": False}
+        if len(positions) < 2:
+            return {"started": True, "completed": True, "points": 0}
+
+        self._streamer = self._create_streamer()
+        if frames is not None and frames.shape[1] == len(self._streamer.encoder):
+            return self._streamer.stream_frames(frames, compiled.rate_hz).to_dict()
+        return self._streamer.stream(positions, compiled.rate_hz).to_dict()
+
+    def run_compiled_job(
+        self,
+        name: str,
+        *,
+        io: Any = None,
+        rate_hz: float = 100.0,
+        handlers: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        按顺序执行整个 IO 作业（config/io_control/jobs_config.json，阻塞），运动段使用预编译轨迹。
+
+        运动段经 run_compiled_motion 下发缓存中的帧，不再重新规划；其余步骤：
+        - wait：等待 parameters.wait_duration 秒；
+        - io_control：io.set_do(do_number, output_level == "高电平")，需传入 io（如 IOSDK）；
+        - emergency_stop：停止流式下发并让所有电机立即停止。
+        其他步骤类型（如夹爪）可通过 handlers 提供 {步骤类型: (step) -> bool}，也可覆盖以上默认处理。
+        任一步骤失败即停止执行后续步骤。
+
+        Args:
+            name: 作业名称（jobs_config.json 中的 key）
+            io: IO 控制对象（提供 set_do(pin, state)），作业含 io_control 步骤时必需
+            rate_hz: 控制频率 (Hz)
+            handlers: 额外或覆盖的步骤处理函数
+
+        Returns:
+            dict: completed / steps（逐步结果）/ failed_step（失败步骤下标，全部成功时为 None）
+        """
+        if not self._motors or self._joint_map is None:
+            raise RuntimeError("请先调用 bind_motors 绑定电机")
+        from Horizon_Core.core.arm_core.trajectory_cache import run_compiled_steps
+
+        compiled = self.get_trajectory_compiler(rate_hz).compile_job(name)
+        step_handlers = {
+            "wait": self._job_wait,
+            "io_control": lambda step: self._job_io_control(io, step),
+            "emergency_stop": self._job_emergency_stop,
+        }
+        step_handlers.update(handlers or {})
+        return run_compiled_steps(compiled, self.run_compiled_motion, step_handlers)
+
+    @staticmethod
+    def _job_wait(step: Dict[str, Any]) -> bool:
+        params = step.get("parameters") or {}
+        time.sleep(max(0.0, float(params.get("wait_duration", step.get("duration", 0.0)) or 0.0)))
+        return True
+
+    @staticmethod
+    def _job_io_control(io: Any, step: Dict[str, Any]) -> bool:
+        params = step.get("parameters") or {}
+        if io is None:
+            print(f" ⚠️ [MotionSDK] 作业步骤 {step.get('step_id')} 需要 IO 控制，请传入 io")
+            return False
+        return bool(io.set_do(int(params["do_number"]), params.get("output_level") == "高电平"))
+
+    def _job_emergency_stop(self, step: Dict[str, Any]) -> bool:
+        self.stop_stream()
+        for motor in self._motors.values():
+            motor.control_actions.stop()
+        return True
+
+    def get_trajectory_compiler(self, rate_hz: float = 100.0) -> TrajectoryCompiler:
+        """
+        获取预设动作 / 作业轨迹编译器。
+
+        已绑定电机时编译结果附带逐周期帧（按当前电机组与减速比编码），执行时无需再换算。
+        """
+        compiler = self._trajectory_compilers.get(float(rate_hz))
+        if compiler is None:
+            frame_encoder = None
+            frame_tag = ""
+            reducer_ratios = None
+            if self._motors and self._joint_map is not None:
+                frame_encoder = self._create_streamer().encode_frames
+                frame_tag = repr(self._joint_map)
+                reducer_ratios = self._joint_map.reducer_ratios.tolist()
+            from Horizon_Core.core.arm_core.trajectory_cache import TrajectoryCompiler
+            compiler = TrajectoryCompiler(rate_hz=rate_hz, reducer_ratios=reducer_ratios,
+                                          frame_encoder=frame_encoder, frame_tag=frame_tag)
+            self._trajectory_compilers[float(rate_hz)] = compiler
+        return compiler
+
+    def _create_streamer(self) -> TrajectoryStreamer:
+        """按当前绑定的电机创建流式下发器（每个下发器持有独立的帧编码缓冲区）"""
+        motor_ids = sorted(self._motors)
+        can_interface = self._motors[motor_ids[0]].can_interface
+        Control_Core = horizon_gateway.get_control_core()
+        encoder = Control_Core.MultiMotorFrameEncoder(motor_ids, mode="direct", is_absolute=True)
+        on_send = self._state_cache.mark_command if self._state_cache is not None else None
+        return TrajectoryStreamer(can_interface, self._joint_map, encoder, on_send=on_send,
+                                  fatal_errors=(Control_Core.CANInterfaceException,))
+
+    def stop_stream(self) -> None:
+        """停止正在进行的流式下发（电机停在最后一次收到的目标处）。"""
+        if self._streamer is not None:
+            self._streamer.stop()
+
+    def get_stream_stats(self) -> Optional[Dict[str, Any]]:
+        """获取最近一次流式下发的统计信息，从未下发时返回 None。"""
+        if self._streamer is None:
+            return None
+        return self._streamer.stats.to_dict()
+
+    # ------------------------------------------------------------------
+    # 速度级笛卡尔控制
+    # ------------------------------------------------------------------
+
+    def start_velocity_control(
+        self,
+        rate_hz: float = 100.0,
+        *,
+        max_joint_velocity: float = 60.0,
+        max_joint_acceleration: float = 300.0,
+        command_timeout: float = 0.2,
+    ) -> None:
+        """
+        启动速度级笛卡尔控制（阻尼最小二乘微分逆解，固定频率下发）。
+
+        启动后用 `set_cartesian_velocity` 持续给出末端速度（如手柄摇杆输入），
+        或用 `set_cartesian_target` 给出目标位姿；无需每次更新都做完整逆解与 c_a_p。
+
+        Args:
+            rate_hz: 控制频率 (Hz)
+            max_joint_velocity: 关节最大角速度 (度/秒)
+            max_joint_acceleration: 关节最大角加速度 (度/秒²)
+            command_timeout: 速度命令超时 (秒)，超时未刷新则减速停下
+        """
+        if not self._motors or self._joint_map is None:
+            raise RuntimeError("请先调用 bind_motors 绑定电机")
+        if self._velocity_servo is not None and self._velocity_servo.is_running():
+            raise RuntimeError("速度控制已在运行，请先调用 stop_velocity_control()")
+        if self._streamer is not None and self._streamer.is_running():
+            raise RuntimeError("已有轨迹正在下发，请先调用 stop_stream()")
+
+        state = read_many(self._motors, fields=("position",))
+        if not state["valid"].all():
+            raise RuntimeError("读取当前关节位置失败，无法启动速度控制")
+        current = self._joint_map.motor_to_joint_degrees(state["position"])
+
+        from Horizon_Core.core.arm_core.resolved_rate import ResolvedRateController, ResolvedRateServo
+        streamer = self._create_streamer()
+        controller = ResolvedRateController.from_config(max_joint_velocity=max_joint_velocity)
+        self._velocity_servo = ResolvedRateServo(
+            controller, streamer.can_interface, self._joint_map, streamer.encoder,
+            rate_hz=rate_hz, command_timeout=command_timeout,
+            max_joint_acceleration=max_joint_acceleration, on_send=streamer.on_send,
+        )
+        self._velocity_servo.start(current)
+
+    def set_cartesian_velocity(
+        self,
+        linear: List[float],
+        angular: Optional[List[float]] = None,
+    ) -> None:
+        """
+        设置末端速度（基座坐标系），需在 command_timeout 内持续刷新。
+
+        Args:
+            linear: [vx, vy, vz] (mm/s)
+            angular: [ωx, ωy, ωz] (度/秒)，None 表示保持姿态
+        """
+        if self._velocity_servo is None or not self._velocity_servo.is_running():
+            raise RuntimeError("请先调用 start_velocity_control()")
+        self._velocity_servo.set_twist(linear, angular)
+
+    def set_cartesian_target(
+        self,
+        position: List[float],
+        orientation: Optional[List[float]] = None,
+    ) -> None:
+        """
+        速度控制下设置末端目标位姿，控制线程按比例律平滑逼近（可随时刷新）。
+
+        Args:
+            position: [x, y, z] (mm)
+            orientation: [yaw, pitch, roll] (度)，None 表示保持当前姿态
+        """
+        if self._velocity_servo is None or not self._velocity_servo.is_running():
+            raise RuntimeError("请先调用 start_velocity_control()")
+        self._velocity_servo.set_target(position, orientation)
+
+    def stop_velocity_control(self) -> Optional[Dict[str, Any]]:
+        """停止速度控制，返回运行统计（未启动时返回 None）。"""
+        if self._velocity_servo is None:
+            return None
+        self._velocity_servo.stop()
+        return self._velocity_servo.stats.to_dict()
+
     # ------------------------------------------------------------------
     # 笛卡尔空间运动
     # ------------------------------------------------------------------
@@ -286,7 +831,16 @@ class MotionSDK:
             position: [x, y, z] 末端目标位置（mm）
             orientation: [yaw, pitch, roll] 末端目标姿态（deg），None 则保持当前姿态
             duration: 期望运动时间（秒），None 则由底层自动计算
+
+        若已生成可达性地图（example/developer_tools/build_reachability_map.py），
+        地图判定不可达的位姿直接返回 False，不再调用 c_a_p（目标与地图同为法兰位姿）。
         """
+        if orientation is not None:
+            from Horizon_Core.core.arm_core.reachability_map import get_default_reachability_map
+            reach = get_default_reachability_map()
+            if reach is not None and reach.is_reachable(position, orientation) is False:
+                print(f" ⚠️ [MotionSDK] 目标位姿不可达: Pos={position}, Ori={orientation}")
+                return False
         embodied_func = horizon_gateway.get_embodied_module()
         return bool(embodied_func.c_a_p(position, orientation, duration))
 
@@ -294,14 +848,29 @@ class MotionSDK:
     # 预设动作
     # ------------------------------------------------------------------
 
-    def execute_preset_action(self, name: str, speed: str = "normal") -> bool:
+    def execute_preset_action(
+        self,
+        name: str,
+        speed: str = "normal",
+        *,
+        use_cache: bool = False,
+        rate_hz: float = 100.0,
+    ) -> bool:
         """
         执行预设动作（基于 config/embodied_config/preset_actions.json，通过授权网关调用）。
         
         Args:
             name: 动作名称（JSON 中的 key）
             speed: "slow" / "normal" / "fast"
+            use_cache: True 则使用预编译轨迹缓存（首次编译后直接加载，配置变化时自动重新编译），
+                以流式方式执行；需先 bind_motors
+            rate_hz: use_cache 时的控制频率 (Hz)
         """
+        if use_cache:
+            compiled = self.get_trajectory_compiler(rate_hz).compile_preset_action(name, speed)
+            result = self.run_compiled_motion(compiled)
+            return bool(result.get("completed", False))
+
         embodied_func = horizon_gateway.get_embodied_module()
         return bool(embodied_func.e_p_a(name, speed))
 
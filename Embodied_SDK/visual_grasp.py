@@ -13,7 +13,8 @@
 - `VisualGraspSDK.grasp_at_bbox`：基础视觉抓取（框选中心点  抓取），对应原来 Qt 中点选抓取的几何逻辑，改为框选中心；
 - `VisualGraspSDK.grasp_at_pixel`：基础视觉抓取（像素点  抓取），完全沿用原有标定与 TCP / 深度参数；
 - （后续可选）颜色阈值法检测到目标后，把像素/框中心传给以上接口即可；
-- `FollowGraspSDK`：跟随抓取（YOLOv8 + CSRT/跟踪器），对应原有跟随抓取模块的逻辑封装。
+- `FollowGraspSDK`：跟随抓取（YOLOv8 + CSRT/跟踪器），对应原有跟随抓取模块的逻辑封装；
+  `configure_follow(servo_mode="velocity")` 时改为 100 Hz 速度级伺服，检测结果只更新目标位姿。
 
 注意：
 - 本 SDK 不负责建立 CAN 连接，只接收已经连接好的 `motors` 字典；
@@ -21,10 +22,9 @@
   建立电机连接，再将 `motors` 交给 `bind_motors`。
 """
 
-from typing import Dict, Any, Optional, Tuple
+from __future__ import annotations
 
-import threading
-import time
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
 
 import cv2
 import numpy as np
@@ -33,6 +33,11 @@ from Horizon_Core import gateway as horizon_gateway
 from Horizon_Core.core.arm_core.yolo_onnx_detector import YOLOOnnxDetector
 from Horizon_Core.core.arm_core.object_follower import SingleObjectFollower
 
+# 采集服务 / 流水线 / 推理服务 / 可达性 / 标定等模块只在对应接口首次调用时导入
+if TYPE_CHECKING:
+    from Horizon_Core.core.arm_core.follow_pipeline import FollowPipeline
+    from Horizon_Core.core.arm_core.resolved_rate import ResolvedRateServo
+
 def _load_motor_config():
     """从 config/motor_config.json 加载电机配置"""
     import os
@@ -104,6 +109,11 @@ class VisualGraspSDK:
             camera_id: OpenCV 摄像头设备 ID，默认为 0
         """
         self.camera_id = camera_id
+        # 关节状态缓存（bind_motors 时按需启用）
+        self._state_cache = None
+        # 已绑定的电机与关节映射（供速度级伺服使用）
+        self._motors: Dict[int, Any] = {}
+        self._joint_map = None
 
         # 初始化摄像头 ID 到内部全局状态（供像素世界坐标转换等函数使用）
         embodied_internal = horizon_gateway.get_embodied_internal_module()
@@ -120,6 +130,7 @@ class VisualGraspSDK:
         use_motor_config: bool = True,
         reducer_ratios: Optional[Dict[int, float]] = None,
         directions: Optional[Dict[int, int]] = None,
+        state_cache_hz: Optional[float] = None,
     ) -> None:
         """
         绑定真实机械臂电机实例。
@@ -132,7 +143,14 @@ class VisualGraspSDK:
             use_motor_config: 是否自动从 `motor_config.json` 读取减速比与方向
             reducer_ratios: 可选，显式传入 {motor_id: ratio}
             directions: 可选，显式传入 {motor_id: direction}
+            state_cache_hz: 可选，启用关节状态缓存的轮询频率(Hz)；跟随伺服读取当前位姿时
+                直接使用后台快照，不再逐个电机查询
         """
+        Control_Core = horizon_gateway.get_control_core()
+        motors, self._state_cache = Control_Core.bind_joint_state_cache(
+            motors, state_cache_hz, self._state_cache, owner="VisualGraspSDK"
+        )
+
         if use_motor_config:
             config = _load_motor_config()
             all_ratios = {int(k): v for k, v in config["motor_reducer_ratios"].items()}
@@ -147,6 +165,10 @@ class VisualGraspSDK:
         embodied_internal = horizon_gateway.get_embodied_internal_module()
         embodied_internal._set_real_motors(motors, rr, dd)
 
+        Control_Core = horizon_gateway.get_control_core()
+        self._motors = dict(motors)
+        self._joint_map = Control_Core.JointMap.from_dicts(rr, dd, motor_ids=sorted(motors))
+
     def set_motion_params(
         self,
         max_speed: int = 100,
@@ -220,25 +242,20 @@ class VisualGraspSDK:
 
     def _capture_single_frame(self) -> Optional["cv2.Mat"]:
         """
-        使用 OpenCV 从当前 `camera_id` 采集一帧图像。
+        从当前 `camera_id` 的共享采集服务取一帧（调用之后采集的新帧）。
+
+        摄像头由 `CameraService` 统一打开并持续采集，不再每次抓取都重新打开设备。
 
         Returns:
             OpenCV 图像（numpy.ndarray），失败时返回 None。
         """
-        cap = cv2.VideoCapture(self.camera_id)
-        if not cap.isOpened():
-            print(f" 无法打开摄像头 {self.camera_id}")
-            cap.release()
-            return None
-
-        ok, frame = cap.read()
-        cap.release()
-
-        if not ok or frame is None:
+        from Horizon_Core.core.arm_core.camera_service import get_camera_service
+        frame = get_camera_service(self.camera_id).wait_next(timeout=2.0)
+        if frame is None:
             print(f" 从摄像头 {self.camera_id} 读取图像失败")
             return None
 
-        return frame
+        return frame.image
 
     # ------------------------------------------------------------------
     # 像素 / 框选式基础视觉抓取（适配 ROS / 网页框选）
@@ -273,44 +290,11 @@ class VisualGraspSDK:
             print(" [GraspPixel] 机械臂未连接或无法获取当前位姿")
             return False
 
-        # 2) 加载相机 / 手眼标定参数
-        calib = None
-        if hasattr(embodied_internal, "_load_calibration_params"):
+        # 2) 加载相机 / 手眼标定参数（进程内共享缓存，文件变化后自动重新读取）
+        from Horizon_Core.core.arm_core.calibration_store import get_calibration_store
+        calib = get_calibration_store().get_raw()
+        if not calib and hasattr(embodied_internal, "_load_calibration_params"):
             calib = embodied_internal._load_calibration_params()
-        else:
-            # 手动加载逻辑 (备用方案)：优先使用统一外置配置目录，其次回退到项目内 config
-            import json
-            import os
-            try:
-                config_path = ""
-                # 1) 优先外置配置目录（run_gui/启动代码会设置 HORIZONARM_CONFIG_DIR）
-                cfg_dir = os.environ.get("HORIZONARM_CONFIG_DIR", "").strip()
-                if cfg_dir:
-                    candidate = os.path.join(cfg_dir, "calibration_parameter.json")
-                    if os.path.exists(candidate):
-                        config_path = candidate
-                # 2) 其次资源根目录（HORIZON_DATA_DIR/config）
-                if not config_path:
-                    data_root = os.environ.get("HORIZON_DATA_DIR", "").strip()
-                    if data_root:
-                        candidate = os.path.join(data_root, "config", "calibration_parameter.json")
-                        if os.path.exists(candidate):
-                            config_path = candidate
-                # 3) 最后回退到项目内 config（假设 SDK 在 Embodied_SDK 目录下）
-                if not config_path:
-                    current_dir = os.path.dirname(os.path.abspath(__file__))
-                    root_dir = os.path.dirname(current_dir)
-                    candidate = os.path.join(root_dir, "config", "calibration_parameter.json")
-                    if os.path.exists(candidate):
-                        config_path = candidate
-
-                if config_path and os.path.exists(config_path):
-                    with open(config_path, "r", encoding="utf-8") as f:
-                        calib = json.load(f)
-                else:
-                    print(" 无法找到标定文件: calibration_parameter.json")
-            except Exception as e:
-                print(f" 手动加载标定参数失败: {e}")
 
         if not calib:
             print(" [GraspPixel] 未找到标定参数 calibration_parameter.json")
@@ -368,6 +352,14 @@ class VisualGraspSDK:
         pos = [float(x_w), float(y_w), float(z_w)]
         ori = [float(yaw), float(pitch), float(roll)]
 
+        # 可达性地图（离线生成）判定为不可达时立即放弃，不再等待逆解失败
+        # pos 已是法兰位置（TCP 偏移在 _convert_pixel_to_world_coords 中处理），不再传 tcp_offset
+        from Horizon_Core.core.arm_core.reachability_map import get_default_reachability_map
+        reach = get_default_reachability_map()
+        if reach is not None and reach.is_reachable(pos, ori) is False:
+            print(f" ⚠️ [GraspPixel] 目标位姿不可达，放弃抓取: Pos={pos}, Ori={ori}")
+            return False
+
         print(f" [GraspPixel] 执行抓取: Pos={pos}, Ori={ori}")
 
         # 6) 调用已有的 c_a_p（末端位姿控制）执行抓取运动
@@ -394,6 +386,48 @@ class VisualGraspSDK:
         cy = (float(y1) + float(y2)) * 0.5
         return self.grasp_at_pixel(cx, cy)
 
+    def pixels_to_world(self, pixels, depth=None, current_pose=None) -> Optional[np.ndarray]:
+        """
+        批量把像素坐标转换为基座坐标（一次矩阵乘法，适合多目标排序 / 深度图转点云前的筛选）。
+
+        Args:
+            pixels: (N, 2) 原始相机像素坐标 (u, v)
+            depth: 相机坐标系下深度 (mm)，标量或 (N,)（例如 StereoDepthEstimator 逐点深度）；
+                   None 时使用抓取参数中的 grasp_depth
+            current_pose: 拍摄时的末端位姿，None 时读取当前位姿
+
+        Returns:
+            (N, 3) 基座坐标 (mm)，为目标点本身的位置（不含 TCP 偏移补偿）；失败时返回 None
+        """
+        embodied_internal = horizon_gateway.get_embodied_internal_module()
+        if current_pose is None:
+            current_pose = embodied_internal._get_current_arm_pose()
+            if current_pose is None:
+                print(" [PixelsToWorld] 机械臂未连接或无法获取当前位姿")
+                return None
+
+        if depth is None:
+            grasp = embodied_internal._get_grasp_params()
+            if getattr(self, "_custom_grasp_params", None):
+                grasp.update(self._custom_grasp_params)
+            depth = grasp.get("grasp_depth", 300.0)
+
+        from Horizon_Core.core.arm_core.calibration_store import get_calibration_store
+        from Horizon_Core.core.arm_core.pixel_projection import PixelProjector
+        calib = get_calibration_store().get()
+        if calib is None:
+            print(" [PixelsToWorld] 未找到标定参数 calibration_parameter.json")
+            return None
+        cached = getattr(self, "_pixel_projector", None)
+        if cached is None or cached[0] != calib.version:
+            try:
+                cached = (calib.version, PixelProjector.from_calibration(calib))
+            except ValueError as e:
+                print(f" [PixelsToWorld] {e}")
+                return None
+            self._pixel_projector = cached
+        return cached[1].pixels_to_base(pixels, current_pose, depth)
+
 
 class FollowGraspSDK(VisualGraspSDK):
     """
@@ -418,7 +452,7 @@ class FollowGraspSDK(VisualGraspSDK):
         self._follow_target_class: str = "person(人)"
         self._follow_conf: float = 0.35
         self._follow_running: bool = False
-        self._follow_thread: Optional[threading.Thread] = None
+        self._follow_pipeline: Optional[FollowPipeline] = None
         # 手动框选跟踪器（CSRT/模板匹配，与 GUI 中 _create_manual_tracker 行为一致）
         self._manual_tracker = None
         self._manual_min_bbox: int = 24
@@ -429,8 +463,14 @@ class FollowGraspSDK(VisualGraspSDK):
         self._offset_y: float = 0.0
         # 默认使用平面跟随——只改 XY，不改 Z，更安全
         self._follow_plane_mode: bool = True
-        # 跟随循环的最大频率（单线程模式下）
+        # 位置伺服模式下两次 c_a_p 的最短间隔（线程模式）
         self._follow_interval: float = 0.1  # 10Hz
+        # 伺服方式："position" 每次更新发送一条 c_a_p；"velocity" 使用速度级伺服线程
+        self._follow_servo_mode: str = "position"
+        # 完整检测的帧间隔（1 为逐帧检测；>1 时检测帧之间只运行轻量跟踪器）
+        self._follow_detect_interval: int = 1
+        self._follow_tracker_type: str = "kcf"
+        self._velocity_servo: Optional[ResolvedRateServo] = None
 
     # === 公共配置接口 ===
 
@@ -446,13 +486,38 @@ class FollowGraspSDK(VisualGraspSDK):
         scale_y: Optional[float] = None,
         offset_x: Optional[float] = None,
         offset_y: Optional[float] = None,
+        servo_mode: Optional[str] = None,
+        detect_interval: Optional[int] = None,
+        tracker_type: Optional[str] = None,
     ) -> None:
-        """配置跟随抓取的基础参数。"""
+        """
+        配置跟随抓取的基础参数。
+
+        Args:
+            servo_mode: 可选，"position"（默认，每次更新发送一条 c_a_p 绝对运动）或
+                "velocity"（100 Hz 速度级伺服，检测结果只更新目标位姿，需先 bind_motors）
+            detect_interval: 可选，每隔多少帧执行一次完整 YOLO 检测（默认 1 为逐帧检测）；
+                其余帧只运行轻量跟踪器，跟踪置信度下降时立即重新检测
+            tracker_type: 可选，检测帧之间的跟踪器 "kcf"（默认）/ "mosse" / "csrt" / "template"
+        """
+        if servo_mode is not None:
+            if servo_mode not in ("position", "velocity"):
+                raise ValueError(f"未知的伺服方式: {servo_mode}")
+            if servo_mode != self._follow_servo_mode:
+                self._stop_velocity_servo()
+            self._follow_servo_mode = servo_mode
         self._follow_target_class = target_class
         self._follow_conf = conf_thres
         self._follow_plane_mode = plane_mode
         self._follow_interval = max(0.02, float(interval))
         self._manual_min_bbox = int(max(8, min_bbox))
+        if detect_interval is not None:
+            self._follow_detect_interval = max(1, int(detect_interval))
+        if tracker_type is not None:
+            from Horizon_Core.core.arm_core.adaptive_follower import TRACKER_TYPES
+            if tracker_type not in TRACKER_TYPES:
+                raise ValueError(f"未知的跟踪器类型: {tracker_type}")
+            self._follow_tracker_type = tracker_type
         if scale_x is not None:
             self._scale_x = float(scale_x)
         if scale_y is not None:
@@ -556,6 +621,14 @@ class FollowGraspSDK(VisualGraspSDK):
         cx, cy = center
         return self._apply_follow_servo(cx, cy)
 
+    def _follow_perceive(self, frame: "cv2.Mat"):
+        """流水线感知级：手动跟踪器优先，否则 YOLO + 跟随器，返回 (ok, center)。"""
+        if self._manual_tracker is not None:
+            return self._manual_tracker.update(frame)
+        if not self._ensure_detector_and_follower():
+            return False, None
+        return self._follower.update(frame)  # type: ignore[union-attr]
+
     # === 内置线程模式：自己采图 + 跟随（可选用，不强制） ===
 
     def start_follow_grasp(
@@ -567,6 +640,9 @@ class FollowGraspSDK(VisualGraspSDK):
     ) -> None:
         """
         启动内部线程，持续从摄像头采集画面并执行跟随伺服。
+
+        采集、检测/跟踪、伺服分别在独立线程中按各自速率运行（见 `get_follow_metrics()`）；
+        `interval` 为位置伺服模式下两次 c_a_p 之间的最短间隔，速度伺服模式下忽略。
         """
         if target_class is not None:
             self._follow_target_class = target_class
@@ -575,58 +651,58 @@ class FollowGraspSDK(VisualGraspSDK):
         if interval is not None:
             self._follow_interval = max(0.02, float(interval))
 
-        if self._follow_running:
+        if self.is_following():
             # 已在运行，直接返回
             return
 
         if not self._ensure_detector_and_follower():
             return
 
+        # 分级流水线：采集（共享采集服务）→ 检测/跟踪（每次取最新帧）→ 伺服（每次取最新目标），
+        # 阻塞的 c_a_p 不再拖慢跟踪，积压的帧与目标直接丢弃
+        from Horizon_Core.core.arm_core.camera_service import get_camera_service
+        from Horizon_Core.core.arm_core.follow_pipeline import FollowPipeline
+        servo_interval = 0.0 if self._follow_servo_mode == "velocity" else self._follow_interval
+        self._follow_pipeline = FollowPipeline(
+            get_camera_service(self.camera_id),
+            perceive=self._follow_perceive,
+            servo=lambda center: self._apply_follow_servo(center[0], center[1]),
+            servo_interval=servo_interval,
+        )
         self._follow_running = True
-
-        def _loop():
-            cap = cv2.VideoCapture(self.camera_id)
-            if not cap.isOpened():
-                print(f" [Follow] 无法打开摄像头 {self.camera_id}")
-                self._follow_running = False
-                cap.release()
-                return
-
-            print(f" [Follow] 启动跟随线程，target_class={self._follow_target_class}, conf={self._follow_conf}")
-            try:
-                while self._follow_running:
-                    ok, frame = cap.read()
-                    if not ok or frame is None:
-                        print(" [Follow] 读取摄像头帧失败")
-                        time.sleep(self._follow_interval)
-                        continue
-
-                    # 一步跟随
-                    try:
-                        self.follow_step(frame)
-                    except Exception as e:
-                        print(f" [Follow] 单步跟随异常: {e}")
-
-                    time.sleep(self._follow_interval)
-            finally:
-                cap.release()
-                self._follow_running = False
-                print(" [Follow] 跟随线程已退出")
-
-        self._follow_thread = threading.Thread(target=_loop, daemon=True)
-        self._follow_thread.start()
+        self._follow_pipeline.start()
+        print(f" [Follow] 启动跟随流水线，target_class={self._follow_target_class}, conf={self._follow_conf}")
 
     def stop_follow_grasp(self) -> None:
         """停止内部跟随线程。"""
         self._follow_running = False
-        if self._follow_thread and self._follow_thread.is_alive():
-            self._follow_thread.join(timeout=2.0)
-        self._follow_thread = None
+        if self._follow_pipeline is not None:
+            self._follow_pipeline.stop()
+            print(" [Follow] 跟随流水线已退出")
+        self._stop_velocity_servo()
 
     def is_following(self) -> bool:
         """返回内部线程模式下是否正在跟随。"""
+        if self._follow_running and self._follow_pipeline is not None and not self._follow_pipeline.is_running():
+            # 流水线自行停止（如摄像头无法打开），同步状态并停下速度伺服
+            self._follow_running = False
+            self._stop_velocity_servo()
         return self._follow_running
 
+    def get_follow_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        跟随流水线各级统计（capture / perception / servo / end_to_end）：
+        处理次数、丢弃数、频率与耗时分布（毫秒）；未启动过线程模式时返回空字典。
+        detect_interval > 1 时另含 detection：检测 / 跟踪帧数与检测占比。
+        """
+        if self._follow_pipeline is None:
+            return {}
+        metrics = self._follow_pipeline.metrics()
+        from Horizon_Core.core.arm_core.adaptive_follower import AdaptiveObjectFollower
+        if isinstance(self._follower, AdaptiveObjectFollower):
+            metrics["detection"] = self._follower.stats()
+        return metrics
+
     # ------------------------------------------------------------------
     # 内部辅助函数
     # ------------------------------------------------------------------
@@ -656,8 +732,13 @@ class FollowGraspSDK(VisualGraspSDK):
                 # 3) 最后回退相对路径（适配源码/自定义运行目录）
                 if not model_path:
                     model_path = os.path.join("config", "yolov8n.onnx")
+                # 4) 按 config/detector_model.json 选择 INT8 / FP16 / 缩小输入等变体（未生成时使用原模型）
+                from Horizon_Core.core.arm_core.model_variants import resolve_detector_model
+                model_path = resolve_detector_model(model_path)
 
-                self._detector = YOLOOnnxDetector(model_path)
+                # 进程内共享推理会话：多个模块 / 多路相机同时推理时自动合批
+                from Horizon_Core.core.arm_core.inference_server import create_shared_detector
+                self._detector = create_shared_detector(model_path)
             except Exception as e:
                 print(f" [Follow] 加载 YOLO-ONNX 模型失败: {e}")
                 self._detector = None
@@ -668,13 +749,27 @@ class FollowGraspSDK(VisualGraspSDK):
             self._follower is None
             or self._follower.target_class != self._follow_target_class
             or abs(self._follower.conf_thres - self._follow_conf) > 1e-6
+            or getattr(self._follower, "detect_interval", 1) != self._follow_detect_interval
+            or getattr(self._follower, "tracker_type", self._follow_tracker_type) != self._follow_tracker_type
         ):
-            self._follower = SingleObjectFollower(
-                self._detector,
-                conf_thres=self._follow_conf,
-                iou_thres=0.45,
-                target_class=self._follow_target_class,
-            )
+            if self._follow_detect_interval > 1:
+                # 每 N 帧检测，其余帧轻量跟踪；跟踪失效时立即重新检测
+                from Horizon_Core.core.arm_core.adaptive_follower import AdaptiveObjectFollower
+                self._follower = AdaptiveObjectFollower(
+                    self._detector,
+                    conf_thres=self._follow_conf,
+                    iou_thres=0.45,
+                    target_class=self._follow_target_class,
+                    detect_interval=self._follow_detect_interval,
+                    tracker_type=self._follow_tracker_type,
+                )
+            else:
+                self._follower = SingleObjectFollower(
+                    self._detector,
+                    conf_thres=self._follow_conf,
+                    iou_thres=0.45,
+                    target_class=self._follow_target_class,
+                )
 
         return True
 
@@ -683,7 +778,7 @@ class FollowGraspSDK(VisualGraspSDK):
         将像素坐标作为跟随目标，执行一次简单的平面伺服：
         - 像素 (u,v)  基座坐标 (x,y,z)（使用全局抓取深度与手眼标定参数）；
         - 采用抓取参数中的 yaw/pitch/roll 作为姿态；
-        - 通过 `c_a_p` 发送一次绝对位姿命令。
+        - 通过 `c_a_p` 发送一次绝对位姿命令；速度伺服模式下只更新伺服线程的目标位姿。
         """
         try:
             # 1) 获取当前机械臂末端位姿
@@ -692,8 +787,11 @@ class FollowGraspSDK(VisualGraspSDK):
             if current_pose is None:
                 return False
 
-            # 2) 加载相机标定参数
-            calib = embodied_internal._load_calibration_params()
+            # 2) 相机标定参数（共享缓存，跟随循环中不再读文件）
+            from Horizon_Core.core.arm_core.calibration_store import get_calibration_store
+            calib = get_calibration_store().get_raw()
+            if not calib:
+                calib = embodied_internal._load_calibration_params()
             if not calib:
                 print(" [Follow] 未找到标定参数 calibration_parameter.json")
                 return False
@@ -748,7 +846,20 @@ class FollowGraspSDK(VisualGraspSDK):
             if delta < 2.0:  # 2mm 死区
                 return False
 
-            # 9) 直接调用 c_a_p 执行一次绝对运动
+            # 可达性地图判定不可达的目标直接跳过（目标离开工作空间时保持当前位置）
+            from Horizon_Core.core.arm_core.reachability_map import get_default_reachability_map
+            reach = get_default_reachability_map()
+            if reach is not None and reach.is_reachable(target_pos, target_ori) is False:
+                return False
+
+            # 9) 速度伺服模式：更新目标，由伺服线程连续逼近
+            if self._follow_servo_mode == "velocity":
+                servo = self._ensure_velocity_servo()
+                if servo is not None:
+                    servo.set_target(target_pos, target_ori)
+                    return True
+
+            # 10) 直接调用 c_a_p 执行一次绝对运动
             embodied_func = horizon_gateway.get_embodied_module()
             ok = embodied_func.c_a_p(target_pos, target_ori)
             return bool(ok)
@@ -757,6 +868,42 @@ class FollowGraspSDK(VisualGraspSDK):
             print(f" [Follow] 伺服控制失败: {e}")
             return False
 
+    def _ensure_velocity_servo(self) -> Optional[ResolvedRateServo]:
+        """懒启动速度级伺服线程（以当前关节角为积分起点），失败时返回 None。"""
+        if self._velocity_servo is not None and self._velocity_servo.is_running():
+            return self._velocity_servo
+        if not self._motors or self._joint_map is None:
+            print(" ⚠️ [Follow] 速度伺服需要先调用 bind_motors，改用 c_a_p")
+            return None
+        try:
+            motor_ids = sorted(self._motors)
+            Control_Core = horizon_gateway.get_control_core()
+            state = Control_Core.read_many(self._motors, fields=("position",))
+            if not state["valid"].all():
+                print(" ⚠️ [Follow] 读取当前关节位置失败，改用 c_a_p")
+                return None
+            current = self._joint_map.motor_to_joint_degrees(state["position"])
+
+            encoder = Control_Core.MultiMotorFrameEncoder(motor_ids, mode="direct", is_absolute=True)
+            on_send = self._state_cache.mark_command if self._state_cache is not None else None
+            from Horizon_Core.core.arm_core.resolved_rate import ResolvedRateController, ResolvedRateServo
+            self._velocity_servo = ResolvedRateServo(
+                ResolvedRateController.from_config(),
+                self._motors[motor_ids[0]].can_interface, self._joint_map, encoder,
+                on_send=on_send,
+            )
+            self._velocity_servo.start(current)
+            return self._velocity_servo
+        except Exception as e:
+            print(f" ⚠️ [Follow] 启动速度伺服失败，改用 c_a_p: {e}")
+            self._velocity_servo = None
+            return None
+
+    def _stop_velocity_servo(self) -> None:
+        if self._velocity_servo is not None:
+            self._velocity_servo.stop()
+            self._velocity_servo = None
+
     # ------------------------------------------------------------------
     # 手动跟踪器实现（参考 GUI 中 _create_manual_tracker / CSRT+模板匹配）
     # ------------------------------------------------------------------
@@ -47,8 +47,9 @@ from .base import BaseMotorController, BaseCommandBuilder, BaseCommandParser
 from .commands import ZDTCommandBuilder, ZDTCommandParser
 DriverManager.register_driver("zdt", ZDTMotorController, ZDTCommandBuilder, ZDTCommandParser)
 
-from .can_interface import (
-    SLCANInterface, create_can_interface
+from .can_interface import SLCANInterface
+from .pipelined_can_interface import (
+    PipelinedSLCANInterface, PendingResponse, create_can_interface, create_pipelined_controllers
 )
 from .commands import (
     ZDTCommandBuilder, ZDTCommandParser,
@@ -74,6 +75,16 @@ from .utils import (
     validate_position, validate_current, validate_acceleration
 )
 
+from .array_utils import (
+    degree_to_motor_position_array, motor_position_to_degree_array,
+    rpm_to_motor_speed_array, motor_speed_to_rpm_array,
+    motor_position_error_to_degree_array,
+    encoder_raw_to_degree_array, encoder_calibrated_to_degree_array
+)
+from .joint_map import JointMap, load_joint_map, get_motor_config_path
+# 预分配缓冲区的多电机帧编码器：MultiMotorFrameEncoder([1, ..., 6], mode="direct")
+from .frame_encoder import MultiMotorFrameEncoder
+
 # 导入模块化组件
 from .modules import (
     ControlActionsModule,
@@ -83,6 +94,15 @@ from .modules import (
     ModifyParametersModule
 )
 
+# 批量读取：read_many(motors, fields=(...))
+from .bulk_read import JOINT_STATE_DTYPE, read_many, read_many_from_interface
+
+# 关节状态遥测缓存
+from .joint_state_cache import (
+    JointStateCache, JointStateSnapshot, CachedMotorProxy,
+    wrap_motors_with_cache, enable_joint_state_cache, bind_joint_state_cache
+)
+
 # 定义导出的公共接口
 __all__ = [
     # 主要控制类
@@ -97,7 +117,23 @@ __all__ = [
     
     # CAN接口类
     "SLCANInterface",
+    "PipelinedSLCANInterface",
+    "PendingResponse",
     "create_can_interface",
+    "create_pipelined_controllers",
+    
+    # 批量读取
+    "JOINT_STATE_DTYPE",
+    "read_many",
+    "read_many_from_interface",
+    
+    # 关节状态缓存
+    "JointStateCache",
+    "JointStateSnapshot",
+    "CachedMotorProxy",
+    "wrap_motors_with_cache",
+    "enable_joint_state_cache",
+    "bind_joint_state_cache",
     
     # 命令类
     "ZDTCommandBuilder",
@@ -149,6 +185,21 @@ __all__ = [
     "validate_position",
     "validate_current",
     "validate_acceleration",
+    "degree_to_motor_position_array",
+    "motor_position_to_degree_array",
+    "rpm_to_motor_speed_array",
+    "motor_speed_to_rpm_array",
+    "motor_position_error_to_degree_array",
+    "encoder_raw_to_degree_array",
+    "encoder_calibrated_to_degree_array",
+    
+    # 关节映射
+    "JointMap",
+    "load_joint_map",
+    "get_motor_config_path",
+    
+    # 帧编码
+    "MultiMotorFrameEncoder",
     
     # 便捷函数
     "create_motor_controller",
@@ -195,7 +246,7 @@ def get_version() -> str:
 
 def get_supported_interfaces() -> list:
     """获取支持的CAN接口类型"""
-    return ["slcan"]
+    return ["slcan", "slcan_pipelined"]
 
 
 # 打印欢迎信息
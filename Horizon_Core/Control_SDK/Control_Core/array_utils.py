@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+数组版单位换算工具
+
+`utils` 中的 `degree_to_motor_position` / `rpm_to_motor_speed` 等为标量函数，
+本模块提供对应的 NumPy 数组版本，一次处理整组关节，并支持 `out=` 原地写入以避免分配。
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from .constants import Parameters
+
+
+def degree_to_motor_position_array(degrees, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    将角度数组转换为电机位置参数 (放大10倍，就近取整、.5 取偶（同 round()），保留符号)
+
+    Args:
+        degrees: 角度数组 (度)
+        out: 可选，float64 输出数组
+
+    Returns:
+        np.ndarray: 电机位置参数（float64，数值为整数）
+    """
+    out = np.multiply(degrees, Parameters.POSITION_SCALE, out=out)
+    return np.rint(out, out=out)
+
+
+def motor_position_to_degree_array(motor_positions, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    将电机位置参数数组转换为角度 (缩小10倍)
+
+    Args:
+        motor_positions: 电机位置参数数组
+        out: 可选，float64 输出数组
+
+    Returns:
+        np.ndarray: 角度 (度)
+    """
+    return np.divide(motor_positions, Parameters.POSITION_SCALE, out=out)
+
+
+def rpm_to_motor_speed_array(rpm, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    将转速数组转换为电机速度参数 (放大10倍，就近取整、.5 取偶（同 round()），保留符号)
+
+    Args:
+        rpm: 转速数组 (RPM)
+        out: 可选，float64 输出数组
+
+    Returns:
+        np.ndarray: 电机速度参数（float64，数值为整数）
+    """
+    out = np.multiply(rpm, Parameters.SPEED_SCALE, out=out)
+    return np.rint(out, out=out)
+
+
+def motor_speed_to_rpm_array(motor_speeds, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    将电机速度参数数组转换为转速 (缩小10倍)
+
+    Args:
+        motor_speeds: 电机速度参数数组
+        out: 可选，float64 输出数组
+
+    Returns:
+        np.ndarray: 转速 (RPM)
+    """
+    return np.divide(motor_speeds, Parameters.SPEED_SCALE, out=out)
+
+
+def motor_position_error_to_degree_array(motor_position_errors, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    将电机位置误差参数数组转换为角度 (缩小100倍)
+
+    Args:
+        motor_position_errors: 电机位置误差参数数组
+        out: 可选，float64 输出数组
+
+    Returns:
+        np.ndarray: 角度误差 (度)
+    """
+    return np.divide(motor_position_errors, Parameters.POSITION_ERROR_SCALE, out=out)
+
+
+def encoder_raw_to_degree_array(encoder_raw, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    将编码器原始值数组转换为角度
+
+    Args:
+        encoder_raw: 编码器原始值数组 (0-16383)
+        out: 可选，float64 输出数组
+
+    Returns:
+        np.ndarray: 角度 (度)
+    """
+    out = np.multiply(encoder_raw, 360.0, out=out)
+    return np.divide(out, Parameters.ENCODER_RAW_MAX, out=out)
+
+
+def encoder_calibrated_to_degree_array(encoder_calibrated, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    将校准后编码器值数组转换为角度
+
+    Args:
+        encoder_calibrated: 校准后编码器值数组 (0-65535)
+        out: 可选，float64 输出数组
+
+    Returns:
+        np.ndarray: 角度 (度)
+    """
+    out = np.multiply(encoder_calibrated, 360.0, out=out)
+    return np.divide(out, Parameters.ENCODER_CALIBRATED_MAX, out=out)
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+多电机批量状态读取
+
+`ReadParametersModule.get_position()` / `get_motor_status()` 每次调用都是一次
+完整的“发送 → 等待回复”往返，监控 6 个关节的位置+状态需要 12 次串行事务。
+
+本模块提供 `read_many()`：先把所有查询背靠背发出，再在同一个接收窗口内统一收取回复，
+结果以紧凑的 NumPy 结构化数组返回（每个电机一行）。
+
+使用示例：
+```python
+motors, interface = create_pipelined_controllers([1, 2, 3, 4, 5, 6], port="COM18")
+state = read_many(motors, fields=("position", "speed", "status"))
+print(state["position"], state["in_position"].all())
+```
+
+说明：
+- 底层为 `PipelinedSLCANInterface` 时，所有查询同时在途，仅需一个总线窗口；
+- 底层为普通 `SLCANInterface` 时自动退化为逐个往返，结果格式保持一致；
+- 未请求或读取失败的字段填充为 NaN / False，并通过 `valid` 标记整行是否完整。
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .constants import FunctionCodes, MotorStatusFlags, Parameters, DEFAULT_TIMEOUT
+from .exceptions import CANInterfaceException, CommandException, TimeoutException
+from .pipelined_can_interface import PipelinedSLCANInterface
+
+
+# 关节状态记录的数据类型（每个电机一行）
+JOINT_STATE_DTYPE = np.dtype([
+    ("motor_id", np.uint8),
+    ("position", np.float64),       # 度
+    ("speed", np.float64),          # RPM
+    ("temperature", np.float32),    # 摄氏度
+    ("status", np.uint8),           # 原始状态标志字节
+    ("enabled", np.bool_),
+    ("in_position", np.bool_),
+    ("stalled", np.bool_),
+    ("stall_protection", np.bool_),
+    ("valid", np.bool_),            # 请求的字段是否全部读取成功
+])
+
+# 字段名 -> 读取功能码
+FIELD_FUNCTION_CODES: Dict[str, int] = {
+    "position": FunctionCodes.READ_REALTIME_POSITION,
+    "speed": FunctionCodes.READ_REALTIME_SPEED,
+    "status": FunctionCodes.READ_MOTOR_STATUS,
+    "temperature": FunctionCodes.READ_TEMPERATURE,
+}
+
+DEFAULT_FIELDS = ("position", "speed", "status")
+
+
+def empty_joint_state(motor_ids: Sequence[int]) -> np.ndarray:
+    """
+    创建空的关节状态记录
+
+    Args:
+        motor_ids: 电机ID列表
+
+    Returns:
+        np.ndarray: JOINT_STATE_DTYPE 结构化数组，数值字段为 NaN，标志字段为 False
+    """
+    state = np.zeros(len(motor_ids), dtype=JOINT_STATE_DTYPE)
+    reset_joint_state(state, motor_ids)
+    return state
+
+
+def reset_joint_state(state: np.ndarray, motor_ids: Sequence[int]) -> None:
+    """把已有的关节状态记录原地重置为空值（用于复用预分配缓冲区）"""
+    state["motor_id"] = motor_ids
+    state["position"] = np.nan
+    state["speed"] = np.nan
+    state["temperature"] = np.nan
+    state["status"] = 0
+    for flag in ("enabled", "in_position", "stalled", "stall_protection", "valid"):
+        state[flag] = False
+
+
+def _signed_value(payload: List[int], width: int) -> float:
+    """解析 `符号字节 + width字节大端无符号数` 格式"""
+    if len(payload) < 1 + width:
+        raise CommandException("数据长度不足")
+    raw = int.from_bytes(bytes(payload[1:1 + width]), "big")
+    return -raw if payload[0] else raw
+
+
+def _decode_field(field: str, response: List[int], state_row: np.ndarray) -> None:
+    """
+    把一条回复解码写入状态记录
+
+    Args:
+        field: 字段名
+        response: 回复数据（功能码 + 数据 + 校验字节）
+        state_row: 结构化数组中的一行（原地修改）
+    """
+    if not response or response[0] != FIELD_FUNCTION_CODES[field]:
+        raise CommandException(f"{field} 回复功能码不匹配")
+    payload = response[1:]
+
+    if field == "position":
+        state_row["position"] = _signed_value(payload, 4) / Parameters.POSITION_SCALE
+    elif field == "speed":
+        state_row["speed"] = _signed_value(payload, 2) / Parameters.SPEED_SCALE
+    elif field == "temperature":
+        state_row["temperature"] = _signed_value(payload, 1)
+    elif field == "status":
+        if not payload:
+            raise CommandException("电机状态数据无效")
+        flags = payload[0]
+        state_row["status"] = flags
+        state_row["enabled"] = bool(flags & MotorStatusFlags.ENABLED)
+        state_row["in_position"] = bool(flags & MotorStatusFlags.IN_POSITION)
+        state_row["stalled"] = bool(flags & MotorStatusFlags.STALLED)
+        state_row["stall_protection"] = bool(flags & MotorStatusFlags.STALL_PROTECTION)
+
+
+def _build_queries(command_builder, fields: Iterable[str]) -> List[Tuple[str, List[int]]]:
+    """按字段生成读取命令（命令本身与电机ID无关，只需生成一次）"""
+    builders = {
+        "position": command_builder.read_realtime_position,
+        "speed": command_builder.read_realtime_speed,
+        "status": command_builder.read_motor_status,
+        "temperature": command_builder.read_temperature,
+    }
+    queries = []
+    for field in fields:
+        if field not in FIELD_FUNCTION_CODES:
+            raise ValueError(f"不支持的批量读取字段: {field}，可选: {list(FIELD_FUNCTION_CODES)}")
+        queries.append((field, list(builders[field]())))
+    return queries
+
+
+def read_many_from_interface(can_interface, command_builder, motor_ids: Sequence[int],
+                             fields: Sequence[str] = DEFAULT_FIELDS,
+                             timeout: float = DEFAULT_TIMEOUT,
+                             out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    在给定CAN接口上批量读取多个电机的状态
+
+    Args:
+        can_interface: CAN接口实例（SLCANInterface 或 PipelinedSLCANInterface）
+        command_builder: 命令构建器（ZDTCommandBuilder）
+        motor_ids: 电机ID列表
+        fields: 需要读取的字段，可选 position / speed / status / temperature
+        timeout: 单个回复的超时时间(秒)：流水线接口为每个在途请求的等待时间，普通接口为每次往返的超时
+        out: 可选，预分配的 JOINT_STATE_DTYPE 数组（长度与 motor_ids 一致），原地写入
+
+    Returns:
+        np.ndarray: JOINT_STATE_DTYPE 结构化数组，顺序与 motor_ids 一致
+    """
+    motor_ids = [int(m) for m in motor_ids]
+    queries = _build_queries(command_builder, fields)
+    if out is None:
+        state = empty_joint_state(motor_ids)
+    else:
+        if out.dtype != JOINT_STATE_DTYPE or len(out) != len(motor_ids):
+            raise ValueError("out 数组的类型或长度与 motor_ids 不匹配")
+        state = out
+        reset_joint_state(state, motor_ids)
+    state["valid"] = True
+
+    if isinstance(can_interface, PipelinedSLCANInterface):
+        # 背靠背发出查询，在途数达到上限时先收取最早的回复，其余回复在同一窗口内到达
+        in_flight = deque()
+
+        def _collect_oldest():
+            row, field, pending = in_flight.popleft()
+            with pending:
+                try:
+                    response = pending.result(timeout)
+                    _decode_field(field, response, state[row])
+                except (TimeoutException, CANInterfaceException, CommandException):
+                    state["valid"][row] = False
+
+        for row, motor_id in enumerate(motor_ids):
+            for field, command in queries:
+                if len(in_flight) >= can_interface.max_in_flight:
+                    _collect_oldest()
+                try:
+                    in_flight.append((row, field, can_interface.submit(motor_id, command)))
+                except CANInterfaceException:
+                    state["valid"][row] = False
+        while in_flight:
+            _collect_oldest()
+        return state
+
+    # 普通接口：逐个往返；每次往返各自持有IO锁，其间其他线程的运动命令可以插入
+    for row, motor_id in enumerate(motor_ids):
+        for field, command in queries:
+            try:
+                response = can_interface.send_command_and_receive_response(motor_id, command, timeout)
+                _decode_field(field, response, state[row])
+            except (TimeoutException, CANInterfaceException, CommandException):
+                state["valid"][row] = False
+    return state
+
+
+def read_many(controllers, fields: Sequence[str] = DEFAULT_FIELDS,
+              timeout: float = DEFAULT_TIMEOUT) -> np.ndarray:
+    """
+    批量读取一组电机控制器的状态
+
+    通过第一个控制器所在的共享CAN接口读取，各控制器需位于同一总线。
+
+    Args:
+        controllers: 控制器序列，或 {motor_id: 控制器}（按 motor_id 排序）
+        fields: 需要读取的字段，可选 position / speed / status / temperature
+        timeout: 单个回复的超时时间(秒)：流水线接口为每个在途请求的等待时间，普通接口为每次往返的超时
+
+    Returns:
+        np.ndarray: JOINT_STATE_DTYPE 结构化数组，顺序与 controllers 一致
+    """
+    if isinstance(controllers, dict):
+        controllers = [controllers[motor_id] for motor_id in sorted(controllers)]
+    else:
+        controllers = list(controllers)
+    if not controllers:
+        raise ValueError("controllers 不能为空")
+    first = controllers[0]
+    if first.can_interface is None:
+        raise CANInterfaceException("电机未连接")
+    motor_ids = [controller.motor_id for controller in controllers]
+    return read_many_from_interface(first.can_interface, first.command_builder, motor_ids, fields, timeout)
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+零分配多电机位置帧编码器
+
+`ZDTCommandBuilder.position_mode_direct` / `position_mode_trapezoid` 每次返回新的 list，
+调用方再前置 `[motor_id]` 并拼装成 Y42 帧，`int32_to_bytes` 等也会逐次分配。
+以 100~200Hz 向 6 个电机流式下发轨迹时，这些临时对象会带来明显的 CPU 与 GC 开销。
+
+`MultiMotorFrameEncoder` 在构造时一次性分配整帧 `bytearray`，并用 NumPy 结构化视图
+直接映射每个电机命令的各字段；之后每个周期只需把整组关节目标写入视图，
+角度→位置参数的换算也以数组方式完成，不产生新的 Python 对象。
+
+帧格式（与 `build_y42_multi_motor_frame` 一致）：
+    AA + 长度(2字节, 大端) + (地址 + 功能码 + 参数 + 6B) × N + 6B
+
+构造时若能导入 `ZDTCommandBuilder`，会用两组探测目标（其中一组全部为取整中点）把编码结果与
+`build_reference_frame`（逐电机调用 position_mode_* + build_y42_multi_motor_frame）逐字节对照，
+不一致时抛出 RuntimeError，避免字段偏移或字节序错误被以 100Hz 下发给所有电机。
+
+使用示例：
+```python
+encoder = MultiMotorFrameEncoder([1, 2, 3, 4, 5, 6], mode="direct")
+frame = encoder.encode(motor_degrees, speeds_rpm)      # memoryview，指向内部缓冲区
+can_interface.send_command_no_response(0, frame)       # Y42 帧通过 CAN ID 0 发送
+```
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .array_utils import degree_to_motor_position_array, rpm_to_motor_speed_array
+from .constants import CHECKSUM_BYTE, FunctionCodes, Parameters
+
+
+# 直通限速位置模式 (FB) 单条命令布局：地址 + FB + 方向 + 速度(2) + 位置(4) + 绝对/相对 + 同步 + 6B
+DIRECT_RECORD_DTYPE = np.dtype([
+    ("address", "u1"),
+    ("function", "u1"),
+    ("direction", "u1"),
+    ("speed", ">u2"),
+    ("position", ">u4"),
+    ("absolute", "u1"),
+    ("sync", "u1"),
+    ("checksum", "u1"),
+])
+
+# 梯形曲线位置模式 (FD) 单条命令布局：地址 + FD + 方向 + 加速度(2) + 减速度(2) + 速度(2) + 位置(4) + 绝对/相对 + 同步 + 6B
+TRAPEZOID_RECORD_DTYPE = np.dtype([
+    ("address", "u1"),
+    ("function", "u1"),
+    ("direction", "u1"),
+    ("acceleration", ">u2"),
+    ("deceleration", ">u2"),
+    ("speed", ">u2"),
+    ("position", ">u4"),
+    ("absolute", "u1"),
+    ("sync", "u1"),
+    ("checksum", "u1"),
+])
+
+_Y42_HEADER_SIZE = 3  # AA + 长度(2字节)
+_UINT16_MAX = 0xFFFF
+_UINT32_MAX = 0xFFFFFFFF
+# 自检用的取整中点：放大 10 倍后在浮点下恰为 x.5
+_MIDPOINT_DEGREES = (0.05, 0.15, 12.25, 97.65, 180.15, 0.35)
+_MIDPOINT_RPM = (12.25, 0.05, 0.15, 2.25, 30.05, 6.45)
+
+
+class MultiMotorFrameEncoder:
+    """
+    预分配缓冲区的 Y42 多电机位置帧编码器
+
+    encode() 返回的 memoryview 指向内部缓冲区，下一次 encode() 会覆盖其内容；
+    需要保留时请自行 bytes(frame) 拷贝。
+    """
+
+    def __init__(self, motor_ids: Sequence[int], mode: str = "direct",
+                 is_absolute: bool = True, multi_sync: bool = False, verify: bool = True):
+        """
+        初始化编码器
+
+        Args:
+            motor_ids: 电机ID列表（帧内命令顺序与之一致）
+            mode: "direct" 直通限速位置模式(FB) / "trapezoid" 梯形曲线位置模式(FD)
+            is_absolute: 是否为绝对位置
+            multi_sync: 是否启用多机同步标志
+            verify: 是否在构造时与 ZDTCommandBuilder 的编码结果对照（无法导入时跳过）
+
+        Raises:
+            RuntimeError: 与 ZDTCommandBuilder 的编码结果不一致
+        """
+        if mode not in ("direct", "trapezoid"):
+            raise ValueError(f"不支持的编码模式: {mode}，可选: direct / trapezoid")
+        if not motor_ids:
+            raise ValueError("电机ID列表不能为空")
+
+        self.motor_ids = [int(m) for m in motor_ids]
+        self.mode = mode
+        count = len(self.motor_ids)
+        record_dtype = DIRECT_RECORD_DTYPE if mode == "direct" else TRAPEZOID_RECORD_DTYPE
+        self.record_size = record_dtype.itemsize
+
+        # 整帧缓冲区：帧头 + N 条命令 + 帧尾校验
+        payload_size = count * self.record_size
+        self._buffer = bytearray(_Y42_HEADER_SIZE + payload_size + 1)
+        self._buffer[0] = FunctionCodes.Y42_MULTI_MOTOR
+        self._buffer[1:3] = (payload_size + 1).to_bytes(2, "big")
+        self._buffer[-1] = CHECKSUM_BYTE
+        self._frame = memoryview(self._buffer)
+
+        # 直接映射到缓冲区的结构化视图，写入字段即写入帧
+        self.records = np.frombuffer(self._buffer, dtype=record_dtype, count=count, offset=_Y42_HEADER_SIZE)
+        self.records["address"] = self.motor_ids
+        self.records["function"] = (FunctionCodes.POSITION_MODE_DIRECT if mode == "direct"
+                                    else FunctionCodes.POSITION_MODE_TRAPEZOID)
+        self.records["checksum"] = CHECKSUM_BYTE
+        self.set_flags(is_absolute=is_absolute, multi_sync=multi_sync)
+
+        # 换算用的预分配暂存数组
+        self._position_scratch = np.empty(count, dtype=np.float64)
+        self._speed_scratch = np.empty(count, dtype=np.float64)
+        self._negative = np.empty(count, dtype=np.bool_)
+        self._direction = np.empty(count, dtype=np.uint8)
+
+        if verify:
+            self.verify_against_builder()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def set_flags(self, is_absolute: Optional[bool] = None, multi_sync: Optional[bool] = None) -> None:
+        """修改绝对/相对与多机同步标志（写入缓冲区，后续帧生效）"""
+        if is_absolute is not None:
+            self.is_absolute = bool(is_absolute)
+            self.records["absolute"] = (Parameters.POSITION_ABSOLUTE if is_absolute
+                                        else Parameters.POSITION_RELATIVE)
+        if multi_sync is not None:
+            self.multi_sync = bool(multi_sync)
+            self.records["sync"] = Parameters.SYNC_ENABLED if multi_sync else Parameters.SYNC_DISABLED
+
+    def encode(self, positions, speeds, acceleration=None, deceleration=None) -> memoryview:
+        """
+        把一组电机目标写入缓冲区并返回整帧
+
+        Args:
+            positions: 电机端目标位置数组 (度，可为负数，长度与 motor_ids 一致)
+            speeds: 运动速度数组或标量 (RPM，取绝对值)
+            acceleration: 梯形模式加速度数组或标量 (RPM/s)，direct 模式忽略
+            deceleration: 梯形模式减速度数组或标量 (RPM/s)，direct 模式忽略
+
+        Returns:
+            memoryview: Y42 帧（不含最前面的地址 00，发送时使用 CAN ID 0）
+        """
+        records = self.records
+
+        position = degree_to_motor_position_array(positions, out=self._position_scratch)
+        np.less(position, 0, out=self._negative)
+        np.abs(position, out=position)
+        np.minimum(position, _UINT32_MAX, out=position)
+        records["position"] = position
+
+        # 方向字节：正方向为 DIRECTION_POSITIVE，负方向为 DIRECTION_NEGATIVE
+        np.multiply(self._negative, Parameters.DIRECTION_NEGATIVE - Parameters.DIRECTION_POSITIVE,
+                    out=self._direction, casting="unsafe")
+        np.add(self._direction, Parameters.DIRECTION_POSITIVE, out=self._direction, casting="unsafe")
+        records["direction"] = self._direction
+
+        speed = rpm_to_motor_speed_array(speeds, out=self._speed_scratch)
+        np.abs(speed, out=speed)
+        np.minimum(speed, _UINT16_MAX, out=speed)
+        records["speed"] = speed
+
+        if self.mode == "trapezoid":
+            if acceleration is not None:
+                records["acceleration"] = np.clip(acceleration, 0, _UINT16_MAX)
+            if deceleration is not None:
+                records["deceleration"] = np.clip(deceleration, 0, _UINT16_MAX)
+
+        return self._frame
+
+    def frame(self) -> memoryview:
+        """返回当前缓冲区中的整帧（不重新编码）"""
+        return self._frame
+
+    def command(self, index: int) -> memoryview:
+        """
+        返回第 index 个电机的单条命令（功能码 + 参数 + 6B，不含地址）
+
+        可用于不走 Y42、逐个电机下发的场景：
+        `can_interface.send_command_no_response(encoder.motor_ids[i], encoder.command(i))`
+        """
+        start = _Y42_HEADER_SIZE + index * self.record_size + 1
+        return self._frame[start:start + self.record_size - 1]
+
+    def verify_against_builder(self, builder=None) -> bool:
+        """
+        用一组探测目标对照 ZDTCommandBuilder 的编码结果（不改变缓冲区当前内容）
+
+        Args:
+            builder: 命令构建器，默认导入 ZDTCommandBuilder
+
+        Returns:
+            bool: 已对照且一致时为 True；无法导入构建器时为 False
+
+        Raises:
+            RuntimeError: 编码结果与构建器不一致
+        """
+        if builder is None:
+            try:
+                from .commands import ZDTCommandBuilder as builder
+            except ImportError:
+                return False
+
+        count = len(self.motor_ids)
+        # 第一组覆盖正负方向与多字节字段；第二组全部落在 0.1 单位的中点（x.x5°、x.x5 RPM），
+        # 检验 np.rint（.5 取偶）与构建器的取整一致
+        probes = [
+            ([(-1) ** i * (12.34 + 97.6 * i) for i in range(count)],
+             [3.2 + 41.7 * i for i in range(count)]),
+            ([(-1) ** i * _MIDPOINT_DEGREES[i % len(_MIDPOINT_DEGREES)] for i in range(count)],
+             [_MIDPOINT_RPM[i % len(_MIDPOINT_RPM)] for i in range(count)]),
+        ]
+        acceleration = [100 + 257 * i for i in range(count)] if self.mode == "trapezoid" else None
+        deceleration = [200 + 263 * i for i in range(count)] if self.mode == "trapezoid" else None
+
+        saved = bytes(self._buffer)
+        try:
+            for positions, speeds in probes:
+                encoded = bytes(self.encode(positions, speeds, acceleration, deceleration))
+                expected = build_reference_frame(builder, self.motor_ids, positions, speeds, mode=self.mode,
+                                                 acceleration=acceleration, deceleration=deceleration,
+                                                 is_absolute=self.is_absolute, multi_sync=self.multi_sync)
+                if encoded != expected:
+                    raise RuntimeError(
+                        "MultiMotorFrameEncoder 与 ZDTCommandBuilder 编码结果不一致:\n"
+                        f"  encoder: {encoded.hex(' ')}\n  builder: {expected.hex(' ')}"
+                    )
+        finally:
+            self._buffer[:] = saved
+        return True
+
+
+def build_reference_frame(builder, motor_ids: Sequence[int], positions, speeds, mode: str = "direct",
+                          acceleration=None, deceleration=None, is_absolute: bool = True,
+                          multi_sync: bool = False) -> bytes:
+    """
+    用命令构建器逐电机构建 Y42 多电机位置帧（逐次分配的参考实现，用于对照 MultiMotorFrameEncoder）
+
+    Args:
+        builder: 命令构建器（ZDTCommandBuilder）
+        motor_ids: 电机ID列表
+        positions: 各电机目标位置 (度)
+        speeds: 各电机速度 (RPM)
+        mode: "direct" / "trapezoid"
+        acceleration / deceleration: 梯形模式各电机加减速度 (RPM/s)
+        is_absolute: 是否为绝对位置
+        multi_sync: 是否启用多机同步标志
+
+    Returns:
+        bytes: Y42 帧
+    """
+    commands: List[List[int]] = []
+    for i, motor_id in enumerate(motor_ids):
+        if mode == "trapezoid":
+            body = builder.position_mode_trapezoid(
+                position=float(positions[i]), speed=abs(float(speeds[i])),
+                acceleration=int(acceleration[i]), deceleration=int(deceleration[i]),
+                is_absolute=is_absolute, multi_sync=multi_sync,
+            )
+        else:
+            body = builder.position_mode_direct(
+                position=float(positions[i]), speed=abs(float(speeds[i])),
+                is_absolute=is_absolute, multi_sync=multi_sync,
+            )
+        commands.append([int(motor_id)] + list(body))
+    return bytes(builder.build_y42_multi_motor_frame(commands))
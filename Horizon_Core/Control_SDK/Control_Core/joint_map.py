@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+关节 ↔ 电机映射
+
+机械臂关节角与电机轴角之间只差减速比和方向：
+    电机角度 = 关节角度 × 减速比 × 方向
+
+目前各层（embodied_internal、trajectory_executor、手柄控制……）都按电机逐个循环换算。
+`JointMap` 把 `motor_config.json` 中的减速比/方向一次性载入为数组，
+整条轨迹（形状为 (..., 关节数) 的数组）可以一次完成换算。
+
+使用示例：
+```python
+joint_map = load_joint_map()                      # 按文件修改时间缓存
+motor_deg = joint_map.joint_to_motor_degrees(trajectory)      # (1000, 6)
+pulses = joint_map.joint_to_motor_positions(trajectory)       # 电机位置参数 (放大10倍)
+```
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .array_utils import degree_to_motor_position_array, motor_position_to_degree_array
+
+
+# 与 Embodied_SDK 中 _load_motor_config 保持一致的默认值
+DEFAULT_REDUCER_RATIOS = {1: 62.0, 2: 51.0, 3: 51.0, 4: 62.0, 5: 12.0, 6: 8.0}
+DEFAULT_DIRECTIONS = {1: 1, 2: 1, 3: 1, 4: 1, 5: 1, 6: 1}
+
+# 每秒 360° 对应 60 RPM
+_DEG_PER_SEC_TO_RPM = 60.0 / 360.0
+
+
+def get_motor_config_path() -> str:
+    """
+    获取 motor_config.json 路径
+
+    优先使用环境变量 HORIZONARM_CONFIG_DIR，否则使用项目根目录下的 config/motor_config.json
+    （目录由 core.arm_core.config_paths.get_config_dir 统一确定）。
+    """
+    from Horizon_Core.core.arm_core.config_paths import get_config_dir
+
+    return os.path.join(get_config_dir(), "motor_config.json")
+
+
+class JointMap:
+    """
+    关节与电机之间的数组化映射
+
+    Attributes:
+        motor_ids: 电机ID数组（与关节顺序一致）
+        reducer_ratios: 减速比数组
+        directions: 方向数组 (+1 / -1)
+        scale: 减速比 × 方向，关节角 → 电机角的乘数
+    """
+
+    def __init__(self, motor_ids: Sequence[int], reducer_ratios: Sequence[float], directions: Sequence[int]):
+        """
+        初始化关节映射
+
+        Args:
+            motor_ids: 电机ID列表
+            reducer_ratios: 与 motor_ids 对应的减速比
+            directions: 与 motor_ids 对应的方向 (+1 / -1)
+        """
+        if not (len(motor_ids) == len(reducer_ratios) == len(directions)):
+            raise ValueError("电机ID、减速比、方向的数量必须一致")
+        self.motor_ids = np.asarray(motor_ids, dtype=np.int64)
+        self.reducer_ratios = np.asarray(reducer_ratios, dtype=np.float64)
+        self.directions = np.asarray(directions, dtype=np.float64)
+        self.scale = self.reducer_ratios * self.directions
+        self.inv_scale = 1.0 / self.scale
+        for arr in (self.motor_ids, self.reducer_ratios, self.directions, self.scale, self.inv_scale):
+            arr.setflags(write=False)
+
+    def __len__(self) -> int:
+        return len(self.motor_ids)
+
+    def __repr__(self) -> str:
+        return (f"JointMap(motor_ids={self.motor_ids.tolist()}, "
+                f"reducer_ratios={self.reducer_ratios.tolist()}, directions={self.directions.astype(int).tolist()})")
+
+    @classmethod
+    def from_dicts(cls, reducer_ratios: Dict[int, float], directions: Dict[int, int],
+                   motor_ids: Optional[Sequence[int]] = None) -> "JointMap":
+        """
+        从 {motor_id: 值} 字典构建
+
+        Args:
+            reducer_ratios: {motor_id: 减速比}
+            directions: {motor_id: 方向}
+            motor_ids: 可选，指定关节顺序，默认按电机ID升序
+        """
+        ratios = {int(k): float(v) for k, v in reducer_ratios.items()}
+        dirs = {int(k): int(v) for k, v in directions.items()}
+        if motor_ids is None:
+            motor_ids = sorted(ratios)
+        return cls(
+            list(motor_ids),
+            [ratios.get(int(mid), 1.0) for mid in motor_ids],
+            [dirs.get(int(mid), 1) for mid in motor_ids],
+        )
+
+    @classmethod
+    def from_config(cls, config_path: Optional[str] = None,
+                    motor_ids: Optional[Sequence[int]] = None) -> "JointMap":
+        """
+        从 motor_config.json 构建（文件不存在或解析失败时使用默认值）
+
+        Args:
+            config_path: 配置文件路径，默认见 get_motor_config_path()
+            motor_ids: 可选，指定关节顺序
+        """
+        ratios = dict(DEFAULT_REDUCER_RATIOS)
+        dirs = dict(DEFAULT_DIRECTIONS)
+        config_path = config_path or get_motor_config_path()
+        try:
+            if os.path.exists(config_path):
+                with open(config_path, "r", encoding="utf-8") as f:
+                    loaded = json.load(f)
+                ratios.update({int(k): float(v) for k, v in loaded.get("motor_reducer_ratios", {}).items()})
+                dirs.update({int(k): int(v) for k, v in loaded.get("motor_directions", {}).items()})
+        except Exception as e:
+            print(f" ⚠️ [JointMap] 加载电机配置失败，使用默认值: {e}")
+        return cls.from_dicts(ratios, dirs, motor_ids)
+
+    def subset(self, motor_ids: Sequence[int]) -> "JointMap":
+        """按给定电机ID顺序取子映射"""
+        index = {int(mid): i for i, mid in enumerate(self.motor_ids)}
+        rows = [index[int(mid)] for mid in motor_ids]
+        return JointMap(self.motor_ids[rows], self.reducer_ratios[rows], self.directions[rows])
+
+    def as_dicts(self) -> Tuple[Dict[int, float], Dict[int, int]]:
+        """返回 ({motor_id: 减速比}, {motor_id: 方向})，兼容 _set_real_motors 等旧接口"""
+        ids = self.motor_ids.tolist()
+        return (dict(zip(ids, self.reducer_ratios.tolist())),
+                dict(zip(ids, self.directions.astype(int).tolist())))
+
+    # ------------------------------------------------------------------
+    # 角度换算（输入形状 (..., 关节数)）
+    # ------------------------------------------------------------------
+
+    def joint_to_motor_degrees(self, joint_degrees, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """关节角度 (度) → 电机轴角度 (度)"""
+        return np.multiply(joint_degrees, self.scale, out=out)
+
+    def motor_to_joint_degrees(self, motor_degrees, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """电机轴角度 (度) → 关节角度 (度)"""
+        return np.multiply(motor_degrees, self.inv_scale, out=out)
+
+    def joint_to_motor_positions(self, joint_degrees, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """关节角度 (度) → 电机位置参数 (放大10倍，保留符号)"""
+        out = self.joint_to_motor_degrees(joint_degrees, out=out)
+        return degree_to_motor_position_array(out, out=out)
+
+    def motor_positions_to_joint(self, motor_positions, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """电机位置参数 → 关节角度 (度)"""
+        out = motor_position_to_degree_array(motor_positions, out=out)
+        return np.multiply(out, self.inv_scale, out=out)
+
+    # ------------------------------------------------------------------
+    # 速度换算
+    # ------------------------------------------------------------------
+
+    def joint_velocity_to_motor_rpm(self, joint_deg_per_sec, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """关节角速度 (度/秒) → 电机转速 (RPM，取绝对值)"""
+        out = np.multiply(joint_deg_per_sec, self.reducer_ratios, out=out)
+        np.multiply(out, _DEG_PER_SEC_TO_RPM, out=out)
+        return np.abs(out, out=out)
+
+    def motor_rpm_to_joint_velocity(self, motor_rpm, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """电机转速 (RPM，带符号) → 关节角速度 (度/秒)"""
+        out = np.multiply(motor_rpm, self.inv_scale, out=out)
+        return np.divide(out, _DEG_PER_SEC_TO_RPM, out=out)
+
+
+_joint_map_cache: Dict[str, Tuple[float, JointMap]] = {}
+_joint_map_lock = threading.Lock()
+
+
+def load_joint_map(config_path: Optional[str] = None) -> JointMap:
+    """
+    获取 motor_config.json 对应的 JointMap（进程内缓存，文件修改后自动重新加载）
+
+    Args:
+        config_path: 配置文件路径，默认见 get_motor_config_path()
+
+    Returns:
+        JointMap: 按电机ID升序排列的关节映射
+    """
+    config_path = os.path.abspath(config_path or get_motor_config_path())
+    try:
+        mtime = os.path.getmtime(config_path)
+    except OSError:
+        mtime = -1.0
+    with _joint_map_lock:
+        cached = _joint_map_cache.get(config_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        joint_map = JointMap.from_config(config_path)
+        _joint_map_cache[config_path] = (mtime, joint_map)
+        return joint_map
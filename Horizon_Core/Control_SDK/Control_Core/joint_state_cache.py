@@ -0,0 +1,522 @@
+# -*- coding: utf-8 -*-
+"""
+关节状态遥测缓存
+
+目前每个使用方（is_in_position、手柄控制线程、跟随伺服的 _get_current_arm_pose、
+GUI 监控……）都各自轮询电机，总线流量随使用方数量线性增长。
+
+本模块提供：
+- `JointStateCache`：挂在共享CAN接口上的后台轮询服务，以固定频率批量读取
+  位置/速度/状态（温度按较低频率读取），每次轮询发布一份新的、只读的带时间戳快照；
+- `CachedMotorProxy`：包装电机控制器，`read_parameters` 的位置/速度/状态/温度读取
+  直接取自快照，其余调用原样转发给真实控制器。
+
+使用示例：
+```python
+cache = JointStateCache.for_controller(motors[1], motor_ids=list(motors), rate_hz=100)
+proxies = wrap_motors_with_cache(motors, cache)
+embodied_internal._set_real_motors(proxies, rr, dd)   # 上层读取不再占用总线
+
+snap = cache.latest()
+print(snap.timestamp, snap.state["position"])
+```
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .bulk_read import read_many_from_interface
+from .commands import MotorStatus
+from .constants import DEFAULT_TIMEOUT
+
+
+class JointStateSnapshot:
+    """
+    一次轮询得到的关节状态快照
+
+    Attributes:
+        seq: 快照序号（单调递增）
+        timestamp: 轮询完成时刻 (time.time())
+        poll_start_ns: 本次轮询开始时刻 (time.perf_counter_ns())
+        state: JOINT_STATE_DTYPE 结构化数组
+    """
+
+    __slots__ = ("seq", "timestamp", "poll_start_ns", "state", "_index")
+
+    def __init__(self, seq: int, timestamp: float, poll_start_ns: int, state: np.ndarray,
+                 index: Optional[Dict[int, int]] = None):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.poll_start_ns = poll_start_ns
+        self.state = state
+        if index is None:
+            index = {int(mid): row for row, mid in enumerate(state["motor_id"])}
+        self._index = index
+
+    def row(self, motor_id: int) -> Optional[np.void]:
+        """获取指定电机的状态行，不存在时返回 None"""
+        index = self._index.get(int(motor_id))
+        return None if index is None else self.state[index]
+
+    def age(self) -> float:
+        """快照距今的时间(秒)"""
+        return time.time() - self.timestamp
+
+
+class JointStateCache:
+    """
+    共享CAN接口上的关节状态后台轮询缓存
+
+    每次轮询都写入一块新分配的状态数组，写完后置为只读，再用一次引用赋值替换前台快照，
+    读取方无需加锁。已发布的快照不会再被修改，`latest()` / `fresh_row()` 的结果可任意长期持有；
+    需要可写副本时使用 `snapshot()`。
+    """
+
+    # 挂在CAN接口实例上的属性名
+    INTERFACE_ATTR = "joint_state_cache"
+    # 保护共享实例的查找/创建与引用计数（多个使用方可能在不同线程中同时获取/释放）
+    _instances_lock = threading.Lock()
+
+    def __init__(self, can_interface, command_builder, motor_ids: Sequence[int],
+                 rate_hz: float = 100.0, fields: Sequence[str] = ("position", "speed", "status"),
+                 slow_fields: Sequence[str] = ("temperature",), slow_divider: int = 50,
+                 timeout: float = DEFAULT_TIMEOUT):
+        """
+        初始化关节状态缓存
+
+        Args:
+            can_interface: 共享CAN接口实例
+            command_builder: 命令构建器（ZDTCommandBuilder）
+            motor_ids: 需要轮询的电机ID列表
+            rate_hz: 轮询频率(Hz)
+            fields: 每个周期都读取的字段
+            slow_fields: 低频读取的字段（默认温度）
+            slow_divider: 低频字段每隔多少个周期读取一次
+            timeout: 单次批量读取的超时时间(秒)
+        """
+        self.can_interface = can_interface
+        self.command_builder = command_builder
+        self.motor_ids = [int(m) for m in motor_ids]
+        self.rate_hz = float(rate_hz)
+        self.fields = tuple(fields)
+        self.slow_fields = tuple(f for f in slow_fields if f not in self.fields)
+        self.slow_divider = max(1, int(slow_divider))
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+
+        self._front: Optional[JointStateSnapshot] = None
+        self._index_ids: Tuple[int, ...] = ()
+        self._buffer_index: Dict[int, int] = {}
+        self._slow_values: Dict[str, np.ndarray] = {}
+        self._seq = 0
+        self._updated = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._ref_count = 0
+        self._command_ns = 0
+
+        # 统计信息
+        self.poll_count = 0
+        self.error_count = 0
+        self.overrun_count = 0
+
+    # ------------------------------------------------------------------
+    # 共享实例管理
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def for_controller(cls, controller, motor_ids: Optional[Sequence[int]] = None,
+                       rate_hz: float = 100.0, **kwargs) -> "JointStateCache":
+        """
+        获取（或创建）控制器所在共享接口上的缓存实例，并增加引用计数
+
+        同一接口上的多个使用方共用一个轮询线程；新的 motor_ids 会并入轮询列表。
+
+        Args:
+            controller: 已连接的电机控制器
+            motor_ids: 需要轮询的电机ID列表，默认仅当前电机
+            rate_hz: 轮询频率(Hz)，仅在首次创建时生效
+
+        Returns:
+            JointStateCache: 已启动的缓存实例
+        """
+        can_interface = controller.can_interface
+        if can_interface is None:
+            raise RuntimeError("电机未连接，无法创建关节状态缓存")
+        motor_ids = [controller.motor_id] if motor_ids is None else list(motor_ids)
+
+        with cls._instances_lock:
+            cache = getattr(can_interface, cls.INTERFACE_ATTR, None)
+            if cache is None:
+                cache = cls(can_interface, controller.command_builder, motor_ids, rate_hz, **kwargs)
+                setattr(can_interface, cls.INTERFACE_ATTR, cache)
+            else:
+                cache.add_motors(motor_ids)
+            cache._ref_count += 1
+            cache.start()
+        return cache
+
+    def release(self) -> None:
+        """减少引用计数，最后一个使用方释放时停止轮询并从接口上摘除"""
+        with self._instances_lock:
+            self._ref_count = max(0, self._ref_count - 1)
+            if self._ref_count == 0:
+                self.stop()
+                if getattr(self.can_interface, self.INTERFACE_ATTR, None) is self:
+                    setattr(self.can_interface, self.INTERFACE_ATTR, None)
+
+    def add_motors(self, motor_ids: Sequence[int]) -> None:
+        """把新的电机并入轮询列表（下一个周期生效）"""
+        merged = list(self.motor_ids)
+        for motor_id in motor_ids:
+            if int(motor_id) not in merged:
+                merged.append(int(motor_id))
+        self.motor_ids = merged
+
+    # ------------------------------------------------------------------
+    # 轮询线程
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """启动后台轮询线程（已启动时忽略）"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._poll_loop, name="joint-state-cache", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """停止后台轮询线程"""
+        self._running = False
+        if self._thread is not None and self._thread.is_alive() \
+                and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+        with self._updated:
+            self._updated.notify_all()
+
+    def is_running(self) -> bool:
+        """轮询线程是否在运行"""
+        return self._running
+
+    def _poll_loop(self) -> None:
+        period_ns = int(1e9 / self.rate_hz) if self.rate_hz > 0 else 0
+        next_deadline = time.perf_counter_ns()
+        cycle = 0
+        while self._running:
+            poll_start_ns = time.perf_counter_ns()
+            try:
+                self._poll_once(poll_start_ns, read_slow=(cycle % self.slow_divider == 0))
+            except Exception as e:
+                self.error_count += 1
+                self.logger.debug(f"关节状态轮询失败: {e}")
+            cycle += 1
+
+            next_deadline += period_ns
+            now = time.perf_counter_ns()
+            if now >= next_deadline:
+                # 本周期超时：跳到下一个周期边界再轮询，不做补偿，避免连续占用共享总线
+                self.overrun_count += 1
+                if period_ns > 0:
+                    next_deadline += ((now - next_deadline) // period_ns + 1) * period_ns
+                else:
+                    next_deadline = now
+            # 每周期至少让出一次 CPU（rate_hz <= 0 时 sleep(0)）
+            time.sleep(max(next_deadline - now, 0) / 1e9)
+
+    def _poll_once(self, poll_start_ns: int, read_slow: bool) -> None:
+        motor_ids = tuple(self.motor_ids)
+        if motor_ids != self._index_ids:
+            # 电机列表变化时重建行索引，并强制读取一次低频字段
+            self._index_ids = motor_ids
+            self._buffer_index = {mid: row for row, mid in enumerate(motor_ids)}
+            self._slow_values = {}
+            read_slow = True
+
+        # 每次读入新数组：已发布的快照可能仍被读取方持有，不能原地覆盖
+        fields = self.fields + (self.slow_fields if read_slow else ())
+        state = read_many_from_interface(
+            self.can_interface, self.command_builder, motor_ids, fields, self.timeout
+        )
+
+        # 低频字段：沿用上一次读取的值
+        for field in self.slow_fields:
+            if read_slow:
+                self._slow_values[field] = state[field].copy()
+            elif field in self._slow_values:
+                state[field] = self._slow_values[field]
+
+        state.flags.writeable = False
+        self._seq += 1
+        snapshot = JointStateSnapshot(self._seq, time.time(), poll_start_ns, state, self._buffer_index)
+        # 单次引用赋值即完成发布，读取方无锁
+        self._front = snapshot
+        self.poll_count += 1
+        with self._updated:
+            self._updated.notify_all()
+
+    # ------------------------------------------------------------------
+    # 读取接口
+    # ------------------------------------------------------------------
+
+    def latest(self) -> Optional[JointStateSnapshot]:
+        """获取最新快照（只读、不拷贝，发布后不再变化；尚无数据时返回 None）"""
+        return self._front
+
+    def snapshot(self) -> Optional[JointStateSnapshot]:
+        """获取最新快照的可写拷贝"""
+        front = self._front
+        if front is None:
+            return None
+        return JointStateSnapshot(front.seq, front.timestamp, front.poll_start_ns, front.state.copy())
+
+    def wait_for_update(self, after_seq: int = 0, timeout: float = 1.0) -> Optional[JointStateSnapshot]:
+        """
+        等待序号大于 after_seq 的快照
+
+        Args:
+            after_seq: 已见过的快照序号
+            timeout: 超时时间(秒)
+
+        Returns:
+            新快照；超时或缓存已停止时返回 None
+        """
+        deadline = time.monotonic() + timeout
+        with self._updated:
+            while self._running:
+                front = self._front
+                if front is not None and front.seq > after_seq:
+                    return front
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._updated.wait(remaining)
+        return None
+
+    def mark_command(self) -> None:
+        """
+        记录一次运动/参数命令的发送时刻
+
+        此时刻之前开始的轮询结果不再视为有效（例如命令前的 in_position 状态），
+        读取方会等待下一次轮询或直接回退到实时读取。
+        """
+        self._command_ns = time.perf_counter_ns()
+
+    def fresh_row(self, motor_id: int, max_age: Optional[float] = None) -> Optional[np.void]:
+        """
+        获取指定电机的有效状态行
+
+        Args:
+            motor_id: 电机ID
+            max_age: 允许的最大快照年龄(秒)，默认 3 个轮询周期
+
+        Returns:
+            状态行；快照过旧、早于最近一次命令或读取失败时返回 None
+        """
+        front = self._front
+        if front is None or not self._running:
+            return None
+        if max_age is None:
+            max_age = 3.0 / self.rate_hz if self.rate_hz > 0 else 0.1
+        command_ns = max(self._command_ns, getattr(self.can_interface, "last_command_ns", 0))
+        if front.poll_start_ns <= command_ns or front.age() > max_age:
+            return None
+        row = front.row(motor_id)
+        if row is None or not row["valid"]:
+            return None
+        return row
+
+
+class _CommandNotifier:
+    """包装命令类模块：任何方法调用后通知缓存有新命令发出"""
+
+    def __init__(self, target, cache: JointStateCache):
+        self._target = target
+        self._cache = cache
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+        cache = self._cache
+
+        def _call(*args, **kwargs):
+            cache.mark_command()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                cache.mark_command()
+        return _call
+
+
+class CachedReadParameters:
+    """
+    从关节状态缓存提供读取的 read_parameters 替身
+
+    get_position / get_speed / get_motor_status / get_temperature 优先使用快照，
+    快照不可用时回退到真实读取；其余方法直接转发。
+    """
+
+    def __init__(self, read_parameters, motor_id: int, cache: JointStateCache):
+        self._read_parameters = read_parameters
+        self._motor_id = motor_id
+        self._cache = cache
+
+    def __getattr__(self, name):
+        return getattr(self._read_parameters, name)
+
+    def get_position(self) -> float:
+        """获取当前位置 (度)"""
+        row = self._cache.fresh_row(self._motor_id)
+        if row is not None and not np.isnan(row["position"]):
+            return float(row["position"])
+        return self._read_parameters.get_position()
+
+    def get_speed(self) -> float:
+        """获取当前转速 (RPM)"""
+        row = self._cache.fresh_row(self._motor_id)
+        if row is not None and not np.isnan(row["speed"]):
+            return float(row["speed"])
+        return self._read_parameters.get_speed()
+
+    def get_temperature(self) -> float:
+        """获取驱动器温度 (摄氏度)"""
+        row = self._cache.fresh_row(self._motor_id, max_age=max(1.0, self._cache.slow_divider / self._cache.rate_hz * 2))
+        if row is not None and not np.isnan(row["temperature"]):
+            return float(row["temperature"])
+        return self._read_parameters.get_temperature()
+
+    def get_motor_status(self) -> MotorStatus:
+        """获取电机状态"""
+        row = self._cache.fresh_row(self._motor_id)
+        if row is not None and "status" in self._cache.fields:
+            return MotorStatus(
+                enabled=bool(row["enabled"]),
+                in_position=bool(row["in_position"]),
+                stalled=bool(row["stalled"]),
+                stall_protection=bool(row["stall_protection"]),
+            )
+        return self._read_parameters.get_motor_status()
+
+
+class CachedMotorProxy:
+    """
+    电机控制器代理
+
+    - read_parameters 的常用读取走关节状态缓存；
+    - control_actions / homing_commands / trigger_actions / modify_parameters
+      以及控制器上的运动方法照常执行，并通知缓存作废命令前的快照；
+    - 其他属性原样转发给真实控制器。
+    """
+
+    _COMMAND_MODULES = ("control_actions", "homing_commands", "trigger_actions", "modify_parameters")
+    _COMMAND_METHODS = ("multi_motor_command", "move_to_position", "sync_motion")
+
+    def __init__(self, controller, cache: JointStateCache):
+        self._controller = controller
+        self._cache = cache
+        self.read_parameters = CachedReadParameters(controller.read_parameters, controller.motor_id, cache)
+
+    @property
+    def controller(self):
+        """被代理的真实控制器"""
+        return self._controller
+
+    @property
+    def cache(self) -> JointStateCache:
+        """所使用的关节状态缓存"""
+        return self._cache
+
+    def __getattr__(self, name):
+        attr = getattr(self._controller, name)
+        if name in self._COMMAND_MODULES:
+            return _CommandNotifier(attr, self._cache)
+        if name in self._COMMAND_METHODS and callable(attr):
+            return _CommandNotifier(self._controller, self._cache).__getattr__(name)
+        return attr
+
+    def get_position(self) -> float:
+        """获取当前位置 (度)"""
+        return self.read_parameters.get_position()
+
+    def is_in_position(self) -> bool:
+        """是否到位"""
+        return bool(self.read_parameters.get_motor_status().in_position)
+
+    def __enter__(self):
+        self._controller.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self._controller.__exit__(exc_type, exc_val, exc_tb)
+
+
+def wrap_motors_with_cache(motors: Dict[int, Any], cache: JointStateCache) -> Dict[int, CachedMotorProxy]:
+    """
+    用关节状态缓存包装一组电机控制器
+
+    Args:
+        motors: {motor_id: ZDTMotorController}
+        cache: 关节状态缓存
+
+    Returns:
+        Dict[int, CachedMotorProxy]: 同样键的代理字典
+    """
+    return {mid: CachedMotorProxy(motor, cache) for mid, motor in motors.items()}
+
+
+def enable_joint_state_cache(motors: Dict[int, Any], rate_hz: float = 100.0,
+                             **kwargs) -> Optional[Dict[int, CachedMotorProxy]]:
+    """
+    为一组共享同一接口的电机启用关节状态缓存
+
+    Args:
+        motors: {motor_id: ZDTMotorController}，需已连接
+        rate_hz: 轮询频率(Hz)
+
+    Returns:
+        代理字典；电机为空或未连接时返回 None
+    """
+    if not motors:
+        return None
+    controller = next(iter(motors.values()))
+    if isinstance(controller, CachedMotorProxy):
+        controller = controller.controller
+    if getattr(controller, "can_interface", None) is None:
+        return None
+    cache = JointStateCache.for_controller(controller, motor_ids=list(motors), rate_hz=rate_hz, **kwargs)
+    raw = {mid: (m.controller if isinstance(m, CachedMotorProxy) else m) for mid, m in motors.items()}
+    return wrap_motors_with_cache(raw, cache)
+
+
+def bind_joint_state_cache(motors: Dict[int, Any], rate_hz: Optional[float],
+                           previous: Optional[JointStateCache] = None,
+                           owner: str = "JointStateCache") -> Tuple[Dict[int, Any], Optional[JointStateCache]]:
+    """
+    绑定电机时切换关节状态缓存：释放 previous 的引用，按 rate_hz 重新启用
+
+    Args:
+        motors: {motor_id: ZDTMotorController}
+        rate_hz: 轮询频率(Hz)，为空时不启用
+        previous: 之前持有的缓存（可为 None）
+        owner: 警告信息中的调用方名称
+
+    Returns:
+        (motors, cache)：启用成功时为代理字典与缓存实例，否则为原始电机与 None
+    """
+    if previous is not None:
+        previous.release()
+    if not rate_hz:
+        return motors, None
+    try:
+        proxies = enable_joint_state_cache(motors, rate_hz=rate_hz)
+    except Exception as e:
+        print(f" ⚠️ [{owner}] 启用关节状态缓存失败，使用直接读取: {e}")
+        return motors, None
+    if not proxies:
+        return motors, None
+    return proxies, next(iter(proxies.values())).cache
@@ -0,0 +1,558 @@
+# -*- coding: utf-8 -*-
+"""
+流水线式 SLCAN 通信接口
+
+`SLCANInterface` 的每次请求都在 `_io_lock` 内“发送 → 阻塞等待回复”，
+多电机共享一条总线时，读取 6 个关节位置需要 6 次完整往返 (6×RTT)。
+
+本模块提供 `PipelinedSLCANInterface`：
+- 后台读线程持续解析串口上的 SLCAN 帧；
+- 发送端只在写串口时短暂加锁，允许多个请求同时在途；
+- 每个回复按 CAN 帧 ID（电机地址）+ 功能码路由给对应的等待者；
+- 同一电机的回复天然按请求顺序返回，因此同 ID 的等待者按 FIFO 匹配；
+- 超时的等待者立即注销，并为其（电机地址, 功能码）留下短时“墓碑”：此后到达的同功能码回复
+  视为其迟到回复直接丢弃；同一（电机地址, 功能码）发出新请求时墓碑随即清除，
+  回复丢失后的重试仍能收到自己的回复，不会让后续请求连带失败。
+
+使用方式（`create_pipelined_controllers` 创建一个流水线接口并挂到每个控制器上）：
+```python
+from Control_Core import create_pipelined_controllers
+
+motors, interface = create_pipelined_controllers(range(1, 7), port="COM18", baudrate=500000)
+...
+interface.disconnect()          # 控制器不持有该接口，结束时由调用方断开
+```
+共享同一接口的多个控制器在多线程中并发读写时即可获得流水线 I/O；
+批量读取可直接使用 `submit()` 背靠背发出请求再等待结果；在途数达到 `max_in_flight` 时
+`submit()` 会阻塞，需先结束已发出的请求：
+```python
+with interface.submit(motor_id, command) as pending:   # 退出时释放在途名额
+    response = pending.result(timeout=0.1)
+```
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .can_interface import SLCANInterface, create_can_interface as _create_slcan_interface
+from .constants import DEFAULT_TIMEOUT
+from .exceptions import CANInterfaceException, TimeoutException
+
+
+# 需要流水线模式时可使用的接口类型名称
+PIPELINED_INTERFACE_TYPES = ("slcan_pipelined", "slcan_async")
+
+
+class PendingResponse:
+    """
+    单个在途请求的回复占位对象
+
+    由 `PipelinedSLCANInterface.submit()` 返回，调用 `result()` 阻塞等待回复；
+    用完后调用 `close()`（或用 with 语句）结束请求，释放在途名额。
+    """
+
+    __slots__ = (
+        "frame_id", "function_code", "accept_any", "multi_frame",
+        "created_at", "finished_at", "_event", "_data", "_error", "_last_frame_at", "_on_close",
+    )
+
+    def __init__(self, frame_id: int, function_code: Optional[int],
+                 accept_any: bool = False, multi_frame: bool = False,
+                 on_close: Optional[Callable[["PendingResponse"], None]] = None):
+        self.frame_id = frame_id
+        self.function_code = function_code
+        self.accept_any = accept_any
+        self.multi_frame = multi_frame
+        self.created_at = time.monotonic()
+        # 等待结束（超时或多包接收完成）的时刻，之后不再接收数据
+        self.finished_at: Optional[float] = None
+        self._event = threading.Event()
+        self._data: List[int] = []
+        self._error: Optional[Exception] = None
+        self._last_frame_at = 0.0
+        self._on_close = on_close
+
+    def matches(self, data: List[int]) -> bool:
+        """判断回复帧的功能码是否与本请求一致"""
+        return self.function_code is None or (bool(data) and data[0] == self.function_code)
+
+    def done(self) -> bool:
+        """是否已收到回复（或已失败）"""
+        return self._event.is_set()
+
+    def close(self) -> None:
+        """结束请求：注销等待者并释放在途名额（可重复调用）"""
+        on_close, self._on_close = self._on_close, None
+        if on_close is not None:
+            on_close(self)
+
+    def __enter__(self) -> "PendingResponse":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _feed(self, data: List[int]) -> None:
+        """读线程写入回复数据；多包回复的后续包去掉重复的功能码"""
+        if self._data and self.function_code is not None and data and data[0] == self.function_code:
+            data = data[1:]
+        self._data.extend(data)
+        self._last_frame_at = time.monotonic()
+        self._event.set()
+
+    def _fail(self, error: Exception) -> None:
+        self._error = error
+        self._event.set()
+
+    def result(self, timeout: float = DEFAULT_TIMEOUT, quiet_gap: float = 0.005) -> List[int]:
+        """
+        等待并返回回复数据
+
+        Args:
+            timeout: 超时时间(秒)
+            quiet_gap: 多包回复时，最后一包之后的静默间隔(秒)，超过即认为接收完整
+
+        Returns:
+            List[int]: 回复数据（功能码 + 数据 + 校验字节）
+
+        Raises:
+            TimeoutException: 超时未收到回复
+        """
+        if not self._event.wait(timeout):
+            self.finished_at = time.monotonic()
+            raise TimeoutException(timeout)
+        if self._error is not None:
+            raise self._error
+        if self.multi_frame:
+            deadline = self.created_at + timeout
+            while True:
+                remaining = quiet_gap - (time.monotonic() - self._last_frame_at)
+                if remaining <= 0 or time.monotonic() >= deadline:
+                    break
+                time.sleep(remaining)
+            self.finished_at = time.monotonic()
+        return list(self._data)
+
+
+class PipelinedSLCANInterface(SLCANInterface):
+    """
+    支持多请求在途的 SLCAN 接口
+
+    与 `SLCANInterface` 接口完全兼容，可直接替换使用。
+    """
+
+    # 回复可能超过 8 字节、需要按多包拼接的读取类功能码
+    MULTI_FRAME_FUNCTION_CODES = frozenset({0x21, 0x22, 0x42, 0x43})
+    # 读取类功能码范围（0x1F 版本 ~ 0x43 系统状态），其余视为会改变电机状态的命令
+    READ_FUNCTION_CODES = frozenset(range(0x1F, 0x44))
+
+    def __init__(self, port: str = "COM18", baudrate: int = 500000, max_in_flight: int = 8,
+                 late_reply_window: float = 0.5):
+        """
+        初始化流水线SLCAN接口
+
+        Args:
+            port: 串口号
+            baudrate: 波特率
+            max_in_flight: 最多同时在途的请求数（避免适配器缓冲区溢出）
+            late_reply_window: 请求超时后，丢弃其迟到回复的时间窗口(秒)
+        """
+        super().__init__(port=port, baudrate=baudrate)
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.late_reply_window = float(late_reply_window)
+
+        self._write_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._pending: Dict[int, Deque[PendingResponse]] = {}
+        self._unsolicited: Dict[int, Deque[List[int]]] = {}
+        # (基础帧ID, 功能码) -> 超时请求的墓碑到期时刻；新请求发出时清除，最多吞掉一条迟到回复
+        self._tombstones: Dict[Tuple[int, int], float] = {}
+        self._in_flight = threading.BoundedSemaphore(self.max_in_flight)
+
+        self._reader_thread: Optional[threading.Thread] = None
+        self._reader_running = False
+        self._rx_buffer = bytearray()
+        # 最近一次非读取类命令的发送时刻 (perf_counter_ns)，供状态缓存判断快照是否过期
+        self.last_command_ns = 0
+
+    # ------------------------------------------------------------------
+    # 连接管理
+    # ------------------------------------------------------------------
+
+    def connect(self):
+        """连接SLCAN设备并启动后台读线程"""
+        super().connect()
+        # 读线程需要能及时响应停止标志，串口读取超时保持很短
+        self.ser.timeout = 0.01
+        self._rx_buffer.clear()
+        self._reader_running = True
+        self._reader_thread = threading.Thread(
+            target=self._reader_loop, name=f"slcan-reader-{self.port}", daemon=True
+        )
+        self._reader_thread.start()
+
+    def disconnect(self):
+        """停止后台读线程并断开SLCAN连接"""
+        self._reader_running = False
+        if self._reader_thread is not None and self._reader_thread.is_alive():
+            self._reader_thread.join(timeout=1.0)
+        self._reader_thread = None
+        self._fail_all_pending(CANInterfaceException("SLCAN连接已断开"))
+        super().disconnect()
+
+    # ------------------------------------------------------------------
+    # 发送
+    # ------------------------------------------------------------------
+
+    def send_message(self, frame_id: int, data: List[int]):
+        """
+        发送CAN消息 (通过SLCAN)，不清空接收缓冲区，不等待回复
+
+        Args:
+            frame_id: CAN帧ID
+            data: 数据字节列表
+        """
+        if self.ser is None or not self.ser.is_open:
+            raise CANInterfaceException("SLCAN未连接")
+        if len(data) > 8:
+            raise CANInterfaceException(f"CAN数据长度不能超过8字节，当前: {len(data)}")
+
+        slcan_cmd = f"T{frame_id:08X}{len(data)}{''.join(f'{b:02X}' for b in data)}\r"
+        try:
+            with self._write_lock:
+                self.ser.write(slcan_cmd.encode("ascii"))
+        except Exception as e:
+            raise CANInterfaceException(f"发送SLCAN消息失败: {e}")
+
+    def _iter_packets(self, motor_id: int, command_data: List[int]) -> Iterator[Tuple[int, List[int]]]:
+        """
+        按ZDT协议拆分命令：首包8字节，后续每包以功能码开头、再跟7字节数据
+
+        Yields:
+            (frame_id, packet_data)
+        """
+        base_frame_id = motor_id << 8
+        if len(command_data) <= 8:
+            yield base_frame_id, list(command_data)
+            return
+
+        function_code = command_data[0]
+        yield base_frame_id, list(command_data[:8])
+        remaining = command_data[8:]
+        packet_index = 1
+        while remaining:
+            yield base_frame_id + packet_index, [function_code] + list(remaining[:7])
+            remaining = remaining[7:]
+            packet_index += 1
+
+    def _write_command(self, motor_id: int, command_data: List[int]) -> None:
+        """连续写出一条命令的全部分包，保证分包之间不被其他请求插入"""
+        if command_data and command_data[0] not in self.READ_FUNCTION_CODES:
+            self.last_command_ns = time.perf_counter_ns()
+        with self._write_lock:
+            for frame_id, packet in self._iter_packets(motor_id, command_data):
+                slcan_cmd = f"T{frame_id:08X}{len(packet)}{''.join(f'{b:02X}' for b in packet)}\r"
+                self.ser.write(slcan_cmd.encode("ascii"))
+
+    def submit(self, motor_id: int, command_data: List[int],
+               expected_response_motor_id: Optional[int] = None) -> PendingResponse:
+        """
+        发出一条命令并立即返回回复占位对象（不阻塞等待回复）
+
+        Args:
+            motor_id: 发送命令的电机ID
+            command_data: 命令数据 (不包含地址，只有功能码+参数+校验)
+            expected_response_motor_id: 期望回复的电机ID（默认与 motor_id 相同）
+
+        Returns:
+            PendingResponse: 调用其 result(timeout) 获取回复数据，结束后须调用 close()（或使用 with 语句）
+        """
+        if self.ser is None or not self.ser.is_open or not self._reader_running:
+            raise CANInterfaceException("SLCAN未连接")
+        if not command_data:
+            raise CANInterfaceException("命令数据不能为空")
+
+        reply_motor_id = motor_id if expected_response_motor_id is None else expected_response_motor_id
+        function_code = command_data[0]
+        pending = PendingResponse(
+            frame_id=reply_motor_id << 8,
+            function_code=function_code,
+            accept_any=expected_response_motor_id is not None,
+            multi_frame=function_code in self.MULTI_FRAME_FUNCTION_CODES,
+            on_close=self._release,
+        )
+
+        # 先登记等待者再写串口，避免极快的回复先于登记到达
+        self._in_flight.acquire()
+        with self._pending_lock:
+            # 迟到回复只可能属于此前超时的请求；有了新请求后不再丢弃，回复交给新请求
+            self._tombstones.pop((pending.frame_id, function_code), None)
+            self._pending.setdefault(pending.frame_id, deque()).append(pending)
+        try:
+            self._write_command(motor_id, command_data)
+        except Exception as e:
+            self._discard(pending)
+            self._in_flight.release()
+            raise CANInterfaceException(f"SLCAN命令发送失败: {e}")
+        return pending
+
+    def send_command_and_receive_response(self, motor_id: int, command_data: List[int],
+                                          timeout: float = DEFAULT_TIMEOUT) -> List[int]:
+        """
+        发送命令并接收响应（可与其他请求并发在途）
+
+        Args:
+            motor_id: 电机ID
+            command_data: 命令数据 (不包含地址，只有功能码+参数+校验)
+            timeout: 超时时间(秒)
+
+        Returns:
+            List[int]: 响应数据
+        """
+        with self.submit(motor_id, command_data) as pending:
+            return pending.result(timeout)
+
+    def send_command_and_receive_response_from(self, motor_id: int, command_data: List[int],
+                                               expected_response_motor_id: int,
+                                               timeout: float = DEFAULT_TIMEOUT) -> List[int]:
+        """
+        发送命令并从特定的期望响应电机ID接收响应（用于Y42多电机命令）
+
+        Args:
+            motor_id: 发送命令的电机ID（例如0号广播）
+            command_data: 命令数据 (不包含地址，只有功能码+参数+校验)
+            expected_response_motor_id: 期望接收回复的电机ID（例如1）
+            timeout: 超时时间(秒)
+        """
+        with self.submit(motor_id, command_data, expected_response_motor_id) as pending:
+            return pending.result(timeout)
+
+    def send_command_no_response(self, motor_id: int, command_data: List[int]):
+        """发送命令但不等待响应，会自动处理分包发送"""
+        if self.ser is None or not self.ser.is_open:
+            raise CANInterfaceException("SLCAN未连接")
+        try:
+            self._write_command(motor_id, command_data)
+        except Exception as e:
+            raise CANInterfaceException(f"SLCAN命令发送失败: {e}")
+
+    # ------------------------------------------------------------------
+    # 接收
+    # ------------------------------------------------------------------
+
+    def receive_message(self, expected_frame_id: Optional[int] = None,
+                        timeout: float = DEFAULT_TIMEOUT) -> List[int]:
+        """
+        接收CAN消息（优先取出无人认领的已到达帧）
+
+        Args:
+            expected_frame_id: 期望的CAN帧ID
+            timeout: 超时时间(秒)
+
+        Returns:
+            List[int]: 接收到的数据
+        """
+        frame_id = 0 if expected_frame_id is None else expected_frame_id
+        with self._pending_lock:
+            queued = self._unsolicited.get(frame_id)
+            if queued:
+                return queued.popleft()
+            pending = PendingResponse(frame_id=frame_id, function_code=None, accept_any=True)
+            self._pending.setdefault(frame_id, deque()).append(pending)
+        try:
+            return pending.result(timeout)
+        finally:
+            self._discard(pending)
+
+    def _release(self, pending: PendingResponse) -> None:
+        """请求结束（PendingResponse.close）：立即注销等待者、释放在途名额；未收到回复时留下墓碑"""
+        pending.finished_at = pending.finished_at or time.monotonic()
+        self._discard(pending)
+        if not pending.done() and pending.function_code is not None and self.late_reply_window > 0:
+            key = (pending.frame_id, pending.function_code)
+            with self._pending_lock:
+                if not self._has_waiter(key):
+                    self._tombstones[key] = time.monotonic() + self.late_reply_window
+        self._in_flight.release()
+
+    def _discard(self, pending: PendingResponse) -> None:
+        with self._pending_lock:
+            queue = self._pending.get(pending.frame_id)
+            if queue is not None:
+                try:
+                    queue.remove(pending)
+                except ValueError:
+                    pass
+
+    def _fail_all_pending(self, error: Exception) -> None:
+        with self._pending_lock:
+            for queue in self._pending.values():
+                for pending in queue:
+                    pending._fail(error)
+            self._pending.clear()
+            self._unsolicited.clear()
+            self._tombstones.clear()
+
+    def _reader_loop(self) -> None:
+        """后台读线程：读取串口字节流、切分SLCAN行并分发"""
+        while self._reader_running:
+            try:
+                chunk = self.ser.read(self.ser.in_waiting or 1)
+            except Exception as e:
+                if self._reader_running:
+                    self.logger.error(f"接收SLCAN消息时发生错误: {e}")
+                    self._fail_all_pending(CANInterfaceException(f"接收SLCAN消息失败: {e}"))
+                    self._reader_running = False
+                break
+            if not chunk:
+                continue
+            self._rx_buffer.extend(chunk)
+            while True:
+                end = self._rx_buffer.find(b"\r")
+                if end < 0:
+                    break
+                line = bytes(self._rx_buffer[:end])
+                del self._rx_buffer[:end + 1]
+                frame = self._parse_line(line)
+                if frame is not None:
+                    self._dispatch(*frame)
+
+    def _parse_line(self, line: bytes) -> Optional[Tuple[int, List[int]]]:
+        """
+        解析一行SLCAN数据
+
+        支持扩展帧 `Tiiiiiiiil<data>` 与标准帧 `tiiil<data>`；
+        发送确认(`z`/`Z`)、空行与错误响铃(\\x07)直接忽略。
+        """
+        line = line.strip(b"\x07\n ")
+        try:
+            if line[:1] == b"T" and len(line) >= 10:
+                frame_id = int(line[1:9], 16)
+                length = int(line[9:10], 16)
+                payload = line[10:10 + 2 * length]
+            elif line[:1] == b"t" and len(line) >= 5:
+                frame_id = int(line[1:4], 16)
+                length = int(line[4:5], 16)
+                payload = line[5:5 + 2 * length]
+            else:
+                return None
+            if len(payload) != 2 * length:
+                return None
+            return frame_id, list(bytes.fromhex(payload.decode("ascii")))
+        except ValueError:
+            self.logger.debug(f"解析响应失败, 原始数据: {line!r}")
+            return None
+
+    def _dispatch(self, frame_id: int, data: List[int]) -> None:
+        """
+        把一帧回复路由给等待者
+
+        路由规则（同一基础帧ID内）：
+        1. 后续包（帧ID低字节 > 0）只交给已收到首包、功能码一致的多包等待者，否则暂存；
+        2. 首包优先匹配最早的、功能码一致且尚未收到回复的等待者；
+        3. 没有这样的等待者时，若同功能码存在超时请求（墓碑未过期或尚未 close），
+           视为其迟到回复直接丢弃（每个超时请求只丢弃一条）；
+        4. 再次匹配最早的 accept_any 等待者（如Y42确认、receive_message）；
+        5. 无人认领则暂存，供 receive_message 取用。
+        已结束（超时）的等待者不参与匹配；新请求发出时清除同功能码的墓碑，
+        因此丢弃的只可能是那个超时请求自己的回复，重试请求不会被错判。
+        """
+        base_frame_id = frame_id & ~0xFF
+        continuation = (frame_id & 0xFF) > 0
+        with self._pending_lock:
+            queue = self._pending.get(base_frame_id) or ()
+            target = None
+            if continuation:
+                for pending in queue:
+                    if (pending.finished_at is None and pending.multi_frame
+                            and pending.done() and pending.matches(data)):
+                        target = pending
+                        break
+            else:
+                for pending in queue:
+                    if pending.finished_at is None and not pending.done() and pending.matches(data):
+                        target = pending
+                        break
+                if target is None and data and self._drop_late_reply(base_frame_id, data[0]):
+                    return
+                if target is None:
+                    for pending in queue:
+                        if pending.finished_at is None and not pending.done() and pending.accept_any:
+                            target = pending
+                            break
+                if target is not None and not target.multi_frame:
+                    queue.remove(target)
+            if target is None:
+                self._unsolicited.setdefault(frame_id, deque(maxlen=64)).append(data)
+                return
+            target._feed(data)
+
+    def _has_waiter(self, key: Tuple[int, int]) -> bool:
+        """是否有同（基础帧ID, 功能码）、仍在等待回复的请求（调用方持有 _pending_lock）"""
+        return any(pending.finished_at is None and not pending.done() and pending.function_code == key[1]
+                   for pending in self._pending.get(key[0], ()))
+
+    def _drop_late_reply(self, base_frame_id: int, function_code: int) -> bool:
+        """
+        回复是否属于某个超时请求（调用方持有 _pending_lock），是则消耗对应标记
+
+        已超时但尚未 close 的请求标记为已到达（close 时不再留墓碑）；已 close 的请求消耗其墓碑。
+        """
+        for pending in self._pending.get(base_frame_id, ()):
+            if (pending.finished_at is not None and not pending.done()
+                    and pending.function_code == function_code):
+                pending._event.set()
+                return True
+        expires_at = self._tombstones.pop((base_frame_id, function_code), None)
+        return expires_at is not None and expires_at >= time.monotonic()
+
+
+def create_can_interface(interface_type: str = "slcan", **kwargs):
+    """
+    创建CAN接口实例的工厂函数
+
+    Args:
+        interface_type: 接口类型 ("slcan" / "slcan_pipelined")
+        **kwargs: 其他参数
+
+    Returns:
+        SLCANInterface 或 PipelinedSLCANInterface 实例
+    """
+    if interface_type in PIPELINED_INTERFACE_TYPES:
+        return PipelinedSLCANInterface(**kwargs)
+    return _create_slcan_interface(interface_type, **kwargs)
+
+
+def create_pipelined_controllers(motor_ids: Iterable[int], port: str = "COM18", baudrate: int = 500000,
+                                 max_in_flight: int = 8, driver_name: str = "zdt",
+                                 **kwargs) -> Tuple[Dict[int, Any], PipelinedSLCANInterface]:
+    """
+    创建共享同一个流水线接口的一组电机控制器
+
+    接口在这里创建并连接，直接挂到各控制器的 `can_interface` 上；控制器不持有该接口，
+    不要再调用各控制器的 connect() / disconnect()，结束时由调用方调用 interface.disconnect()。
+
+    Args:
+        motor_ids: 电机ID列表
+        port: 串口号
+        baudrate: 波特率
+        max_in_flight: 最多同时在途的请求数
+        driver_name: 驱动名称 (默认为"zdt")
+        **kwargs: 传给控制器构造函数的其他参数
+
+    Returns:
+        ({motor_id: 控制器}, PipelinedSLCANInterface)
+    """
+    from .driver_manager import DriverManager
+
+    controller_cls = DriverManager.get_controller_class(driver_name)
+    interface = PipelinedSLCANInterface(port=port, baudrate=baudrate, max_in_flight=max_in_flight)
+    interface.connect()
+    controllers = {}
+    for motor_id in motor_ids:
+        controller = controller_cls(motor_id, interface_type="slcan", port=port, baudrate=baudrate, **kwargs)
+        controller.can_interface = interface
+        controllers[motor_id] = controller
+    return controllers, interface
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+检测间隔自适应的单目标跟随器
+
+`SingleObjectFollower.update` 每帧都执行一次 YOLO 推理，只有检测丢失时才退化为 CSRT / 模板匹配；
+跟随时绝大部分 CPU 时间花在逐帧检测上，而相邻帧间目标位移很小，逐帧检测并不必要。
+
+`AdaptiveObjectFollower` 是 `SingleObjectFollower` 的子类，检测帧仍由父类完成（目标选择、丢失处理、
+速度预测逻辑不变），检测帧之间只运行轻量跟踪器（KCF / MOSSE / CSRT，不可用时为局部模板匹配）：
+- 每 `detect_interval` 帧执行一次完整检测，并用检测框重新初始化跟踪器；
+- 跟踪失败、外观置信度（跟踪框与检测时目标外观的归一化相关系数）低于 `min_confidence`、
+  或跟踪位置偏离速度预测过远时，当前帧立即改为完整检测；
+- 检测也未命中时由父类的位置预测（`prediction_enabled`）衔接，与原行为一致；
+- 跟踪帧的位置同样写入父类状态（`prev_center` / `velocity` / `last_bbox_xyxy` / `lost_frames`，
+  并经 `_update_position_history` 记入位置历史），下一次检测的关联与预测基于最新位置。
+
+`detect_interval=1` 时与 `SingleObjectFollower` 完全相同。`stats()` 返回检测 / 跟踪帧数与检测占比。
+"""
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .object_follower import SingleObjectFollower
+
+
+TRACKER_TYPES = ("kcf", "mosse", "csrt", "template")
+# 外观置信度计算使用的缩略图最长边（像素）
+_APPEARANCE_SIZE = 32
+
+
+class _TemplateTracker:
+    """
+    局部模板匹配跟踪器（OpenCV 跟踪器不可用时使用），接口与 OpenCV 跟踪器一致：
+    init(frame, (x, y, w, h)) / update(frame) -> (ok, (x, y, w, h))
+    """
+
+    def __init__(self, search_scale: float = 2.0, min_score: float = 0.4):
+        self._search_scale = float(search_scale)
+        self._min_score = float(min_score)
+        self._template = None
+        self._bbox = None
+
+    def init(self, frame, bbox) -> bool:
+        x, y, w, h = (int(v) for v in bbox)
+        template = frame[y:y + h, x:x + w]
+        if template.size == 0:
+            return False
+        self._template = template.copy()
+        self._bbox = (x, y, w, h)
+        return True
+
+    def update(self, frame):
+        import cv2
+
+        x, y, w, h = self._bbox
+        fh, fw = frame.shape[:2]
+        mx, my = int(w * (self._search_scale - 1) / 2), int(h * (self._search_scale - 1) / 2)
+        x0, y0 = max(0, x - mx), max(0, y - my)
+        x1, y1 = min(fw, x + w + mx), min(fh, y + h + my)
+        if x1 - x0 < w or y1 - y0 < h:
+            return False, self._bbox
+        res = cv2.matchTemplate(frame[y0:y1, x0:x1], self._template, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(res)
+        if max_val < self._min_score:
+            return False, self._bbox
+        self._bbox = (x0 + max_loc[0], y0 + max_loc[1], w, h)
+        return True, self._bbox
+
+
+def create_tracker(tracker_type: str = "kcf"):
+    """
+    创建轻量跟踪器；所选 OpenCV 跟踪器不可用（如未安装 contrib）时退化为局部模板匹配
+
+    Args:
+        tracker_type: "kcf" / "mosse" / "csrt" / "template"
+    """
+    if tracker_type not in TRACKER_TYPES:
+        raise ValueError(f"未知的跟踪器类型: {tracker_type}（可选 {', '.join(TRACKER_TYPES)}）")
+    if tracker_type != "template":
+        import cv2
+
+        factory_name = f"Tracker{tracker_type.upper()}_create"
+        for namespace in (getattr(cv2, "legacy", None), cv2):
+            factory = getattr(namespace, factory_name, None) if namespace is not None else None
+            if factory is not None:
+                try:
+                    return factory()
+                except Exception:
+                    pass
+    return _TemplateTracker()
+
+
+def appearance_signature(frame: np.ndarray, bbox) -> Optional[np.ndarray]:
+    """目标区域的零均值、单位范数灰度缩略图，用于计算外观相关系数"""
+    import cv2
+
+    fh, fw = frame.shape[:2]
+    x, y, w, h = (int(round(v)) for v in bbox)
+    x0, y0, x1, y1 = max(0, x), max(0, y), min(fw, x + w), min(fh, y + h)
+    if x1 - x0 < 2 or y1 - y0 < 2:
+        return None
+    patch = frame[y0:y1, x0:x1]
+    if patch.ndim == 3:
+        patch = cv2.cvtColor(patch, cv2.COLOR_BGR2GRAY)
+    patch = cv2.resize(patch, (_APPEARANCE_SIZE, _APPEARANCE_SIZE), interpolation=cv2.INTER_AREA)
+    vec = patch.astype(np.float32).ravel()
+    vec -= vec.mean()
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm > 1e-6 else None
+
+
+class AdaptiveObjectFollower(SingleObjectFollower):
+    """
+    每 N 帧检测、其余帧轻量跟踪的 SingleObjectFollower
+
+    Attributes:
+        detect_interval: 完整检测的帧间隔（1 表示逐帧检测）
+        tracker_type: 检测帧之间使用的跟踪器
+        min_confidence: 外观置信度下限，低于该值立即重新检测
+        max_jump_ratio: 跟踪位置与速度预测位置的最大偏差（相对目标框对角线）
+    """
+
+    def __init__(self, detector, *args, detect_interval: int = 5, tracker_type: str = "kcf",
+                 min_confidence: float = 0.5, max_jump_ratio: float = 0.75, **kwargs):
+        """
+        Args:
+            detector: YOLOOnnxDetector 或兼容对象
+            detect_interval: 完整检测的帧间隔
+            tracker_type: "kcf" / "mosse" / "csrt" / "template"
+            min_confidence: 外观置信度下限（归一化相关系数，-1~1）
+            max_jump_ratio: 相对目标框对角线的最大预测偏差
+            其余参数同 SingleObjectFollower（conf_thres、iou_thres、target_class 等）
+        """
+        if tracker_type not in TRACKER_TYPES:
+            raise ValueError(f"未知的跟踪器类型: {tracker_type}（可选 {', '.join(TRACKER_TYPES)}）")
+        super().__init__(detector, *args, **kwargs)
+        self.detect_interval = max(1, int(detect_interval))
+        self.tracker_type = tracker_type
+        self.min_confidence = float(min_confidence)
+        self.max_jump_ratio = float(max_jump_ratio)
+
+        self._light_tracker = None
+        self._signature: Optional[np.ndarray] = None
+        self._bbox: Optional[Tuple[float, float, float, float]] = None
+        self._center: Optional[Tuple[float, float]] = None
+        self._center_time = 0.0
+        self._pixel_velocity = np.zeros(2)
+        self._since_detect = 0
+        self._stats = {"frames": 0, "detections": 0, "tracked": 0, "forced": 0}
+
+    def update(self, frame):
+        """
+        Args:
+            frame: BGR 图像
+
+        Returns:
+            (ok, (cx, cy))，与 SingleObjectFollower.update 一致
+        """
+        self._stats["frames"] += 1
+        tracking = self._light_tracker is not None and self._since_detect < self.detect_interval - 1
+        if tracking:
+            center = self._track(frame)
+            if center is not None:
+                self._since_detect += 1
+                self._stats["tracked"] += 1
+                return True, center
+            self._stats["forced"] += 1
+        return self._detect(frame)
+
+    def reset_tracking(self) -> None:
+        """丢弃轻量跟踪状态，下一帧执行完整检测"""
+        self._light_tracker = None
+        self._signature = None
+        self._bbox = None
+        self._center = None
+        self._pixel_velocity = np.zeros(2)
+
+    def stats(self) -> Dict[str, Any]:
+        """检测 / 跟踪帧数、因跟踪失效触发的检测次数与检测占比"""
+        stats = dict(self._stats)
+        stats["detect_ratio"] = stats["detections"] / stats["frames"] if stats["frames"] else 0.0
+        return stats
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+
+    def _detect(self, frame):
+        self._stats["detections"] += 1
+        self._since_detect = 0
+        ok, center = super().update(frame)
+        if not ok or center is None:
+            self.reset_tracking()
+            return ok, center
+
+        bbox = self._target_bbox()
+        if bbox is None or self.detect_interval <= 1:
+            # 本帧由父类的位置预测给出，没有可用于初始化的目标框
+            self._light_tracker = None
+        else:
+            self._init_light_tracker(frame, bbox)
+        self._observe(center)
+        return ok, center
+
+    def _target_bbox(self) -> Optional[Tuple[float, float, float, float]]:
+        """父类本帧选中目标的框 (x, y, w, h)；父类处于位置预测状态时返回 None"""
+        if self.is_predicting:
+            return None
+        bbox = self.last_bbox_xyxy if self.last_bbox_xyxy is not None else self.current_target_bbox
+        if isinstance(bbox, dict):
+            bbox = bbox.get("bbox_xyxy")
+        if bbox is None:
+            return None
+        x1, y1, x2, y2 = (float(v) for v in bbox)
+        if x2 - x1 < 2 or y2 - y1 < 2:
+            return None
+        return x1, y1, x2 - x1, y2 - y1
+
+    def _init_light_tracker(self, frame, bbox) -> None:
+        tracker = create_tracker(self.tracker_type)
+        int_bbox = tuple(int(round(v)) for v in bbox)
+        try:
+            ok = tracker.init(frame, int_bbox)
+        except Exception as e:
+            print(f" ⚠️ [AdaptiveFollower] 跟踪器初始化失败: {e}")
+            ok = False
+        # 新版 OpenCV 的 init 返回 None
+        if ok is False:
+            self._light_tracker = None
+            return
+        self._light_tracker = tracker
+        self._signature = appearance_signature(frame, int_bbox)
+        self._bbox = bbox
+
+    def _track(self, frame) -> Optional[Tuple[float, float]]:
+        """轻量跟踪一帧；失败、外观不符或偏离预测时返回 None"""
+        try:
+            ok, bbox = self._light_tracker.update(frame)
+        except Exception:
+            ok = False
+        if not ok:
+            return None
+        x, y, w, h = (float(v) for v in bbox)
+        center = (x + w / 2.0, y + h / 2.0)
+
+        if self._signature is not None:
+            signature = appearance_signature(frame, (x, y, w, h))
+            if signature is None or float(signature @ self._signature) < self.min_confidence:
+                return None
+
+        if self._center is not None:
+            dt = max(time.monotonic() - self._center_time, 0.0)
+            predicted = np.asarray(self._center) + self._pixel_velocity * dt
+            gate = max(self.max_jump_ratio * float(np.hypot(w, h)), 10.0)
+            if float(np.hypot(*(np.asarray(center) - predicted))) > gate:
+                return None
+
+        self._bbox = (x, y, w, h)
+        self._observe(center)
+        self._update_parent_state(center, (x, y, x + w, y + h))
+        return center
+
+    def _update_parent_state(self, center, bbox_xyxy) -> None:
+        """跟踪帧的结果写入父类状态，与父类跟踪帧的更新一致（速度为相邻两次位置之差）"""
+        if self.prev_center is not None:
+            self.velocity = (center[0] - self.prev_center[0], center[1] - self.prev_center[1])
+        self.prev_center = center
+        self.last_bbox_xyxy = bbox_xyxy
+        self.lost_frames = 0
+        self.is_predicting = False
+        self._update_position_history(center)
+
+    def _observe(self, center) -> None:
+        """更新像素速度估计（指数平滑），用于跟踪帧的运动一致性检查"""
+        now = time.monotonic()
+        center = (float(center[0]), float(center[1]))
+        if self._center is not None:
+            dt = now - self._center_time
+            if 1e-3 < dt < 1.0:
+                velocity = (np.asarray(center) - np.asarray(self._center)) / dt
+                self._pixel_velocity = 0.5 * self._pixel_velocity + 0.5 * velocity
+        self._center = center
+        self._center_time = now
@@ -0,0 +1,510 @@
+# -*- coding: utf-8 -*-
+"""
+批量逆运动学（带分支连续选择与位姿缓存）
+
+`RobotKinematics.inverse_kinematics(return_all=True)` 每次求解一个位姿，
+`CartesianTrajectoryExecutor` 对每个插补点各调用一次，再用 `select_closest_solution` 选解；
+一条 500 点的直线需要数百毫秒。
+
+`BatchInverseKinematics` 针对本机械臂的结构（第 4/5/6 轴交于腕心、肩部无偏置）给出闭式解：
+- 腕心 = 末端位置 - d6 · z6，θ1 有两解（正对/背对），θ3 由余弦定理得到两解，θ2 随之唯一；
+- R36 = R03ᵀ · R，θ5 取正负两解，θ4 / θ6 随之唯一，共 8 组解；
+所有位姿、所有分支一次向量化计算。
+
+`solve_path` 对整条路径统一选分支：全部点、全部分支一次计算节点代价（限位余量、可操作度）与
+相邻点转移代价（关节距离，单步变化过大视为构型翻转并附加大代价），再用动态规划取全局代价最小的
+分支序列，路径中途不会翻转构型；角度展开到与上一点连续（避免 ±180° 处跳变），
+腕部奇异（θ5≈0/180°）时保持 θ4 不变。
+`solve` 用于单个位姿（如抓取接近位姿），解与节点代价按量化后的位姿做 LRU 缓存。
+
+使用示例：
+```python
+ik = BatchInverseKinematics.from_config()
+T = transforms_from_poses(positions, euler_angles)      # (N, 4, 4)
+q, ok = ik.solve_path(T, seed=current_joints)           # (N, 6) 关节角 (度)，ok: (N,) 是否有解
+q_grasp = ik.solve(T_grasp, seed=current_joints)        # 单个位姿，命中缓存时无需重新求解
+```
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch_kinematics import DEFAULT_JOINT_LIMITS, BatchKinematics, transforms_from_poses
+
+
+# 每个位姿的解的数量：θ1 两解 × θ3 两解 × θ5 两解
+SOLUTIONS_PER_POSE = 8
+
+# 闭式解要求的扭角 (度)
+_REQUIRED_ALPHA_DEG = [0.0, -90.0, 0.0, -90.0, 90.0, -90.0]
+
+# 腕部奇异判定阈值（|sin θ5|）
+_WRIST_SINGULAR_EPS = 1e-6
+# 腕心位于 J1 轴线上时的判定阈值 (mm)
+_SHOULDER_SINGULAR_EPS = 1e-6
+# 余弦定理允许的数值误差
+_REACH_EPS = 1e-9
+
+
+def _wrap_degrees(angles: np.ndarray) -> np.ndarray:
+    """把角度规范到 [-180, 180]"""
+    return angles - 360.0 * np.rint(angles / 360.0)
+
+
+def _min_plus_path(start: np.ndarray, steps: np.ndarray) -> np.ndarray:
+    """
+    (min, +) 连乘的最优状态序列
+
+    Args:
+        start: (S,) 首点各状态的代价
+        steps: (K, S, S) 各步转移代价，[k, a, b] 为第 k 点取 a、第 k+1 点取 b
+
+    Returns:
+        np.ndarray: (K+1,) 总代价最小的状态序列
+    """
+    count, states = len(steps), len(start)
+    if count == 0:
+        return np.array([int(np.argmin(start))])
+    # 补齐到 2 的幂，补充步为 (min, +) 单位矩阵（状态不变、代价为 0）
+    size = 1 << (count - 1).bit_length()
+    identity = np.full((states, states), np.inf)
+    np.fill_diagonal(identity, 0.0)
+    level = np.concatenate([steps, np.broadcast_to(identity, (size - count, states, states))])
+
+    mids = []
+    while len(level) > 1:
+        # [k, a, b, c]：中间状态 c 放在最后一维，规约时内存连续
+        combined = level[0::2, :, None, :] + level[1::2].transpose(0, 2, 1)[:, None, :, :]
+        mid = combined.argmin(axis=3)
+        mids.append(mid)
+        level = np.take_along_axis(combined, mid[..., None], axis=3)[..., 0]
+
+    first, last = np.unravel_index(int(np.argmin(start[:, None] + level[0])), (states, states))
+    bounds = np.array([[first, last]])
+    for mid in reversed(mids):
+        middle = mid[np.arange(len(bounds)), bounds[:, 0], bounds[:, 1]]
+        split = np.empty((2 * len(bounds), 2), dtype=np.int64)
+        split[0::2, 0], split[0::2, 1] = bounds[:, 0], middle
+        split[1::2, 0], split[1::2, 1] = middle, bounds[:, 1]
+        bounds = split
+    return np.append(bounds[:, 0], bounds[-1, 1])[:count + 1]
+
+
+class BatchInverseKinematics:
+    """
+    6 自由度机械臂批量逆运动学
+
+    Attributes:
+        kinematics: BatchKinematics，DH 参数与关节偏转
+        joint_limits: (6, 2) 关节角度范围 (度)
+    """
+
+    def __init__(self, kinematics: BatchKinematics,
+                 joint_limits: Optional[Sequence[Tuple[float, float]]] = None,
+                 cache_size: int = 256, position_quantum: float = 0.01, angle_quantum: float = 0.001,
+                 limit_zone: float = 20.0, limit_weight: float = 0.5, manipulability_weight: float = 1.0,
+                 flip_threshold: float = 30.0, flip_penalty: float = 1000.0):
+        """
+        初始化批量逆运动学
+
+        Args:
+            kinematics: BatchKinematics 实例
+            joint_limits: 关节角度范围 [(min, max), ...] (度)
+            cache_size: 单位姿求解缓存的最大条目数，0 表示不缓存
+            position_quantum: 缓存键的位置量化步长 (mm)
+            angle_quantum: 缓存键的旋转矩阵元素量化步长
+            limit_zone: 距关节限位小于该值 (度) 时开始计入限位代价
+            limit_weight: 限位代价权重（每个路径点，单位与关节距离 (度) 相同）
+            manipulability_weight: 低可操作度代价权重
+            flip_threshold: 相邻两点任一关节变化超过该值 (度) 视为构型翻转
+            flip_penalty: 构型翻转的附加代价
+        """
+        d, a = kinematics.d, kinematics.a
+        if (np.any(np.abs(a[[0, 1, 4, 5]]) > 1e-9) or np.any(np.abs(d[[1, 2, 4]]) > 1e-9)
+                or not np.allclose(kinematics.alpha_deg, _REQUIRED_ALPHA_DEG)):
+            raise ValueError("闭式逆解仅适用于腕部三轴交于一点、肩部无偏置的DH结构")
+
+        self.kinematics = kinematics
+        self.joint_limits = np.asarray(DEFAULT_JOINT_LIMITS if joint_limits is None else joint_limits,
+                                       dtype=np.float64)
+        if self.joint_limits.shape != (6, 2):
+            raise ValueError("关节限制数量必须为6")
+
+        self._d1, self._d4, self._d6 = float(d[0]), float(d[3]), float(d[5])
+        self._a2, self._a3 = float(a[2]), float(a[3])
+        self._rho = float(np.hypot(self._a3, self._d4))
+        self._phi = float(np.arctan2(self._d4, self._a3))
+
+        self.limit_zone = float(limit_zone)
+        self.limit_weight = float(limit_weight)
+        self.manipulability_weight = float(manipulability_weight)
+        self.flip_threshold = float(flip_threshold)
+        self.flip_penalty = float(flip_penalty)
+
+        self.cache_size = int(cache_size)
+        self.position_quantum = float(position_quantum)
+        self.angle_quantum = float(angle_quantum)
+        self._cache: "OrderedDict[bytes, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @classmethod
+    def from_config(cls, config_path: Optional[str] = None, **kwargs) -> "BatchInverseKinematics":
+        """从 dh_parameters_config.json 构建（关节限制同样取自该文件）"""
+        kinematics = BatchKinematics.from_config(config_path)
+        if "joint_limits" not in kwargs:
+            kwargs["joint_limits"] = kinematics.joint_limits
+        return cls(kinematics, **kwargs)
+
+    # ------------------------------------------------------------------
+    # 全部解
+    # ------------------------------------------------------------------
+
+    def solve_all(self, T) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        求每个位姿的全部 8 组解
+
+        Args:
+            T: (N, 4, 4) 目标位姿矩阵
+
+        Returns:
+            (solutions, valid, singular):
+                solutions: (N, 8, 6) 关节角 (度，规范到 [-180, 180]），无解处为 NaN；
+                valid: (N, 8) 该组解存在且在关节限制内；
+                singular: (N, 8) 腕部奇异（此时 θ4 取 0，θ4 与 θ6 只确定其和/差）
+        """
+        T = np.asarray(T, dtype=np.float64)
+        if T.ndim != 3 or T.shape[1:] != (4, 4):
+            raise ValueError(f"目标位姿形状应为 (N, 4, 4)，实际: {T.shape}")
+        count = len(T)
+        R = T[:, :3, :3]
+        wrist = T[:, :3, 3] - self._d6 * R[:, :, 2]
+        wx, wy, wz = wrist[:, 0], wrist[:, 1], wrist[:, 2]
+
+        theta = np.full((count, SOLUTIONS_PER_POSE, 6), np.nan)
+        reachable = np.zeros((count, SOLUTIONS_PER_POSE), dtype=bool)
+        singular = np.zeros((count, SOLUTIONS_PER_POSE), dtype=bool)
+
+        radial = np.hypot(wx, wy)
+        base = np.where(radial > _SHOULDER_SINGULAR_EPS, np.arctan2(wy, wx), 0.0)
+        height = wz - self._d1
+        # 余弦定理：a3·cosθ3 - d4·sinθ3 = ρ·cos(θ3 + φ) = K
+        cos_arg = ((radial ** 2 + height ** 2 - self._a2 ** 2 - self._rho ** 2)
+                   / (2.0 * self._a2 * self._rho))
+        arm_reachable = np.abs(cos_arg) <= 1.0 + _REACH_EPS
+        elbow = np.arccos(np.clip(cos_arg, -1.0, 1.0))
+
+        branch = 0
+        for shoulder in (1.0, -1.0):
+            theta1 = base if shoulder > 0 else base + np.pi
+            r = shoulder * radial
+            for elbow_sign in (1.0, -1.0):
+                theta3 = elbow_sign * elbow - self._phi
+                c3, s3 = np.cos(theta3), np.sin(theta3)
+                vx = self._a2 + self._a3 * c3 - self._d4 * s3
+                vy = self._a3 * s3 + self._d4 * c3
+                theta2 = np.arctan2(-height, r) - np.arctan2(vy, vx)
+
+                R36 = self._wrist_rotation(theta1, theta2 + theta3, R)
+                c5 = np.clip(R36[:, 1, 2], -1.0, 1.0)
+                for wrist_sign in (1.0, -1.0):
+                    s5 = wrist_sign * np.sqrt(1.0 - c5 ** 2)
+                    theta5 = np.arctan2(s5, c5)
+                    is_singular = np.abs(s5) < _WRIST_SINGULAR_EPS
+                    safe_s5 = np.where(is_singular, 1.0, s5)
+                    theta4 = np.where(is_singular, 0.0, np.arctan2(R36[:, 2, 2] / safe_s5, -R36[:, 0, 2] / safe_s5))
+                    # 奇异时 c5=±1：θ4 ± θ6 由 R36 第一行确定，取 θ4=0
+                    theta6_singular = np.where(c5 > 0, np.arctan2(-R36[:, 0, 1], R36[:, 0, 0]),
+                                               -np.arctan2(-R36[:, 0, 1], -R36[:, 0, 0]))
+                    theta6 = np.where(is_singular, theta6_singular,
+                                      np.arctan2(-R36[:, 1, 1] / safe_s5, R36[:, 1, 0] / safe_s5))
+
+                    theta[:, branch] = np.stack([theta1, theta2, theta3, theta4, theta5, theta6], axis=-1)
+                    reachable[:, branch] = arm_reachable
+                    singular[:, branch] = is_singular
+                    branch += 1
+
+        solutions = _wrap_degrees(np.degrees(theta) + self.kinematics.joint_offsets)
+        solutions[~reachable] = np.nan
+        valid = reachable & self._within_limits(solutions)
+        return solutions, valid, singular
+
+    @staticmethod
+    def _wrist_rotation(theta1: np.ndarray, theta23: np.ndarray, R: np.ndarray) -> np.ndarray:
+        """R36 = R03ᵀ · R，R03 = Rz(θ1) · RotX(-90°) · Rz(θ2 + θ3)"""
+        c1, s1 = np.cos(theta1), np.sin(theta1)
+        c23, s23 = np.cos(theta23), np.sin(theta23)
+        R03 = np.empty((len(theta1), 3, 3))
+        R03[:, 0, 0], R03[:, 0, 1], R03[:, 0, 2] = c1 * c23, -c1 * s23, -s1
+        R03[:, 1, 0], R03[:, 1, 1], R03[:, 1, 2] = s1 * c23, -s1 * s23, c1
+        R03[:, 2, 0], R03[:, 2, 1], R03[:, 2, 2] = -s23, -c23, 0.0
+        return np.matmul(R03.transpose(0, 2, 1), R)
+
+    def _within_limits(self, q: np.ndarray) -> np.ndarray:
+        with np.errstate(invalid="ignore"):
+            return np.all((q >= self.joint_limits[:, 0]) & (q <= self.joint_limits[:, 1]), axis=-1)
+
+    # ------------------------------------------------------------------
+    # 分支评分
+    # ------------------------------------------------------------------
+
+    def manipulability(self, solutions: np.ndarray) -> np.ndarray:
+        """
+        归一化可操作度（与 |det J| 成正比，范围 [0, 1]）
+
+        本结构的 |det J| = a2·ρ·|sin(θ3+φ)|·r·|sin θ5|（r 为腕心到 J1 轴线的距离），
+        分别对应肘部伸直、腕心位于 J1 轴线、腕部 θ5=0 三类奇异。
+
+        Args:
+            solutions: (..., 6) 关节角 (度)
+
+        Returns:
+            np.ndarray: (...) 可操作度，NaN 解为 NaN
+        """
+        theta = np.radians(solutions - self.kinematics.joint_offsets)
+        theta2, theta3, theta5 = theta[..., 1], theta[..., 2], theta[..., 4]
+        c3, s3 = np.cos(theta3), np.sin(theta3)
+        vx = self._a2 + self._a3 * c3 - self._d4 * s3
+        vy = self._a3 * s3 + self._d4 * c3
+        radial = np.abs(np.hypot(vx, vy) * np.cos(theta2 + np.arctan2(vy, vx)))
+        reach = self._a2 + self._rho
+        return np.abs(np.sin(theta3 + self._phi)) * np.minimum(radial / reach, 1.0) * np.abs(np.sin(theta5))
+
+    def score_solutions(self, solutions: np.ndarray, valid: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        所有路径点、所有分支的节点代价（一次向量化计算）
+
+        Args:
+            solutions: (N, 8, 6) solve_all 返回的关节角 (度)
+            valid: (N, 8) 是否有效
+
+        Returns:
+            dict: limit_margin (N, 8) 距最近限位的距离 (度)；manipulability (N, 8)；
+                cost (N, 8) 节点代价（无效解为 inf）
+        """
+        with np.errstate(invalid="ignore"):
+            margin = np.minimum(solutions - self.joint_limits[:, 0], self.joint_limits[:, 1] - solutions)
+            # 进入限位附近区域后按平方增长，各关节求和
+            closeness = np.clip(1.0 - margin / self.limit_zone, 0.0, 1.0)
+            limit_cost = np.sum(closeness * closeness, axis=-1)
+        manipulability = self.manipulability(solutions)
+        cost = self.limit_weight * limit_cost + self.manipulability_weight * (1.0 - manipulability)
+        cost = np.where(valid, cost, np.inf)
+        return {"limit_margin": np.min(margin, axis=-1), "manipulability": manipulability, "cost": cost}
+
+    def _transition_costs(self, previous: np.ndarray, current: np.ndarray) -> np.ndarray:
+        """
+        相邻两点各分支之间的转移代价
+
+        Args:
+            previous: (M, 8, 6)，current: (M, 8, 6) 关节角 (度)
+
+        Returns:
+            np.ndarray: (M, 8, 8)，[m, a, b] 为前一点取分支 a、后一点取分支 b 的代价：
+                关节空间距离 (度，回绕到 ±180°) + 构型翻转附加代价
+        """
+        delta = current[:, None, :, :] - previous[:, :, None, :]
+        delta -= 360.0 * np.rint(delta / 360.0)
+        cost = np.sqrt(np.einsum("mabj,mabj->mab", delta, delta))
+        np.abs(delta, out=delta)
+        cost += self.flip_penalty * (delta > self.flip_threshold).any(axis=-1)
+        return cost
+
+    def _branch_sequence(self, solutions: np.ndarray, valid: np.ndarray, seed: np.ndarray,
+                         node_cost: np.ndarray) -> list:
+        """
+        动态规划选取全局代价最小的分支序列
+
+        总代价 = 种子到首点的转移 + Σ 节点代价 + Σ 相邻点转移代价；无解的点跳过（其前后两点直接相连）。
+        逐点递推等价于各步 8×8 代价矩阵的 (min, +) 连乘，这里按二叉树两两合并（log2(N) 层，
+        每层一次向量化计算）并记录中间分支，再自顶向下回溯，避免逐点的 Python 循环。
+
+        Returns:
+            list: 每个点的分支下标（无解点为 0）
+        """
+        count = len(solutions)
+        points = np.flatnonzero(valid.any(axis=1))
+        branches = np.zeros(count, dtype=np.int64)
+        if len(points) == 0:
+            return branches.tolist()
+
+        chain = np.nan_to_num(solutions[points], nan=0.0)
+        start = self._transition_costs(np.broadcast_to(seed, (1, SOLUTIONS_PER_POSE, 6)), chain[:1])[0, 0]
+        start = start + node_cost[points[0]]
+        # 第 k 步：点 k 取分支 a → 点 k+1 取分支 b 的代价（含点 k+1 的节点代价，无效分支为 inf）
+        steps = self._transition_costs(chain[:-1], chain[1:]) + node_cost[points[1:], None, :]
+        branches[points] = _min_plus_path(start, steps)
+        return branches.tolist()
+
+    # ------------------------------------------------------------------
+    # 路径求解
+    # ------------------------------------------------------------------
+
+    def solve_path(self, T, seed: Optional[Sequence[float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        求解整条笛卡尔路径，分支与角度在相邻点之间保持连续
+
+        Args:
+            T: (N, 4, 4) 路径上各点的目标位姿
+            seed: 起始参考关节角 (度)，通常为当前关节角；None 则以全零为参考
+
+        Returns:
+            (q, ok): (N, 6) 关节角 (度)，(N,) 该点是否有满足限制的解
+                （无解的点沿用上一点的关节角）
+        """
+        solutions, valid, singular = self.solve_all(T)
+        return self._select_path(solutions, valid, singular, seed)
+
+    def solve_poses(self, positions, euler_angles, seed: Optional[Sequence[float]] = None
+                    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        按位置与欧拉角求解路径
+
+        Args:
+            positions: (N, 3) 末端位置 (mm)
+            euler_angles: (N, 3) [yaw, pitch, roll] (度)
+            seed: 起始参考关节角 (度)
+        """
+        return self.solve_path(transforms_from_poses(positions, euler_angles), seed)
+
+    def _select_path(self, solutions: np.ndarray, valid: np.ndarray, singular: np.ndarray,
+                     seed: Optional[Sequence[float]], node_cost: Optional[np.ndarray] = None
+                     ) -> Tuple[np.ndarray, np.ndarray]:
+        count = len(solutions)
+        seed = np.zeros(6) if seed is None else np.asarray(seed, dtype=np.float64)
+        ok = valid.any(axis=1)
+        if count == 0:
+            return np.zeros((0, 6)), ok
+        if node_cost is None:
+            node_cost = self.score_solutions(solutions, valid)["cost"]
+
+        branches = self._branch_sequence(solutions, valid, seed, node_cost)
+
+        q = solutions[np.arange(count), branches]
+        q[~ok] = np.nan
+
+        # 腕部奇异：保持上一点的 θ4，与 θ4 耦合的 θ6 相应补偿（θ5≈0 时 θ4+θ6 不变，θ5≈180° 时 θ4-θ6 不变）
+        for n in np.flatnonzero(singular[np.arange(count), branches] & ok):
+            previous = q[n - 1] if n > 0 and ok[n - 1] else seed
+            sign = 1.0 if np.cos(np.radians(q[n, 4] - self.kinematics.joint_offsets[4])) > 0 else -1.0
+            delta = previous[3] - q[n, 3]
+            q[n, 3] += delta
+            q[n, 5] -= sign * delta
+
+        # 无解点沿用上一点，随后整体展开为连续角度（以种子为起点）
+        q = self._forward_fill(q, ok, seed)
+        unwrapped = seed + np.cumsum(_wrap_degrees(np.diff(np.vstack([seed, q]), axis=0)), axis=0)
+        in_range = (unwrapped >= self.joint_limits[:, 0]) & (unwrapped <= self.joint_limits[:, 1])
+        q = np.where(in_range, unwrapped, _wrap_degrees(q))
+
+        out_of_range = ok & ~self._within_limits(q)
+        if out_of_range.any():
+            ok &= ~out_of_range
+            q[out_of_range] = np.nan
+            q = self._forward_fill(q, ok, seed)
+        return q, ok
+
+    @staticmethod
+    def _forward_fill(q: np.ndarray, ok: np.ndarray, seed: np.ndarray) -> np.ndarray:
+        """把 ok=False 的行替换为之前最近一个有效行（开头的无效行用种子）"""
+        if ok.all():
+            return q
+        index = np.where(ok, np.arange(len(q)), -1)
+        np.maximum.accumulate(index, out=index)
+        filled = np.vstack([seed, q])[index + 1]
+        return filled
+
+    # ------------------------------------------------------------------
+    # 单位姿（带缓存）
+    # ------------------------------------------------------------------
+
+    def solve(self, T, seed: Optional[Sequence[float]] = None) -> Optional[np.ndarray]:
+        """
+        求解单个位姿，返回与种子最接近的解
+
+        Args:
+            T: 4x4 目标位姿矩阵
+            seed: 参考关节角 (度)
+
+        Returns:
+            np.ndarray: (6,) 关节角 (度)，无解时返回 None
+        """
+        T = np.asarray(T, dtype=np.float64)
+        if T.shape != (4, 4):
+            raise ValueError("目标位姿矩阵必须为4x4")
+        key = self._cache_key(T)
+        entry = self._cache_get(key) if self.cache_size > 0 else None
+        if entry is None:
+            solutions, valid, singular = self.solve_all(T[None])
+            entry = (solutions, valid, singular, self.score_solutions(solutions, valid)["cost"])
+            if self.cache_size > 0:
+                self._cache_put(key, entry)
+        solutions, valid, singular, node_cost = entry
+        if not valid.any():
+            return None
+        q, ok = self._select_path(solutions, valid, singular, seed, node_cost)
+        return q[0] if ok[0] else None
+
+    def cache_info(self) -> Dict[str, Any]:
+        """缓存统计"""
+        with self._cache_lock:
+            return {"hits": self.cache_hits, "misses": self.cache_misses,
+                    "size": len(self._cache), "max_size": self.cache_size}
+
+    def clear_cache(self) -> None:
+        with self._cache_lock:
+            self._cache.clear()
+            self.cache_hits = self.cache_misses = 0
+
+    def _cache_key(self, T: np.ndarray) -> bytes:
+        position = np.rint(T[:3, 3] / self.position_quantum).astype(np.int64)
+        rotation = np.rint(T[:3, :3] / self.angle_quantum).astype(np.int64)
+        return position.tobytes() + rotation.tobytes()
+
+    def _cache_get(self, key: bytes):
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self.cache_misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return entry
+
+    def _cache_put(self, key: bytes, entry) -> None:
+        with self._cache_lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+
+def robot_inverse_kinematics_batch(kinematics: Any, T, seed: Optional[Sequence[float]] = None):
+    """
+    按 RobotKinematics 实例当前的 DH 参数、关节偏转与关节限制批量求逆解：整条路径一次求解，分支与角度保持连续
+
+    Args:
+        kinematics: RobotKinematics 实例
+        T: (N, 4, 4) 目标位姿矩阵
+        seed: 起始参考关节角（单位与初始化时的 angle_unit 一致）
+
+    Returns:
+        (q, ok): (N, 6) 关节角（单位同上），(N,) 是否有解
+    """
+    in_radians = getattr(kinematics, "angle_unit", "deg") == "rad"
+    if seed is not None and in_radians:
+        seed = np.degrees(np.asarray(seed, dtype=np.float64))
+    limits = getattr(kinematics, "joint_limits", None)
+    if limits is not None and np.shape(limits) != (6, 2):
+        limits = None
+    if limits is not None and in_radians:
+        # BatchInverseKinematics 的关节限制以度为单位
+        limits = np.degrees(np.asarray(limits, dtype=np.float64))
+    solver = BatchInverseKinematics(BatchKinematics.from_robot_kinematics(kinematics),
+                                    joint_limits=limits, cache_size=0)
+    q, ok = solver.solve_path(T, seed)
+    return (np.radians(q) if in_radians else q), ok
@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+"""
+批量正运动学
+
+`RobotKinematics.forward_kinematics` 每次只处理一组关节角，逐关节调用 `trans_cal` 生成 4x4 矩阵。
+逆解选优、RRT 碰撞检测、工作空间可视化、轨迹校验等场景需要对成千上万组关节角求正解，
+逐个调用的 Python 开销远大于矩阵运算本身。
+
+`BatchKinematics` 使用与 `RobotKinematics` 相同的改进 DH 约定：
+    T_{i-1,i} = RotX(α_{i-1}) · TransX(a_{i-1}) · RotZ(θ_i) · TransZ(d_i)，θ_i = q_i - offset_i
+每个连杆变换对 (cosθ, sinθ, 1) 是线性的，因此 (N, 6) 关节角的全部连杆矩阵由一次批量矩阵乘
+(6, N, 3) @ (6, 3, 16) 得到；再按关节顺序对 (N, 4, 4) 矩阵栈做 5 次批量矩阵乘（`np.matmul`，
+关节优先的内存布局保证每次相乘的两个矩阵栈都是连续内存）。
+
+`jacobian_batch` 由各连杆坐标系的 z 轴与原点直接给出几何雅可比 (N, 6, 6)，用于速度级（微分逆解）控制。
+
+已有 `RobotKinematics` 实例时，`robot_forward_kinematics_batch(kinematics, q)` /
+`robot_jacobian_batch(kinematics, q)` 按该实例当前的 DH 参数与角度单位批量求解。
+
+使用示例：
+```python
+kin = BatchKinematics.from_config()
+T = kin.forward_kinematics_batch(q)                         # (N, 4, 4)
+T, frames = kin.forward_kinematics_batch(q, return_frames=True)   # frames: (N, 6, 4, 4) 基座→各连杆
+positions, euler = poses_from_transforms(T)                # (N, 3) mm, (N, 3) [yaw, pitch, roll] 度
+```
+"""
+
+import json
+import os
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .config_paths import get_config_dir
+
+
+# 与 config/dh_parameters_config.json 默认内容一致
+DEFAULT_DH_PARAMETERS = {
+    "d": [160.4, 0.0, 0.0, 220.0, 0.0, 73.4],
+    "a": [0.0, 0.0, 200.6, 23.5, 0.0, 0.0],
+    "alpha_deg": [0.0, -90.0, 0.0, -90.0, 90.0, -90.0],
+}
+DEFAULT_JOINT_OFFSETS = [0.0, 90.0, 0.0, 0.0, 0.0, 0.0]
+DEFAULT_JOINT_LIMITS = [(-180.0, 180.0)] * 6
+
+# 欧拉角奇异判定阈值（与单点版本的 sy 判定一致）
+_SINGULAR_EPS = 1e-6
+
+
+def get_dh_config_path() -> str:
+    """
+    获取 dh_parameters_config.json 路径
+
+    优先使用环境变量 HORIZONARM_CONFIG_DIR，否则使用项目根目录下的 config/dh_parameters_config.json。
+    """
+    return os.path.join(get_config_dir(), "dh_parameters_config.json")
+
+
+def dh_coefficients(alpha_deg, a, d) -> np.ndarray:
+    """
+    改进 DH 连杆变换关于 (cosθ, sinθ, 1) 的线性系数（trans_cal 的展开形式）
+
+        T_i(θ) = cosθ · C[i, 0] + sinθ · C[i, 1] + C[i, 2]
+
+    Args:
+        alpha_deg: (关节数,) 连杆扭角 α_{i-1} (度)
+        a: (关节数,) 连杆长度 a_{i-1} (mm)
+        d: (关节数,) 连杆偏移 d_i (mm)
+
+    Returns:
+        np.ndarray: (关节数, 3, 16) 系数，最后一维为按行展开的 4x4 矩阵
+    """
+    alpha = np.radians(np.asarray(alpha_deg, dtype=np.float64))
+    a = np.asarray(a, dtype=np.float64)
+    d = np.asarray(d, dtype=np.float64)
+    ca, sa = np.cos(alpha), np.sin(alpha)
+
+    C = np.zeros((len(alpha), 3, 4, 4), dtype=np.float64)
+    # cosθ 项
+    C[:, 0, 0, 0] = 1.0
+    C[:, 0, 1, 1] = ca
+    C[:, 0, 2, 1] = sa
+    # sinθ 项
+    C[:, 1, 0, 1] = -1.0
+    C[:, 1, 1, 0] = ca
+    C[:, 1, 2, 0] = sa
+    # 常数项
+    C[:, 2, 0, 3] = a
+    C[:, 2, 1, 2] = -sa
+    C[:, 2, 1, 3] = -sa * d
+    C[:, 2, 2, 2] = ca
+    C[:, 2, 2, 3] = ca * d
+    C[:, 2, 3, 3] = 1.0
+    return C.reshape(len(alpha), 3, 16)
+
+
+def poses_from_transforms(T) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    从一批 4x4 变换矩阵提取位置与欧拉角（get_end_effector_pose_from_transform 的数组版本）
+
+    Args:
+        T: (..., 4, 4) 变换矩阵
+
+    Returns:
+        (positions, euler_angles): (..., 3) 位置 (mm)，(..., 3) [yaw, pitch, roll] (度)
+    """
+    T = np.asarray(T, dtype=np.float64)
+    R = T[..., :3, :3]
+    sy = np.hypot(R[..., 0, 0], R[..., 1, 0])
+    singular = sy < _SINGULAR_EPS
+
+    roll = np.where(singular, np.arctan2(-R[..., 1, 2], R[..., 1, 1]), np.arctan2(R[..., 2, 1], R[..., 2, 2]))
+    pitch = np.arctan2(-R[..., 2, 0], sy)
+    yaw = np.where(singular, 0.0, np.arctan2(R[..., 1, 0], R[..., 0, 0]))
+
+    euler = np.degrees(np.stack([yaw, pitch, roll], axis=-1))
+    return T[..., :3, 3].copy(), euler
+
+
+def transforms_from_poses(positions, euler_angles) -> np.ndarray:
+    """
+    由位置与欧拉角批量构造 4x4 变换矩阵（poses_from_transforms 的逆过程，R = Rz(yaw)·Ry(pitch)·Rx(roll)）
+
+    Args:
+        positions: (..., 3) 位置 (mm)
+        euler_angles: (..., 3) [yaw, pitch, roll] (度)
+
+    Returns:
+        np.ndarray: (..., 4, 4) 变换矩阵
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    yaw, pitch, roll = np.moveaxis(np.radians(np.asarray(euler_angles, dtype=np.float64)), -1, 0)
+    cy, sy, cp, sp, cr, sr = np.cos(yaw), np.sin(yaw), np.cos(pitch), np.sin(pitch), np.cos(roll), np.sin(roll)
+
+    T = np.zeros(positions.shape[:-1] + (4, 4), dtype=np.float64)
+    T[..., 0, 0] = cy * cp
+    T[..., 0, 1] = cy * sp * sr - sy * cr
+    T[..., 0, 2] = cy * sp * cr + sy * sr
+    T[..., 1, 0] = sy * cp
+    T[..., 1, 1] = sy * sp * sr + cy * cr
+    T[..., 1, 2] = sy * sp * cr - cy * sr
+    T[..., 2, 0] = -sp
+    T[..., 2, 1] = cp * sr
+    T[..., 2, 2] = cp * cr
+    T[..., :3, 3] = positions
+    T[..., 3, 3] = 1.0
+    return T
+
+
+class BatchKinematics:
+    """
+    6 自由度机械臂批量正运动学
+
+    Attributes:
+        d, a, alpha_deg: (6,) DH 参数（mm / 度）
+        joint_offsets: (6,) 关节角度偏转 (度)，θ = q - offset
+        joint_limits: (6, 2) 关节角度范围 (度)，供逆解等使用
+    """
+
+    def __init__(self, d: Sequence[float], a: Sequence[float], alpha_deg: Sequence[float],
+                 joint_offsets: Optional[Sequence[float]] = None,
+                 joint_limits: Optional[Sequence[Tuple[float, float]]] = None):
+        """
+        初始化批量正运动学
+
+        Args:
+            d: 连杆偏移参数 [d1..d6] (mm)
+            a: 连杆长度参数 [a1..a6] (mm)
+            alpha_deg: 连杆扭角参数 [α1..α6] (度)
+            joint_offsets: 关节角度偏转 (度)，None 表示不偏转
+            joint_limits: 关节角度范围 [(min, max), ...] (度)，None 表示 ±180°
+        """
+        self.d = np.asarray(d, dtype=np.float64)
+        self.a = np.asarray(a, dtype=np.float64)
+        self.alpha_deg = np.asarray(alpha_deg, dtype=np.float64)
+        if not (len(self.d) == len(self.a) == len(self.alpha_deg) == 6):
+            raise ValueError("DH参数长度必须为6")
+        self.joint_offsets = (np.zeros(6) if joint_offsets is None
+                              else np.asarray(joint_offsets, dtype=np.float64))
+        if len(self.joint_offsets) != 6:
+            raise ValueError("关节偏转参数长度必须为6")
+        self.joint_limits = np.asarray(DEFAULT_JOINT_LIMITS if joint_limits is None else joint_limits,
+                                       dtype=np.float64)
+        if self.joint_limits.shape != (6, 2):
+            raise ValueError("关节限制数量必须为6")
+        self._coefficients = dh_coefficients(self.alpha_deg, self.a, self.d)
+
+    @classmethod
+    def from_config(cls, config_path: Optional[str] = None) -> "BatchKinematics":
+        """
+        从 dh_parameters_config.json 构建（文件不存在或解析失败时使用默认值）
+
+        Args:
+            config_path: 配置文件路径，默认见 get_dh_config_path()
+        """
+        dh = dict(DEFAULT_DH_PARAMETERS)
+        offsets = list(DEFAULT_JOINT_OFFSETS)
+        limits = list(DEFAULT_JOINT_LIMITS)
+        config_path = config_path or get_dh_config_path()
+        try:
+            if os.path.exists(config_path):
+                with open(config_path, "r", encoding="utf-8") as f:
+                    loaded = json.load(f)
+                dh.update(loaded.get("dh_parameters", {}))
+                offsets = loaded.get("joint_offsets", offsets)
+                loaded_limits = loaded.get("joint_limits", {})
+                limits = [tuple(loaded_limits.get(str(i + 1), limits[i])) for i in range(6)]
+                if not loaded.get("enable_offset", True):
+                    offsets = None
+        except Exception as e:
+            print(f" ⚠️ [BatchKinematics] 加载DH参数失败，使用默认值: {e}")
+        return cls(dh["d"], dh["a"], dh["alpha_deg"], offsets, limits)
+
+    @classmethod
+    def from_robot_kinematics(cls, kinematics: Any) -> "BatchKinematics":
+        """
+        按 RobotKinematics 实例当前的 DH 参数与关节偏转构建（角度统一换算为度）
+
+        Args:
+            kinematics: RobotKinematics 实例
+        """
+        dh = kinematics.get_dh_parameters()
+        alpha_deg = dh["alpha_deg"] if "alpha_deg" in dh else np.degrees(np.asarray(dh["alpha"], dtype=np.float64))
+        in_radians = getattr(kinematics, "angle_unit", "deg") == "rad"
+
+        offsets = getattr(kinematics, "angle_offset", None)
+        if offsets is None:
+            offsets = getattr(kinematics, "joint_offsets", None)
+        enabled = getattr(kinematics, "enable_forward_offset", getattr(kinematics, "enable_offset", True))
+        if offsets is not None and enabled:
+            offsets = np.asarray(offsets, dtype=np.float64)
+            if in_radians:
+                offsets = np.degrees(offsets)
+        else:
+            offsets = None
+        return cls(dh["d"], dh["a"], alpha_deg, offsets)
+
+    def link_transforms(self, q) -> np.ndarray:
+        """
+        各连杆相对前一连杆的变换
+
+        Args:
+            q: (N, 6) 关节角 (度)
+
+        Returns:
+            np.ndarray: (N, 6, 4, 4)
+        """
+        return np.moveaxis(self._joint_major_links(q), 0, 1)
+
+    def _joint_major_links(self, q) -> np.ndarray:
+        """(6, N, 4, 4) 连杆变换，每个关节的矩阵栈为连续内存"""
+        q = np.asarray(q, dtype=np.float64)
+        if q.ndim != 2 or q.shape[1] != 6:
+            raise ValueError(f"关节角形状应为 (N, 6)，实际: {q.shape}")
+        theta = np.radians(q - self.joint_offsets).T
+        basis = np.empty((6, len(q), 3), dtype=np.float64)
+        np.cos(theta, out=basis[..., 0])
+        np.sin(theta, out=basis[..., 1])
+        basis[..., 2] = 1.0
+        return np.matmul(basis, self._coefficients).reshape(6, len(q), 4, 4)
+
+    def forward_kinematics_batch(self, q, return_frames: bool = False
+                                 ) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """
+        批量正运动学
+
+        Args:
+            q: (N, 6) 关节角 (度)；传入 (6,) 时按单组处理并去掉批维度
+            return_frames: 是否同时返回基座到各连杆的变换
+
+        Returns:
+            T: (N, 4, 4) 末端位姿矩阵；
+            return_frames=True 时返回 (T, frames)，frames 为 (N, 6, 4, 4)，frames[:, -1] 即 T
+        """
+        q = np.asarray(q, dtype=np.float64)
+        single = q.ndim == 1
+        links = self._joint_major_links(q[None] if single else q)
+
+        if return_frames:
+            # 原地累乘：links[i] ← links[i-1] · links[i]
+            for i in range(1, len(links)):
+                np.matmul(links[i - 1], links[i], out=links[i])
+            frames = np.moveaxis(links, 0, 1)
+            T = links[-1]
+        else:
+            T = links[0]
+            scratch = np.empty_like(T)
+            for i in range(1, len(links)):
+                np.matmul(T, links[i], out=scratch)
+                T, scratch = scratch, T
+
+        if single:
+            return (T[0], frames[0]) if return_frames else T[0]
+        return (T, frames) if return_frames else T
+
+    def jacobian_batch(self, q) -> np.ndarray:
+        """
+        批量几何雅可比矩阵（基座坐标系）
+
+        改进 DH 中关节 i 绕连杆坐标系 i 的 z 轴旋转：
+            J_v,i = z_i × (p_e - o_i)，J_ω,i = z_i
+
+        Args:
+            q: (N, 6) 关节角 (度)；传入 (6,) 时返回单个 (6, 6)
+
+        Returns:
+            np.ndarray: (N, 6, 6)，前三行为线速度 (mm/rad)，后三行为角速度 (rad/rad)
+        """
+        q = np.asarray(q, dtype=np.float64)
+        single = q.ndim == 1
+        _, frames = self.forward_kinematics_batch(q[None] if single else q, return_frames=True)
+        axes = frames[:, :, :3, 2]                         # (N, 6, 3)
+        origins = frames[:, :, :3, 3]                      # (N, 6, 3)
+        end = frames[:, -1, :3, 3][:, None, :]             # (N, 1, 3)
+
+        J = np.empty((len(axes), 6, 6), dtype=np.float64)
+        J[:, :3, :] = np.cross(axes, end - origins).transpose(0, 2, 1)
+        J[:, 3:, :] = axes.transpose(0, 2, 1)
+        return J[0] if single else J
+
+    def end_effector_poses(self, q) -> Dict[str, np.ndarray]:
+        """
+        批量末端位姿
+
+        Args:
+            q: (N, 6) 关节角 (度)
+
+        Returns:
+            dict: transformation_matrix (N, 4, 4)、position (N, 3)、euler_angles (N, 3)
+        """
+        T = self.forward_kinematics_batch(q)
+        position, euler = poses_from_transforms(T)
+        return {"transformation_matrix": T, "position": position, "euler_angles": euler}
+
+
+def robot_forward_kinematics_batch(kinematics: Any, q, return_frames: bool = False):
+    """
+    按 RobotKinematics 实例当前的 DH 参数与关节偏转批量求正解
+
+    Args:
+        kinematics: RobotKinematics 实例
+        q: (N, 6) 关节角，单位与初始化时的 angle_unit 一致
+        return_frames: 是否同时返回基座到各连杆的变换 (N, 6, 4, 4)
+
+    Returns:
+        (N, 4, 4) 末端位姿矩阵，或 (T, frames)
+    """
+    q = np.asarray(q, dtype=np.float64)
+    if getattr(kinematics, "angle_unit", "deg") == "rad":
+        q = np.degrees(q)
+    return BatchKinematics.from_robot_kinematics(kinematics).forward_kinematics_batch(q, return_frames)
+
+
+def robot_jacobian_batch(kinematics: Any, q):
+    """
+    按 RobotKinematics 实例当前的 DH 参数与关节偏转批量求几何雅可比矩阵
+
+    Args:
+        kinematics: RobotKinematics 实例
+        q: (N, 6) 或 (6,) 关节角，单位与初始化时的 angle_unit 一致
+
+    Returns:
+        (N, 6, 6) 或 (6, 6)：前三行线速度 (mm/rad)，后三行角速度 (rad/rad)
+    """
+    q = np.asarray(q, dtype=np.float64)
+    if getattr(kinematics, "angle_unit", "deg") == "rad":
+        q = np.degrees(q)
+    return BatchKinematics.from_robot_kinematics(kinematics).jacobian_batch(q)
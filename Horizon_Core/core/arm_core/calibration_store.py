@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+进程内共享的相机标定参数缓存
+
+`VisualGraspSDK.grasp_at_pixel` 与跟随伺服的每一步都调用 `embodied_internal._load_calibration_params()`，
+每次都重新读取 `calibration_parameter.json`；`VisionDetector` / `StereoDepthEstimator` 也在各自实例中
+重新计算 `initUndistortRectifyMap`。
+
+`CalibrationStore` 只在文件变化时重新读取：
+- 按间隔检查文件的 mtime / 大小（默认 1 秒检查一次），变化后整体重新加载，`version` 加 1；
+- 加载结果为不可变快照 `CalibrationData`，附带派生数据：内参逆矩阵、手眼矩阵 `RT_camera2end` 及其逆；
+- 去畸变 / 双目校正映射表按图像尺寸懒计算并缓存（`CV_16SC2`，`cv2.remap` 最快的定点格式），
+  同一快照的所有使用者共享。
+
+使用示例：
+```python
+store = get_calibration_store()
+calib = store.get()                         # CalibrationData，文件不存在时为 None
+K_inv, RT = calib.camera_matrix_inv, calib.RT_camera2end
+map1, map2, new_K = calib.undistort_maps((640, 480))
+frame = cv2.remap(frame, map1, map2, cv2.INTER_LINEAR)
+```
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .config_paths import find_config_file
+
+
+CALIBRATION_FILE_NAME = "calibration_parameter.json"
+
+
+def get_calibration_path() -> str:
+    """
+    标定文件路径：依次查找 HORIZONARM_CONFIG_DIR、HORIZON_DATA_DIR/config、项目根目录下的 config/
+
+    Returns:
+        str: 第一个存在的路径；都不存在时返回项目 config/ 下的默认路径
+    """
+    return find_config_file(CALIBRATION_FILE_NAME)
+
+
+def _distortion(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64).reshape(-1)
+
+
+class CalibrationData:
+    """
+    标定参数快照（只读）
+
+    Attributes:
+        raw: 原始 JSON 字典（可直接传给 embodied_internal 的坐标转换函数，请勿修改）
+        version: 快照版本号，文件每重新加载一次加 1
+        camera_matrix / camera_matrix_inv: 单目内参及其逆 (3, 3)，未标定时为 None
+        distortion: 单目畸变系数 (N,)
+        model: 单目相机模型（"pinhole" / "fisheye"）
+        RT_camera2end / RT_end2camera: 手眼矩阵及其逆 (4, 4)，未标定时为 None
+    """
+
+    def __init__(self, raw: Dict[str, Any], version: int = 0):
+        self.raw = raw
+        self.version = int(version)
+
+        one = raw.get("one") or {}
+        self.model = str(one.get("model", "pinhole")).lower()
+        self.camera_matrix = None
+        self.camera_matrix_inv = None
+        self.distortion = np.zeros(5)
+        if "camera_matrix" in one:
+            self.camera_matrix = np.asarray(one["camera_matrix"], dtype=np.float64)
+            self.camera_matrix_inv = np.linalg.inv(self.camera_matrix)
+            self.distortion = _distortion(one.get("camera_distortion", [0.0] * 5))
+
+        eye = raw.get("eyeinhand") or {}
+        self.RT_camera2end = None
+        self.RT_end2camera = None
+        if "RT_camera2end" in eye:
+            self.RT_camera2end = np.asarray(eye["RT_camera2end"], dtype=np.float64)
+            self.RT_end2camera = np.linalg.inv(self.RT_camera2end)
+
+        self._maps: Dict[Tuple, Any] = {}
+        self._maps_lock = threading.Lock()
+
+    def __getitem__(self, key):
+        return self.raw[key]
+
+    def get(self, key, default=None):
+        return self.raw.get(key, default)
+
+    # ------------------------------------------------------------------
+    # 映射表
+    # ------------------------------------------------------------------
+
+    def undistort_maps(self, image_size: Tuple[int, int], balance: float = 0.0):
+        """
+        单目去畸变映射表（CV_16SC2）
+
+        Args:
+            image_size: (宽, 高)
+            balance: 鱼眼模型新内参的 balance（0~1），针孔模型忽略
+
+        Returns:
+            (map1, map2, new_camera_matrix)；未标定单目内参时返回 None
+        """
+        if self.camera_matrix is None:
+            return None
+        key = ("one", tuple(int(v) for v in image_size), float(balance))
+        return self._cached(key, lambda: self._build_undistort_maps(key[1], balance))
+
+    def _build_undistort_maps(self, size: Tuple[int, int], balance: float):
+        import cv2
+        K, D = self.camera_matrix, self.distortion
+        if self.model == "fisheye":
+            D = D[:4].reshape(4, 1)
+            new_K = cv2.fisheye.estimateNewCameraMatrixForUndistortRectify(K, D, size, np.eye(3), balance=balance)
+            map1, map2 = cv2.fisheye.initUndistortRectifyMap(K, D, np.eye(3), new_K, size, cv2.CV_16SC2)
+        else:
+            new_K = K.copy()
+            map1, map2 = cv2.initUndistortRectifyMap(K, D, None, new_K, size, cv2.CV_16SC2)
+        return map1, map2, new_K
+
+    def stereo_rectify_maps(self, image_size: Tuple[int, int], alpha: float = 0.0):
+        """
+        双目校正映射表（CV_16SC2）
+
+        Args:
+            image_size: 单目图像 (宽, 高)
+            alpha: stereoRectify 的缩放参数
+
+        Returns:
+            dict: left_maps / right_maps 为 (map1, map2)，另含 R1 / R2 / P1 / P2 / Q；未标定双目时返回 None
+        """
+        two = self.raw.get("two") or {}
+        if "left_camera_matrix" not in two or "R" not in two or "T" not in two:
+            return None
+        key = ("two", tuple(int(v) for v in image_size), float(alpha))
+        return self._cached(key, lambda: self._build_stereo_maps(two, key[1], alpha))
+
+    @staticmethod
+    def _build_stereo_maps(two: Dict[str, Any], size: Tuple[int, int], alpha: float):
+        import cv2
+        K1 = np.asarray(two["left_camera_matrix"], dtype=np.float64)
+        K2 = np.asarray(two["right_camera_matrix"], dtype=np.float64)
+        D1 = _distortion(two.get("left_distortion", [0.0] * 5))
+        D2 = _distortion(two.get("right_distortion", [0.0] * 5))
+        R = np.asarray(two["R"], dtype=np.float64)
+        T = np.asarray(two["T"], dtype=np.float64).reshape(3, 1)
+        if str(two.get("model", "pinhole")).lower() == "fisheye":
+            D1, D2 = D1[:4].reshape(4, 1), D2[:4].reshape(4, 1)
+            R1, R2, P1, P2, Q = cv2.fisheye.stereoRectify(K1, D1, K2, D2, size, R, T, cv2.CALIB_ZERO_DISPARITY,
+                                                          balance=alpha)
+            init = cv2.fisheye.initUndistortRectifyMap
+        else:
+            R1, R2, P1, P2, Q, _, _ = cv2.stereoRectify(K1, D1, K2, D2, size, R, T,
+                                                        flags=cv2.CALIB_ZERO_DISPARITY, alpha=alpha)
+            init = cv2.initUndistortRectifyMap
+        return {
+            "left_maps": init(K1, D1, R1, P1, size, cv2.CV_16SC2),
+            "right_maps": init(K2, D2, R2, P2, size, cv2.CV_16SC2),
+            "R1": R1, "R2": R2, "P1": P1, "P2": P2, "Q": Q,
+        }
+
+    def _cached(self, key: Tuple, build):
+        with self._maps_lock:
+            if key not in self._maps:
+                self._maps[key] = build()
+            return self._maps[key]
+
+
+class CalibrationStore:
+    """
+    标定文件的共享缓存（按 mtime 失效）
+
+    Attributes:
+        path: 标定文件路径
+        check_interval: 两次检查文件状态的最短间隔 (秒)，0 表示每次都检查
+    """
+
+    def __init__(self, path: Optional[str] = None, check_interval: float = 1.0):
+        self.path = path or get_calibration_path()
+        self.check_interval = float(check_interval)
+        self._lock = threading.Lock()
+        self._data: Optional[CalibrationData] = None
+        self._signature: Optional[Tuple[float, int]] = None
+        self._last_check = 0.0
+        self._version = 0
+
+    def get(self) -> Optional[CalibrationData]:
+        """当前快照；文件不存在或解析失败时返回 None（解析失败时保留上一次的快照）"""
+        now = time.monotonic()
+        if self._data is not None and now - self._last_check < self.check_interval:
+            return self._data
+        with self._lock:
+            if self._data is not None and now - self._last_check < self.check_interval:
+                return self._data
+            self._last_check = now
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                return self._data
+            signature = (stat.st_mtime, stat.st_size)
+            if signature != self._signature:
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        raw = json.load(f)
+                    self._version += 1
+                    self._data = CalibrationData(raw, self._version)
+                    self._signature = signature
+                except Exception as e:
+                    print(f" ⚠️ [CalibrationStore] 读取标定文件失败: {e}")
+            return self._data
+
+    def get_raw(self) -> Optional[Dict[str, Any]]:
+        """原始标定字典（与 `_load_calibration_params()` 返回值相同的结构）"""
+        data = self.get()
+        return None if data is None else data.raw
+
+    def invalidate(self) -> None:
+        """强制下一次 get() 重新读取文件（例如刚完成标定并写入文件后）"""
+        with self._lock:
+            self._last_check = 0.0
+            self._signature = None
+
+
+_default_store: Optional[CalibrationStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_calibration_store() -> CalibrationStore:
+    """进程内共享的默认标定缓存"""
+    global _default_store
+    if _default_store is None:
+        with _default_store_lock:
+            if _default_store is None:
+                _default_store = CalibrationStore()
+    return _default_store
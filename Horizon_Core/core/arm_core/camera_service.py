@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+"""
+共享摄像头采集服务
+
+`VisualGraspSDK._capture_single_frame` 每次抓取都 `cv2.VideoCapture(camera_id)` 打开、读一帧、释放，
+设备初始化就要几百毫秒；跟随线程、GUI 又各自打开同一个摄像头。
+
+`CameraService` 为每个 camera_id 只运行一个采集线程：
+- 帧直接解码进预分配的环形缓冲区（`cap.read(slot)`，分辨率不变时不再分配内存），
+  每帧带单调递增的序号与采集时间戳；
+- `latest()` 取最新帧，`wait_next()` 阻塞等待比给定序号更新的帧；
+- `acquire()` 为零拷贝接口：在 with 块内钉住缓冲槽，采集线程跳过被钉住的槽，不会覆盖正在读取的图像；
+- `subscribe(callback)` 在采集线程中逐帧回调（图像为缓冲区视图，仅在回调期间有效）；
+- 长时间无人读取且无订阅者时（`idle_timeout`）自动释放摄像头，下次读取时重新打开，
+  不会一直独占设备。
+
+使用示例：
+```python
+service = get_camera_service(0)
+frame = service.wait_next(timeout=2.0)        # CameraFrame(seq, timestamp, image)，超时为 None
+with service.acquire() as frame:              # 零拷贝
+    detector.detect(frame.image)
+```
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+
+class CameraFrame(NamedTuple):
+    """一帧图像：序号从 1 开始递增，timestamp 为 time.monotonic() 采集时刻"""
+
+    seq: int
+    timestamp: float
+    image: np.ndarray
+
+
+class CameraService:
+    """
+    单个摄像头的后台采集服务（通常通过 get_camera_service 获取共享实例）
+
+    Attributes:
+        camera_id: 摄像头 ID
+        buffer_size: 环形缓冲区槽数（>= 3：最新帧、正在写入的帧，以及至少一个可被钉住的槽）
+        idle_timeout: 无人读取多久后释放摄像头 (秒)，None 表示一直采集
+    """
+
+    def __init__(self, camera_id: int = 0, buffer_size: int = 4, idle_timeout: Optional[float] = 10.0,
+                 width: Optional[int] = None, height: Optional[int] = None, fps: Optional[float] = None):
+        """
+        Args:
+            camera_id: 摄像头 ID
+            buffer_size: 环形缓冲区槽数
+            idle_timeout: 空闲释放时间 (秒)
+            width / height / fps: 可选，打开摄像头后设置的采集参数
+        """
+        self.camera_id = camera_id
+        self.buffer_size = max(3, int(buffer_size))
+        self.idle_timeout = idle_timeout
+        self._capture_props = (width, height, fps)
+
+        self._cond = threading.Condition()
+        self._ring: Optional[np.ndarray] = None
+        self._slot_seq = [0] * self.buffer_size
+        self._slot_time = [0.0] * self.buffer_size
+        self._pins = [0] * self.buffer_size
+        self._latest = -1
+        self._seq = 0
+        self._subscribers: List[Callable[[CameraFrame], None]] = []
+
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._last_access = time.monotonic()
+        self._fps = 0.0
+        self._last_error: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # 生命周期
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """启动采集线程（已在运行时直接返回）"""
+        with self._cond:
+            self._last_access = time.monotonic()
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._capture_loop, name=f"CameraService-{self.camera_id}",
+                                            daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """停止采集线程并释放摄像头"""
+        with self._cond:
+            self._running = False
+            thread = self._thread
+            self._cond.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    @property
+    def last_error(self) -> Optional[str]:
+        """最近一次打开摄像头失败的原因，成功打开后清空"""
+        return self._last_error
+
+    @property
+    def fps(self) -> float:
+        """最近的实际采集帧率（指数平滑）"""
+        return self._fps
+
+    # ------------------------------------------------------------------
+    # 读取
+    # ------------------------------------------------------------------
+
+    def latest(self, copy: bool = True) -> Optional[CameraFrame]:
+        """
+        最新一帧
+
+        Args:
+            copy: True 返回图像副本；False 返回缓冲区视图（可能随后被覆盖，需长期持有时请用 acquire）
+
+        Returns:
+            CameraFrame，尚无图像时为 None
+        """
+        self.start()
+        with self._cond:
+            if self._latest < 0:
+                return None
+            index = self._latest
+            frame = self._frame(index)
+            if not copy:
+                return frame
+            self._pins[index] += 1
+        try:
+            return frame._replace(image=frame.image.copy())
+        finally:
+            self._unpin(index)
+
+    def wait_next(self, after_seq: Optional[int] = None, timeout: Optional[float] = 1.0,
+                  copy: bool = True) -> Optional[CameraFrame]:
+        """
+        等待比 after_seq 更新的一帧
+
+        Args:
+            after_seq: 已处理过的帧序号；None 表示调用时刻的最新序号（即等待调用之后采集的帧）
+            timeout: 最长等待时间 (秒)，None 表示一直等待
+            copy: 同 latest()
+
+        Returns:
+            CameraFrame，超时或服务停止时为 None
+        """
+        self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if after_seq is None:
+                after_seq = self._seq
+            while self._seq <= after_seq:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if (remaining is not None and remaining <= 0) or not self._running:
+                    return None
+                self._cond.wait(remaining)
+            self._last_access = time.monotonic()
+            index = self._latest
+            frame = self._frame(index)
+            if not copy:
+                return frame
+            self._pins[index] += 1
+        try:
+            return frame._replace(image=frame.image.copy())
+        finally:
+            self._unpin(index)
+
+    @contextmanager
+    def acquire(self, after_seq: Optional[int] = None, timeout: Optional[float] = 1.0):
+        """
+        零拷贝读取：with 块内图像所在的缓冲槽不会被采集线程覆盖（请勿修改图像内容）
+
+        Args:
+            after_seq: 给出时等待比该序号更新的帧，否则取最新帧（尚无图像时等待第一帧）
+            timeout: 最长等待时间 (秒)
+
+        Yields:
+            CameraFrame，超时时为 None
+        """
+        self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            threshold = 0 if after_seq is None else after_seq
+            while self._seq <= threshold:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if (remaining is not None and remaining <= 0) or not self._running:
+                    break
+                self._cond.wait(remaining)
+            index = self._latest if self._seq > threshold else -1
+            if index >= 0:
+                frame = self._frame(index)
+                self._pins[index] += 1
+                self._last_access = time.monotonic()
+        if index < 0:
+            yield None
+            return
+        try:
+            yield frame
+        finally:
+            self._unpin(index)
+
+    def subscribe(self, callback: Callable[[CameraFrame], None]) -> None:
+        """
+        注册逐帧回调（在采集线程中执行，应尽快返回；图像仅在回调期间有效，需保留时请复制）
+        """
+        with self._cond:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+        self.start()
+
+    def unsubscribe(self, callback: Callable[[CameraFrame], None]) -> None:
+        """取消逐帧回调"""
+        with self._cond:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+
+    def _frame(self, index: int) -> CameraFrame:
+        return CameraFrame(self._slot_seq[index], self._slot_time[index], self._ring[index])
+
+    def _unpin(self, index: int) -> None:
+        with self._cond:
+            self._pins[index] -= 1
+
+    def _next_slot(self) -> int:
+        """下一个可写的槽：跳过最新帧与被钉住的槽，全部被占用时返回 -1"""
+        for step in range(1, self.buffer_size + 1):
+            index = (self._latest + step) % self.buffer_size
+            if index != self._latest and self._pins[index] == 0:
+                return index
+        return -1
+
+    def _open(self):
+        import cv2
+        cap = cv2.VideoCapture(self.camera_id)
+        if not cap.isOpened():
+            cap.release()
+            return None
+        width, height, fps = self._capture_props
+        if width:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height:
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if fps:
+            cap.set(cv2.CAP_PROP_FPS, fps)
+        # 只保留驱动中的最新帧，避免读取到积压的旧画面
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return cap
+
+    def _capture_loop(self) -> None:
+        me = threading.current_thread()
+        cap = self._open()
+        if cap is None:
+            print(f" ⚠️ [CameraService] 无法打开摄像头 {self.camera_id}")
+            with self._cond:
+                self._last_error = f"无法打开摄像头 {self.camera_id}"
+                if self._thread is me:
+                    self._running = False
+                self._cond.notify_all()
+            return
+        self._last_error = None
+
+        failures = 0
+        last_time = None
+        try:
+            while True:
+                with self._cond:
+                    if not self._running or self._thread is not me:
+                        break
+                    if (self.idle_timeout is not None and not self._subscribers
+                            and time.monotonic() - self._last_access > self.idle_timeout):
+                        # 与 start() 在同一把锁内判定，空闲退出后的下一次读取会重新启动线程
+                        self._running = False
+                        break
+                    index = self._next_slot() if self._ring is not None else -1
+
+                if index < 0 and self._ring is not None:
+                    # 所有槽都被钉住：读取后丢弃该帧
+                    cap.grab()
+                    continue
+
+                slot = self._ring[index] if index >= 0 else None
+                ok, image = cap.read(slot)
+                if not ok or image is None:
+                    failures += 1
+                    if failures >= 30:
+                        print(f" ⚠️ [CameraService] 摄像头 {self.camera_id} 连续读取失败，重新打开")
+                        cap.release()
+                        time.sleep(0.5)
+                        cap = self._open()
+                        if cap is None:
+                            print(f" ⚠️ [CameraService] 无法重新打开摄像头 {self.camera_id}")
+                            self._last_error = f"无法重新打开摄像头 {self.camera_id}"
+                            break
+                        failures = 0
+                    else:
+                        time.sleep(0.01)
+                    continue
+                failures = 0
+                now = time.monotonic()
+
+                with self._cond:
+                    if image is not slot:
+                        # 首帧或分辨率变化：按新尺寸重新分配缓冲区（被钉住的旧缓冲区仍由读取方持有引用）
+                        if self._ring is None or self._ring.shape[1:] != image.shape or self._ring.dtype != image.dtype:
+                            self._ring = np.empty((self.buffer_size,) + image.shape, dtype=image.dtype)
+                            self._latest = -1
+                        index = self._next_slot()
+                        if index < 0:
+                            continue
+                        self._ring[index] = image
+                    self._seq += 1
+                    self._slot_seq[index] = self._seq
+                    self._slot_time[index] = now
+                    self._latest = index
+                    subscribers = list(self._subscribers)
+                    self._cond.notify_all()
+
+                if last_time is not None and now > last_time:
+                    self._fps = 0.9 * self._fps + 0.1 / (now - last_time) if self._fps else 1.0 / (now - last_time)
+                last_time = now
+
+                if subscribers:
+                    frame = self._frame(index)
+                    with self._cond:
+                        self._pins[index] += 1
+                    try:
+                        for callback in subscribers:
+                            try:
+                                callback(frame)
+                            except Exception as e:
+                                print(f" ⚠️ [CameraService] 帧回调异常: {e}")
+                    finally:
+                        self._unpin(index)
+        finally:
+            if cap is not None:
+                cap.release()
+            with self._cond:
+                if self._thread is me:
+                    self._running = False
+                self._cond.notify_all()
+
+
+_services: Dict[int, CameraService] = {}
+_services_lock = threading.Lock()
+
+
+def get_camera_service(camera_id: int = 0, **kwargs) -> CameraService:
+    """
+    进程内共享的摄像头采集服务（同一 camera_id 只有一个实例，首次读取时自动启动）
+
+    Args:
+        camera_id: 摄像头 ID
+        **kwargs: 首次创建时传给 CameraService 的参数（buffer_size / idle_timeout / width / height / fps）
+    """
+    with _services_lock:
+        service = _services.get(camera_id)
+        if service is None:
+            service = CameraService(camera_id, **kwargs)
+            _services[camera_id] = service
+        return service
+
+
+def close_camera_services() -> None:
+    """停止所有共享采集服务并释放摄像头"""
+    with _services_lock:
+        services = list(_services.values())
+        _services.clear()
+    for service in services:
+        service.stop()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+配置目录定位
+
+arm_core 下各模块（DH 参数、URDF、轨迹缓存、可达性地图、标定、模型选择……）与 Control_Core.joint_map
+统一从这里取得配置目录：优先使用环境变量 HORIZONARM_CONFIG_DIR，否则为项目根目录下的 config/。
+本模块只依赖标准库，Control_Core 可以直接导入。
+需要兼顾打包资源目录的文件（如标定参数）用 `find_config_file` 依次查找。
+"""
+
+import os
+
+
+def get_project_root() -> str:
+    """项目根目录（Horizon_Core 的上一级）"""
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.dirname(os.path.dirname(os.path.dirname(package_dir)))
+
+
+def get_config_dir() -> str:
+    """配置目录：优先使用环境变量 HORIZONARM_CONFIG_DIR，否则为项目根目录下的 config/"""
+    config_dir = os.environ.get("HORIZONARM_CONFIG_DIR", "").strip()
+    return config_dir or os.path.join(get_project_root(), "config")
+
+
+def find_config_file(file_name: str) -> str:
+    """
+    依次在 HORIZONARM_CONFIG_DIR、HORIZON_DATA_DIR/config、项目根目录下的 config/ 中查找配置文件
+
+    Returns:
+        str: 第一个存在的路径；都不存在时返回项目 config/ 下的默认路径
+    """
+    candidates = []
+    config_dir = os.environ.get("HORIZONARM_CONFIG_DIR", "").strip()
+    if config_dir:
+        candidates.append(os.path.join(config_dir, file_name))
+    data_root = os.environ.get("HORIZON_DATA_DIR", "").strip()
+    if data_root:
+        candidates.append(os.path.join(data_root, "config", file_name))
+    candidates.append(os.path.join(get_project_root(), "config", file_name))
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    return candidates[-1]
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+跟随抓取的分级流水线：采集 → 感知（检测 / 跟踪） → 伺服
+
+原先的跟随线程串行执行“读帧 → YOLO / 跟踪 → 逆解 → 阻塞的 c_a_p → sleep”，
+整体频率由最慢的一级决定，阻塞运动期间相机帧全部积压或丢失。
+
+`FollowPipeline` 把各级拆到独立线程，级间用容量为 1 的“最新值”槽连接：
+- 采集：`CameraService` 后台线程按相机帧率写入环形缓冲区；
+- 感知：总是取最新一帧（跳过处理期间到达的旧帧，计入丢帧），跟踪器按相机帧率更新；
+- 伺服：取最新的目标观测下发运动命令；命令执行期间到达的观测被新值覆盖而不排队，
+  过期观测（超过 max_age）直接丢弃。
+每一级记录处理耗时、丢弃数与频率，`metrics()` 返回快照。
+
+使用示例：
+```python
+pipeline = FollowPipeline(get_camera_service(0), perceive=lambda img: follower.update(img),
+                          servo=lambda center: apply_servo(*center), servo_interval=0.1)
+pipeline.start()
+print(pipeline.metrics()["perception"]["latency_ms"])
+```
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+
+class Observation(NamedTuple):
+    """感知结果：来源帧序号、采集时刻 (time.monotonic) 与目标像素中心"""
+
+    seq: int
+    capture_time: float
+    center: Tuple[float, float]
+
+
+class LatestValue:
+    """
+    容量为 1 的最新值槽：put 覆盖旧值（未被取走的旧值计为丢弃），get 等待比给定序号更新的值
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._value: Any = None
+        self._seq = 0
+        self._taken = 0
+        self.dropped = 0
+
+    def put(self, value: Any) -> None:
+        with self._cond:
+            if self._seq > self._taken:
+                self.dropped += 1
+            self._value = value
+            self._seq += 1
+            self._cond.notify_all()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """取出尚未取过的最新值，超时返回 None"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._seq <= self._taken:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            self._taken = self._seq
+            return self._value
+
+    def wake(self) -> None:
+        """唤醒所有等待者（停止流水线时使用）"""
+        with self._cond:
+            self._cond.notify_all()
+
+
+class StageMetrics:
+    """
+    单级统计：处理次数、丢弃数、频率与最近 window 次的耗时分布
+    """
+
+    def __init__(self, window: int = 200):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._stamps = deque(maxlen=window)
+        self.count = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def record(self, latency: float, ok: bool = True) -> None:
+        with self._lock:
+            self.count += 1
+            if not ok:
+                self.failed += 1
+            self._latencies.append(latency)
+            self._stamps.append(time.monotonic())
+
+    def drop(self, n: int = 1) -> None:
+        with self._lock:
+            self.dropped += n
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns:
+            dict: count / dropped / failed / rate_hz，以及 latency_ms（mean / p50 / p95 / max）
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            span = self._stamps[-1] - self._stamps[0] if len(self._stamps) > 1 else 0.0
+            rate = (len(self._stamps) - 1) / span if span > 0 else 0.0
+            count, dropped, failed = self.count, self.dropped, self.failed
+        latency = {}
+        if latencies:
+            latency = {
+                "mean": 1000.0 * sum(latencies) / len(latencies),
+                "p50": 1000.0 * latencies[len(latencies) // 2],
+                "p95": 1000.0 * latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+                "max": 1000.0 * latencies[-1],
+            }
+        return {"count": count, "dropped": dropped, "failed": failed, "rate_hz": rate, "latency_ms": latency}
+
+
+class FollowPipeline:
+    """
+    采集 → 感知 → 伺服 三级流水线
+
+    Attributes:
+        servo_interval: 两次伺服命令之间的最短间隔 (秒)，0 表示有新观测就下发
+        max_age: 观测的最大允许时延 (秒，自帧采集时刻起算)，超过后不再下发
+        error: 流水线因摄像头故障自行停止时的原因，正常运行或手动停止时为 None
+    """
+
+    def __init__(self, camera, perceive: Callable[[Any], Tuple[bool, Optional[Tuple[float, float]]]],
+                 servo: Callable[[Tuple[float, float]], bool], servo_interval: float = 0.0,
+                 max_age: float = 0.5):
+        """
+        Args:
+            camera: CameraService（提供 wait_next(after_seq, timeout)）
+            perceive: 感知函数 image -> (ok, (cx, cy))，与 SingleObjectFollower.update 返回值一致
+            servo: 伺服函数 (cx, cy) -> bool
+            servo_interval: 伺服命令最短间隔 (秒)
+            max_age: 观测最大时延 (秒)
+        """
+        self.camera = camera
+        self.perceive = perceive
+        self.servo = servo
+        self.servo_interval = max(0.0, float(servo_interval))
+        self.max_age = float(max_age)
+
+        self._observations = LatestValue()
+        self._stages = {
+            "capture": StageMetrics(),
+            "perception": StageMetrics(),
+            "servo": StageMetrics(),
+            "end_to_end": StageMetrics(),
+        }
+        self._running = False
+        self._threads = []
+        self.error: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # 生命周期
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """启动感知与伺服线程（采集由 CameraService 负责）"""
+        if self._running:
+            return
+        self._running = True
+        self.error = None
+        self._threads = [
+            threading.Thread(target=self._perception_loop, name="FollowPipeline-perception", daemon=True),
+            threading.Thread(target=self._servo_loop, name="FollowPipeline-servo", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """停止流水线（正在执行的伺服命令会先完成）"""
+        self._running = False
+        self._observations.wake()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=timeout)
+        self._threads = []
+
+    def is_running(self) -> bool:
+        """流水线是否在运行（摄像头无法打开时会自行停止，原因见 error）"""
+        return self._running
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        各级统计快照
+
+        Returns:
+            dict: capture（latency 为帧从采集到开始感知的等待时间，dropped 为感知跳过的帧数）、
+                  perception、servo（dropped 含被覆盖与过期的观测）、end_to_end（采集到命令下发完成）
+        """
+        result = {name: stage.snapshot() for name, stage in self._stages.items()}
+        result["servo"]["dropped"] += self._observations.dropped
+        fps = getattr(self.camera, "fps", None)
+        if fps is not None:
+            result["capture"]["camera_fps"] = fps
+        return result
+
+    # ------------------------------------------------------------------
+    # 各级线程
+    # ------------------------------------------------------------------
+
+    def _perception_loop(self) -> None:
+        capture, perception = self._stages["capture"], self._stages["perception"]
+        last_seq = 0
+        try:
+            while self._running:
+                frame = self.camera.wait_next(last_seq, timeout=1.0)
+                if frame is None:
+                    error = getattr(self.camera, "last_error", None)
+                    if error and not self.camera.is_running:
+                        # 采集线程已因无法打开摄像头退出：停止流水线，而不是每次 wait_next 都重启采集线程重试
+                        print(f" ❌ [FollowPipeline] 摄像头不可用，停止跟随: {error}")
+                        self.error = error
+                        break
+                    continue
+                if last_seq and frame.seq > last_seq + 1:
+                    capture.drop(frame.seq - last_seq - 1)
+                last_seq = frame.seq
+
+                start = time.monotonic()
+                capture.record(start - frame.timestamp)
+                try:
+                    ok, center = self.perceive(frame.image)
+                except Exception as e:
+                    print(f" ⚠️ [FollowPipeline] 感知异常: {e}")
+                    ok, center = False, None
+                perception.record(time.monotonic() - start, ok=bool(ok and center is not None))
+                if ok and center is not None:
+                    self._observations.put(Observation(frame.seq, frame.timestamp,
+                                                       (float(center[0]), float(center[1]))))
+        finally:
+            self._running = False
+            self._observations.wake()
+
+    def _servo_loop(self) -> None:
+        servo, end_to_end = self._stages["servo"], self._stages["end_to_end"]
+        last_command = 0.0
+        try:
+            while self._running:
+                wait = last_command + self.servo_interval - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                observation = self._observations.get(timeout=0.5)
+                if observation is None or not self._running:
+                    continue
+                if time.monotonic() - observation.capture_time > self.max_age:
+                    servo.drop()
+                    continue
+
+                start = time.monotonic()
+                try:
+                    ok = bool(self.servo(observation.center))
+                except Exception as e:
+                    print(f" ⚠️ [FollowPipeline] 伺服异常: {e}")
+                    ok = False
+                now = time.monotonic()
+                servo.record(now - start, ok=ok)
+                end_to_end.record(now - observation.capture_time, ok=ok)
+                last_command = start
+        finally:
+            self._running = False
@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""
+进程内共享的 ONNX 批量推理服务
+
+`YOLOOnnxDetector` 每个实例各自创建一个 `InferenceSession`，每次推理只跑一帧；GUI、
+`FollowGraspSDK`、具身视觉指令各自加载一份 `yolov8n.onnx`，多个会话争抢同一组 CPU 核心。
+
+`InferenceServer` 每个模型只创建一个会话（可配置 intra / inter-op 线程数，开启全部图优化），
+由单独的推理线程执行：
+- 多个调用方（多路相机 / 多个模块）同时提交的输入沿 batch 维拼接成一次 `[N, 3, H, W]` 推理，
+  结果再按调用方拆分；模型 batch 维为静态 1 时退化为串行执行（仍然共享一个会话）；
+- 凑批最多等待 `max_delay`（默认 3 ms），且只在最近有其他调用方活跃时才等待，
+  单一调用方不增加任何延迟；
+- 使用 IO binding 直接绑定输入输出内存，不支持时回退到 `session.run`。
+
+`create_shared_detector()` 构造的 `YOLOOnnxDetector` 使用共享会话（检测器的预处理 / 后处理不变）：
+
+```python
+detector = create_shared_detector("config/yolov8n.onnx")     # 多处调用共用同一个会话
+server = get_inference_server("config/yolov8n.onnx")
+print(server.stats())                                        # {'batches': ..., 'mean_batch': ...}
+```
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+class _Request:
+    __slots__ = ("inputs", "batch", "outputs", "error", "done")
+
+    def __init__(self, inputs: np.ndarray):
+        self.inputs = inputs
+        self.batch = int(inputs.shape[0])
+        self.outputs: Optional[List[np.ndarray]] = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+class InferenceServer:
+    """
+    单模型共享推理服务
+
+    Attributes:
+        model_path: 模型路径
+        max_batch: 单次推理的最大 batch
+        max_delay: 凑批的最长等待时间 (秒)
+        dynamic_batch: 模型输入 batch 维是否可变
+    """
+
+    def __init__(self, model_path: str, intra_op_threads: Optional[int] = None, inter_op_threads: int = 1,
+                 max_batch: int = 8, max_delay: float = 0.003, providers: Optional[Sequence[str]] = None,
+                 use_io_binding: bool = True):
+        """
+        Args:
+            model_path: ONNX 模型路径
+            intra_op_threads: 单个算子内部线程数，None 为 onnxruntime 默认（物理核心数）
+            inter_op_threads: 算子间并行线程数
+            max_batch: 最大 batch
+            max_delay: 凑批最长等待 (秒)
+            providers: 执行提供者，默认按 onnxruntime 可用列表（CUDA 优先于 CPU）
+            use_io_binding: 是否使用 IO binding
+        """
+        import onnxruntime as ort
+
+        self.model_path = model_path
+        self.max_batch = max(1, int(max_batch))
+        self.max_delay = max(0.0, float(max_delay))
+        self.use_io_binding = bool(use_io_binding)
+
+        options = ort.SessionOptions()
+        if intra_op_threads:
+            options.intra_op_num_threads = int(intra_op_threads)
+        if inter_op_threads:
+            options.inter_op_num_threads = int(inter_op_threads)
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        if providers is None:
+            available = ort.get_available_providers()
+            providers = [p for p in ("CUDAExecutionProvider", "CPUExecutionProvider") if p in available]
+        self.session = ort.InferenceSession(model_path, sess_options=options, providers=list(providers))
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.output_names = [o.name for o in self.session.get_outputs()]
+        self.dynamic_batch = not isinstance(model_input.shape[0], int) or model_input.shape[0] <= 0
+        if not self.dynamic_batch:
+            self.max_batch = 1
+
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        self._callers: Dict[int, float] = {}
+        self._running = True
+        self._batches = 0
+        self._frames = 0
+        self._busy_time = 0.0
+        self._thread = threading.Thread(target=self._worker, name="InferenceServer", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # 调用接口
+    # ------------------------------------------------------------------
+
+    def infer(self, inputs: np.ndarray, timeout: Optional[float] = None) -> List[np.ndarray]:
+        """
+        提交一次推理并等待结果（线程安全，可由多个线程并发调用）
+
+        Args:
+            inputs: 模型输入，形如 (B, 3, H, W)
+            timeout: 最长等待时间 (秒)
+
+        Returns:
+            各输出（batch 维与 inputs 一致），顺序同 session.get_outputs()
+        """
+        request = _Request(np.ascontiguousarray(inputs))
+        with self._cond:
+            if not self._running:
+                raise RuntimeError("推理服务已关闭")
+            now = time.monotonic()
+            self._callers[threading.get_ident()] = now
+            if len(self._callers) > 64:
+                self._callers = {k: t for k, t in self._callers.items() if now - t < 1.0}
+            self._queue.append(request)
+            self._cond.notify_all()
+        if not request.done.wait(timeout):
+            raise TimeoutError("推理超时")
+        if request.error is not None:
+            raise request.error
+        return request.outputs
+
+    def session_proxy(self) -> "SharedSessionProxy":
+        """兼容 InferenceSession 接口（run / get_inputs / get_outputs）的代理，推理经由本服务合批执行"""
+        return SharedSessionProxy(self)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns:
+            dict: batches（推理次数）、frames（累计输入数）、mean_batch（平均 batch）、busy_s（累计推理耗时）
+        """
+        with self._cond:
+            batches, frames, busy = self._batches, self._frames, self._busy_time
+        return {"batches": batches, "frames": frames,
+                "mean_batch": frames / batches if batches else 0.0, "busy_s": busy}
+
+    def close(self) -> None:
+        """停止推理线程，未完成的请求以 RuntimeError 结束"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join(timeout=2.0)
+
+    # ------------------------------------------------------------------
+    # 推理线程
+    # ------------------------------------------------------------------
+
+    def _collect(self) -> List[_Request]:
+        """取出一批形状相同的请求；其他调用方最近活跃时最多等待 max_delay 凑批"""
+        with self._cond:
+            while self._running and not self._queue:
+                self._cond.wait()
+            if not self._running:
+                return []
+            first = self._queue.popleft()
+            batch = [first]
+            size = first.batch
+            shape = first.inputs.shape[1:]
+            deadline = time.monotonic() + self.max_delay
+            while size < self.max_batch:
+                matched = False
+                for request in list(self._queue):
+                    if request.inputs.shape[1:] == shape and size + request.batch <= self.max_batch:
+                        self._queue.remove(request)
+                        batch.append(request)
+                        size += request.batch
+                        matched = True
+                if size >= self.max_batch or matched:
+                    continue
+                now = time.monotonic()
+                # 最近 1 秒内活跃、且尚未在本批中的调用方数量
+                active = sum(1 for t in self._callers.values() if now - t < 1.0)
+                if active <= len(batch) or now >= deadline:
+                    break
+                self._cond.wait(deadline - now)
+            return batch
+
+    def _run(self, inputs: np.ndarray) -> List[np.ndarray]:
+        if self.use_io_binding:
+            try:
+                binding = self.session.io_binding()
+                binding.bind_cpu_input(self.input_name, inputs)
+                for name in self.output_names:
+                    binding.bind_output(name)
+                self.session.run_with_iobinding(binding)
+                return binding.copy_outputs_to_cpu()
+            except Exception as e:
+                print(f" ⚠️ [InferenceServer] IO binding 不可用，改用 session.run: {e}")
+                self.use_io_binding = False
+        return self.session.run(self.output_names, {self.input_name: inputs})
+
+    def _worker(self) -> None:
+        while True:
+            batch = self._collect()
+            if not batch:
+                break
+            start = time.monotonic()
+            try:
+                inputs = batch[0].inputs if len(batch) == 1 else np.concatenate([r.inputs for r in batch], axis=0)
+                outputs = self._run(inputs)
+                offset = 0
+                for request in batch:
+                    request.outputs = [o[offset:offset + request.batch] for o in outputs]
+                    offset += request.batch
+            except Exception as e:
+                for request in batch:
+                    request.error = e
+            with self._cond:
+                self._batches += 1
+                self._frames += sum(r.batch for r in batch)
+                self._busy_time += time.monotonic() - start
+            for request in batch:
+                request.done.set()
+
+        with self._cond:
+            pending = list(self._queue)
+            self._queue.clear()
+        for request in pending:
+            request.error = RuntimeError("推理服务已关闭")
+            request.done.set()
+
+
+class SharedSessionProxy:
+    """
+    InferenceSession 的替身：`run` 交由 InferenceServer 合批执行，其余查询转发给共享会话
+    """
+
+    def __init__(self, server: InferenceServer):
+        self._server = server
+
+    def run(self, output_names, input_feed: Dict[str, np.ndarray], run_options=None) -> List[np.ndarray]:
+        outputs = self._server.infer(input_feed[self._server.input_name])
+        if not output_names:
+            return outputs
+        index = {name: i for i, name in enumerate(self._server.output_names)}
+        return [outputs[index[name]] for name in output_names]
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._server.session, name)
+
+
+# ------------------------------------------------------------------
+# 共享实例
+# ------------------------------------------------------------------
+
+_servers: Dict[str, InferenceServer] = {}
+_servers_lock = threading.Lock()
+
+
+def get_inference_server(model_path: str, **kwargs) -> InferenceServer:
+    """
+    按模型路径共享的推理服务（首次调用时创建）
+
+    Args:
+        model_path: ONNX 模型路径
+        **kwargs: 首次创建时传给 InferenceServer 的参数
+    """
+    key = os.path.normcase(os.path.abspath(model_path))
+    with _servers_lock:
+        server = _servers.get(key)
+        if server is None:
+            server = InferenceServer(model_path, **kwargs)
+            _servers[key] = server
+        return server
+
+
+def create_shared_detector(model_path: str, detector_cls=None, **kwargs):
+    """
+    构造使用共享推理服务的 YOLO 检测器（预处理 / 后处理沿用检测器类自身的实现）
+
+    先创建（或取得）共享推理服务，再以其会话代理构造检测器：检测器类提供 `with_session` 时调用之，
+    否则以 `detector_cls.__new__` 构造并由 `bind_session` 设置推理状态，不经过 `__init__`，
+    因此不会另外加载一份模型。
+
+    Args:
+        model_path: ONNX 模型路径
+        detector_cls: 检测器类，默认 FastYOLODetector（向量化后处理）
+        **kwargs: 首次创建推理服务时的参数（intra_op_threads / max_batch / max_delay 等）
+
+    Returns:
+        检测器实例；共享服务不可用时返回独立会话的检测器
+    """
+    from .yolo_postprocess import FastYOLODetector, bind_session
+
+    if detector_cls is None:
+        detector_cls = FastYOLODetector
+
+    try:
+        server = get_inference_server(model_path, **kwargs)
+    except Exception as e:
+        print(f" ⚠️ [InferenceServer] 创建共享推理服务失败，使用独立会话: {e}")
+        return detector_cls(model_path)
+
+    proxy = server.session_proxy()
+    with_session = getattr(detector_cls, "with_session", None)
+    if with_session is not None:
+        return with_session(proxy)
+    detector = detector_cls.__new__(detector_cls)
+    bind_session(detector, proxy)
+    return detector
@@ -0,0 +1,601 @@
+# -*- coding: utf-8 -*-
+"""
+示教程序前瞻混合规划
+
+`config/teaching_program/*.json` 目前逐点执行：每个点使用自己的梯形参数，
+机械臂在每个路点处完全停下，节拍时间大约翻倍。
+
+`LookaheadBlendPlanner` 一次读入整个示教程序：
+- 前瞻相邻两段的运动方向，为中间路点分配“穿越速度”（方向一致时不停顿，换向时速度为零）；
+- 每段使用五次多项式（与 `interpolation.QuinticPolynomial` 相同的位置/速度/加速度边界条件），
+  在速度、加速度限制内求最短段时长；
+- 输出一条连续轨迹，可按控制频率采样后交给流式执行器（`MotionSDK.stream_trajectory`）。
+
+示教点的 `interpolation_type` 为 "cartesian" 时，到该点的一段保持末端走直线：
+位置线性插值、姿态按等效转轴匀速旋转，沿路径的梯形速度规划使用示教参数中的
+linear/angular velocity 与 acceleration，插补点由 `BatchInverseKinematics.solve_path` 一次求解。
+笛卡尔段两端速度为零（前后的关节空间段在此停下），段内不做关节速度/加速度限制检查。
+
+`QuinticPolynomial` 为逐关节、逐段的标量实现；这里对同样的边界条件使用闭式系数，
+所有关节、所有采样点一次向量化计算。
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+# 未指定时的默认关节限制（关节端，度/秒、度/秒²）
+DEFAULT_MAX_JOINT_VELOCITY = 60.0
+DEFAULT_MAX_JOINT_ACCELERATION = 120.0
+
+# 检查段内峰值速度/加速度时的采样点数
+_CHECK_SAMPLES = 48
+
+# 笛卡尔段未给出参数时的默认限制（mm/s、mm/s²、度/秒、度/秒²）
+DEFAULT_LINEAR_VELOCITY = 100.0
+DEFAULT_LINEAR_ACCELERATION = 200.0
+DEFAULT_ANGULAR_VELOCITY = 60.0
+DEFAULT_ANGULAR_ACCELERATION = 120.0
+# 笛卡尔段的插补时间步 (秒)
+CARTESIAN_SAMPLE_TIME = 0.01
+# 笛卡尔段逆解终点与示教关节角的最大允许偏差 (度)
+CARTESIAN_END_TOLERANCE = 1.0
+
+
+def _quintic_coefficients(p0, v0, p1, v1, T):
+    """
+    五次多项式闭式系数（两端加速度为零）
+
+    Args:
+        p0, v0, p1, v1: (..., 关节数) 起止位置与速度
+        T: (...) 段时长，需可广播到 (..., 1)
+
+    Returns:
+        np.ndarray: (6, ..., 关节数)，依次为 c0..c5，q(t) = Σ c_k t^k
+    """
+    T = np.asarray(T, dtype=np.float64)[..., None]
+    d = p1 - p0
+    T2 = T * T
+    T3 = T2 * T
+    c0 = p0
+    c1 = v0
+    c2 = np.zeros_like(p0)
+    c3 = (10.0 * d - (6.0 * v0 + 4.0 * v1) * T) / T3
+    c4 = (-15.0 * d + (8.0 * v0 + 7.0 * v1) * T) / (T3 * T)
+    c5 = (6.0 * d - 3.0 * (v0 + v1) * T) / (T3 * T2)
+    return np.stack([c0, c1, c2, c3, c4, c5])
+
+
+def _evaluate(coeffs: np.ndarray, t: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    计算多项式在局部时间 t 处的位置/速度/加速度
+
+    Args:
+        coeffs: (6, N, 关节数) 每个采样点所在段的系数
+        t: (N,) 段内局部时间
+
+    Returns:
+        (position, velocity, acceleration)，形状均为 (N, 关节数)
+    """
+    t = t[:, None]
+    c0, c1, c2, c3, c4, c5 = coeffs
+    pos = c0 + t * (c1 + t * (c2 + t * (c3 + t * (c4 + t * c5))))
+    vel = c1 + t * (2.0 * c2 + t * (3.0 * c3 + t * (4.0 * c4 + t * 5.0 * c5)))
+    acc = 2.0 * c2 + t * (6.0 * c3 + t * (12.0 * c4 + t * 20.0 * c5))
+    return pos, vel, acc
+
+
+def _checked_stop_at(stop_at: Optional[Sequence[int]], count: int, name: str = "路点") -> List[int]:
+    """校验停止点序号均在 [0, count) 内，返回整数列表"""
+    indices = [] if stop_at is None else list(stop_at)
+    invalid = [i for i in indices if isinstance(i, bool) or not isinstance(i, (int, np.integer))
+               or not 0 <= int(i) < count]
+    if invalid:
+        raise ValueError(f"stop_at 含无效的{name}序号 {invalid}，有效范围为 0 ~ {count - 1}")
+    return [int(i) for i in indices]
+
+
+class BlendedTrajectory:
+    """
+    分段五次多项式表示的连续关节轨迹
+
+    Attributes:
+        waypoints: (M, 关节数) 路点
+        knot_velocities: (M, 关节数) 各路点的穿越速度
+        durations: (M-1,) 各段时长 (秒)
+        start_times: (M,) 各路点的到达时刻 (秒)
+    """
+
+    def __init__(self, waypoints: np.ndarray, knot_velocities: np.ndarray, durations: np.ndarray):
+        self.waypoints = waypoints
+        self.knot_velocities = knot_velocities
+        self.durations = durations
+        self.start_times = np.concatenate([[0.0], np.cumsum(durations)])
+        # (6, 段数, 关节数)
+        self.coefficients = _quintic_coefficients(
+            waypoints[:-1], knot_velocities[:-1], waypoints[1:], knot_velocities[1:], durations
+        )
+
+    @property
+    def duration(self) -> float:
+        """轨迹总时长 (秒)"""
+        return float(self.start_times[-1])
+
+    def evaluate(self, times) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        计算任意时刻的关节状态
+
+        Args:
+            times: 时刻数组 (秒)，超出范围时截断到首尾
+
+        Returns:
+            (positions, velocities, accelerations)，形状均为 (N, 关节数)
+        """
+        times = np.clip(np.atleast_1d(np.asarray(times, dtype=np.float64)), 0.0, self.duration)
+        segment = np.searchsorted(self.start_times, times, side="right") - 1
+        np.clip(segment, 0, len(self.durations) - 1, out=segment)
+        local = times - self.start_times[segment]
+        return _evaluate(self.coefficients[:, segment], local)
+
+    def sample(self, rate_hz: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        按控制频率等间隔采样（包含终点）
+
+        Args:
+            rate_hz: 采样频率 (Hz)
+
+        Returns:
+            (times, positions, velocities)
+        """
+        count = int(np.ceil(self.duration * rate_hz)) + 1
+        times = np.minimum(np.arange(count) / rate_hz, self.duration)
+        positions, velocities, _ = self.evaluate(times)
+        return times, positions, velocities
+
+
+class LookaheadBlendPlanner:
+    """
+    前瞻混合规划器
+
+    使用示例：
+    ```python
+    planner = LookaheadBlendPlanner(max_velocity=60, max_acceleration=120)
+    traj = planner.plan(waypoints)                 # (M, 6) 关节角度
+    times, points, _ = traj.sample(100)
+    motion.stream_trajectory(points, rate_hz=100)
+    ```
+    """
+
+    def __init__(self, max_velocity: Union[float, Sequence[float]] = DEFAULT_MAX_JOINT_VELOCITY,
+                 max_acceleration: Union[float, Sequence[float]] = DEFAULT_MAX_JOINT_ACCELERATION,
+                 min_segment_time: float = 0.05, iterations: int = 3):
+        """
+        初始化规划器
+
+        Args:
+            max_velocity: 关节最大速度 (度/秒)，标量或逐关节数组
+            max_acceleration: 关节最大加速度 (度/秒²)，标量或逐关节数组
+            min_segment_time: 最短段时长 (秒)
+            iterations: 穿越速度与段时长交替优化的迭代次数
+        """
+        self.max_velocity = np.asarray(max_velocity, dtype=np.float64)
+        self.max_acceleration = np.asarray(max_acceleration, dtype=np.float64)
+        self.min_segment_time = float(min_segment_time)
+        self.iterations = max(1, int(iterations))
+
+    def plan(self, waypoints, stop_at: Optional[Sequence[int]] = None,
+             max_velocity: Optional[np.ndarray] = None,
+             max_acceleration: Optional[np.ndarray] = None) -> BlendedTrajectory:
+        """
+        规划经过全部路点的连续轨迹
+
+        Args:
+            waypoints: (M, 关节数) 关节角度 (度)
+            stop_at: 需要完全停下的路点索引（如夹爪动作点），首尾总是停下
+            max_velocity: 可选，(M-1, 关节数) 逐段速度限制，覆盖构造参数
+            max_acceleration: 可选，(M-1, 关节数) 逐段加速度限制，覆盖构造参数
+
+        Returns:
+            BlendedTrajectory: 连续轨迹
+        """
+        points = np.asarray(waypoints, dtype=np.float64)
+        if points.ndim != 2 or len(points) < 2:
+            raise ValueError("至少需要两个路径点")
+        stop_at = _checked_stop_at(stop_at, len(points))
+
+        # 去掉与前一点重合的路点（不产生运动的段）
+        keep = np.ones(len(points), dtype=bool)
+        keep[1:] = np.any(np.abs(np.diff(points, axis=0)) > 1e-9, axis=1)
+        index_map = np.cumsum(keep) - 1
+        points = points[keep]
+        if len(points) < 2:
+            return BlendedTrajectory(points.repeat(2, axis=0), np.zeros((2, points.shape[1])),
+                                     np.array([self.min_segment_time]))
+
+        segments = len(points) - 1
+        joints = points.shape[1]
+        vmax = self._segment_limits(self.max_velocity if max_velocity is None else max_velocity,
+                                    keep, segments, joints)
+        amax = self._segment_limits(self.max_acceleration if max_acceleration is None else max_acceleration,
+                                    keep, segments, joints)
+
+        stops = np.zeros(len(points), dtype=bool)
+        stops[[0, -1]] = True
+        if stop_at:
+            stops[np.unique(index_map[stop_at])] = True
+
+        deltas = np.diff(points, axis=0)
+
+        # 初值：静止到静止的五次多项式（峰值速度 1.875 d/T，峰值加速度 5.7735 d/T²）
+        abs_d = np.abs(deltas)
+        durations = np.max(np.maximum(1.875 * abs_d / vmax, np.sqrt(5.7735 * abs_d / amax)), axis=1)
+        np.maximum(durations, self.min_segment_time, out=durations)
+        knot_velocities = np.zeros_like(points)
+
+        for _ in range(self.iterations):
+            knot_velocities = self._knot_velocities(deltas, durations, stops, vmax)
+            durations = self._fit_durations(points, knot_velocities, durations, vmax, amax)
+
+        return BlendedTrajectory(points, knot_velocities, durations)
+
+    @staticmethod
+    def _segment_limits(limit, keep: np.ndarray, segments: int, joints: int) -> np.ndarray:
+        """把标量/逐关节/逐段限制统一为 (段数, 关节数)，逐段限制随重合路点一起剔除"""
+        limit = np.asarray(limit, dtype=np.float64)
+        if limit.ndim == 2 and len(limit) == len(keep) - 1:
+            limit = limit[keep[1:]]
+        return np.broadcast_to(limit, (segments, joints)).copy()
+
+    def _knot_velocities(self, deltas: np.ndarray, durations: np.ndarray,
+                         stops: np.ndarray, vmax: np.ndarray) -> np.ndarray:
+        """
+        前瞻分配路点穿越速度
+
+        相邻两段同向时取两段平均速度中较小者（保证不越过路点），换向或一段静止时为零。
+        """
+        slopes = deltas / durations[:, None]
+        before = slopes[:-1]
+        after = slopes[1:]
+        same_direction = (np.sign(before) == np.sign(after)) & (before != 0)
+        magnitude = np.minimum(np.abs(before), np.abs(after))
+        magnitude = np.minimum(magnitude, np.minimum(vmax[:-1], vmax[1:]))
+        interior = np.where(same_direction, np.sign(before) * magnitude, 0.0)
+
+        velocities = np.zeros((len(deltas) + 1, deltas.shape[1]))
+        velocities[1:-1] = interior
+        velocities[stops] = 0.0
+        return velocities
+
+    def _fit_durations(self, points: np.ndarray, knot_velocities: np.ndarray, durations: np.ndarray,
+                       vmax: np.ndarray, amax: np.ndarray) -> np.ndarray:
+        """在给定穿越速度下，为每段求满足速度/加速度限制的最短时长"""
+        # 下界：全程以最大速度匀速通过
+        lower = np.max(np.abs(np.diff(points, axis=0)) / vmax, axis=1)
+        durations = np.maximum(np.maximum(lower, self.min_segment_time), durations * 0.5)
+        u = np.linspace(0.0, 1.0, _CHECK_SAMPLES)
+
+        for _ in range(20):
+            coeffs = _quintic_coefficients(points[:-1], knot_velocities[:-1],
+                                           points[1:], knot_velocities[1:], durations)
+            # (段数, 采样点, 关节数)
+            t = u[None, :] * durations[:, None]
+            c = coeffs[:, :, None, :]
+            tt = t[:, :, None]
+            vel = c[1] + tt * (2.0 * c[2] + tt * (3.0 * c[3] + tt * (4.0 * c[4] + tt * 5.0 * c[5])))
+            acc = 2.0 * c[2] + tt * (6.0 * c[3] + tt * (12.0 * c[4] + tt * 20.0 * c[5]))
+            v_ratio = np.max(np.abs(vel) / vmax[:, None, :], axis=(1, 2))
+            a_ratio = np.max(np.abs(acc) / amax[:, None, :], axis=(1, 2))
+            scale = np.maximum(v_ratio, np.sqrt(a_ratio))
+            if np.all(scale <= 1.0 + 1e-3):
+                break
+            durations = np.where(scale > 1.0 + 1e-3, durations * np.maximum(scale, 1.05), durations)
+        return durations
+
+
+# ----------------------------------------------------------------------
+# 笛卡尔直线段
+# ----------------------------------------------------------------------
+
+class SampledTrajectory:
+    """
+    按固定时间步给出的关节轨迹（笛卡尔直线段的逆解结果），采样时线性插值到控制频率
+
+    Attributes:
+        times: (N,) 时刻 (秒)，从 0 开始
+        positions: (N, 关节数) 关节角 (度)
+    """
+
+    def __init__(self, times: np.ndarray, positions: np.ndarray):
+        self.times = np.asarray(times, dtype=np.float64)
+        self.positions = np.asarray(positions, dtype=np.float64)
+
+    @property
+    def duration(self) -> float:
+        return float(self.times[-1])
+
+    def sample(self, rate_hz: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """按控制频率等间隔采样（包含终点），返回 (times, positions, velocities)"""
+        count = int(np.ceil(self.duration * rate_hz)) + 1
+        times = np.minimum(np.arange(count) / rate_hz, self.duration)
+        positions = np.stack([np.interp(times, self.times, q) for q in self.positions.T], axis=1)
+        velocities = np.gradient(positions, times, axis=0) if count > 1 else np.zeros_like(positions)
+        return times, positions, velocities
+
+
+class ProgramTrajectory:
+    """
+    依次拼接的轨迹片段（关节空间混合段与笛卡尔直线段），接口与 BlendedTrajectory.sample 一致
+
+    Attributes:
+        pieces: BlendedTrajectory / SampledTrajectory 列表，相邻片段首尾相接
+    """
+
+    def __init__(self, pieces: List[Any]):
+        self.pieces = list(pieces)
+
+    @property
+    def duration(self) -> float:
+        return float(sum(piece.duration for piece in self.pieces))
+
+    def sample(self, rate_hz: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """各片段分别按控制频率采样后拼接（去掉与上一片段终点重合的首点）"""
+        times_parts, position_parts, velocity_parts = [], [], []
+        offset = 0.0
+        for i, piece in enumerate(self.pieces):
+            times, positions, velocities = piece.sample(rate_hz)
+            start = 0 if i == 0 else 1
+            times_parts.append(times[start:] + offset)
+            position_parts.append(positions[start:])
+            velocity_parts.append(velocities[start:])
+            offset += piece.duration
+        return np.concatenate(times_parts), np.concatenate(position_parts), np.concatenate(velocity_parts)
+
+
+def _trapezoid_profile(max_rate: float, max_accel: float, times: np.ndarray) -> np.ndarray:
+    """路径参数 s∈[0,1] 的梯形速度曲线在 times 处的取值"""
+    if max_rate * max_rate / max_accel >= 1.0:
+        # 三角形：达不到最大速度
+        t_acc = np.sqrt(1.0 / max_accel)
+        peak, cruise = max_accel * t_acc, 0.0
+    else:
+        t_acc = max_rate / max_accel
+        peak, cruise = max_rate, (1.0 - max_rate * t_acc) / max_rate
+    total = 2.0 * t_acc + cruise
+    t = np.clip(times, 0.0, total)
+    accel_part = 0.5 * max_accel * np.minimum(t, t_acc) ** 2
+    cruise_part = peak * np.clip(t - t_acc, 0.0, cruise)
+    t_dec = np.clip(t - t_acc - cruise, 0.0, t_acc)
+    decel_part = peak * t_dec - 0.5 * max_accel * t_dec ** 2
+    return np.minimum(accel_part + cruise_part + decel_part, 1.0)
+
+
+def _trapezoid_duration(max_rate: float, max_accel: float) -> float:
+    if max_rate * max_rate / max_accel >= 1.0:
+        return 2.0 * np.sqrt(1.0 / max_accel)
+    return 2.0 * max_rate / max_accel + (1.0 - max_rate * max_rate / max_accel) / max_rate
+
+
+def _rotation_axis_angle(R: np.ndarray) -> Tuple[np.ndarray, float]:
+    """旋转矩阵的等效转轴与转角（弧度）"""
+    angle = float(np.arccos(np.clip((np.trace(R) - 1.0) / 2.0, -1.0, 1.0)))
+    if angle < 1e-9:
+        return np.array([0.0, 0.0, 1.0]), 0.0
+    if np.pi - angle < 1e-6:
+        # 接近 180°：由 R + I 的最大列确定转轴
+        M = R + np.eye(3)
+        axis = M[:, int(np.argmax(np.linalg.norm(M, axis=0)))]
+        return axis / np.linalg.norm(axis), angle
+    axis = np.array([R[2, 1] - R[1, 2], R[0, 2] - R[2, 0], R[1, 0] - R[0, 1]]) / (2.0 * np.sin(angle))
+    return axis, angle
+
+
+def cartesian_segment(q_start, q_end, params: Optional[Dict[str, Any]], ik,
+                      sample_time: float = CARTESIAN_SAMPLE_TIME) -> SampledTrajectory:
+    """
+    两个示教关节角之间末端走直线的一段
+
+    Args:
+        q_start / q_end: 起止关节角 (度)
+        params: 示教点的 interpolation_params（linear_velocity、linear_acceleration、
+            angular_velocity、angular_acceleration）
+        ik: BatchInverseKinematics（同时提供正运动学）
+        sample_time: 插补时间步 (秒)
+
+    Returns:
+        SampledTrajectory: 两端静止的关节轨迹
+
+    Raises:
+        ValueError: 插补点无逆解，或逆解终点与示教关节角不一致（构型不同）
+    """
+    params = params or {}
+    q_start = np.asarray(q_start, dtype=np.float64)
+    q_end = np.asarray(q_end, dtype=np.float64)
+    T_start, T_end = ik.kinematics.forward_kinematics_batch(np.stack([q_start, q_end]))
+    p_start, p_end = T_start[:3, 3], T_end[:3, 3]
+    R_start = T_start[:3, :3]
+    axis, angle = _rotation_axis_angle(R_start.T @ T_end[:3, :3])
+    length = float(np.linalg.norm(p_end - p_start))
+
+    # 路径参数 s 的速度/加速度上限：线速度与角速度限制同时满足
+    rates, accels = [np.inf], [np.inf]
+    if length > 1e-6:
+        rates.append(float(params.get("linear_velocity") or DEFAULT_LINEAR_VELOCITY) / length)
+        accels.append(float(params.get("linear_acceleration") or DEFAULT_LINEAR_ACCELERATION) / length)
+    if angle > 1e-6:
+        rates.append(np.radians(float(params.get("angular_velocity") or DEFAULT_ANGULAR_VELOCITY)) / angle)
+        accels.append(np.radians(float(params.get("angular_acceleration") or DEFAULT_ANGULAR_ACCELERATION)) / angle)
+    if len(rates) == 1:
+        return SampledTrajectory(np.zeros(1), q_end[None])
+    max_rate, max_accel = min(rates), min(accels)
+
+    duration = _trapezoid_duration(max_rate, max_accel)
+    times = np.append(np.arange(0.0, duration, sample_time), duration)
+    path = _trapezoid_profile(max_rate, max_accel, times)
+
+    # 位置线性插值，姿态绕固定等效轴匀速转动（Rodrigues）
+    K = np.array([[0.0, -axis[2], axis[1]], [axis[2], 0.0, -axis[0]], [-axis[1], axis[0], 0.0]])
+    theta = path * angle
+    R_rel = (np.eye(3) + np.sin(theta)[:, None, None] * K
+             + (1.0 - np.cos(theta))[:, None, None] * (K @ K))
+    T = np.zeros((len(times), 4, 4))
+    T[:, :3, :3] = R_start @ R_rel
+    T[:, :3, 3] = p_start + path[:, None] * (p_end - p_start)
+    T[:, 3, 3] = 1.0
+
+    q, ok = ik.solve_path(T, seed=q_start)
+    if not ok.all():
+        raise ValueError(f"笛卡尔直线段有 {int((~ok).sum())} 个插补点无逆解（超出工作空间或关节限位）")
+    if np.max(np.abs(q[-1] - q_end)) > CARTESIAN_END_TOLERANCE:
+        raise ValueError("笛卡尔直线段的逆解终点与示教关节角构型不一致，请改用关节插补")
+    q[0], q[-1] = q_start, q_end
+    return SampledTrajectory(times, q)
+
+
+# ----------------------------------------------------------------------
+# 示教程序
+# ----------------------------------------------------------------------
+
+def load_teaching_program(program: Union[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    读取示教程序
+
+    Args:
+        program: JSON 文件路径，或已解析的示教点列表
+
+    Returns:
+        List[Dict]: 按 index 排序的示教点
+    """
+    if isinstance(program, str):
+        with open(program, "r", encoding="utf-8") as f:
+            program = json.load(f)
+    return sorted(program, key=lambda p: p.get("index", 0))
+
+
+def teaching_program_limits(points: List[Dict[str, Any]], reducer_ratios: Optional[Sequence[float]] = None,
+                            default_velocity: float = DEFAULT_MAX_JOINT_VELOCITY,
+                            default_acceleration: float = DEFAULT_MAX_JOINT_ACCELERATION
+                            ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    由示教点的插补参数推导逐段关节速度/加速度限制
+
+    梯形/点到点参数 (max_speed RPM、acceleration RPM/s) 为电机端数值，按减速比换算为关节端；
+    关节空间参数 (joint_max_velocity / max_velocities 度/秒、joint_max_acceleration / max_accelerations
+    度/秒²，标量或逐关节) 直接使用；其他类型（笛卡尔）使用默认关节限制。第 i 段使用目标点 i+1 的参数。
+
+    Args:
+        points: 示教点列表
+        reducer_ratios: 各关节减速比，缺省时按 1 处理
+        default_velocity: 默认关节速度限制 (度/秒)
+        default_acceleration: 默认关节加速度限制 (度/秒²)
+
+    Returns:
+        (max_velocity, max_acceleration): 两个 (段数, 关节数) 数组
+    """
+    joints = len(points[0]["joint_angles"])
+    ratios = np.ones(joints) if reducer_ratios is None else np.abs(np.asarray(reducer_ratios, dtype=np.float64))
+    vmax = np.full((len(points) - 1, joints), float(default_velocity))
+    amax = np.full((len(points) - 1, joints), float(default_acceleration))
+    for i, point in enumerate(points[1:]):
+        params = point.get("interpolation_params") or {}
+        if "max_speed" in params:
+            # RPM → 度/秒：×6，再除以减速比
+            vmax[i] = float(params["max_speed"]) * 6.0 / ratios
+            accel = min(float(params.get("acceleration", 0) or 0), float(params.get("deceleration", 0) or 0)) \
+                if "deceleration" in params else float(params.get("acceleration", 0) or 0)
+            if accel > 0:
+                amax[i] = accel * 6.0 / ratios
+        elif "joint_max_velocity" in params or "max_velocities" in params:
+            velocity = np.asarray(params.get("joint_max_velocity", params.get("max_velocities")), dtype=np.float64)
+            vmax[i] = np.where(velocity > 0, velocity, vmax[i])
+            accel = params.get("joint_max_acceleration", params.get("max_accelerations"))
+            if accel is not None:
+                accel = np.asarray(accel, dtype=np.float64)
+                amax[i] = np.where(accel > 0, accel, amax[i])
+    return vmax, amax
+
+
+def is_cartesian_point(point: Dict[str, Any]) -> bool:
+    """到该示教点的一段是否要求末端走直线"""
+    return point.get("interpolation_type") == "cartesian"
+
+
+def plan_program_points(points: List[Dict[str, Any]], reducer_ratios: Optional[Sequence[float]] = None,
+                        planner: Optional["LookaheadBlendPlanner"] = None,
+                        stop_at: Optional[Sequence[int]] = None, ik=None):
+    """
+    规划一串示教点：连续的关节空间段前瞻混合，笛卡尔段走直线（两端停下）
+
+    Args:
+        points: 示教点列表（joint_angles、interpolation_type、interpolation_params）
+        reducer_ratios: 各关节减速比
+        planner: 可选，自定义规划器
+        stop_at: 需要完全停下的示教点序号（列表下标）
+        ik: 可选，BatchInverseKinematics；含笛卡尔段且未给出时按 dh_parameters_config.json 构建
+
+    Returns:
+        不含笛卡尔段时为 BlendedTrajectory，否则为 ProgramTrajectory
+    """
+    stop_at = _checked_stop_at(stop_at, len(points), "示教点")
+    planner = planner or LookaheadBlendPlanner()
+    waypoints = np.array([p["joint_angles"] for p in points], dtype=np.float64)
+    vmax, amax = teaching_program_limits(points, reducer_ratios)
+    cartesian = [is_cartesian_point(p) for p in points[1:]]
+    if not any(cartesian):
+        return planner.plan(waypoints, stop_at=stop_at, max_velocity=vmax, max_acceleration=amax)
+
+    if ik is None:
+        from .batch_ik import BatchInverseKinematics
+        ik = BatchInverseKinematics.from_config()
+    stops = set(stop_at)
+    pieces = []
+    start = 0
+    for seg in range(len(points) - 1):
+        if not cartesian[seg]:
+            continue
+        if seg > start:
+            # 之前连续的关节空间段 [start, seg] 作为一段混合轨迹
+            local_stops = [i - start for i in stops if start <= i <= seg]
+            pieces.append(planner.plan(waypoints[start:seg + 1], stop_at=local_stops,
+                                       max_velocity=vmax[start:seg], max_acceleration=amax[start:seg]))
+        try:
+            piece = cartesian_segment(waypoints[seg], waypoints[seg + 1], points[seg + 1].get("interpolation_params"), ik)
+        except ValueError as e:
+            raise ValueError(f"示教点 {seg} → {seg + 1}: {e}") from None
+        if piece.duration > 0:
+            pieces.append(piece)
+        start = seg + 1
+    if start < len(points) - 1:
+        local_stops = [i - start for i in stops if i >= start]
+        pieces.append(planner.plan(waypoints[start:], stop_at=local_stops,
+                                   max_velocity=vmax[start:], max_acceleration=amax[start:]))
+    if not pieces:
+        return SampledTrajectory(np.zeros(1), waypoints[-1:])
+    return ProgramTrajectory(pieces)
+
+
+def plan_teaching_program(program: Union[str, List[Dict[str, Any]]],
+                          reducer_ratios: Optional[Sequence[float]] = None,
+                          planner: Optional[LookaheadBlendPlanner] = None,
+                          stop_at: Optional[Sequence[int]] = None, ik=None):
+    """
+    把整个示教程序规划为一条连续轨迹
+
+    Args:
+        program: 示教程序 JSON 路径或示教点列表
+        reducer_ratios: 各关节减速比（用于把示教参数换算到关节端）
+        planner: 可选，自定义规划器
+        stop_at: 需要完全停下的示教点序号（列表下标）
+        ik: 可选，笛卡尔段使用的 BatchInverseKinematics
+
+    Returns:
+        BlendedTrajectory 或 ProgramTrajectory（含笛卡尔直线段时），均提供 duration / sample(rate_hz)
+
+    Raises:
+        ValueError: 示教点不足两个，或 stop_at 含超出示教点范围的序号
+    """
+    points = load_teaching_program(program)
+    if len(points) < 2:
+        raise ValueError("示教程序至少需要两个点")
+    return plan_program_points(points, reducer_ratios, planner, stop_at, ik)
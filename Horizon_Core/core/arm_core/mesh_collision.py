@@ -0,0 +1,576 @@
+# -*- coding: utf-8 -*-
+"""
+基于 URDF 连杆网格的批量碰撞检测
+
+`RRTPlanner.is_collision_free` 依赖调用方提供的回调，现有代码也没有用 `config/urdf/*.STL` 的真实外形
+检测自碰撞或与桌面的碰撞。
+
+`MeshCollisionChecker`：
+- 一次性读取 URDF 运动链与各连杆 STL，长三角形先细分，再按三角形构建球体包围层次（BVH，二叉树，
+  叶子球半径不超过 max_leaf_radius，默认 15 mm；叶子球包含其三角形的全部顶点，因此对网格是保守的），
+  可选外扩 padding；
+- URDF 关节链的正运动学对一批关节角向量化计算，包围球只在下探到时才变换到基座坐标系；
+- 自碰撞：所有需检测的连杆对、所有关节角同时逐层下探（只展开包围球相交的节点对），每层先沿重叠最深的
+  节点对贪心下探，找到相交的叶子对即确定碰撞；
+- 桌面 / 球体 / 长方体障碍：同样逐层下探到叶子包围球；
+- 连杆对的允许碰撞矩阵（相邻连杆、在随机采样中始终相交的连杆对不检测）与各连杆 BVH 一起按
+  URDF/STL 内容哈希缓存在 `<config>/collision_cache/`，后续启动直接加载。
+
+URDF 关节角与本项目关节角（DH 模型，度）的对应关系为 `URDF_JOINT_MAP`：
+    q_urdf = 方向 × q + 偏移
+
+使用示例：
+```python
+checker = MeshCollisionChecker.from_config(table_height=0.0)
+valid = checker(q)                         # q: (N, 6) 关节角 (度) → (N,) 是否无碰撞
+print(checker.colliding_pairs(q[0]))       # [("2_Link", "6_Link"), ...]
+planner = RRTConnectPlanner(checker)
+```
+"""
+
+import hashlib
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch_kinematics import BatchKinematics
+from .config_paths import get_config_dir
+
+
+# URDF 连杆（与 STL 文件名一致），第 0 个为基座
+URDF_LINK_NAMES = ["base_link", "1_Link", "2_Link", "3_Link", "4_Link", "5_Link", "6_Link"]
+# 各关节：URDF 关节角 = 方向 × 关节角 + 偏移 (度)，由 URDF 关节轴线与 DH 模型逐轴对齐得到
+URDF_JOINT_MAP = [(1.0, 0.0), (-1.0, 0.0), (-1.0, 0.0), (1.0, 180.0), (1.0, 0.0), (1.0, 0.0)]
+# URDF / STL 长度单位为米，本模块统一使用毫米
+URDF_UNIT_SCALE = 1000.0
+
+# 缓存格式版本，BVH 构建方式或文件结构变化时递增
+COLLISION_CACHE_VERSION = 2
+
+# 随机采样中相交比例不低于该值的连杆对视为“始终接触”，不参与检测
+_ALWAYS_COLLIDING_RATIO = 0.95
+# 不参与桌面/障碍检测的连杆（固定在桌面上的基座与第一关节）
+_GROUNDED_LINKS = 2
+# 节点对展开时两侧子节点的组合（堆式编号的偏移）
+_CHILD_PAIRS = np.array([[1, 1], [1, 2], [2, 1], [2, 2]])
+
+
+def get_urdf_dir() -> str:
+    """URDF 目录：优先使用环境变量 HORIZONARM_CONFIG_DIR，否则为项目根目录下的 config/urdf"""
+    return os.path.join(get_config_dir(), "urdf")
+
+
+# ----------------------------------------------------------------------
+# 文件读取
+# ----------------------------------------------------------------------
+
+_STL_RECORD = np.dtype([("normal", "<f4", 3), ("vertices", "<f4", (3, 3)), ("attr", "<u2")])
+_ASCII_VERTEX = re.compile(rb"vertex\s+(\S+)\s+(\S+)\s+(\S+)")
+
+
+def load_stl(path: str) -> np.ndarray:
+    """
+    读取 STL（二进制或 ASCII）
+
+    Returns:
+        np.ndarray: (T, 3, 3) 三角形顶点（文件原单位）
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    if len(raw) >= 84:
+        count = int(np.frombuffer(raw, dtype="<u4", count=1, offset=80)[0])
+        if len(raw) == 84 + 50 * count:
+            records = np.frombuffer(raw, dtype=_STL_RECORD, count=count, offset=84)
+            return records["vertices"].astype(np.float64)
+    vertices = np.array(_ASCII_VERTEX.findall(raw), dtype=np.float64)
+    if len(vertices) == 0 or len(vertices) % 3:
+        raise ValueError(f"无法解析 STL 文件: {path}")
+    return vertices.reshape(-1, 3, 3)
+
+
+def _rpy_matrix(roll: float, pitch: float, yaw: float) -> np.ndarray:
+    cr, sr = np.cos(roll), np.sin(roll)
+    cp, sp = np.cos(pitch), np.sin(pitch)
+    cy, sy = np.cos(yaw), np.sin(yaw)
+    return np.array([
+        [cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr],
+        [sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr],
+        [-sp, cp * sr, cp * cr],
+    ])
+
+
+def parse_urdf_chain(path: str, link_names: Sequence[str] = URDF_LINK_NAMES) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    读取串联关节链
+
+    Args:
+        path: URDF 文件路径
+        link_names: 从基座开始的连杆名称（相邻两连杆之间为一个转动关节）
+
+    Returns:
+        (origins, axes): (关节数, 4, 4) 各关节在父连杆中的位姿 (mm)，(关节数, 3) 单位转轴
+    """
+    root = ET.parse(path).getroot()
+    joints = {}
+    for joint in root.findall("joint"):
+        parent = joint.find("parent").get("link")
+        child = joint.find("child").get("link")
+        origin = joint.find("origin")
+        xyz = [float(v) for v in (origin.get("xyz", "0 0 0") if origin is not None else "0 0 0").split()]
+        rpy = [float(v) for v in (origin.get("rpy", "0 0 0") if origin is not None else "0 0 0").split()]
+        axis_node = joint.find("axis")
+        axis = [float(v) for v in (axis_node.get("xyz") if axis_node is not None else "1 0 0").split()]
+        joints[(parent, child)] = (xyz, rpy, axis)
+
+    origins, axes = [], []
+    for parent, child in zip(link_names[:-1], link_names[1:]):
+        if (parent, child) not in joints:
+            raise ValueError(f"URDF 中缺少关节 {parent} → {child}")
+        xyz, rpy, axis = joints[(parent, child)]
+        T = np.eye(4)
+        T[:3, :3] = _rpy_matrix(*rpy)
+        T[:3, 3] = np.asarray(xyz) * URDF_UNIT_SCALE
+        origins.append(T)
+        axes.append(np.asarray(axis) / np.linalg.norm(axis))
+    return np.array(origins), np.array(axes)
+
+
+# ----------------------------------------------------------------------
+# 包围球层次
+# ----------------------------------------------------------------------
+
+def subdivide_triangles(triangles: np.ndarray, max_edge: float) -> np.ndarray:
+    """
+    把最长边超过 max_edge 的三角形沿最长边中点反复一分为二（细分后的三角形与原网格覆盖同一表面）
+
+    Args:
+        triangles: (T, 3, 3) 三角形顶点
+        max_edge: 最长边上限
+
+    Returns:
+        np.ndarray: (T', 3, 3) 细分后的三角形
+    """
+    done = []
+    pending = np.asarray(triangles, dtype=np.float64)
+    while len(pending):
+        # 第 k 条边为顶点 k → k+1
+        edges = np.linalg.norm(np.roll(pending, -1, axis=1) - pending, axis=2)
+        longest = np.argmax(edges, axis=1)
+        small = edges[np.arange(len(pending)), longest] <= max_edge
+        done.append(pending[small])
+        pending, longest = pending[~small], longest[~small]
+        if not len(pending):
+            break
+        # 按最长边起点轮换顶点顺序，使最长边为 v0 → v1
+        order = (longest[:, None] + np.arange(3)) % 3
+        pending = np.take_along_axis(pending, order[:, :, None], axis=1)
+        mid = 0.5 * (pending[:, 0] + pending[:, 1])
+        pending = np.concatenate([np.stack([pending[:, 0], mid, pending[:, 2]], axis=1),
+                                  np.stack([mid, pending[:, 1], pending[:, 2]], axis=1)])
+    return np.concatenate(done)
+
+
+def build_sphere_tree(triangles: np.ndarray, max_leaf_radius: float = 15.0,
+                      padding: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    按三角形构建二叉包围球树（堆式编号：节点 k 的子节点为 2k+1、2k+2），叶子球半径不超过 max_leaf_radius
+
+    长三角形先细分（最长边不超过 max_leaf_radius - padding），保证单个三角形总能放进一个叶子球；
+    每层把半径超限节点内的三角形按质心在包围盒最长边中点处一分为二。半径已满足要求的节点不再细分：
+    其第一个子节点与自身相同，第二个子节点为空节点（半径 -inf，与任何物体都不相交），因此叶子层
+    包含全部叶子球。包围球包含其三角形的全部顶点，对网格是保守的。
+
+    Args:
+        triangles: (T, 3, 3) 三角形顶点 (mm)
+        max_leaf_radius: 叶子球半径上限（含 padding，mm）
+        padding: 包围球半径外扩 (mm)
+
+    Returns:
+        (centers, radii): (2^(depth+1)-1, 3)，(2^(depth+1)-1,)
+    """
+    limit = float(max_leaf_radius) - float(padding)
+    if limit <= 0:
+        raise ValueError("max_leaf_radius 必须大于 padding")
+    triangles = subdivide_triangles(triangles, limit)
+    centroids = triangles.mean(axis=1)
+
+    levels: List[Tuple[np.ndarray, np.ndarray]] = []
+    groups: List[Optional[np.ndarray]] = [np.arange(len(triangles))]
+    while True:
+        centers = np.zeros((len(groups), 3))
+        radii = np.full(len(groups), -np.inf)
+        next_groups: List[Optional[np.ndarray]] = []
+        split = False
+        for k, group in enumerate(groups):
+            if group is None:
+                next_groups += [None, None]
+                continue
+            vertices = triangles[group].reshape(-1, 3)
+            lo, hi = vertices.min(axis=0), vertices.max(axis=0)
+            center = 0.5 * (lo + hi)
+            radius = np.sqrt(np.max(np.einsum("ij,ij->i", vertices - center, vertices - center)))
+            centers[k], radii[k] = center, radius + padding
+            if radius <= limit or len(group) == 1:
+                next_groups += [group, None]
+            else:
+                # 沿包围盒最长边的中点切分（按空间而非三角形数量，层数随尺寸对数增长）
+                axis = int(np.argmax(hi - lo))
+                points = centroids[group, axis]
+                left = points < center[axis]
+                if left.all() or not left.any():
+                    left = points < np.median(points)
+                    if left.all() or not left.any():
+                        left = np.arange(len(group)) < len(group) // 2
+                next_groups += [group[left], group[~left]]
+                split = True
+        levels.append((centers, radii))
+        if not split:
+            break
+        groups = next_groups
+    return np.concatenate([c for c, _ in levels]), np.concatenate([r for _, r in levels])
+
+
+def extend_sphere_tree(centers: np.ndarray, radii: np.ndarray, depth: int) -> Tuple[np.ndarray, np.ndarray]:
+    """把包围球树加深到 depth 层：原叶子作为第一个子节点向下复制，第二个子节点为空节点"""
+    current = int(np.log2(len(radii) + 1)) - 1
+    centers, radii = list(centers), list(radii)
+    leaves_c = np.asarray(centers[2 ** current - 1:])
+    leaves_r = np.asarray(radii[2 ** current - 1:])
+    for _ in range(current, depth):
+        child_c = np.zeros((2 * len(leaves_r), 3))
+        child_r = np.full(2 * len(leaves_r), -np.inf)
+        child_c[0::2], child_r[0::2] = leaves_c, leaves_r
+        centers += list(child_c)
+        radii += list(child_r)
+        leaves_c, leaves_r = child_c, child_r
+    return np.asarray(centers).reshape(-1, 3), np.asarray(radii)
+
+
+def _axis_rotations(axis: np.ndarray, theta: np.ndarray) -> np.ndarray:
+    """绕单位轴 axis 旋转 theta (弧度，(N,)) 的 (N, 4, 4) 齐次矩阵（Rodrigues）"""
+    K = np.array([[0.0, -axis[2], axis[1]], [axis[2], 0.0, -axis[0]], [-axis[1], axis[0], 0.0]])
+    s = np.sin(theta)[:, None, None]
+    c = np.cos(theta)[:, None, None]
+    T = np.zeros((len(theta), 4, 4))
+    T[:, :3, :3] = np.eye(3) + s * K + (1.0 - c) * (K @ K)
+    T[:, 3, 3] = 1.0
+    return T
+
+
+class MeshCollisionChecker:
+    """
+    URDF 连杆网格的批量碰撞检测
+
+    Attributes:
+        link_names: 连杆名称（第 0 个为基座）
+        pairs: (P, 2) 需检测的自碰撞连杆对
+        pair_status: {(a, b): "adjacent" / "always" / "checked"}，全部非自身连杆对的分类
+    """
+
+    def __init__(self, origins: np.ndarray, axes: np.ndarray, trees: List[Tuple[np.ndarray, np.ndarray]],
+                 link_names: Sequence[str] = URDF_LINK_NAMES,
+                 joint_map: Sequence[Tuple[float, float]] = URDF_JOINT_MAP,
+                 table_height: Optional[float] = None):
+        """
+        Args:
+            origins: (关节数, 4, 4) 各关节在父连杆中的位姿 (mm)
+            axes: (关节数, 3) 关节转轴
+            trees: 各连杆的 (centers, radii) 包围球树（深度不同时按最深的补齐）
+            link_names: 连杆名称
+            joint_map: [(方向, 偏移), ...]，关节角 → URDF 关节角
+            table_height: 桌面高度 (mm)，None 表示不检测桌面
+        """
+        self.origins = np.asarray(origins, dtype=np.float64)
+        self.axes = np.asarray(axes, dtype=np.float64)
+        self.link_names = list(link_names)
+        self.table_height = None if table_height is None else float(table_height)
+        joint_map = np.asarray(joint_map, dtype=np.float64)
+        self._joint_sign = joint_map[:, 0]
+        self._joint_offset = joint_map[:, 1]
+
+        self.depth = max(int(np.log2(len(r) + 1)) - 1 for _, r in trees)
+        trees = [extend_sphere_tree(c, r, self.depth) for c, r in trees]
+        self.centers = np.stack([c for c, _ in trees])        # (L, M, 3)
+        self.radii = np.stack([r for _, r in trees])          # (L, M)，空节点为 -inf
+
+        links = len(self.link_names)
+        self.pairs = np.array([(a, b) for a in range(links) for b in range(a + 2, links)], dtype=np.int64)
+        self.pair_status: Dict[Tuple[str, str], str] = {}
+        for a in range(links):
+            for b in range(a + 1, links):
+                status = "adjacent" if b == a + 1 else "checked"
+                self.pair_status[(self.link_names[a], self.link_names[b])] = status
+
+        self._sphere_centers = np.zeros((0, 3))
+        self._sphere_radii = np.zeros(0)
+        self._box_min = np.zeros((0, 3))
+        self._box_max = np.zeros((0, 3))
+
+    @classmethod
+    def from_config(cls, urdf_dir: Optional[str] = None, urdf_file: str = "new_arm.urdf",
+                    max_leaf_radius: float = 15.0, padding: float = 2.0, table_height: Optional[float] = None,
+                    cache_dir: Optional[str] = None, samples: int = 2000) -> "MeshCollisionChecker":
+        """
+        从 config/urdf 构建（BVH 与允许碰撞矩阵优先从缓存加载）
+
+        Args:
+            urdf_dir: URDF 与 STL 所在目录，默认见 get_urdf_dir()
+            urdf_file: URDF 文件名
+            max_leaf_radius: 叶子包围球半径上限（含 padding，mm），越小越贴合网格、层数越深
+            padding: 包围球外扩 (mm)
+            table_height: 桌面高度 (mm)，None 表示不检测桌面
+            cache_dir: 缓存目录，默认 <config>/collision_cache；传入空字符串则不缓存
+            samples: 计算允许碰撞矩阵的随机采样数
+        """
+        urdf_dir = urdf_dir or get_urdf_dir()
+        urdf_path = os.path.join(urdf_dir, urdf_file)
+        stl_paths = [os.path.join(urdf_dir, f"{name}.STL") for name in URDF_LINK_NAMES]
+        origins, axes = parse_urdf_chain(urdf_path)
+        joint_limits = BatchKinematics.from_config().joint_limits
+
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(urdf_dir), "collision_cache")
+        digest = hashlib.sha256()
+        for path in [urdf_path] + stl_paths:
+            with open(path, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        digest.update(json.dumps({"version": COLLISION_CACHE_VERSION, "max_leaf_radius": max_leaf_radius,
+                                  "padding": padding, "samples": samples, "joint_map": URDF_JOINT_MAP,
+                                  "joint_limits": np.asarray(joint_limits).tolist()}).encode("utf-8"))
+        cache_path = os.path.join(cache_dir, f"mesh_{digest.hexdigest()[:16]}.npz") if cache_dir else ""
+
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with np.load(cache_path) as data:
+                    trees = list(zip(data["centers"], data["radii"]))
+                    checker = cls(origins, axes, trees, table_height=table_height)
+                    checker._apply_pair_ratios(data["pairs"], data["ratios"])
+                return checker
+            except Exception as e:
+                print(f" ⚠️ [MeshCollision] 碰撞缓存损坏，重新构建: {e}")
+
+        trees = [build_sphere_tree(load_stl(path) * URDF_UNIT_SCALE, max_leaf_radius, padding) for path in stl_paths]
+        checker = cls(origins, axes, trees, table_height=table_height)
+        rng = np.random.default_rng(0)
+        limits = np.asarray(joint_limits, dtype=np.float64)
+        ratios = checker.pair_collision_ratios(rng.uniform(limits[:, 0], limits[:, 1], size=(samples, 6)))
+        pairs = checker.pairs.copy()
+        checker._apply_pair_ratios(pairs, ratios)
+
+        if cache_path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                tmp_path = cache_path + ".tmp.npz"
+                np.savez(tmp_path, centers=checker.centers, radii=checker.radii, pairs=pairs, ratios=ratios)
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                print(f" ⚠️ [MeshCollision] 写入碰撞缓存失败: {e}")
+        return checker
+
+    def _apply_pair_ratios(self, pairs: np.ndarray, ratios: np.ndarray) -> None:
+        """按采样相交比例去掉“始终接触”的连杆对"""
+        always = ratios >= _ALWAYS_COLLIDING_RATIO
+        for a, b in pairs[always]:
+            self.pair_status[(self.link_names[a], self.link_names[b])] = "always"
+        self.pairs = np.asarray(pairs, dtype=np.int64)[~always].reshape(-1, 2)
+
+    # ------------------------------------------------------------------
+    # 障碍
+    # ------------------------------------------------------------------
+
+    def add_sphere(self, center: Sequence[float], radius: float) -> None:
+        """添加球体障碍（基座坐标系，mm）"""
+        self._sphere_centers = np.vstack([self._sphere_centers, np.asarray(center, dtype=np.float64)])
+        self._sphere_radii = np.append(self._sphere_radii, float(radius))
+
+    def add_box(self, min_corner: Sequence[float], max_corner: Sequence[float]) -> None:
+        """添加轴对齐长方体障碍（基座坐标系，mm）"""
+        lo = np.minimum(min_corner, max_corner).astype(np.float64)
+        hi = np.maximum(min_corner, max_corner).astype(np.float64)
+        self._box_min = np.vstack([self._box_min, lo])
+        self._box_max = np.vstack([self._box_max, hi])
+
+    def clear(self) -> None:
+        """清空全部障碍（不影响自碰撞与桌面检测）"""
+        self._sphere_centers = np.zeros((0, 3))
+        self._sphere_radii = np.zeros(0)
+        self._box_min = np.zeros((0, 3))
+        self._box_max = np.zeros((0, 3))
+
+    # ------------------------------------------------------------------
+    # 检测
+    # ------------------------------------------------------------------
+
+    def link_transforms(self, q) -> np.ndarray:
+        """
+        批量 URDF 正运动学
+
+        Args:
+            q: (N, 6) 关节角 (度，本项目约定)
+
+        Returns:
+            np.ndarray: (N, 连杆数, 4, 4) 基座坐标系下各连杆位姿 (mm)
+        """
+        q = np.atleast_2d(np.asarray(q, dtype=np.float64))
+        theta = np.radians(q * self._joint_sign + self._joint_offset)
+        transforms = np.empty((len(q), len(self.link_names), 4, 4))
+        transforms[:, 0] = np.eye(4)
+        current = transforms[:, 0]
+        for j in range(len(self.axes)):
+            current = np.matmul(np.matmul(current, self.origins[j]), _axis_rotations(self.axes[j], theta[:, j]))
+            transforms[:, j + 1] = current
+        return transforms
+
+    def __call__(self, q) -> np.ndarray:
+        """批量检测，返回 (N,) 是否无碰撞"""
+        T = self.link_transforms(q)
+        return ~(self._self_collisions(T) | self._environment_collisions(T))
+
+    def colliding_pairs(self, q) -> List[Tuple[str, str]]:
+        """单组关节角下相交的连杆对（自碰撞），用于诊断"""
+        T = self.link_transforms(np.asarray(q, dtype=np.float64)[None])
+        hit = self._traverse(T, np.zeros(len(self.pairs), dtype=np.int64), np.arange(len(self.pairs)),
+                             per_pair=True)
+        return [(self.link_names[a], self.link_names[b]) for a, b in self.pairs[np.unique(hit)]]
+
+    def pair_collision_ratios(self, q) -> np.ndarray:
+        """每个待检测连杆对在给定关节角集合中相交的比例，(P,)"""
+        T = self.link_transforms(q)
+        count = len(T)
+        cfg = np.repeat(np.arange(count), len(self.pairs))
+        pair = np.tile(np.arange(len(self.pairs)), count)
+        hit_cfg, hit_pair = self._traverse(T, cfg, pair, return_configs=True, per_pair=True)
+        hits = np.zeros((count, len(self.pairs)), dtype=bool)
+        hits[hit_cfg, hit_pair] = True
+        return hits.mean(axis=0)
+
+    def _world_centers(self, T: np.ndarray, cfg: np.ndarray, link: np.ndarray, node: np.ndarray) -> np.ndarray:
+        """指定 (关节角, 连杆, 节点) 的包围球球心在基座坐标系中的位置，(K, 3)"""
+        frames = T[cfg, link]
+        return np.einsum("kij,kj->ki", frames[:, :3, :3], self.centers[link, node]) + frames[:, :3, 3]
+
+    def _self_collisions(self, T: np.ndarray) -> np.ndarray:
+        count = len(T)
+        collided = np.zeros(count, dtype=bool)
+        if len(self.pairs) == 0:
+            return collided
+        cfg = np.repeat(np.arange(count), len(self.pairs))
+        pair = np.tile(np.arange(len(self.pairs)), count)
+        hit_cfg, _ = self._traverse(T, cfg, pair, return_configs=True)
+        collided[hit_cfg] = True
+        return collided
+
+    def _traverse(self, T: np.ndarray, cfg: np.ndarray, pair: np.ndarray, return_configs: bool = False,
+                  per_pair: bool = False):
+        """
+        所有 (关节角, 连杆对) 同时逐层下探包围球树，球心只对仍相交的节点对计算
+
+        深度相交的关节角会在每层留下大量相交节点对；每层先从重叠最深的节点对贪心下探到叶子，
+        找到相交的叶子对即可确定碰撞，其余节点对不再展开。
+
+        Args:
+            per_pair: True 时逐个连杆对给出结果（否则每组关节角找到一个相交连杆对即停止）
+
+        Returns:
+            叶子层相交的 pair 下标；return_configs=True 时返回 (cfg, pair)
+        """
+        link_a = self.pairs[pair, 0]
+        link_b = self.pairs[pair, 1]
+        node_a = np.zeros(len(cfg), dtype=np.int64)
+        node_b = np.zeros(len(cfg), dtype=np.int64)
+        found_cfg, found_pair = [], []
+        for level in range(self.depth + 1):
+            overlap = self._overlap(T, cfg, link_a, link_b, node_a, node_b)
+            hit = overlap > -np.inf
+            cfg, pair, link_a, link_b = cfg[hit], pair[hit], link_a[hit], link_b[hit]
+            node_a, node_b, overlap = node_a[hit], node_b[hit], overlap[hit]
+            if level == self.depth or len(cfg) == 0:
+                found_cfg.append(cfg)
+                found_pair.append(pair)
+                break
+
+            # 每个关节角（或连杆对）取重叠最深的节点对贪心下探
+            key = cfg * len(self.pairs) + pair if per_pair else cfg
+            order = np.lexsort((-overlap, key))
+            first = order[np.r_[True, key[order][1:] != key[order][:-1]]]
+            witness = first[self._dive(T, cfg[first], link_a[first], link_b[first],
+                                       node_a[first], node_b[first], level)]
+            if len(witness):
+                found_cfg.append(cfg[witness])
+                found_pair.append(pair[witness])
+                rest = ~np.isin(key, key[witness])
+                cfg, pair, link_a, link_b = cfg[rest], pair[rest], link_a[rest], link_b[rest]
+                node_a, node_b = node_a[rest], node_b[rest]
+
+            # 每个相交节点对展开为 4 个子节点对
+            cfg, pair = np.repeat(cfg, 4), np.repeat(pair, 4)
+            link_a, link_b = np.repeat(link_a, 4), np.repeat(link_b, 4)
+            node_a = np.repeat(2 * node_a, 4) + np.tile(_CHILD_PAIRS[:, 0], len(node_a))
+            node_b = np.repeat(2 * node_b, 4) + np.tile(_CHILD_PAIRS[:, 1], len(node_b))
+        cfg, pair = np.concatenate(found_cfg), np.concatenate(found_pair)
+        return (cfg, pair) if return_configs else pair
+
+    def _overlap(self, T, cfg, link_a, link_b, node_a, node_b) -> np.ndarray:
+        """节点对包围球的重叠深度（半径和 - 球心距），不相交（含空节点）为 -inf"""
+        # 空节点半径为 -inf，reach 不为正时不相交
+        reach = self.radii[link_a, node_a] + self.radii[link_b, node_b]
+        overlap = np.full(len(cfg), -np.inf)
+        valid = np.flatnonzero(reach > 0)
+        diff = (self._world_centers(T, cfg[valid], link_a[valid], node_a[valid])
+                - self._world_centers(T, cfg[valid], link_b[valid], node_b[valid]))
+        depth = reach[valid] - np.sqrt(np.einsum("ij,ij->i", diff, diff))
+        overlap[valid] = np.where(depth > 0, depth, -np.inf)
+        return overlap
+
+    def _dive(self, T, cfg, link_a, link_b, node_a, node_b, level: int) -> np.ndarray:
+        """从给定节点对逐层选重叠最深的子节点对下探，返回 (K,) 是否到达相交的叶子对"""
+        alive = np.ones(len(cfg), dtype=bool)
+        for _ in range(level, self.depth):
+            count = len(cfg)
+            child_a = np.repeat(2 * node_a, 4) + np.tile(_CHILD_PAIRS[:, 0], count)
+            child_b = np.repeat(2 * node_b, 4) + np.tile(_CHILD_PAIRS[:, 1], count)
+            overlap = self._overlap(T, np.repeat(cfg, 4), np.repeat(link_a, 4), np.repeat(link_b, 4),
+                                    child_a, child_b).reshape(count, 4)
+            best = np.argmax(overlap, axis=1)
+            alive &= overlap[np.arange(count), best] > -np.inf
+            node_a = child_a.reshape(count, 4)[np.arange(count), best]
+            node_b = child_b.reshape(count, 4)[np.arange(count), best]
+        return alive
+
+    def _environment_collisions(self, T: np.ndarray) -> np.ndarray:
+        """包围球树与桌面 / 障碍逐层下探（基座与第一关节连杆除外），叶子层仍相交即碰撞"""
+        count = len(T)
+        collided = np.zeros(count, dtype=bool)
+        if self.table_height is None and not len(self._sphere_radii) and not len(self._box_min):
+            return collided
+        links = np.arange(_GROUNDED_LINKS, len(self.link_names))
+        cfg = np.repeat(np.arange(count), len(links))
+        link = np.tile(links, count)
+        node = np.zeros(len(cfg), dtype=np.int64)
+        for level in range(self.depth + 1):
+            radii = self.radii[link, node]
+            keep = radii > -np.inf
+            cfg, link, node, radii = cfg[keep], link[keep], node[keep], radii[keep]
+            centers = self._world_centers(T, cfg, link, node)
+            hit = np.zeros(len(cfg), dtype=bool)
+            if self.table_height is not None:
+                hit |= centers[:, 2] - radii < self.table_height
+            if len(self._sphere_radii):
+                diff = centers[:, None, :] - self._sphere_centers
+                reach = radii[:, None] + self._sphere_radii
+                hit |= np.any(np.einsum("kod,kod->ko", diff, diff) < reach * reach, axis=1)
+            if len(self._box_min):
+                gap = np.maximum(np.maximum(self._box_min - centers[:, None, :],
+                                            centers[:, None, :] - self._box_max), 0.0)
+                hit |= np.any(np.einsum("kod,kod->ko", gap, gap) < (radii * radii)[:, None], axis=1)
+            cfg, link, node = cfg[hit], link[hit], node[hit]
+            if level == self.depth or len(cfg) == 0:
+                break
+            cfg, link = np.repeat(cfg, 2), np.repeat(link, 2)
+            node = np.repeat(2 * node, 2) + np.tile([1, 2], len(node))
+        collided[cfg] = True
+        return collided
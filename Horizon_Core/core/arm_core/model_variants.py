@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+检测模型变体（INT8 / FP16 / 缩小输入尺寸 / 融合预处理）的命名与按配置选择
+
+变体由 `example/developer_tools/build_yolo_variants.py` 离线生成，与原模型放在同一目录，
+文件名在原模型名后追加标签：
+
+    yolov8n.onnx                 原始 FP32
+    yolov8n.int8.onnx            静态 INT8 量化（QDQ，使用 data/ 下图像校准）
+    yolov8n.fp16.onnx            FP16 权重（输入输出保持 float32）
+    yolov8n.416.onnx             输入尺寸 416
+    yolov8n.int8.416.nhwc.onnx   以上组合，nhwc 表示输入为 uint8 NHWC BGR（归一化已融合进模型）
+
+运行时按 `config/detector_model.json` 选择（文件不存在或变体未生成时使用原模型）：
+
+    {"variant": "int8", "input_size": 416, "fused_preprocess": true}
+
+用 `example/developer_tools/benchmark_yolo_variants.py` 对比各变体的延迟、FPS 与相对 FP32 的 mAP 偏差，
+为每台部署设备选择最快且精度可接受的组合。
+"""
+
+import json
+import os
+from typing import Any, Dict, Optional
+
+from .config_paths import get_config_dir
+
+
+MODEL_CONFIG_FILE_NAME = "detector_model.json"
+VARIANTS = ("fp32", "int8", "fp16")
+
+
+def get_model_config_path() -> str:
+    """模型选择配置路径：优先 HORIZONARM_CONFIG_DIR，其次项目根目录下的 config/"""
+    return os.path.join(get_config_dir(), MODEL_CONFIG_FILE_NAME)
+
+
+def load_model_config(path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    读取模型选择配置
+
+    Returns:
+        dict: variant（fp32 / int8 / fp16）、input_size（None 表示原尺寸）、fused_preprocess
+    """
+    config = {"variant": "fp32", "input_size": None, "fused_preprocess": False}
+    path = path or get_model_config_path()
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                config.update(json.load(f))
+        except Exception as e:
+            print(f" ⚠️ [ModelVariants] 读取模型配置失败，使用原模型: {e}")
+    return config
+
+
+def variant_path(base_path: str, variant: str = "fp32", input_size: Optional[int] = None,
+                 fused_preprocess: bool = False) -> str:
+    """
+    变体文件路径
+
+    Args:
+        base_path: 原始模型路径（如 config/yolov8n.onnx）
+        variant: "fp32" / "int8" / "fp16"
+        input_size: 输入边长，None 表示与原模型相同
+        fused_preprocess: 是否为 uint8 NHWC 输入（融合预处理）的变体
+    """
+    if variant not in VARIANTS:
+        raise ValueError(f"未知的模型变体: {variant}（可选 {', '.join(VARIANTS)}）")
+    stem, ext = os.path.splitext(base_path)
+    tags = []
+    if variant != "fp32":
+        tags.append(variant)
+    if input_size:
+        tags.append(str(int(input_size)))
+    if fused_preprocess:
+        tags.append("nhwc")
+    return ".".join([stem] + tags) + (ext or ".onnx")
+
+
+def resolve_detector_model(base_path: str, config: Optional[Dict[str, Any]] = None) -> str:
+    """
+    按配置返回实际加载的模型路径；所选变体不存在时回退到原模型
+
+    Args:
+        base_path: 原始模型路径
+        config: 可选，直接给出配置（默认读取 config/detector_model.json）
+    """
+    config = config if config is not None else load_model_config()
+    try:
+        path = variant_path(base_path, str(config.get("variant", "fp32")), config.get("input_size"),
+                            bool(config.get("fused_preprocess", False)))
+    except ValueError as e:
+        print(f" ⚠️ [ModelVariants] {e}，使用原模型")
+        return base_path
+    if path != base_path and not os.path.exists(path):
+        print(f" ⚠️ [ModelVariants] 模型变体不存在: {path}，使用原模型（请先运行 build_yolo_variants.py）")
+        return base_path
+    return path
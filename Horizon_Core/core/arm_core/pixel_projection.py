@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+像素 → 基座坐标的批量投影
+
+`embodied_internal._convert_pixel_to_world_coords` 一次转换一个像素：按深度反投影到相机坐标
+（P_camera_homogeneous），经手眼矩阵到末端（P_end_homogeneous），再经当前末端位姿到基座
+（P_base_homogeneous）。多目标场景需要对每个检测框循环，深度图需要对每个像素循环。
+
+`PixelProjector` 把 K⁻¹、RT_camera2end、末端位姿预先合成为一个 3×4 变换：
+    P_base = Z · (A · [u, v, 1]ᵀ) + b
+N 个像素（可逐点给出深度）只需一次矩阵乘法；深度图按图像尺寸缓存像素射线，
+整幅图转点云同样是一次乘法。
+
+说明：
+- 返回的是目标点本身在基座坐标系下的位置 (mm)，不含 TCP 偏移补偿（抓取位姿由调用方按 TCP 计算）；
+- `calibration_parameter.json` 中手眼矩阵的平移单位为米，投影时换算为毫米；
+- 深度图来自双目校正后的左图时，应以校正后的内参（stereoRectify 的 P1[:3, :3]）构造投影器。
+
+使用示例：
+```python
+projector = PixelProjector.from_calibration()                 # 单目内参 + 手眼矩阵（共享标定缓存）
+points = projector.pixels_to_base(centers, current_pose, depth=300.0)      # (N, 3) mm
+cloud = projector.depth_map_to_base(depth_map, current_pose, stride=4)   # (M, 3) mm
+```
+"""
+
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .batch_kinematics import transforms_from_poses
+from .calibration_store import CalibrationData, get_calibration_store
+
+
+# calibration_parameter.json 中手眼平移 (米) → 毫米
+HAND_EYE_TRANSLATION_SCALE = 1000.0
+
+
+class PixelProjector:
+    """
+    相机像素到机械臂基座坐标的批量投影器
+
+    Attributes:
+        camera_matrix / camera_matrix_inv: (3, 3) 内参及其逆
+        camera_to_end: (4, 4) 相机 → 末端变换（平移单位 mm）
+        distortion: 畸变系数，None 表示像素已去畸变
+    """
+
+    def __init__(self, camera_matrix, camera_to_end, distortion=None,
+                 translation_scale: float = HAND_EYE_TRANSLATION_SCALE):
+        """
+        Args:
+            camera_matrix: (3, 3) 相机内参
+            camera_to_end: (4, 4) 手眼矩阵 RT_camera2end
+            distortion: 可选，畸变系数；给出时 undistort=True 的调用先对像素去畸变（需要 OpenCV）
+            translation_scale: 手眼矩阵平移的单位换算系数（米 → 毫米为 1000）
+        """
+        self.camera_matrix = np.asarray(camera_matrix, dtype=np.float64)
+        self.camera_matrix_inv = np.linalg.inv(self.camera_matrix)
+        self.camera_to_end = np.array(camera_to_end, dtype=np.float64)
+        self.camera_to_end[:3, 3] *= float(translation_scale)
+        self.distortion = None if distortion is None else np.asarray(distortion, dtype=np.float64).reshape(-1)
+        self._ray_cache: Dict[Tuple[int, int, int], np.ndarray] = {}
+
+    @classmethod
+    def from_calibration(cls, calibration: Optional[CalibrationData] = None,
+                         camera_matrix=None) -> "PixelProjector":
+        """
+        由标定快照构建（默认取共享标定缓存的当前快照）
+
+        Args:
+            calibration: CalibrationData，默认 get_calibration_store().get()
+            camera_matrix: 可选，覆盖单目内参（例如双目校正后的左相机内参）
+        """
+        calibration = calibration or get_calibration_store().get()
+        if calibration is None or calibration.RT_camera2end is None:
+            raise ValueError("未找到手眼标定参数 RT_camera2end")
+        if camera_matrix is None:
+            if calibration.camera_matrix is None:
+                raise ValueError("未找到单目相机内参")
+            return cls(calibration.camera_matrix, calibration.RT_camera2end, calibration.distortion)
+        return cls(camera_matrix, calibration.RT_camera2end)
+
+    # ------------------------------------------------------------------
+    # 合成变换
+    # ------------------------------------------------------------------
+
+    def compose(self, current_pose: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        合成像素 → 基座的线性部分
+
+        Args:
+            current_pose: 当前末端位姿 [x, y, z, yaw, pitch, roll] (mm / 度)
+
+        Returns:
+            (A, b): P_base = Z · A · [u, v, 1]ᵀ + b，A 为 (3, 3)，b 为 (3,)
+        """
+        pose = np.asarray(current_pose, dtype=np.float64)
+        camera_to_base = transforms_from_poses(pose[:3], pose[3:6]) @ self.camera_to_end
+        return camera_to_base[:3, :3] @ self.camera_matrix_inv, camera_to_base[:3, 3]
+
+    # ------------------------------------------------------------------
+    # 投影
+    # ------------------------------------------------------------------
+
+    def pixels_to_base(self, pixels, current_pose: Sequence[float],
+                       depth: Union[float, Sequence[float], np.ndarray],
+                       undistort: bool = False) -> np.ndarray:
+        """
+        批量像素 → 基座坐标
+
+        Args:
+            pixels: (N, 2) 像素坐标 (u, v)
+            current_pose: 拍摄时的末端位姿 [x, y, z, yaw, pitch, roll]
+            depth: 相机坐标系下的深度 Z (mm)，标量或 (N,)
+            undistort: 是否先对像素去畸变（需要构造时给出畸变系数）
+
+        Returns:
+            np.ndarray: (N, 3) 基座坐标 (mm)
+        """
+        pixels = np.asarray(pixels, dtype=np.float64).reshape(-1, 2)
+        if undistort and self.distortion is not None and len(pixels):
+            import cv2
+            pixels = cv2.undistortPoints(pixels.reshape(-1, 1, 2), self.camera_matrix, self.distortion,
+                                         P=self.camera_matrix).reshape(-1, 2)
+        A, b = self.compose(current_pose)
+        depth = np.broadcast_to(np.asarray(depth, dtype=np.float64), (len(pixels),))
+        # [u, v, 1] · Aᵀ = u·A[:, 0] + v·A[:, 1] + A[:, 2]
+        rays = pixels @ A[:, :2].T + A[:, 2]
+        return depth[:, None] * rays + b
+
+    def pixel_rays(self, shape: Tuple[int, int], stride: int = 1) -> np.ndarray:
+        """
+        图像网格上各像素的归一化射线 K⁻¹·[u, v, 1]（按尺寸与步长缓存）
+
+        Returns:
+            np.ndarray: (H', W', 3)
+        """
+        key = (int(shape[0]), int(shape[1]), int(stride))
+        rays = self._ray_cache.get(key)
+        if rays is None:
+            v, u = np.mgrid[0:key[0]:key[2], 0:key[1]:key[2]].astype(np.float64)
+            rays = np.stack([u, v, np.ones_like(u)], axis=-1) @ self.camera_matrix_inv.T
+            self._ray_cache[key] = rays
+        return rays
+
+    def depth_map_to_base(self, depth_map: np.ndarray, current_pose: Sequence[float], stride: int = 1,
+                          min_depth: float = 1.0, max_depth: float = np.inf,
+                          return_pixels: bool = False):
+        """
+        深度图 → 基座坐标点云
+
+        Args:
+            depth_map: (H, W) 相机坐标系深度 (mm)，无效值为 0 / NaN / inf
+            current_pose: 拍摄时的末端位姿
+            stride: 采样步长（像素）
+            min_depth / max_depth: 有效深度范围 (mm)
+            return_pixels: 是否同时返回各点的像素坐标
+
+        Returns:
+            np.ndarray: (M, 3) 有效像素的基座坐标 (mm)；return_pixels=True 时返回 (points, pixels)
+        """
+        depth_map = np.asarray(depth_map)
+        rays = self.pixel_rays(depth_map.shape[:2], stride)
+        depth = depth_map[::stride, ::stride].astype(np.float64)
+        with np.errstate(invalid="ignore"):
+            valid = np.isfinite(depth) & (depth >= min_depth) & (depth <= max_depth)
+
+        pose = np.asarray(current_pose, dtype=np.float64)
+        camera_to_base = transforms_from_poses(pose[:3], pose[3:6]) @ self.camera_to_end
+        camera_points = rays[valid] * depth[valid][:, None]
+        points = camera_points @ camera_to_base[:3, :3].T + camera_to_base[:3, 3]
+        if return_pixels:
+            rows, cols = np.nonzero(valid)
+            return points, np.stack([cols * stride, rows * stride], axis=-1)
+        return points
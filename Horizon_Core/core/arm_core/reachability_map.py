@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+"""
+工作空间可达性地图与逆解种子索引
+
+`VisualGraspSDK.grasp_at_pixel` 等调用 `c_a_p` 时，目标位置在给定 yaw/pitch/roll 下是否可达要等逆解
+失败后才知道。
+
+`ReachabilityMap` 离线构建（`example/developer_tools/build_reachability_map.py`）：
+- 工作空间按体素划分，姿态 [yaw, pitch, roll] 按等间距分箱；
+- 每个 (体素中心, 姿态箱中心) 一次批量闭式逆解，取最接近参考关节角的有效解作为种子；
+- 再随机采样关节角做批量正运动学，补充落入体素/姿态箱但中心无解的单元；
+- 最后在空间与姿态各维上膨胀一格（邻格种子填入空单元），使“不可达”的判定偏保守：
+  只有目标所在单元及其全部邻格都无解时才会被拒绝。
+
+结果以 int16（0.01 度）保存为 `.npy`，另附 JSON 元数据（范围、分箱、DH 参数摘要）。运行时以
+内存映射方式打开，`is_reachable` / `seed` 只做一次下标计算与一次读取，O(1)。
+DH 参数或关节限制变化后摘要不一致，地图不再加载。
+
+使用示例：
+```python
+reach = get_default_reachability_map()           # 文件不存在时为 None
+if reach is not None and reach.is_reachable(pos, ori) is False:
+    return False                                  # 立即拒绝
+q_seed = reach.seed(pos, ori)                     # (6,) 关节角 (度)，可作为 BatchInverseKinematics.solve 的 seed
+```
+
+地图按 DH 末端（法兰）位姿构建。`c_a_p`、`_get_current_arm_pose`、示教 end_pose 与正运动学输出
+均为法兰位姿（抓取 TCP 偏移已在 `_convert_pixel_to_world_coords` 中处理），直接查询即可；
+只有输入确实是 TCP 位姿时才传入 tcp_offset，查表前换算为法兰位置（p_flange = p_tcp - R·tcp_offset）。
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch_ik import BatchInverseKinematics
+from .batch_kinematics import BatchKinematics, poses_from_transforms, transforms_from_poses
+from .config_paths import get_config_dir
+
+
+# 文件格式版本
+REACHABILITY_FORMAT_VERSION = 1
+# 关节角存储单位 (度)
+SEED_SCALE = 0.01
+# 无解单元的标记值
+UNREACHABLE = np.iinfo(np.int16).min
+
+# 默认工作空间范围 (mm) 与体素大小
+DEFAULT_BOUNDS = ((-500.0, 500.0), (-500.0, 500.0), (0.0, 650.0))
+DEFAULT_VOXEL_SIZE = 25.0
+# 默认姿态分箱 (起点, 步长, 数量)：yaw 全周，pitch / roll 覆盖朝下抓取附近
+DEFAULT_ORIENTATION_BINS = ((-180.0, 30.0, 12), (-30.0, 30.0, 3), (150.0, 30.0, 3))
+
+
+def get_reachability_map_path() -> str:
+    """地图文件路径：优先使用环境变量 HORIZONARM_CONFIG_DIR，否则为项目根目录下的 config/"""
+    return os.path.join(get_config_dir(), "reachability", "reachability_map.npy")
+
+
+def kinematics_digest(kinematics: BatchKinematics) -> str:
+    """DH 参数、关节偏转与关节限制的摘要（地图与当前配置是否匹配）"""
+    payload = np.concatenate([kinematics.d, kinematics.a, kinematics.alpha_deg, kinematics.joint_offsets,
+                              kinematics.joint_limits.ravel()])
+    return hashlib.sha256(np.round(payload, 6).tobytes()).hexdigest()[:16]
+
+
+def flange_position(position, orientation, tcp_offset=None) -> np.ndarray:
+    """
+    TCP 位置换算为法兰位置：p_flange = p_tcp - R(yaw, pitch, roll)·tcp_offset
+
+    Args:
+        position: [x, y, z] TCP 位置 (mm)
+        orientation: [yaw, pitch, roll] (度)
+        tcp_offset: 工具坐标系下的 TCP 偏移 [x, y, z] (mm)，None 时原样返回
+
+    Returns:
+        np.ndarray: (3,) 法兰位置 (mm)
+    """
+    position = np.asarray(position, dtype=np.float64)
+    if tcp_offset is None:
+        return position
+    R = transforms_from_poses(position, orientation)[:3, :3]
+    return position - R @ np.asarray(tcp_offset, dtype=np.float64)
+
+
+class ReachabilityMap:
+    """
+    体素 × 姿态箱的可达性与种子表
+
+    Attributes:
+        seeds: (X, Y, Z, B, 6) int16，关节角 / SEED_SCALE，无解为 UNREACHABLE（运行时为内存映射）
+        origin: (3,) 第一个体素中心 (mm)
+        voxel_size: 体素边长 (mm)
+        orientation_bins: [(起点, 步长, 数量)] × 3，对应 yaw / pitch / roll（度）
+    """
+
+    def __init__(self, seeds: np.ndarray, origin: Sequence[float], voxel_size: float,
+                 orientation_bins: Sequence[Tuple[float, float, int]], digest: str = ""):
+        self.seeds = seeds
+        self.origin = np.asarray(origin, dtype=np.float64)
+        self.voxel_size = float(voxel_size)
+        self.orientation_bins = [(float(s), float(d), int(n)) for s, d, n in orientation_bins]
+        self.digest = digest
+        self.shape = tuple(int(n) for n in seeds.shape[:3])
+        self._origin = self.origin.tolist()
+        # 覆盖整周的维度按环形取下标
+        self._circular = [abs(d * n - 360.0) < 1e-6 for _, d, n in self.orientation_bins]
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+
+    def _cell(self, position, orientation) -> Optional[Tuple[int, int, int, int]]:
+        """目标所在单元 (ix, iy, iz, bin)，超出地图范围时返回 None"""
+        cell = [int(round((float(p) - o) / self.voxel_size)) for p, o in zip(position, self._origin)]
+        if not all(0 <= c < n for c, n in zip(cell, self.shape)):
+            return None
+        flat = 0
+        for angle, (start, step, count), circular in zip(orientation, self.orientation_bins, self._circular):
+            offset = (float(angle) - start + 180.0) % 360.0 - 180.0
+            index = int(round(offset / step))
+            if circular:
+                index %= count
+            elif not 0 <= index < count:
+                return None
+            flat = flat * count + index
+        return cell[0], cell[1], cell[2], flat
+
+    def _cells(self, positions: np.ndarray, orientations: np.ndarray):
+        """_cell 的批量版本，返回 ((ix, iy, iz, bin), inside)"""
+        cell = np.rint((positions - self.origin) / self.voxel_size).astype(np.int64)
+        inside = np.all((cell >= 0) & (cell < self.shape), axis=1)
+        flat = np.zeros(len(cell), dtype=np.int64)
+        for k, ((start, step, count), circular) in enumerate(zip(self.orientation_bins, self._circular)):
+            index = np.rint(((orientations[:, k] - start + 180.0) % 360.0 - 180.0) / step).astype(np.int64)
+            if circular:
+                index %= count
+            else:
+                inside &= (index >= 0) & (index < count)
+            flat = flat * count + index
+        cell = np.where(inside[:, None], cell, 0)
+        return (cell[:, 0], cell[:, 1], cell[:, 2], np.where(inside, flat, 0)), inside
+
+    def is_reachable(self, position, orientation, tcp_offset=None) -> Optional[bool]:
+        """
+        目标位姿是否可达
+
+        Args:
+            position: [x, y, z] (mm)；给出 tcp_offset 时为 TCP 位置，否则为法兰位置
+            orientation: [yaw, pitch, roll] (度)
+            tcp_offset: 可选，工具坐标系下的 TCP 偏移 [x, y, z] (mm)；地图按法兰位姿构建，
+                先换算为法兰位置再查表
+
+        Returns:
+            True / False；目标超出地图覆盖范围（位置或姿态）时返回 None，由调用方照常求解
+        """
+        cell = self._cell(flange_position(position, orientation, tcp_offset), orientation)
+        if cell is None:
+            return None
+        return bool(self.seeds[cell + (0,)] != UNREACHABLE)
+
+    def seed(self, position, orientation, tcp_offset=None) -> Optional[np.ndarray]:
+        """目标所在单元的种子关节角 (6,) (度)，不可达或超出范围时返回 None；tcp_offset 同 is_reachable"""
+        cell = self._cell(flange_position(position, orientation, tcp_offset), orientation)
+        if cell is None:
+            return None
+        raw = np.array(self.seeds[cell])
+        if raw[0] == UNREACHABLE:
+            return None
+        return raw.astype(np.float64) * SEED_SCALE
+
+    def coverage(self) -> float:
+        """可达单元占比"""
+        return float(np.mean(np.asarray(self.seeds[..., 0]) != UNREACHABLE))
+
+    # ------------------------------------------------------------------
+    # 构建
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, ik: Optional[BatchInverseKinematics] = None,
+              bounds: Sequence[Tuple[float, float]] = DEFAULT_BOUNDS,
+              voxel_size: float = DEFAULT_VOXEL_SIZE,
+              orientation_bins: Sequence[Tuple[float, float, int]] = DEFAULT_ORIENTATION_BINS,
+              fk_samples: int = 200000, reference: Optional[Sequence[float]] = None,
+              chunk_size: int = 65536, seed: int = 0,
+              progress: Optional[Callable[[float], None]] = None) -> "ReachabilityMap":
+        """
+        离线构建地图
+
+        Args:
+            ik: BatchInverseKinematics，默认从 dh_parameters_config.json 构建
+            bounds: [(min, max)] × 3 工作空间范围 (mm)
+            voxel_size: 体素边长 (mm)
+            orientation_bins: [(起点, 步长, 数量)] × 3，yaw / pitch / roll 分箱 (度)
+            fk_samples: 补充的随机关节采样数
+            reference: 选种子的参考关节角 (度)，默认全零
+            chunk_size: 每批逆解的位姿数
+            seed: 随机种子
+            progress: 可选，进度回调 (0~1)
+        """
+        ik = ik or BatchInverseKinematics.from_config()
+        bounds = np.asarray(bounds, dtype=np.float64)
+        origin = bounds[:, 0]
+        shape = tuple(int(np.floor((hi - lo) / voxel_size)) + 1 for lo, hi in bounds)
+        bin_counts = [int(n) for _, _, n in orientation_bins]
+        bin_total = int(np.prod(bin_counts))
+        reference = np.zeros(6) if reference is None else np.asarray(reference, dtype=np.float64)
+
+        seeds = np.full(shape + (bin_total, 6), UNREACHABLE, dtype=np.int16)
+        flat_seeds = seeds.reshape(-1, 6)
+
+        # 1) 体素中心 × 姿态箱中心的闭式逆解
+        axes = [np.arange(n) * voxel_size + lo for n, lo in zip(shape, origin)]
+        centers = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 1, 3)
+        angle_axes = [start + step * np.arange(n) for start, step, n in orientation_bins]
+        angles = np.stack(np.meshgrid(*angle_axes, indexing="ij"), axis=-1).reshape(1, -1, 3)
+        total = len(flat_seeds)
+        for begin in range(0, total, chunk_size):
+            index = np.arange(begin, min(begin + chunk_size, total))
+            T = transforms_from_poses(centers[index // bin_total, 0], angles[0, index % bin_total])
+            solutions, valid, _ = ik.solve_all(T)
+            best = cls._best_solutions(solutions, valid, reference)
+            found = ~np.isnan(best[:, 0])
+            flat_seeds[index[found]] = np.rint(best[found] / SEED_SCALE).astype(np.int16)
+            if progress is not None:
+                progress(0.9 * (begin + len(index)) / total)
+
+        # 2) 随机关节采样补充中心无解的单元
+        if fk_samples > 0:
+            rng = np.random.default_rng(seed)
+            limits = ik.joint_limits
+            q = rng.uniform(limits[:, 0], limits[:, 1], size=(int(fk_samples), 6))
+            positions, euler = poses_from_transforms(ik.kinematics.forward_kinematics_batch(q))
+            probe = cls(seeds, origin, voxel_size, orientation_bins)
+            cells, inside = probe._cells(positions, euler)
+            cells, q = tuple(c[inside] for c in cells), q[inside]
+            empty = seeds[cells][:, 0] == UNREACHABLE
+            seeds[tuple(c[empty] for c in cells)] = np.rint(q[empty] / SEED_SCALE).astype(np.int16)
+        if progress is not None:
+            progress(0.95)
+
+        # 3) 各维膨胀一格（可分离，等价于全部邻格）
+        grid = seeds.reshape(shape + tuple(bin_counts) + (6,))
+        circular = [abs(d * n - 360.0) < 1e-6 for _, d, n in orientation_bins]
+        for axis in range(6):
+            wrap = axis >= 3 and circular[axis - 3]
+            cls._dilate(grid, axis, wrap)
+        if progress is not None:
+            progress(1.0)
+        return cls(seeds, origin, voxel_size, orientation_bins, kinematics_digest(ik.kinematics))
+
+    @staticmethod
+    def _best_solutions(solutions: np.ndarray, valid: np.ndarray, reference: np.ndarray) -> np.ndarray:
+        """每个位姿取与参考关节角最接近的有效解，(N, 6)，无解为 NaN"""
+        distance = np.where(valid, np.nansum(np.abs(solutions - reference), axis=2), np.inf)
+        choice = np.argmin(distance, axis=1)
+        best = solutions[np.arange(len(solutions)), choice].copy()
+        best[~valid.any(axis=1)] = np.nan
+        return best
+
+    @staticmethod
+    def _dilate(grid: np.ndarray, axis: int, wrap: bool) -> None:
+        """沿 axis 把相邻单元的种子填入空单元（原地）"""
+        empty = grid[..., 0] == UNREACHABLE
+        filled = grid.copy()
+        for shift in (1, -1):
+            neighbour = np.roll(grid, shift, axis=axis)
+            usable = empty & (neighbour[..., 0] != UNREACHABLE) & (filled[..., 0] == UNREACHABLE)
+            if not wrap:
+                edge = [slice(None)] * usable.ndim
+                edge[axis] = 0 if shift == 1 else -1
+                usable[tuple(edge)] = False
+            filled[usable] = neighbour[usable]
+        grid[...] = filled
+
+    # ------------------------------------------------------------------
+    # 文件
+    # ------------------------------------------------------------------
+
+    def save(self, path: Optional[str] = None) -> str:
+        """保存为 .npy（种子表）+ .json（元数据），返回 .npy 路径"""
+        path = path or get_reachability_map_path()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = path + ".tmp.npy"
+        np.save(tmp_path, np.ascontiguousarray(self.seeds))
+        os.replace(tmp_path, path)
+        meta = {"version": REACHABILITY_FORMAT_VERSION, "origin": self.origin.tolist(),
+                "voxel_size": self.voxel_size, "orientation_bins": self.orientation_bins,
+                "seed_scale": SEED_SCALE, "digest": self.digest}
+        with open(os.path.splitext(path)[0] + ".json", "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, kinematics: Optional[BatchKinematics] = None,
+             mmap: bool = True) -> Optional["ReachabilityMap"]:
+        """
+        加载地图（默认内存映射）
+
+        Args:
+            path: .npy 路径，默认见 get_reachability_map_path()
+            kinematics: 用于校验摘要的 BatchKinematics，默认从配置构建
+            mmap: 是否以只读内存映射方式打开
+
+        Returns:
+            ReachabilityMap；文件不存在、格式不符或与当前 DH 配置不匹配时返回 None
+        """
+        path = path or get_reachability_map_path()
+        meta_path = os.path.splitext(path)[0] + ".json"
+        if not (os.path.exists(path) and os.path.exists(meta_path)):
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") != REACHABILITY_FORMAT_VERSION or meta.get("seed_scale") != SEED_SCALE:
+                print(" ⚠️ [Reachability] 可达性地图格式版本不匹配，请重新生成")
+                return None
+            digest = kinematics_digest(kinematics or BatchKinematics.from_config())
+            if meta.get("digest") != digest:
+                print(" ⚠️ [Reachability] 可达性地图与当前 DH 参数/关节限制不匹配，请重新生成")
+                return None
+            seeds = np.load(path, mmap_mode="r" if mmap else None)
+            return cls(seeds, meta["origin"], meta["voxel_size"], meta["orientation_bins"], digest)
+        except Exception as e:
+            print(f" ⚠️ [Reachability] 加载可达性地图失败: {e}")
+            return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """地图概要"""
+        return {"shape": self.shape, "orientation_bins": self.orientation_bins, "voxel_size": self.voxel_size,
+                "origin": self.origin.tolist(), "coverage": self.coverage()}
+
+
+_default_map: Optional[ReachabilityMap] = None
+_default_map_loaded = False
+_default_map_lock = threading.Lock()
+
+
+def get_default_reachability_map() -> Optional[ReachabilityMap]:
+    """进程内共享的默认地图（首次调用时加载，文件不存在时返回 None）"""
+    global _default_map, _default_map_loaded
+    if not _default_map_loaded:
+        with _default_map_lock:
+            if not _default_map_loaded:
+                _default_map = ReachabilityMap.load()
+                _default_map_loaded = True
+    return _default_map
@@ -0,0 +1,467 @@
+# -*- coding: utf-8 -*-
+"""
+速度级（微分逆解）笛卡尔控制
+
+JoyCon 笛卡尔模式、视觉跟随等场景每次更新都做一次完整逆解再发送一条绝对位置 `c_a_p` 命令，
+更新频率受逆解与梯形运动启停限制，末端运动呈“走走停停”。
+
+本模块改为速度级控制：
+- `ResolvedRateController`：由几何雅可比求关节速度 q̇ = Jᵀ(JJᵀ + λ²I)⁻¹ ξ（阻尼最小二乘，DLS）。
+  阻尼系数随最小奇异值自适应：远离奇异时 λ=0（精确解），接近奇异时平滑增大，避免关节速度发散；
+  关节速度按同一比例缩放到限速以内（保持末端运动方向），接近关节限位时禁止继续向外运动。
+- `ResolvedRateServo`：固定频率（默认 100 Hz）控制线程，把期望末端速度积分为关节目标，
+  每周期发送一帧 Y42 直通限速位置命令 (FB)。支持两种输入：
+  * 速度模式 `set_twist`：遥操作（手柄）持续给出末端速度，超过 command_timeout 未更新则自动减速停下；
+  * 目标模式 `set_target`：视觉伺服只需给出目标位置，控制线程每周期按比例律生成末端速度，
+    低频的检测更新不会造成运动停顿。
+
+末端速度 twist 为基座坐标系下 [vx, vy, vz (mm/s), ωx, ωy, ωz (度/秒)]。
+
+本模块不直接依赖 Control_Core，编码器与关节映射由调用方注入，见
+`Embodied_SDK.motion.MotionSDK.start_velocity_control`。
+
+使用示例：
+```python
+controller = ResolvedRateController.from_config(max_joint_velocity=60.0)
+qdot = controller.joint_velocity(q, [20, 0, 0, 0, 0, 0])     # 末端沿 x 方向 20 mm/s
+
+servo = ResolvedRateServo(controller, can_interface, joint_map, encoder)
+servo.start(current_joints)
+servo.set_twist([0, 10, 0])                                 # 需持续调用，否则 command_timeout 后停下
+servo.set_target([250, 0, 300])                             # 或直接给出目标位置
+servo.stop()
+```
+"""
+
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .batch_kinematics import DEFAULT_JOINT_LIMITS, BatchKinematics, transforms_from_poses
+from .trajectory_streamer import TrajectoryStreamer, _raise_thread_priority
+
+
+def rotation_error(R_current, R_target) -> np.ndarray:
+    """
+    从当前姿态到目标姿态的旋转向量（基座坐标系，弧度）
+
+    Args:
+        R_current: (..., 3, 3) 当前旋转矩阵
+        R_target: (..., 3, 3) 目标旋转矩阵
+
+    Returns:
+        np.ndarray: (..., 3) 旋转向量，方向为转轴，模为转角（误差接近 180° 时方向不唯一）
+    """
+    R = np.matmul(np.asarray(R_target, dtype=np.float64), np.swapaxes(R_current, -1, -2))
+    vee = 0.5 * np.stack([R[..., 2, 1] - R[..., 1, 2],
+                          R[..., 0, 2] - R[..., 2, 0],
+                          R[..., 1, 0] - R[..., 0, 1]], axis=-1)
+    sin_angle = np.linalg.norm(vee, axis=-1, keepdims=True)
+    cos_angle = 0.5 * (np.trace(R, axis1=-2, axis2=-1)[..., None] - 1.0)
+    angle = np.arctan2(sin_angle, cos_angle)
+    scale = np.where(sin_angle > 1e-12, angle / np.maximum(sin_angle, 1e-12), 1.0)
+    return vee * scale
+
+
+class ResolvedRateController:
+    """
+    阻尼最小二乘（DLS）微分逆解
+
+    Attributes:
+        kinematics: BatchKinematics，用于计算雅可比
+        joint_limits: (6, 2) 关节角度范围 (度)
+        max_joint_velocity: (6,) 各关节最大角速度 (度/秒)
+    """
+
+    def __init__(self, kinematics: BatchKinematics,
+                 joint_limits: Optional[Sequence[Tuple[float, float]]] = None,
+                 max_joint_velocity: Union[float, Sequence[float]] = 60.0,
+                 damping: float = 0.05, singular_threshold: float = 0.05,
+                 length_scale: float = 200.0, limit_margin: float = 2.0):
+        """
+        初始化控制器
+
+        Args:
+            kinematics: BatchKinematics 实例
+            joint_limits: 关节角度范围 [(min, max), ...] (度)
+            max_joint_velocity: 关节最大角速度 (度/秒)，标量或每关节一个值
+            damping: 完全奇异时的阻尼系数 λ_max
+            singular_threshold: 最小奇异值低于该值时开始加阻尼（雅可比已按 length_scale 归一化）
+            length_scale: 特征长度 (mm)，线速度行除以该值后与角速度行量纲一致
+            limit_margin: 距关节限位小于该角度 (度) 时禁止继续向限位运动
+        """
+        self.kinematics = kinematics
+        self.joint_limits = np.asarray(DEFAULT_JOINT_LIMITS if joint_limits is None else joint_limits,
+                                       dtype=np.float64)
+        if self.joint_limits.shape != (6, 2):
+            raise ValueError("关节限制数量必须为6")
+        self.max_joint_velocity = np.broadcast_to(
+            np.asarray(max_joint_velocity, dtype=np.float64), (6,)).copy()
+        if np.any(self.max_joint_velocity <= 0):
+            raise ValueError("关节最大角速度必须大于0")
+        self.damping = float(damping)
+        self.singular_threshold = float(singular_threshold)
+        self.length_scale = float(length_scale)
+        self.limit_margin = float(limit_margin)
+
+        self._row_scale = np.array([1.0 / self.length_scale] * 3 + [1.0] * 3)
+
+    @classmethod
+    def from_config(cls, config_path: Optional[str] = None, **kwargs) -> "ResolvedRateController":
+        """从 dh_parameters_config.json 构建（关节限制同样取自该文件）"""
+        kinematics = BatchKinematics.from_config(config_path)
+        if "joint_limits" not in kwargs:
+            kwargs["joint_limits"] = kinematics.joint_limits
+        return cls(kinematics, **kwargs)
+
+    # ------------------------------------------------------------------
+    # 速度求解
+    # ------------------------------------------------------------------
+
+    def joint_velocity(self, q, twist) -> np.ndarray:
+        """
+        末端速度 → 关节速度
+
+        Args:
+            q: (6,) 或 (N, 6) 当前关节角 (度)
+            twist: (6,) 或 (N, 6) 基座坐标系末端速度 [mm/s ×3, 度/秒 ×3]
+
+        Returns:
+            np.ndarray: 与 q 同形状的关节速度 (度/秒)，已做限速与限位处理
+        """
+        qdot, _ = self._solve(q, twist)
+        return qdot
+
+    def step(self, q, twist, dt: float) -> np.ndarray:
+        """按末端速度积分一个控制周期，返回新的关节角 (度，已限制在关节范围内)"""
+        q = np.asarray(q, dtype=np.float64)
+        return np.clip(q + self.joint_velocity(q, twist) * dt,
+                       self.joint_limits[:, 0], self.joint_limits[:, 1])
+
+    def min_singular_value(self, q) -> np.ndarray:
+        """归一化雅可比的最小奇异值（越接近 0 越接近奇异），(N,) 或标量"""
+        q = np.asarray(q, dtype=np.float64)
+        J = self.kinematics.jacobian_batch(np.atleast_2d(q)) * self._row_scale[:, None]
+        sigma = np.linalg.svd(J, compute_uv=False)[:, -1]
+        return sigma[0] if q.ndim == 1 else sigma
+
+    def _solve(self, q, twist) -> Tuple[np.ndarray, np.ndarray]:
+        q = np.asarray(q, dtype=np.float64)
+        single = q.ndim == 1
+        q2 = np.atleast_2d(q)
+        twist = np.asarray(twist, dtype=np.float64)
+        if twist.shape[-1] != 6:
+            raise ValueError(f"末端速度应为 6 维 [vx, vy, vz, ωx, ωy, ωz]，实际: {twist.shape}")
+
+        J = self.kinematics.jacobian_batch(q2) * self._row_scale[:, None]       # (N, 6, 6)
+        xi = np.broadcast_to(twist, (len(q2), 6)).copy()
+        xi[:, :3] *= self._row_scale[:3]
+        xi[:, 3:] = np.radians(xi[:, 3:])
+
+        # 自适应阻尼：σ_min ≥ ε 时 λ = 0，σ_min → 0 时 λ² → λ_max²
+        sigma = np.linalg.svd(J, compute_uv=False)[:, -1]
+        ratio = np.clip(sigma / self.singular_threshold, 0.0, 1.0)
+        lam2 = (self.damping ** 2) * (1.0 - ratio ** 2)
+        A = np.matmul(J, J.transpose(0, 2, 1)) + lam2[:, None, None] * np.eye(6)
+        qdot = np.degrees(np.matmul(J.transpose(0, 2, 1), np.linalg.solve(A, xi[..., None]))[..., 0])
+
+        # 接近关节限位时禁止继续向外运动
+        blocked = (((q2 - self.joint_limits[:, 0] < self.limit_margin) & (qdot < 0))
+                   | ((self.joint_limits[:, 1] - q2 < self.limit_margin) & (qdot > 0)))
+        qdot[blocked] = 0.0
+
+        # 统一比例缩放到限速以内，保持末端运动方向
+        over = np.max(np.abs(qdot) / self.max_joint_velocity, axis=1, keepdims=True)
+        qdot /= np.maximum(over, 1.0)
+        return (qdot[0], sigma[0]) if single else (qdot, sigma)
+
+
+@dataclass
+class ServoStats:
+    """速度控制线程统计信息"""
+    ticks: int = 0                  # 控制周期数
+    sent: int = 0                   # 发送的帧数（静止时不发送）
+    deadline_misses: int = 0        # 晚于截止时刻超过半个周期的次数
+    send_errors: int = 0            # 发送异常次数
+    watchdog_stops: int = 0         # 速度命令超时自动停止次数
+    compute_mean_us: float = 0.0    # 每周期平均计算耗时 (微秒)
+    compute_max_us: float = 0.0     # 每周期最大计算耗时 (微秒)
+    min_singular_value: float = float("inf")    # 运行期间出现过的最小奇异值
+    duration_s: float = 0.0         # 运行总时长 (秒)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ResolvedRateServo:
+    """
+    固定频率的笛卡尔速度控制线程
+
+    关节目标由起始关节角开始积分（不依赖每周期回读），每周期发送一帧所有关节的限速位置命令，
+    限速取本周期关节速度 × speed_margin，电机据此平滑跟随。
+    """
+
+    def __init__(self, controller: ResolvedRateController, can_interface, joint_map, encoder, *,
+                 rate_hz: float = 100.0, command_timeout: float = 0.2,
+                 max_joint_acceleration: Union[float, Sequence[float]] = 300.0,
+                 position_gain: float = 2.0, orientation_gain: float = 2.0,
+                 max_linear_speed: float = 100.0, max_angular_speed: float = 45.0,
+                 position_tolerance: float = 0.5, orientation_tolerance: float = 0.2,
+                 speed_margin: float = 1.2, min_speed_rpm: float = 1.0, max_speed_rpm: float = 3000.0,
+                 on_send: Optional[Callable[[], None]] = None):
+        """
+        初始化速度控制线程
+
+        Args:
+            controller: ResolvedRateController
+            can_interface: 共享CAN接口
+            joint_map: JointMap，关节角 → 电机角换算
+            encoder: MultiMotorFrameEncoder（direct 模式，电机顺序与 joint_map 一致）
+            rate_hz: 控制频率 (Hz)
+            command_timeout: 速度模式下命令超时 (秒)，超时后减速停下
+            max_joint_acceleration: 关节最大角加速度 (度/秒²)
+            position_gain: 目标模式位置比例增益 (1/秒)
+            orientation_gain: 目标模式姿态比例增益 (1/秒)
+            max_linear_speed: 目标模式最大末端线速度 (mm/s)
+            max_angular_speed: 目标模式最大末端角速度 (度/秒)
+            position_tolerance: 目标模式位置到位阈值 (mm)
+            orientation_tolerance: 目标模式姿态到位阈值 (度)
+            speed_margin / min_speed_rpm / max_speed_rpm: 同 TrajectoryStreamer
+            on_send: 可选，每次发送前的回调
+        """
+        if list(encoder.motor_ids) != [int(m) for m in joint_map.motor_ids]:
+            raise ValueError("编码器与关节映射的电机顺序不一致")
+        if len(joint_map) != 6:
+            raise ValueError("速度控制需要绑定全部 6 个关节电机")
+        if rate_hz <= 0:
+            raise ValueError("控制频率必须大于0")
+        self.controller = controller
+        self.can_interface = can_interface
+        self.joint_map = joint_map
+        self.encoder = encoder
+        self.rate_hz = float(rate_hz)
+        self.command_timeout = float(command_timeout)
+        self.max_joint_acceleration = np.broadcast_to(
+            np.asarray(max_joint_acceleration, dtype=np.float64), (6,)).copy()
+        self.position_gain = float(position_gain)
+        self.orientation_gain = float(orientation_gain)
+        self.max_linear_speed = float(max_linear_speed)
+        self.max_angular_speed = float(max_angular_speed)
+        self.position_tolerance = float(position_tolerance)
+        self.orientation_tolerance = float(orientation_tolerance)
+        self.speed_margin = float(speed_margin)
+        self.min_speed_rpm = float(min_speed_rpm)
+        self.max_speed_rpm = float(max_speed_rpm)
+        self.on_send = on_send
+
+        self._lock = threading.Lock()
+        self._twist = np.zeros(6)
+        self._twist_time = 0.0
+        self._target_position: Optional[np.ndarray] = None
+        self._target_rotation: Optional[np.ndarray] = None
+        self._q = np.zeros(6)
+        self._qdot = np.zeros(6)
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._stats = ServoStats()
+        self._accepts_buffer = hasattr(can_interface, "submit")
+
+    # ------------------------------------------------------------------
+    # 命令输入
+    # ------------------------------------------------------------------
+
+    def set_twist(self, linear: Sequence[float], angular: Optional[Sequence[float]] = None) -> None:
+        """
+        速度模式：设置末端速度（需持续刷新，超过 command_timeout 未更新则停下）
+
+        Args:
+            linear: [vx, vy, vz] (mm/s)，基座坐标系
+            angular: [ωx, ωy, ωz] (度/秒)，基座坐标系，None 表示保持姿态
+        """
+        twist = np.zeros(6)
+        twist[:3] = linear
+        if angular is not None:
+            twist[3:] = angular
+        with self._lock:
+            self._target_position = self._target_rotation = None
+            self._twist = twist
+            self._twist_time = time.monotonic()
+
+    def set_target(self, position: Sequence[float], orientation: Optional[Sequence[float]] = None) -> None:
+        """
+        目标模式：设置末端目标位姿，控制线程按比例律持续逼近，到位后保持静止
+
+        Args:
+            position: [x, y, z] (mm)
+            orientation: [yaw, pitch, roll] (度)，或 3x3 旋转矩阵；None 表示保持当前姿态
+        """
+        rotation = None
+        if orientation is not None:
+            orientation = np.asarray(orientation, dtype=np.float64)
+            if orientation.shape == (3, 3):
+                rotation = orientation
+            else:
+                rotation = transforms_from_poses(np.zeros((1, 3)), orientation.reshape(1, 3))[0, :3, :3]
+        with self._lock:
+            self._target_position = np.asarray(position, dtype=np.float64).reshape(3).copy()
+            self._target_rotation = rotation
+            self._twist = np.zeros(6)
+
+    def hold(self) -> None:
+        """清除速度与目标，减速停在当前位置"""
+        with self._lock:
+            self._target_position = self._target_rotation = None
+            self._twist = np.zeros(6)
+
+    # ------------------------------------------------------------------
+    # 线程控制
+    # ------------------------------------------------------------------
+
+    def start(self, initial_joints: Sequence[float]) -> None:
+        """
+        启动控制线程
+
+        Args:
+            initial_joints: 当前实际关节角 (度)，作为积分起点
+        """
+        if self.is_running():
+            raise RuntimeError("速度控制已在运行")
+        q0 = np.asarray(initial_joints, dtype=np.float64).reshape(6)
+        with self._lock:
+            self._q = q0.copy()
+            self._qdot = np.zeros(6)
+            self._twist = np.zeros(6)
+            self._target_position = self._target_rotation = None
+        self._stop_event.clear()
+        self._stats = ServoStats()
+        self._thread = threading.Thread(target=self._run, name="resolved-rate-servo", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """停止控制线程（电机停在最后一次收到的目标处）"""
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def commanded_joints(self) -> np.ndarray:
+        """当前关节目标 (度)"""
+        with self._lock:
+            return self._q.copy()
+
+    @property
+    def stats(self) -> ServoStats:
+        return self._stats
+
+    # ------------------------------------------------------------------
+    # 控制循环
+    # ------------------------------------------------------------------
+
+    def _desired_twist(self, q: np.ndarray) -> np.ndarray:
+        """按当前输入模式生成本周期的末端速度"""
+        with self._lock:
+            twist = self._twist
+            target_position = self._target_position
+            target_rotation = self._target_rotation
+            twist_time = self._twist_time
+        if target_position is None:
+            if twist.any() and time.monotonic() - twist_time > self.command_timeout:
+                with self._lock:
+                    if self._twist_time == twist_time:
+                        self._twist = np.zeros(6)
+                self._stats.watchdog_stops += 1
+                return np.zeros(6)
+            return twist
+
+        T = self.controller.kinematics.forward_kinematics_batch(q[None])[0]
+        twist = np.zeros(6)
+        error = target_position - T[:3, 3]
+        distance = float(np.linalg.norm(error))
+        if distance > self.position_tolerance:
+            twist[:3] = error * min(self.position_gain, self.max_linear_speed / distance)
+        if target_rotation is not None:
+            rotvec = np.degrees(rotation_error(T[:3, :3], target_rotation))
+            angle = float(np.linalg.norm(rotvec))
+            if angle > self.orientation_tolerance:
+                twist[3:] = rotvec * min(self.orientation_gain, self.max_angular_speed / angle)
+        return twist
+
+    def _send(self, q: np.ndarray, qdot: np.ndarray) -> None:
+        motor_degrees = self.joint_map.joint_to_motor_degrees(q)
+        motor_rpm = self.joint_map.joint_velocity_to_motor_rpm(qdot)
+        motor_rpm *= self.speed_margin
+        np.clip(motor_rpm, self.min_speed_rpm, self.max_speed_rpm, out=motor_rpm)
+        frame = self.encoder.encode(motor_degrees, motor_rpm)
+        if self.on_send is not None:
+            self.on_send()
+        if self._accepts_buffer:
+            self.can_interface.send_command_no_response(0, frame)
+        else:
+            self.can_interface.send_command_no_response(0, list(frame))
+
+    def _run(self) -> None:
+        _raise_thread_priority()
+        stats = self._stats
+        period_ns = int(round(1e9 / self.rate_hz))
+        dt = 1.0 / self.rate_hz
+        max_dv = self.max_joint_acceleration * dt
+        lower, upper = self.controller.joint_limits[:, 0], self.controller.joint_limits[:, 1]
+        spin_ns = TrajectoryStreamer.SPIN_WINDOW_NS
+        compute_total_ns = 0
+        moving = False
+
+        start_ns = time.perf_counter_ns()
+        deadline_ns = start_ns
+        try:
+            while not self._stop_event.is_set():
+                remaining_ns = deadline_ns - time.perf_counter_ns()
+                if remaining_ns > spin_ns:
+                    if self._stop_event.wait((remaining_ns - spin_ns) / 1e9):
+                        break
+                while time.perf_counter_ns() < deadline_ns:
+                    pass
+
+                tick_ns = time.perf_counter_ns()
+                late_ns = tick_ns - deadline_ns
+                if late_ns > period_ns // 2:
+                    stats.deadline_misses += 1
+                if late_ns >= period_ns:
+                    # 错过整周期：从当前时刻重新排程，积分步长仍按一个周期计
+                    deadline_ns = tick_ns
+
+                q = self._q
+                qdot_desired, sigma = self.controller._solve(q, self._desired_twist(q))
+                qdot = self._qdot + np.clip(qdot_desired - self._qdot, -max_dv, max_dv)
+                q_next = np.clip(q + qdot * dt, lower, upper)
+                qdot = (q_next - q) / dt
+                with self._lock:
+                    self._q = q_next
+                    self._qdot = qdot
+
+                # 静止时不再重复发送同一目标
+                active = bool(np.any(np.abs(qdot) > 1e-6))
+                if active or moving:
+                    try:
+                        self._send(q_next, qdot)
+                        stats.sent += 1
+                    except Exception:
+                        stats.send_errors += 1
+                moving = active
+
+                elapsed_ns = time.perf_counter_ns() - tick_ns
+                compute_total_ns += elapsed_ns
+                stats.ticks += 1
+                stats.compute_max_us = max(stats.compute_max_us, elapsed_ns / 1e3)
+                stats.min_singular_value = min(stats.min_singular_value, float(sigma))
+                deadline_ns += period_ns
+        finally:
+            stats.duration_s = (time.perf_counter_ns() - start_ns) / 1e9
+            if stats.ticks:
+                stats.compute_mean_us = compute_total_ns / stats.ticks / 1e3
@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+"""
+关节路径时间最优参数化（TOPP）
+
+`JointSpaceInterpolator.plan_trajectory` / `CartesianSpaceInterpolator` 按经验的最大速度/加速度
+估算时长（`min_duration`、`optimize_trajectory`），各关节通常远未达到限制，节拍时间偏长。
+
+`TimeOptimalParameterizer` 只接收几何路径（关节角序列），在各关节速度/加速度（可选加加速度）
+限制下求最快的时间律 s(t)：
+- 路径按关节空间弧长 s 重采样为等间距网格，q'(s)、q''(s) 由差分得到；
+- 关节约束化为每个网格点上 ṡ² 的上限（速度曲线）与路径加速度 s̈ 的线性约束
+  |s̈ + β·ṡ²| ≤ r（r = a/|q'|，β = q''/q'），所有网格点、所有关节一次向量化计算；
+- 前向（最大加速）与后向（最大减速）两遍扫描求 ṡ² 曲线，后向扫描对线性约束精确求解；
+- 指定加加速度限制时，对 ṡ(t) 做时间域滑动平均（窗口 = 关节加速度变化幅度 / j），使 s̈ 连续、加加速度有界；
+- 最后对密集采样点逐一校验速度/加速度/加加速度，必要时整体放慢（时间缩放）保证不超限。
+
+速度/加速度限制可由 `motor_config.json` 的减速比推导（电机端 RPM、RPM/s → 关节端 度/秒、度/秒²）。
+路径应足够平滑（例如插补器或前瞻规划器的输出）；折线路点在拐角处会减速到接近停止。
+
+使用示例：
+```python
+topp = TimeOptimalParameterizer.from_motor_config(max_jerk=2000.0)
+traj = topp.parameterize(path)                    # path: (N, 6) 关节角度 (度)
+times, points, _ = traj.sample(100)
+motion.stream_trajectory(points, rate_hz=100)
+```
+"""
+
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+# 电机端默认限制：减速比 62 的关节约为 60 度/秒、120 度/秒²，与前瞻规划器默认值一致
+DEFAULT_MOTOR_MAX_RPM = 600.0
+DEFAULT_MOTOR_MAX_ACCELERATION = 1200.0    # RPM/s
+
+# 时间律的密集采样间隔 (秒)
+_TIME_RESOLUTION = 0.001
+# 判定 q'(s) 为零的阈值
+_DERIVATIVE_EPS = 1e-9
+
+
+def joint_limits_from_reducer_ratios(reducer_ratios: Sequence[float],
+                                     max_motor_rpm: float = DEFAULT_MOTOR_MAX_RPM,
+                                     max_motor_acceleration: float = DEFAULT_MOTOR_MAX_ACCELERATION,
+                                     max_motor_jerk: Optional[float] = None
+                                     ) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """
+    电机端限制 → 关节端限制
+
+    Args:
+        reducer_ratios: 各关节减速比
+        max_motor_rpm: 电机最大转速 (RPM)
+        max_motor_acceleration: 电机最大加速度 (RPM/s)
+        max_motor_jerk: 可选，电机最大加加速度 (RPM/s²)
+
+    Returns:
+        (max_velocity, max_acceleration, max_jerk): 关节端 度/秒、度/秒²、度/秒³（未指定加加速度时为 None）
+    """
+    # RPM → 度/秒：×6，再除以减速比
+    scale = 6.0 / np.abs(np.asarray(reducer_ratios, dtype=np.float64))
+    max_jerk = None if max_motor_jerk is None else float(max_motor_jerk) * scale
+    return float(max_motor_rpm) * scale, float(max_motor_acceleration) * scale, max_jerk
+
+
+class TimeOptimalTrajectory:
+    """
+    时间最优参数化结果
+
+    时间律以密集采样保存（times / s / sd / sdd），关节状态由路径网格插值得到。
+
+    Attributes:
+        grid: (K,) 路径弧长网格
+        path: (K, 关节数) 网格上的关节角 (度)
+        times: (M,) 时间律采样时刻 (秒)
+        s / sd / sdd: (M,) 路径参数及其一、二阶导数
+    """
+
+    def __init__(self, grid: np.ndarray, path: np.ndarray, dpath: np.ndarray, ddpath: np.ndarray,
+                 times: np.ndarray, s: np.ndarray, sd: np.ndarray, sdd: np.ndarray):
+        self.grid = grid
+        self.path = path
+        self.dpath = dpath
+        self.ddpath = ddpath
+        self.times = times
+        self.s = s
+        self.sd = sd
+        self.sdd = sdd
+
+    @property
+    def duration(self) -> float:
+        """轨迹总时长 (秒)"""
+        return float(self.times[-1])
+
+    def evaluate(self, times) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        计算任意时刻的关节状态
+
+        Args:
+            times: 时刻数组 (秒)，超出范围时截断到首尾
+
+        Returns:
+            (positions, velocities, accelerations)，形状均为 (N, 关节数)
+        """
+        times = np.clip(np.atleast_1d(np.asarray(times, dtype=np.float64)), 0.0, self.duration)
+        s = np.interp(times, self.times, self.s)
+        sd = np.interp(times, self.times, self.sd)[:, None]
+        sdd = np.interp(times, self.times, self.sdd)[:, None]
+        positions, dq, ddq = self._path_state(s)
+        return positions, dq * sd, dq * sdd + ddq * sd * sd
+
+    def sample(self, rate_hz: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        按控制频率等间隔采样（包含终点）
+
+        Returns:
+            (times, positions, velocities)
+        """
+        count = int(np.ceil(self.duration * rate_hz)) + 1
+        times = np.minimum(np.arange(count) / rate_hz, self.duration)
+        positions, velocities, _ = self.evaluate(times)
+        return times, positions, velocities
+
+    def _path_state(self, s: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """路径参数 s 处的 q、q'、q''（网格间线性插值）"""
+        if len(self.grid) < 2:
+            shape = (len(s), self.path.shape[1])
+            return np.broadcast_to(self.path[0], shape).copy(), np.zeros(shape), np.zeros(shape)
+        index = np.clip(np.searchsorted(self.grid, s, side="right") - 1, 0, len(self.grid) - 2)
+        w = ((s - self.grid[index]) / (self.grid[index + 1] - self.grid[index]))[:, None]
+
+        def lerp(values):
+            return values[index] + (values[index + 1] - values[index]) * w
+
+        return lerp(self.path), lerp(self.dpath), lerp(self.ddpath)
+
+
+class TimeOptimalParameterizer:
+    """
+    关节路径时间最优参数化器
+
+    Attributes:
+        max_velocity / max_acceleration: (关节数,) 关节端限制 (度/秒、度/秒²)
+        max_jerk: (关节数,) 关节端加加速度限制 (度/秒³)，None 表示不限制
+    """
+
+    def __init__(self, max_velocity: Union[float, Sequence[float]],
+                 max_acceleration: Union[float, Sequence[float]],
+                 max_jerk: Union[None, float, Sequence[float]] = None,
+                 grid_step: float = 0.5, time_resolution: float = _TIME_RESOLUTION):
+        """
+        初始化参数化器
+
+        Args:
+            max_velocity: 关节最大速度 (度/秒)，标量或逐关节数组
+            max_acceleration: 关节最大加速度 (度/秒²)，标量或逐关节数组
+            max_jerk: 可选，关节最大加加速度 (度/秒³)
+            grid_step: 路径网格间距（关节空间弧长，度）
+            time_resolution: 时间律密集采样间隔 (秒)
+        """
+        self.max_velocity = np.atleast_1d(np.asarray(max_velocity, dtype=np.float64))
+        self.max_acceleration = np.atleast_1d(np.asarray(max_acceleration, dtype=np.float64))
+        self.max_jerk = None if max_jerk is None else np.atleast_1d(np.asarray(max_jerk, dtype=np.float64))
+        if np.any(self.max_velocity <= 0) or np.any(self.max_acceleration <= 0):
+            raise ValueError("速度/加速度限制必须大于0")
+        if self.max_jerk is not None and np.any(self.max_jerk <= 0):
+            raise ValueError("加加速度限制必须大于0")
+        self.grid_step = float(grid_step)
+        self.time_resolution = float(time_resolution)
+
+    @classmethod
+    def from_motor_config(cls, config_path: Optional[str] = None,
+                          reducer_ratios: Optional[Sequence[float]] = None,
+                          max_motor_rpm: float = DEFAULT_MOTOR_MAX_RPM,
+                          max_motor_acceleration: float = DEFAULT_MOTOR_MAX_ACCELERATION,
+                          max_jerk: Union[None, float, Sequence[float]] = None,
+                          **kwargs) -> "TimeOptimalParameterizer":
+        """
+        由 motor_config.json 的减速比推导关节限制
+
+        Args:
+            config_path: motor_config.json 路径，默认见 Control_Core.get_motor_config_path()
+            reducer_ratios: 可选，直接给出减速比（优先于配置文件）
+            max_motor_rpm / max_motor_acceleration: 电机端限制 (RPM、RPM/s)
+            max_jerk: 可选，关节端加加速度限制 (度/秒³)
+        """
+        if reducer_ratios is None:
+            from Horizon_Core import gateway as horizon_gateway
+            joint_map = horizon_gateway.get_control_core().load_joint_map(config_path)
+            reducer_ratios = np.abs(joint_map.reducer_ratios)
+        vmax, amax, _ = joint_limits_from_reducer_ratios(reducer_ratios, max_motor_rpm, max_motor_acceleration)
+        return cls(vmax, amax, max_jerk=max_jerk, **kwargs)
+
+    # ------------------------------------------------------------------
+    # 参数化
+    # ------------------------------------------------------------------
+
+    def parameterize(self, path) -> TimeOptimalTrajectory:
+        """
+        求静止到静止的时间最优时间律
+
+        Args:
+            path: (N, 关节数) 几何路径（关节角度，度）
+
+        Returns:
+            TimeOptimalTrajectory
+        """
+        path = np.asarray(path, dtype=np.float64)
+        if path.ndim != 2 or len(path) == 0:
+            raise ValueError("路径形状应为 (N, 关节数)")
+        joints = path.shape[1]
+        vmax = np.broadcast_to(self.max_velocity, (joints,))
+        amax = np.broadcast_to(self.max_acceleration, (joints,))
+
+        grid, q, dq, ddq = self._resample(path)
+        if len(grid) < 2:
+            zero = np.zeros(1)
+            return TimeOptimalTrajectory(grid, q, dq, ddq, zero, zero, zero, zero)
+
+        limit, r, beta = self._constraints(dq, ddq, vmax, amax)
+        x = self._integrate(np.diff(grid), limit, r, beta)
+        times, s, sd, sdd = self._time_law(grid, x)
+
+        if self.max_jerk is not None:
+            # 滑动平均后 s⃛ ≤ (s̈_max - s̈_min) / 窗口，窗口按各关节实际加速度变化幅度取
+            jmax = np.broadcast_to(self.max_jerk, (joints,))
+            _, dq_t, ddq_t = TimeOptimalTrajectory(grid, q, dq, ddq, times, s, sd, sdd)._path_state(s)
+            acc = dq_t * sdd[:, None] + ddq_t * (sd * sd)[:, None]
+            window = float(np.max((acc.max(axis=0) - acc.min(axis=0)) / jmax))
+            times, s, sd, sdd = self._smooth(sd, window, grid[-1])
+
+        trajectory = TimeOptimalTrajectory(grid, q, dq, ddq, times, s, sd, sdd)
+        self._enforce_limits(trajectory, vmax, amax)
+        return trajectory
+
+    def _resample(self, path: np.ndarray):
+        """按关节空间弧长重采样为等间距网格，并求 q'(s)、q''(s)"""
+        steps = np.linalg.norm(np.diff(path, axis=0), axis=1)
+        keep = np.concatenate([[True], steps > 1e-9])
+        path = path[keep]
+        if len(path) < 2:
+            zeros = np.zeros_like(path[:1])
+            return np.zeros(1), path[:1], zeros, zeros
+
+        arc = np.concatenate([[0.0], np.cumsum(steps[keep[1:]])])
+        count = max(3, int(np.ceil(arc[-1] / self.grid_step)) + 1)
+        grid = np.linspace(0.0, arc[-1], count)
+        q = np.stack([np.interp(grid, arc, path[:, j]) for j in range(path.shape[1])], axis=1)
+        ds = grid[1] - grid[0]
+        dq = np.gradient(q, ds, axis=0, edge_order=2)
+        ddq = np.gradient(dq, ds, axis=0, edge_order=2)
+        return grid, q, dq, ddq
+
+    @staticmethod
+    def _constraints(dq: np.ndarray, ddq: np.ndarray, vmax: np.ndarray, amax: np.ndarray):
+        """
+        各网格点的 ṡ² 上限与路径加速度约束
+
+        Returns:
+            (limit, r, beta): limit (K,) 为 ṡ² 上限；关节 j 的加速度约束为 |s̈ + β_j ṡ²| ≤ r_j，
+                q'_j≈0 的关节 r=inf、β=0（其约束并入 limit）
+        """
+        abs_dq = np.abs(dq)
+        moving = abs_dq > _DERIVATIVE_EPS
+        safe_dq = np.where(moving, dq, 1.0)
+
+        with np.errstate(divide="ignore"):
+            # 速度：|q'| ṡ ≤ v
+            limit = np.min(np.where(moving, (vmax / np.where(moving, abs_dq, 1.0)) ** 2, np.inf), axis=1)
+            # q'≈0 的关节只受 |q''| ṡ² ≤ a 约束
+            still = ~moving & (np.abs(ddq) > _DERIVATIVE_EPS)
+            limit = np.minimum(limit, np.min(np.where(still, amax / np.where(still, np.abs(ddq), 1.0), np.inf),
+                                             axis=1))
+        r = np.where(moving, amax / np.where(moving, abs_dq, 1.0), np.inf)
+        beta = np.where(moving, ddq / safe_dq, 0.0)
+
+        # 加速度约束可行（存在 s̈ 同时满足各关节）所需的 ṡ² 上限：
+        # 对任意两关节 l、m：-r_l - β_l x ≤ r_m - β_m x  ⇒  (β_m - β_l) x ≤ r_l + r_m
+        gap = beta[:, None, :] - beta[:, :, None]                 # [k, l, m] = β_m - β_l
+        bound = r[:, :, None] + r[:, None, :]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            pair_limit = np.where(gap > _DERIVATIVE_EPS, bound / np.where(gap > _DERIVATIVE_EPS, gap, 1.0), np.inf)
+        limit = np.minimum(limit, np.nan_to_num(pair_limit.min(axis=(1, 2)), nan=np.inf))
+        return limit, r, beta
+
+    @staticmethod
+    def _integrate(ds: np.ndarray, limit: np.ndarray, r: np.ndarray, beta: np.ndarray) -> np.ndarray:
+        """前向最大加速 + 后向最大减速，返回各网格点的 ṡ²"""
+        count = len(limit)
+        limit_list = np.minimum(limit, 1e18).tolist()
+        r_list, beta_list, ds_list = r.tolist(), beta.tolist(), ds.tolist()
+
+        # 前向：x_{i+1} = x_i + 2Δs·s̈_max(x_i)，s̈_max(x) = min_j (r_j - β_j x)
+        forward = [0.0] * count
+        for i in range(count - 1):
+            x = forward[i]
+            u = min(rj - bj * x for rj, bj in zip(r_list[i], beta_list[i]))
+            forward[i + 1] = min(limit_list[i + 1], max(0.0, x + 2.0 * ds_list[i] * u))
+
+        # 后向：满足 x_{i+1} - x_i ≥ 2Δs (-r_j - β_j x_i) 的最大 x_i（对 x_i 线性，逐关节精确求解）
+        x = [0.0] * count
+        for i in range(count - 2, -1, -1):
+            upper = forward[i]
+            nxt = x[i + 1]
+            h = 2.0 * ds_list[i]
+            for rj, bj in zip(r_list[i], beta_list[i]):
+                c = 1.0 - h * bj
+                if c > 0.0 and rj != float("inf"):
+                    upper = min(upper, (nxt + h * rj) / c)
+            x[i] = max(0.0, upper)
+        return np.asarray(x)
+
+    def _time_law(self, grid: np.ndarray, x: np.ndarray):
+        """由网格上的 ṡ² 得到密集时间采样（相邻网格点之间 s̈ 为常数）"""
+        ds = np.diff(grid)
+        sd_nodes = np.sqrt(x)
+        speed_sum = sd_nodes[:-1] + sd_nodes[1:]
+        dt = np.where(speed_sum > 0, 2.0 * ds / np.maximum(speed_sum, 1e-12), 0.0)
+        node_times = np.concatenate([[0.0], np.cumsum(dt)])
+        u = np.where(dt > 0, (sd_nodes[1:] - sd_nodes[:-1]) / np.maximum(dt, 1e-12), 0.0)
+
+        count = int(np.ceil(node_times[-1] / self.time_resolution)) + 1
+        times = np.minimum(np.arange(count) * self.time_resolution, node_times[-1])
+        index = np.clip(np.searchsorted(node_times, times, side="right") - 1, 0, len(ds) - 1)
+        tau = times - node_times[index]
+        sd = np.maximum(sd_nodes[index] + u[index] * tau, 0.0)
+        s = np.minimum(grid[index] + sd_nodes[index] * tau + 0.5 * u[index] * tau * tau, grid[index + 1])
+        return times, s, sd, u[index]
+
+    def _smooth(self, sd: np.ndarray, window: float, length: float):
+        """
+        对 ṡ(t) 做时间域滑动平均（窗口 window 秒）：s̈ 变为连续、s⃛ ≤ Δs̈ / window，
+        总时长增加 window，积分后按路径总长做微小归一化
+        """
+        dt = self.time_resolution
+        width = max(1, int(round(window / dt)))
+        sd = np.convolve(sd, np.full(width, 1.0 / width))
+        s = np.concatenate([[0.0], np.cumsum(0.5 * (sd[1:] + sd[:-1]) * dt)])
+        if s[-1] > 0:
+            scale = length / s[-1]
+            s *= scale
+            sd *= scale
+        times = np.arange(len(sd)) * dt
+        sdd = np.gradient(sd, dt)
+        return times, s, sd, sdd
+
+    def _enforce_limits(self, trajectory: TimeOptimalTrajectory, vmax: np.ndarray, amax: np.ndarray) -> None:
+        """逐采样点校验限制，超限时整体放慢（时间 ×c：速度 /c、加速度 /c²、加加速度 /c³）"""
+        if len(trajectory.times) < 3:
+            return
+        _, vel, acc = trajectory.evaluate(trajectory.times)
+        ratio = max(float(np.max(np.abs(vel) / vmax)), float(np.sqrt(np.max(np.abs(acc) / amax))))
+        if self.max_jerk is not None:
+            jerk = np.gradient(acc, trajectory.times, axis=0)
+            jmax = np.broadcast_to(self.max_jerk, (vel.shape[1],))
+            ratio = max(ratio, float(np.cbrt(np.max(np.abs(jerk) / jmax))))
+        if ratio > 1.0 + 1e-6:
+            trajectory.times = trajectory.times * ratio
+            trajectory.sd = trajectory.sd / ratio
+            trajectory.sdd = trajectory.sdd / (ratio * ratio)
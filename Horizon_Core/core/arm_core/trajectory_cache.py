@@ -0,0 +1,443 @@
+# -*- coding: utf-8 -*-
+"""
+预设动作 / IO 作业的轨迹预编译缓存
+
+`e_p_a` 每次执行“点头”等预设动作都会重新读取 `preset_actions.json`、重新插补并计算时长；
+IO 作业（`config/io_control/jobs_config.json`）的每个运动步骤也是如此。这些动作内容固定，
+完全可以只规划一次。
+
+`TrajectoryCompiler` 把预设动作或作业编译为 `CompiledTrajectory`：
+- 按控制频率采样的关节轨迹 (times / positions)；
+- 可选的逐周期 Y42 帧 (frames)，执行时由 `TrajectoryStreamer.start_frames` 直接下发；
+- 作业的步骤列表（运动步骤记录在轨迹中的采样区间，IO / 等待等步骤原样保留）。
+
+编译结果以未压缩 `.npz` 保存在缓存目录，文件名中的内容哈希由以下输入计算：
+动作/作业的 JSON 内容、`dh_parameters_config.json`、`motor_config.json`、控制频率、速度档位等。
+任一输入变化时哈希随之变化，旧缓存自动失效并被清理。
+
+使用示例：
+```python
+compiler = TrajectoryCompiler(rate_hz=100)
+nod = compiler.compile_preset_action("点头", speed="fast")   # 首次规划并写入缓存，之后直接加载
+times, positions = nod.times, nod.positions
+job = compiler.compile_job("test")
+result = run_compiled_steps(job, run_motion=motion.run_compiled_motion,
+                            handlers={"wait": lambda step: ...})   # 运动段与 IO / 等待步骤按顺序执行
+```
+"""
+
+import glob
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .config_paths import get_config_dir
+from .lookahead_planner import BlendedTrajectory, LookaheadBlendPlanner, plan_program_points
+
+
+# 缓存格式版本，规划算法或文件结构变化时递增以作废旧缓存
+CACHE_FORMAT_VERSION = 1
+
+# 预设动作速度档位 → 时长倍率
+PRESET_SPEED_SCALES = {"slow": 1.5, "normal": 1.0, "fast": 0.6}
+
+# 参与哈希的公共配置文件
+DEPENDENCY_CONFIG_FILES = ("dh_parameters_config.json", "motor_config.json")
+
+# 作业中的运动步骤类型，其余类型（io_control / wait / emergency_stop ...）原样保留
+MOTION_STEP_TYPE = "move_joints"
+
+# 编译结果中运动段的步骤类型
+TRAJECTORY_STEP_TYPE = "trajectory"
+
+
+@dataclass
+class CompiledTrajectory:
+    """
+    预编译轨迹
+
+    Attributes:
+        kind: "preset" / "job"
+        name: 动作或作业名称
+        key: 内容哈希
+        rate_hz: 采样频率 (Hz)
+        times: (N,) 采样时刻 (秒)
+        positions: (N, 关节数) 关节角度 (度)
+        frames: (N, 帧长) uint8 逐周期 Y42 帧；编译时未提供编码函数则为 None
+        steps: 步骤列表，运动步骤为 {"type": "trajectory", "start": i, "stop": j, ...}，
+            [start, stop) 为其在 times/positions/frames 中的区间
+    """
+    kind: str
+    name: str
+    key: str
+    rate_hz: float
+    times: np.ndarray
+    positions: np.ndarray
+    frames: Optional[np.ndarray] = None
+    steps: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        """所有运动步骤的总时长 (秒)"""
+        return sum(step["duration"] for step in self.steps if step["type"] == TRAJECTORY_STEP_TYPE)
+
+    def motion(self, step: Dict[str, Any]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """返回运动步骤对应的 (positions, frames) 切片"""
+        rows = slice(step["start"], step["stop"])
+        return self.positions[rows], (None if self.frames is None else self.frames[rows])
+
+    def save(self, path: str) -> None:
+        """写入 .npz（先写临时文件再替换，避免并发读到半个文件）"""
+        meta = {
+            "version": CACHE_FORMAT_VERSION, "kind": self.kind, "name": self.name,
+            "key": self.key, "rate_hz": self.rate_hz, "steps": self.steps,
+        }
+        arrays = {"times": self.times, "positions": self.positions,
+                  "meta": np.array(json.dumps(meta, ensure_ascii=False))}
+        if self.frames is not None:
+            arrays["frames"] = self.frames
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledTrajectory":
+        """从 .npz 读取"""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != CACHE_FORMAT_VERSION:
+                raise ValueError(f"缓存格式版本不匹配: {meta.get('version')}")
+            return cls(
+                kind=meta["kind"], name=meta["name"], key=meta["key"], rate_hz=float(meta["rate_hz"]),
+                times=data["times"], positions=data["positions"],
+                frames=data["frames"] if "frames" in data.files else None,
+                steps=meta["steps"],
+            )
+
+
+class TrajectoryCompiler:
+    """
+    预设动作 / 作业轨迹编译器（带磁盘缓存与进程内缓存）
+
+    frame_encoder 为可选的编码函数 `(positions, rate_hz) -> (N, 帧长) uint8`，
+    通常传入 `TrajectoryStreamer.encode_frames`；frame_tag 用于区分不同电机组/编码参数生成的帧，
+    会参与哈希计算。
+    """
+
+    def __init__(self, config_dir: Optional[str] = None, cache_dir: Optional[str] = None,
+                 rate_hz: float = 100.0, reducer_ratios: Optional[Sequence[float]] = None,
+                 planner: Optional[LookaheadBlendPlanner] = None,
+                 frame_encoder: Optional[Callable[[np.ndarray, float], np.ndarray]] = None,
+                 frame_tag: str = ""):
+        """
+        初始化编译器
+
+        Args:
+            config_dir: 配置目录，默认见 get_config_dir()
+            cache_dir: 缓存目录，默认为 <config_dir>/trajectory_cache
+            rate_hz: 采样频率 (Hz)
+            reducer_ratios: 各关节减速比（作业中电机端速度参数换算用）
+            planner: 作业运动段使用的规划器
+            frame_encoder: 可选，轨迹 → 帧 的编码函数
+            frame_tag: 帧编码参数标识（例如电机ID与减速比），参与哈希
+        """
+        if rate_hz <= 0:
+            raise ValueError("采样频率必须大于0")
+        self.config_dir = config_dir or get_config_dir()
+        self.cache_dir = cache_dir or os.path.join(self.config_dir, "trajectory_cache")
+        self.rate_hz = float(rate_hz)
+        self.reducer_ratios = None if reducer_ratios is None else [float(r) for r in reducer_ratios]
+        self.planner = planner or LookaheadBlendPlanner()
+        self.frame_encoder = frame_encoder
+        self.frame_tag = str(frame_tag) if frame_encoder is not None else ""
+
+        self._lock = threading.Lock()
+        self._memory: Dict[Tuple[str, str, str], CompiledTrajectory] = {}
+        self._file_digests: Dict[str, Tuple[float, int, str]] = {}
+        # 笛卡尔插补步骤使用的批量逆解（首次遇到时按 dh_parameters_config.json 构建）
+        self._ik = None
+
+    # ------------------------------------------------------------------
+    # 对外接口
+    # ------------------------------------------------------------------
+
+    def compile_preset_action(self, name: str, speed: str = "normal") -> CompiledTrajectory:
+        """
+        编译（或从缓存加载）预设动作
+
+        Args:
+            name: 动作名称（preset_actions.json 中的 key）
+            speed: "slow" / "normal" / "fast"
+        """
+        if speed not in PRESET_SPEED_SCALES:
+            raise ValueError(f"不支持的速度档位: {speed}，可选: {list(PRESET_SPEED_SCALES)}")
+        actions = self._read_json(self.preset_actions_path)
+        if name not in actions:
+            raise KeyError(f"未知的预设动作: {name}，可用动作: {list(actions)}")
+        payload = {"action": actions[name], "speed": speed}
+        return self._compile("preset", f"{name}@{speed}", payload,
+                             lambda: self._build_preset(actions[name], PRESET_SPEED_SCALES[speed]))
+
+    def compile_job(self, name: str) -> CompiledTrajectory:
+        """
+        编译（或从缓存加载）IO 作业
+
+        Args:
+            name: 作业名称（jobs_config.json 中的 key）
+        """
+        jobs = self._read_json(self.jobs_config_path)
+        if name not in jobs:
+            raise KeyError(f"未知的作业: {name}，可用作业: {list(jobs)}")
+        return self._compile("job", name, {"job": jobs[name]}, lambda: self._build_job(jobs[name]))
+
+    def compile_all(self) -> Dict[str, CompiledTrajectory]:
+        """预编译全部预设动作（所有速度档位）与作业，返回 {"preset:名称@速度" / "job:名称": 结果}"""
+        results: Dict[str, CompiledTrajectory] = {}
+        if os.path.exists(self.preset_actions_path):
+            for name in self._read_json(self.preset_actions_path):
+                for speed in PRESET_SPEED_SCALES:
+                    results[f"preset:{name}@{speed}"] = self.compile_preset_action(name, speed)
+        if os.path.exists(self.jobs_config_path):
+            for name in self._read_json(self.jobs_config_path):
+                results[f"job:{name}"] = self.compile_job(name)
+        return results
+
+    def clear(self) -> None:
+        """清空进程内缓存与缓存目录"""
+        with self._lock:
+            self._memory.clear()
+            for path in glob.glob(os.path.join(self.cache_dir, "*.npz")):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    @property
+    def preset_actions_path(self) -> str:
+        return os.path.join(self.config_dir, "embodied_config", "preset_actions.json")
+
+    @property
+    def jobs_config_path(self) -> str:
+        return os.path.join(self.config_dir, "io_control", "jobs_config.json")
+
+    # ------------------------------------------------------------------
+    # 缓存
+    # ------------------------------------------------------------------
+
+    def cache_key(self, payload: Dict[str, Any]) -> str:
+        """计算内容哈希：条目 JSON + 依赖配置文件 + 编译参数"""
+        h = hashlib.sha256()
+        h.update(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+        for filename in DEPENDENCY_CONFIG_FILES:
+            h.update(filename.encode("utf-8"))
+            h.update(self._file_digest(os.path.join(self.config_dir, filename)).encode("ascii"))
+        params = {
+            "version": CACHE_FORMAT_VERSION, "rate_hz": self.rate_hz, "reducer_ratios": self.reducer_ratios,
+            "planner": [self.planner.max_velocity.tolist(), self.planner.max_acceleration.tolist(),
+                        self.planner.min_segment_time, self.planner.iterations],
+            "frames": self.frame_tag if self.frame_encoder is not None else None,
+        }
+        h.update(json.dumps(params, sort_keys=True).encode("utf-8"))
+        return h.hexdigest()
+
+    def _compile(self, kind: str, name: str, payload: Dict[str, Any],
+                 build: Callable[[], Tuple[np.ndarray, np.ndarray, List[Dict[str, Any]]]]) -> CompiledTrajectory:
+        key = self.cache_key(payload)
+        memory_key = (kind, name, key)
+        with self._lock:
+            cached = self._memory.get(memory_key)
+            if cached is not None:
+                return cached
+
+            prefix = f"{kind}_{hashlib.sha1(name.encode('utf-8')).hexdigest()[:12]}"
+            path = os.path.join(self.cache_dir, f"{prefix}_{key[:24]}.npz")
+            compiled = None
+            if os.path.exists(path):
+                try:
+                    compiled = CompiledTrajectory.load(path)
+                    if compiled.key != key:
+                        compiled = None
+                except Exception as e:
+                    print(f" ⚠️ [TrajectoryCompiler] 缓存文件损坏，重新编译: {e}")
+                    compiled = None
+
+            if compiled is None:
+                times, positions, steps = build()
+                frames = self.frame_encoder(positions, self.rate_hz) if self.frame_encoder is not None else None
+                compiled = CompiledTrajectory(kind, name, key, self.rate_hz, times, positions, frames, steps)
+                self._store(compiled, prefix, path)
+
+            for stale in [k for k in self._memory if k[:2] == (kind, name)]:
+                del self._memory[stale]
+            self._memory[memory_key] = compiled
+            return compiled
+
+    def _store(self, compiled: CompiledTrajectory, prefix: str, path: str) -> None:
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # 同一条目的旧版本缓存已失效，直接清理
+            for stale in glob.glob(os.path.join(self.cache_dir, f"{prefix}_*.npz")):
+                if os.path.abspath(stale) != os.path.abspath(path):
+                    os.remove(stale)
+            compiled.save(path)
+        except OSError as e:
+            print(f" ⚠️ [TrajectoryCompiler] 写入缓存失败（本次仅保留在内存中）: {e}")
+
+    def _file_digest(self, path: str) -> str:
+        """依赖文件内容摘要（按修改时间与大小缓存，文件不存在时返回 'missing'）"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return "missing"
+        cached = self._file_digests.get(path)
+        if cached is not None and cached[:2] == (stat.st_mtime, stat.st_size):
+            return cached[2]
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        self._file_digests[path] = (stat.st_mtime, stat.st_size, digest)
+        return digest
+
+    @staticmethod
+    def _read_json(path: str) -> Dict[str, Any]:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    # ------------------------------------------------------------------
+    # 规划
+    # ------------------------------------------------------------------
+
+    def _build_preset(self, action: Dict[str, Any], time_scale: float
+                      ) -> Tuple[np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        """
+        预设动作：依次经过各子动作的关节角，每个子动作用时 duration × 速度倍率，子动作之间停顿
+
+        首个子动作的起点为执行时的当前位置，编译时未知，因此轨迹从首个子动作开始；
+        执行方需先以 approach_duration 运动到首点（单点动作即只有这一步）。
+        """
+        joints = np.asarray(action["joints"], dtype=np.float64)
+        waypoints = joints.reshape(1, -1) if joints.ndim == 1 else joints
+        segment_time = max(float(action.get("duration", 2.0)) * time_scale, self.planner.min_segment_time)
+
+        if len(waypoints) > 1:
+            trajectory = BlendedTrajectory(
+                waypoints, np.zeros_like(waypoints), np.full(len(waypoints) - 1, segment_time)
+            )
+            times, positions, _ = trajectory.sample(self.rate_hz)
+        else:
+            times, positions = np.zeros(1), waypoints.copy()
+
+        step = {"type": TRAJECTORY_STEP_TYPE, "start": 0, "stop": len(times),
+                "duration": float(times[-1]), "approach_duration": segment_time}
+        return times, positions, [step]
+
+    def _build_job(self, job: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        """
+        作业：连续的 move_joints 步骤合并为一段前瞻混合轨迹，其他步骤（IO、等待、急停）把轨迹分段
+
+        第一段从其首个目标点开始（执行方需先运动到该点），之后各段从上一段终点开始。
+        """
+        steps: List[Dict[str, Any]] = []
+        times_parts: List[np.ndarray] = []
+        position_parts: List[np.ndarray] = []
+        cursor = 0
+        last_point: Optional[np.ndarray] = None
+        pending: List[Dict[str, Any]] = []
+
+        def flush():
+            nonlocal cursor, last_point
+            if not pending:
+                return
+            points = [self._job_step_to_point(s) for s in pending]
+            if last_point is not None:
+                points.insert(0, {"joint_angles": last_point.tolist()})
+            times, positions = self._plan_points(points)
+            step = {"type": TRAJECTORY_STEP_TYPE, "start": cursor, "stop": cursor + len(times),
+                    "duration": float(times[-1]), "step_ids": [s.get("step_id") for s in pending],
+                    "approach_duration": float(pending[0].get("duration", 0) or 0)}
+            steps.append(step)
+            times_parts.append(times)
+            position_parts.append(positions)
+            cursor += len(times)
+            last_point = positions[-1]
+            pending.clear()
+
+        for raw_step in job.get("steps", []):
+            if raw_step.get("type") == MOTION_STEP_TYPE:
+                pending.append(raw_step)
+            else:
+                flush()
+                steps.append(dict(raw_step))
+        flush()
+
+        if not position_parts:
+            return np.zeros(0), np.zeros((0, 6)), steps
+        return np.concatenate(times_parts), np.concatenate(position_parts), steps
+
+    @staticmethod
+    def _job_step_to_point(step: Dict[str, Any]) -> Dict[str, Any]:
+        """把作业的 move_joints 步骤转换为示教点格式（复用示教程序的限速换算）"""
+        params = dict(step.get("parameters") or {})
+        interpolation_params = {k: v for k, v in params.items()
+                                if k not in ("joint_angles", "end_pose", "mode", "interpolation_type",
+                                             "interpolation_params_type")}
+        interpolation_params["type"] = params.get("interpolation_params_type")
+        return {"joint_angles": params["joint_angles"], "interpolation_type": params.get("interpolation_type"),
+                "interpolation_params": interpolation_params}
+
+    def _plan_points(self, points: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """关节插补的连续步骤前瞻混合，笛卡尔插补的步骤按末端直线逆解（见 lookahead_planner）"""
+        if len(points) == 1:
+            return np.zeros(1), np.array([points[0]["joint_angles"]], dtype=np.float64)
+        if self._ik is None and any(p.get("interpolation_type") == "cartesian" for p in points[1:]):
+            from .batch_ik import BatchInverseKinematics
+            self._ik = BatchInverseKinematics.from_config(os.path.join(self.config_dir, "dh_parameters_config.json"))
+        trajectory = plan_program_points(points, self.reducer_ratios, self.planner, ik=self._ik)
+        times, positions, _ = trajectory.sample(self.rate_hz)
+        return times, positions
+
+
+def run_compiled_steps(compiled: CompiledTrajectory,
+                       run_motion: Callable[[CompiledTrajectory, Dict[str, Any]], Dict[str, Any]],
+                       handlers: Dict[str, Callable[[Dict[str, Any]], bool]]) -> Dict[str, Any]:
+    """
+    按顺序执行预编译作业：运动段交给 run_motion，其余步骤按类型交给 handlers
+
+    任一步骤失败（运动段未完成、处理函数返回 False 或抛出异常、没有对应处理函数）即停止，
+    后续步骤不再执行。
+
+    Args:
+        compiled: TrajectoryCompiler.compile_job 的结果
+        run_motion: 执行一个运动段 (compiled, step) -> dict，返回值的 completed 表示是否完成
+            （通常为 MotionSDK.run_compiled_motion）
+        handlers: {步骤类型: (step) -> bool}，例如 io_control / wait / emergency_stop / 夹爪
+
+    Returns:
+        dict: completed（全部步骤成功）、steps（已执行步骤的 {"index", "type", "ok", "result"}）、
+              failed_step（失败步骤的下标，全部成功时为 None）
+    """
+    executed: List[Dict[str, Any]] = []
+    for index, step in enumerate(compiled.steps):
+        step_type = step.get("type")
+        result: Any = None
+        try:
+            if step_type == TRAJECTORY_STEP_TYPE:
+                result = run_motion(compiled, step)
+                ok = bool(result.get("completed", False))
+            elif step_type in handlers:
+                ok = bool(handlers[step_type](step))
+            else:
+                print(f" ⚠️ [TrajectoryCompiler] 作业 {compiled.name} 第 {index + 1} 步类型未知: {step_type}")
+                ok = False
+        except Exception as e:
+            print(f" ⚠️ [TrajectoryCompiler] 作业 {compiled.name} 第 {index + 1} 步 ({step_type}) 执行失败: {e}")
+            result, ok = str(e), False
+        executed.append({"index": index, "type": step_type, "ok": ok, "result": result})
+        if not ok:
+            return {"completed": False, "steps": executed, "failed_step": index}
+    return {"completed": True, "steps": executed, "failed_step": None}
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""
+关节轨迹实时流式下发
+
+`c_a_j` / `c_a_p` 每段运动发送一次梯形位置命令，再轮询 `is_in_position` 等待到位，
+多路点运动会在每个路点处停顿。`TrajectoryStreamer` 则以固定控制频率逐点下发：
+
+- 独立的高优先级线程，基于 `time.perf_counter_ns()` 的绝对截止时刻调度（无累计漂移）；
+- 每个周期把所有关节的目标写入一帧 Y42 直通限速位置命令 (FB)，经 CAN ID 0 一次发出；
+- 统计截止时刻错过次数与发送抖动，便于评估控制回路的实时性；
+- 发送失败（总线断开等致命异常，或连续多次出错）时立即停止下发，`completed` 只在每一帧都发送成功时为 True。
+
+本模块不直接依赖 Control_Core，编码器（MultiMotorFrameEncoder）与关节映射（JointMap）
+由调用方注入，见 `Embodied_SDK.motion.MotionSDK.stream_trajectory`。
+"""
+
+import sys
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+import numpy as np
+
+
+@dataclass
+class StreamStats:
+    """流式下发统计信息"""
+    points: int = 0                 # 轨迹点数
+    sent: int = 0                   # 成功发送的帧数
+    skipped: int = 0                # 因严重超时被跳过的轨迹点数
+    deadline_misses: int = 0        # 发送时刻晚于截止时刻超过半个周期的次数
+    send_errors: int = 0            # 发送异常次数
+    error: str = ""                 # 导致下发中止的发送异常
+    jitter_mean_us: float = 0.0     # 平均发送延迟 (微秒)
+    jitter_p99_us: float = 0.0      # 99分位发送延迟 (微秒)
+    jitter_max_us: float = 0.0      # 最大发送延迟 (微秒)
+    duration_s: float = 0.0         # 实际总耗时 (秒)
+    completed: bool = False         # 是否完整发送（未被中途停止，且没有发送异常）
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _raise_thread_priority() -> None:
+    """尽力提升当前线程优先级（Windows 下设为 TIME_CRITICAL，其他平台忽略）"""
+    if sys.platform != "win32":
+        return
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        THREAD_PRIORITY_TIME_CRITICAL = 15
+        kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_TIME_CRITICAL)
+    except Exception:
+        pass
+
+
+class TrajectoryStreamer:
+    """
+    固定频率的关节轨迹流式下发器
+
+    使用示例：
+    ```python
+    streamer = TrajectoryStreamer(can_interface, joint_map, encoder)
+    stats = streamer.stream(points, rate_hz=100)      # points: (N, 6) 关节角度(度)
+    print(stats.deadline_misses, stats.jitter_p99_us)
+    ```
+    """
+
+    # 截止时刻前改为忙等的时间窗（纳秒），兼顾 CPU 占用与发送精度
+    SPIN_WINDOW_NS = 1_500_000
+
+    def __init__(self, can_interface, joint_map, encoder, *,
+                 speed_margin: float = 1.2, min_speed_rpm: float = 1.0, max_speed_rpm: float = 3000.0,
+                 on_send: Optional[Callable[[], None]] = None, max_consecutive_errors: int = 3,
+                 fatal_errors: Tuple[Type[BaseException], ...] = ()):
+        """
+        初始化流式下发器
+
+        Args:
+            can_interface: 共享CAN接口（SLCANInterface / PipelinedSLCANInterface）
+            joint_map: JointMap，关节角 → 电机角换算
+            encoder: MultiMotorFrameEncoder（direct 模式，电机顺序与 joint_map 一致）
+            speed_margin: 限速裕量，实际限速 = 本周期所需速度 × speed_margin
+            min_speed_rpm: 最小限速 (RPM)，避免低速段电机跟不上
+            max_speed_rpm: 最大限速 (RPM)
+            on_send: 可选，每次发送前的回调（例如通知关节状态缓存有新命令）
+            max_consecutive_errors: 连续发送失败达到该次数时停止下发
+            fatal_errors: 出现即停止下发的异常类型（如 CANInterfaceException）
+        """
+        if list(encoder.motor_ids) != [int(m) for m in joint_map.motor_ids]:
+            raise ValueError("编码器与关节映射的电机顺序不一致")
+        self.can_interface = can_interface
+        self.joint_map = joint_map
+        self.encoder = encoder
+        self.speed_margin = float(speed_margin)
+        self.min_speed_rpm = float(min_speed_rpm)
+        self.max_speed_rpm = float(max_speed_rpm)
+        self.on_send = on_send
+        self.max_consecutive_errors = max(1, int(max_consecutive_errors))
+        self.fatal_errors = tuple(fatal_errors)
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._done_event = threading.Event()
+        self._done_event.set()
+        self._stats = StreamStats()
+
+        # 普通 SLCAN 接口按 list 接收命令数据，流水线接口可直接接收 memoryview
+        self._accepts_buffer = hasattr(can_interface, "submit")
+
+    # ------------------------------------------------------------------
+    # 轨迹预处理
+    # ------------------------------------------------------------------
+
+    def prepare(self, points, rate_hz: float):
+        """
+        把关节轨迹换算为逐周期的电机目标角度与限速
+
+        Args:
+            points: (N, 关节数) 关节角度 (度)，按 rate_hz 等间隔采样
+            rate_hz: 控制频率 (Hz)
+
+        Returns:
+            (motor_degrees, motor_rpm): 两个 (N, 关节数) 数组
+        """
+        points = np.asarray(points, dtype=np.float64)
+        if points.ndim != 2 or points.shape[1] != len(self.joint_map):
+            raise ValueError(f"轨迹点形状应为 (N, {len(self.joint_map)})，实际: {points.shape}")
+        if len(points) == 0:
+            raise ValueError("轨迹点为空")
+
+        motor_degrees = self.joint_map.joint_to_motor_degrees(points)
+
+        # 每个周期需要的关节速度：相邻点差分 × 频率（首点沿用第二点的速度）
+        joint_velocity = np.empty_like(points)
+        if len(points) > 1:
+            joint_velocity[1:] = np.diff(points, axis=0) * rate_hz
+            joint_velocity[0] = joint_velocity[1]
+        else:
+            joint_velocity[:] = 0.0
+        motor_rpm = self.joint_map.joint_velocity_to_motor_rpm(joint_velocity)
+        motor_rpm *= self.speed_margin
+        np.clip(motor_rpm, self.min_speed_rpm, self.max_speed_rpm, out=motor_rpm)
+        return motor_degrees, motor_rpm
+
+    def encode_frames(self, points, rate_hz: float) -> np.ndarray:
+        """
+        把整条关节轨迹预先编码为逐周期的 Y42 帧
+
+        Args:
+            points: (N, 关节数) 关节角度 (度)，按 rate_hz 等间隔采样
+            rate_hz: 控制频率 (Hz)
+
+        Returns:
+            np.ndarray: (N, 帧长) uint8，每行为一帧，可交给 start_frames() 直接下发
+        """
+        motor_degrees, motor_rpm = self.prepare(points, rate_hz)
+        frames = np.empty((len(motor_degrees), len(self.encoder)), dtype=np.uint8)
+        for i in range(len(motor_degrees)):
+            frames[i] = np.frombuffer(self.encoder.encode(motor_degrees[i], motor_rpm[i]), dtype=np.uint8)
+        return frames
+
+    # ------------------------------------------------------------------
+    # 下发控制
+    # ------------------------------------------------------------------
+
+    def start(self, points, rate_hz: float = 100.0) -> None:
+        """
+        在后台线程中开始下发（非阻塞）
+
+        Args:
+            points: (N, 关节数) 关节角度 (度)，按 rate_hz 等间隔采样
+            rate_hz: 控制频率 (Hz)
+        """
+        self._check_can_start(rate_hz)
+        motor_degrees, motor_rpm = self.prepare(points, rate_hz)
+        self._launch(len(motor_degrees), lambda i: self._send(motor_degrees[i], motor_rpm[i]), rate_hz)
+
+    def start_frames(self, frames, rate_hz: float = 100.0) -> None:
+        """
+        在后台线程中下发预编码的帧（非阻塞），例如轨迹缓存中加载的 frames
+
+        Args:
+            frames: (N, 帧长) uint8，encode_frames() 的输出
+            rate_hz: 编码时使用的控制频率 (Hz)
+        """
+        self._check_can_start(rate_hz)
+        frames = np.ascontiguousarray(frames, dtype=np.uint8)
+        if frames.ndim != 2 or frames.shape[1] != len(self.encoder) or len(frames) == 0:
+            raise ValueError(f"帧数组形状应为 (N, {len(self.encoder)})，实际: {frames.shape}")
+        self._launch(len(frames), lambda i: self._send_frame(frames[i]), rate_hz)
+
+    def stream(self, points, rate_hz: float = 100.0) -> StreamStats:
+        """下发整条轨迹并阻塞等待完成，返回统计信息"""
+        self.start(points, rate_hz)
+        return self.wait()
+
+    def stream_frames(self, frames, rate_hz: float = 100.0) -> StreamStats:
+        """下发预编码的帧并阻塞等待完成，返回统计信息"""
+        self.start_frames(frames, rate_hz)
+        return self.wait()
+
+    def wait(self, timeout: Optional[float] = None) -> StreamStats:
+        """等待当前轨迹下发结束，返回统计信息"""
+        self._done_event.wait(timeout)
+        return self._stats
+
+    def stop(self) -> None:
+        """请求停止下发（电机停在最后一次收到的目标处）"""
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+
+    def is_running(self) -> bool:
+        """是否正在下发"""
+        return not self._done_event.is_set()
+
+    @property
+    def stats(self) -> StreamStats:
+        """最近一次（或当前）下发的统计信息"""
+        return self._stats
+
+    def _check_can_start(self, rate_hz: float) -> None:
+        if self.is_running():
+            raise RuntimeError("已有轨迹正在下发")
+        if rate_hz <= 0:
+            raise ValueError("控制频率必须大于0")
+
+    def _launch(self, count: int, send: Callable[[int], None], rate_hz: float) -> None:
+        self._stop_event.clear()
+        self._done_event.clear()
+        self._stats = StreamStats(points=count)
+        self._thread = threading.Thread(
+            target=self._run, args=(count, send, rate_hz),
+            name="trajectory-streamer", daemon=True
+        )
+        self._thread.start()
+
+    def _send(self, motor_degrees: np.ndarray, motor_rpm: np.ndarray) -> None:
+        frame = self.encoder.encode(motor_degrees, motor_rpm)
+        if self.on_send is not None:
+            self.on_send()
+        if self._accepts_buffer:
+            self.can_interface.send_command_no_response(0, frame)
+        else:
+            self.can_interface.send_command_no_response(0, list(frame))
+
+    def _send_frame(self, frame: np.ndarray) -> None:
+        if self.on_send is not None:
+            self.on_send()
+        if self._accepts_buffer:
+            self.can_interface.send_command_no_response(0, memoryview(frame))
+        else:
+            self.can_interface.send_command_no_response(0, frame.tolist())
+
+    def _run(self, count: int, send: Callable[[int], None], rate_hz: float) -> None:
+        _raise_thread_priority()
+        stats = self._stats
+        period_ns = int(round(1e9 / rate_hz))
+        lateness_ns = np.zeros(count, dtype=np.int64)
+        sent_mask = np.zeros(count, dtype=np.bool_)
+
+        start_ns = time.perf_counter_ns()
+        index = 0
+        consecutive_errors = 0
+        try:
+            while index < count and not self._stop_event.is_set():
+                deadline_ns = start_ns + index * period_ns
+
+                # 先休眠到截止时刻前的忙等窗口，再忙等到截止时刻
+                remaining_ns = deadline_ns - time.perf_counter_ns()
+                if remaining_ns > self.SPIN_WINDOW_NS:
+                    if self._stop_event.wait((remaining_ns - self.SPIN_WINDOW_NS) / 1e9):
+                        break
+                while time.perf_counter_ns() < deadline_ns:
+                    pass
+
+                now_ns = time.perf_counter_ns()
+                late_ns = now_ns - deadline_ns
+                if late_ns >= period_ns and index < count - 1:
+                    # 已错过整周期：跳到当前时刻对应的轨迹点，保持时间轴不漂移
+                    target = min(count - 1, index + int(late_ns // period_ns))
+                    stats.skipped += target - index
+                    stats.deadline_misses += 1
+                    index = target
+                    deadline_ns = start_ns + index * period_ns
+                    late_ns = now_ns - deadline_ns
+                elif late_ns > period_ns // 2:
+                    stats.deadline_misses += 1
+
+                try:
+                    send(index)
+                except Exception as e:
+                    stats.send_errors += 1
+                    consecutive_errors += 1
+                    if isinstance(e, self.fatal_errors) or consecutive_errors >= self.max_consecutive_errors:
+                        stats.error = str(e) or type(e).__name__
+                        print(f" ⚠️ [TrajectoryStreamer] 发送失败，停止下发 "
+                              f"(第 {index + 1}/{count} 点，共 {stats.send_errors} 次失败): {stats.error}")
+                        break
+                else:
+                    consecutive_errors = 0
+                    stats.sent += 1
+                    lateness_ns[index] = max(0, late_ns)
+                    sent_mask[index] = True
+                index += 1
+
+            stats.completed = index >= count and stats.send_errors == 0
+        finally:
+            stats.duration_s = (time.perf_counter_ns() - start_ns) / 1e9
+            if sent_mask.any():
+                lateness_us = lateness_ns[sent_mask] / 1e3
+                stats.jitter_mean_us = float(lateness_us.mean())
+                stats.jitter_p99_us = float(np.percentile(lateness_us, 99))
+                stats.jitter_max_us = float(lateness_us.max())
+            self._done_event.set()
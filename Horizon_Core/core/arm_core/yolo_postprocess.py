@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+YOLO 输出的向量化解码与按类别批量 NMS
+
+`YOLOOnnxDetector._postprocess` 先整体转置输出、逐类别 / 逐保留框循环做 argsort 式 NMS，
+候选框多（拥挤画面、低阈值）时后处理成为 CPU 上的主要耗时。
+
+本模块的后处理全部是数组运算：
+- 解码：YOLOv8 输出 (4+nc, N) 不做整体转置，按行求类别最大值后先用 conf_thres 过滤，
+  只对候选列取 argmax；YOLOv5 输出 (N, 5+nc) 先按 objectness 过滤；
+- 预 NMS top-k：候选数超过 `pre_nms_topk` 时用 argpartition 只保留得分最高的 k 个；
+- NMS：在一个 float64 IoU 矩阵上做抑制，类别掩码限定只有同类框互相抑制，
+  “被更高分且保留的框抑制” 的不动点迭代与逐框贪心 NMS 结果一致，通常 2~3 次迭代收敛；
+- 最多输出 `max_det` 个目标。
+
+`FastYOLODetector` 是 `YOLOOnnxDetector` 的子类，替换预处理（`yolo_preprocess.LetterboxPreprocessor`）
+与后处理，输出格式不变：
+    { 'cls': int, 'score': float, 'bbox_xyxy': (x1,y1,x2,y2), 'center': (cx,cy) }
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .yolo_onnx_detector import YOLOOnnxDetector
+from .yolo_preprocess import LetterboxGeometry, LetterboxPreprocessor
+
+
+def decode_predictions(output: np.ndarray, conf_thres: float, pre_nms_topk: int = 300):
+    """
+    解码单张图像的原始输出
+
+    Args:
+        output: YOLOv8 (4+nc, N) 或 YOLOv5 (N, 5+nc)，可带 batch 维 1
+        conf_thres: 置信度阈值
+        pre_nms_topk: NMS 前最多保留的候选数
+
+    Returns:
+        (boxes_xyxy (K, 4), scores (K,), class_ids (K,))，按得分降序
+    """
+    out = np.asarray(output)
+    if out.ndim == 3:
+        out = out[0]
+
+    if out.shape[0] < out.shape[1]:
+        # YOLOv8：(4+nc, N)，不转置整个矩阵
+        cls = out[4:]
+        conf = cls.max(axis=0)
+        idx = np.flatnonzero(conf > conf_thres)
+        scores = conf[idx]
+        if len(idx) > pre_nms_topk:
+            top = np.argpartition(-scores, pre_nms_topk - 1)[:pre_nms_topk]
+            idx, scores = idx[top], scores[top]
+        class_ids = cls[:, idx].argmax(axis=0)
+        xywh = out[:4, idx].T
+    else:
+        # YOLOv5：(N, 5+nc)，score = obj * cls ≤ obj，先按 objectness 过滤
+        idx = np.flatnonzero(out[:, 4] > conf_thres)
+        cand = out[idx]
+        cls_scores = cand[:, 5:] * cand[:, 4:5]
+        class_ids = cls_scores.argmax(axis=1)
+        scores = cls_scores[np.arange(len(cand)), class_ids]
+        keep = scores > conf_thres
+        idx, scores, class_ids = np.flatnonzero(keep), scores[keep], class_ids[keep]
+        if len(idx) > pre_nms_topk:
+            top = np.argpartition(-scores, pre_nms_topk - 1)[:pre_nms_topk]
+            idx, scores, class_ids = idx[top], scores[top], class_ids[top]
+        xywh = cand[idx, :4]
+
+    order = np.argsort(-scores, kind="stable")
+    xywh, scores, class_ids = xywh[order], scores[order], class_ids[order]
+    half = xywh[:, 2:4] * 0.5
+    boxes = np.concatenate([xywh[:, :2] - half, xywh[:, :2] + half], axis=1)
+    return boxes, scores, class_ids
+
+
+def batched_nms(boxes: np.ndarray, class_ids: np.ndarray, iou_thres: float, max_det: int = 100,
+                workspace: Optional[Dict[str, np.ndarray]] = None) -> np.ndarray:
+    """
+    按类别的 NMS（输入已按得分降序），结果与逐框贪心 NMS 一致
+
+    IoU 在 float64 下按 inter / union 计算，只比较同类别的框（类别掩码，不做坐标偏移）。
+
+    Args:
+        boxes: (K, 4) xyxy
+        class_ids: (K,) 类别
+        iou_thres: IoU 阈值
+        max_det: 最多保留数
+        workspace: 可选，跨调用复用的 (K, K) 缓冲区（避免每帧重新分配大数组）
+
+    Returns:
+        np.ndarray: 保留框的下标（得分降序）
+    """
+    n = len(boxes)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    boxes = np.asarray(boxes, dtype=np.float64)
+    x1, y1, x2, y2 = (np.ascontiguousarray(v) for v in boxes.T)
+    areas = (x2 - x1) * (y2 - y1)
+
+    w, h, overlap, same, upper = _nms_buffers(workspace, n)
+    np.minimum(x2[:, None], x2, out=w)
+    w -= np.maximum(x1[:, None], x1, out=h)
+    np.maximum(w, 0, out=w)
+    np.minimum(y2[:, None], y2, out=h)
+    h -= np.maximum(y1[:, None], y1)
+    np.maximum(h, 0, out=h)
+    w *= h
+    # h <- union = area_i + area_j - inter，w <- IoU
+    np.add(areas[:, None], areas, out=h)
+    h -= w
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w /= h
+    np.greater(w, iou_thres, out=overlap)
+    # 只有同类别且得分更高（下标更小）的框能抑制当前框
+    np.equal(class_ids[:, None], class_ids, out=same)
+    overlap &= same
+    overlap &= upper
+
+    keep = np.ones(n, dtype=bool)
+    while True:
+        new_keep = ~overlap[keep].any(axis=0)
+        if np.array_equal(new_keep, keep):
+            break
+        keep = new_keep
+    return np.flatnonzero(keep)[:max_det]
+
+
+def _nms_buffers(workspace: Optional[Dict[str, np.ndarray]], n: int):
+    """(K, K) 工作缓冲区与严格上三角掩码；大缓冲区左上角的切片同样是严格上三角"""
+    if workspace is None:
+        return (np.empty((n, n), np.float64), np.empty((n, n), np.float64), np.empty((n, n), bool),
+                np.empty((n, n), bool), np.triu(np.ones((n, n), dtype=bool), k=1))
+    if workspace.get("size", 0) < n:
+        workspace["size"] = n
+        workspace["w"] = np.empty((n, n), np.float64)
+        workspace["h"] = np.empty((n, n), np.float64)
+        workspace["overlap"] = np.empty((n, n), bool)
+        workspace["same"] = np.empty((n, n), bool)
+        workspace["upper"] = np.triu(np.ones((n, n), dtype=bool), k=1)
+    return (workspace["w"][:n, :n], workspace["h"][:n, :n], workspace["overlap"][:n, :n],
+            workspace["same"][:n, :n], workspace["upper"][:n, :n])
+
+
+class FastYOLODetector(YOLOOnnxDetector):
+    """
+    使用复用缓冲区预处理与向量化后处理的 YOLOOnnxDetector（推理沿用父类）
+
+    Attributes:
+        pre_nms_topk: NMS 前保留的最多候选数
+        max_det: 每帧最多输出的目标数
+    """
+
+    def __init__(self, onnx_path, *args, pre_nms_topk: int = 300, max_det: int = 100, **kwargs):
+        super().__init__(onnx_path, *args, **kwargs)
+        self._init_postprocess_state(pre_nms_topk, max_det)
+
+    @classmethod
+    def with_session(cls, session, pre_nms_topk: int = 300, max_det: int = 100) -> "FastYOLODetector":
+        """
+        使用外部提供的会话构造（不经过父类 __init__，不会再加载一份模型）
+
+        Args:
+            session: InferenceSession 或兼容对象（run / get_inputs / get_outputs），如共享推理服务的代理
+            pre_nms_topk: NMS 前保留的最多候选数
+            max_det: 每帧最多输出的目标数
+        """
+        detector = cls.__new__(cls)
+        bind_session(detector, session)
+        detector._init_postprocess_state(pre_nms_topk, max_det)
+        return detector
+
+    def _init_postprocess_state(self, pre_nms_topk: int, max_det: int) -> None:
+        self.pre_nms_topk = max(1, int(pre_nms_topk))
+        self.max_det = max(1, int(max_det))
+        self._nms_workspace: Dict[str, np.ndarray] = {}
+        self._letterbox: Optional[LetterboxPreprocessor] = None
+
+    def _preprocess(self, bgr):
+        # 复用缓冲区的 letterbox；模型输入为 uint8 NHWC（融合归一化）时不再生成 float 张量
+        if self._letterbox is None:
+            self._letterbox = LetterboxPreprocessor.from_session(self.session)
+        return self._letterbox(bgr)
+
+    def _postprocess(self, outputs, meta, conf_thres, iou_thres) -> List[Dict[str, Any]]:
+        boxes, scores, class_ids = detect_boxes(outputs[0], _geometry_from_meta(meta), conf_thres, iou_thres,
+                                                self.pre_nms_topk, self.max_det, self._nms_workspace)
+        boxes = boxes.astype(np.int64)
+        centers = (boxes[:, :2] + boxes[:, 2:]) // 2
+        return [
+            {"cls": int(c), "score": float(s), "bbox_xyxy": tuple(b.tolist()), "center": tuple(ct.tolist())}
+            for c, s, b, ct in zip(class_ids.tolist(), scores.tolist(), boxes, centers)
+        ]
+
+
+def bind_session(detector, session) -> None:
+    """
+    按会话设置 YOLOOnnxDetector 推理所需的状态（session / input_name / in_h / in_w / num_classes）
+
+    用于以 `cls.__new__(cls)` 构造、未经过 `YOLOOnnxDetector.__init__` 的检测器。
+    """
+    model_input = session.get_inputs()[0]
+    letterbox = LetterboxPreprocessor.from_session(session)
+    detector.session = session
+    detector.input_name = model_input.name
+    detector.in_h, detector.in_w = letterbox.in_h, letterbox.in_w
+    # YOLOv8 输出 (1, 4+nc, N)；YOLOv5 输出 (1, N, 5+nc)
+    shape = list(session.get_outputs()[0].shape)
+    num_classes = None
+    if len(shape) == 3 and all(isinstance(d, int) and d > 0 for d in shape[1:]):
+        num_classes = shape[1] - 4 if shape[1] < shape[2] else shape[2] - 5
+    detector.num_classes = num_classes
+
+
+def detect_boxes(output: np.ndarray, geometry: LetterboxGeometry, conf_thres: float, iou_thres: float,
+                 pre_nms_topk: int = 300, max_det: int = 100,
+                 workspace: Optional[Dict[str, np.ndarray]] = None):
+    """
+    解码 + NMS + 映射回原图坐标
+
+    Returns:
+        (boxes_xyxy (M, 4) float，原图坐标, scores (M,), class_ids (M,))，按得分降序
+    """
+    boxes, scores, class_ids = decode_predictions(output, conf_thres, pre_nms_topk)
+    keep = batched_nms(boxes, class_ids, iou_thres, max_det, workspace)
+    boxes = boxes[keep]
+    boxes[:, [0, 2]] = np.clip((boxes[:, [0, 2]] - geometry.left) / geometry.ratio, 0, geometry.width - 1)
+    boxes[:, [1, 3]] = np.clip((boxes[:, [1, 3]] - geometry.top) / geometry.ratio, 0, geometry.height - 1)
+    return boxes, scores[keep], class_ids[keep]
+
+
+def _geometry_from_meta(meta) -> LetterboxGeometry:
+    """从预处理元数据取 letterbox 参数（兼容 LetterboxGeometry 与字典形式）"""
+    if isinstance(meta, LetterboxGeometry):
+        return meta
+    if isinstance(meta, dict) and "r" in meta:
+        return LetterboxGeometry(float(meta["r"]), float(meta.get("left", 0)), float(meta.get("top", 0)),
+                                 int(meta["w0"]), int(meta["h0"]))
+    raise ValueError(f"无法解析预处理元数据: {type(meta).__name__}")
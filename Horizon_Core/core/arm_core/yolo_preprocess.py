@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+YOLO 输入的 letterbox 预处理（复用缓冲区）
+
+`YOLOOnnxDetector._preprocess` 每帧执行 resize → copyMakeBorder → astype(float32) → transpose → 归一化，
+每一步都分配新数组；640×640 输入每帧要分配并写入数 MB 内存，低功耗 CPU 上 30 FPS 时开销明显。
+
+`LetterboxPreprocessor`：
+- 按输入分辨率缓存 letterbox 几何参数（缩放比例、缩放尺寸、填充）；
+- 每个线程一组预分配缓冲区：uint8 画布（填充区只在分辨率变化时重写）与 float32 输入张量，
+  缩放结果直接写入画布（整行填充时写入原位），通道翻转 + HWC→CHW + /255 由一次 ufunc 写入输入张量；
+- 模型输入为 uint8 NHWC（归一化、BGR→RGB、转置已融合进模型的变体）时直接把画布作为输入，
+  完全省去 float 拷贝。
+
+返回的张量在同一线程下一次调用时会被覆盖，调用方需在此之前完成推理。
+"""
+
+import threading
+from typing import Dict, NamedTuple, Tuple
+
+import numpy as np
+
+
+DEFAULT_INPUT_SIZE = 640
+PAD_VALUE = 114
+
+
+class LetterboxGeometry(NamedTuple):
+    """letterbox 几何参数：缩放比例、左 / 上填充、原图宽高"""
+
+    ratio: float
+    left: float
+    top: float
+    width: int
+    height: int
+
+
+def letterbox_geometry(src_shape: Tuple[int, int], dst_shape: Tuple[int, int]) -> LetterboxGeometry:
+    """
+    按等比缩放 + 居中填充计算 letterbox 参数
+
+    Args:
+        src_shape: 原图 (高, 宽)
+        dst_shape: 网络输入 (高, 宽)
+    """
+    h0, w0 = int(src_shape[0]), int(src_shape[1])
+    in_h, in_w = int(dst_shape[0]), int(dst_shape[1])
+    r = min(in_h / h0, in_w / w0)
+    nw, nh = int(round(w0 * r)), int(round(h0 * r))
+    left = int(round((in_w - nw) / 2.0 - 0.1))
+    top = int(round((in_h - nh) / 2.0 - 0.1))
+    return LetterboxGeometry(r, left, top, w0, h0)
+
+
+class LetterboxPreprocessor:
+    """
+    复用缓冲区的 letterbox 预处理（线程安全：缓冲区按线程分配）
+
+    Attributes:
+        in_h / in_w: 网络输入尺寸
+        layout: "nchw"（float32，RGB，/255）或 "nhwc_uint8"（uint8，BGR，归一化已融合进模型）
+    """
+
+    def __init__(self, input_size: Tuple[int, int] = (DEFAULT_INPUT_SIZE, DEFAULT_INPUT_SIZE),
+                 layout: str = "nchw", pad_value: int = PAD_VALUE):
+        """
+        Args:
+            input_size: 网络输入 (高, 宽)
+            layout: 输入布局，"nchw" 或 "nhwc_uint8"
+            pad_value: 填充灰度值
+        """
+        if layout not in ("nchw", "nhwc_uint8"):
+            raise ValueError(f"未知的输入布局: {layout}")
+        self.in_h, self.in_w = int(input_size[0]), int(input_size[1])
+        self.layout = layout
+        self.pad_value = int(pad_value)
+        self._geometry: Dict[Tuple[int, int], Tuple[LetterboxGeometry, int, int]] = {}
+        self._local = threading.local()
+
+    @classmethod
+    def from_session(cls, session, default_size: int = DEFAULT_INPUT_SIZE) -> "LetterboxPreprocessor":
+        """
+        按模型输入（类型与形状）选择布局与尺寸
+
+        Args:
+            session: InferenceSession 或兼容对象（get_inputs）
+            default_size: 输入尺寸为动态维度时使用的边长
+        """
+        model_input = session.get_inputs()[0]
+        shape = list(model_input.shape)
+        uint8 = "uint8" in str(getattr(model_input, "type", ""))
+        if uint8:
+            dims = shape[1:3]
+        else:
+            dims = shape[2:4]
+        size = tuple(d if isinstance(d, int) and d > 0 else default_size for d in dims)
+        return cls(size, layout="nhwc_uint8" if uint8 else "nchw")
+
+    def geometry(self, src_shape: Tuple[int, int]) -> LetterboxGeometry:
+        """指定分辨率的 letterbox 参数（缓存）"""
+        return self._entry(int(src_shape[0]), int(src_shape[1]))[0]
+
+    def _entry(self, h0: int, w0: int) -> Tuple[LetterboxGeometry, int, int]:
+        entry = self._geometry.get((h0, w0))
+        if entry is None:
+            geometry = letterbox_geometry((h0, w0), (self.in_h, self.in_w))
+            entry = (geometry, int(round(w0 * geometry.ratio)), int(round(h0 * geometry.ratio)))
+            self._geometry[(h0, w0)] = entry
+        return entry
+
+    def _buffers(self):
+        local = self._local
+        if getattr(local, "canvas", None) is None:
+            local.canvas = np.full((self.in_h, self.in_w, 3), self.pad_value, dtype=np.uint8)
+            local.blob = np.empty((1, 3, self.in_h, self.in_w), dtype=np.float32) if self.layout == "nchw" else None
+            local.resized = {}
+            local.last_size = None
+        return local
+
+    def __call__(self, bgr: np.ndarray):
+        """
+        Args:
+            bgr: BGR uint8 图像 (H, W, 3)
+
+        Returns:
+            (input_tensor, LetterboxGeometry)：nchw 为 (1, 3, H, W) float32，nhwc_uint8 为 (1, H, W, 3) uint8
+        """
+        import cv2
+
+        h0, w0 = bgr.shape[:2]
+        geometry, nw, nh = self._entry(h0, w0)
+        buffers = self._buffers()
+        canvas = buffers.canvas
+        top, left = int(geometry.top), int(geometry.left)
+
+        if buffers.last_size != (nh, nw):
+            # 缩放尺寸变化时重写填充区
+            canvas.fill(self.pad_value)
+            buffers.last_size = (nh, nw)
+
+        roi = canvas[top:top + nh, left:left + nw]
+        if (nw, nh) == (w0, h0):
+            roi[...] = bgr
+        elif nw == self.in_w:
+            # 整行宽度：画布中的目标区域是连续内存，直接作为 resize 的输出
+            out = cv2.resize(bgr, (nw, nh), dst=roi, interpolation=cv2.INTER_LINEAR)
+            if out is not roi:
+                roi[...] = out
+        else:
+            resized = buffers.resized.get((nh, nw))
+            if resized is None:
+                resized = buffers.resized[(nh, nw)] = np.empty((nh, nw, 3), dtype=np.uint8)
+            out = cv2.resize(bgr, (nw, nh), dst=resized, interpolation=cv2.INTER_LINEAR)
+            roi[...] = out
+
+        if self.layout == "nhwc_uint8":
+            return canvas[None], geometry
+        # BGR→RGB、HWC→CHW、/255 在一次 ufunc 中写入预分配的 float32 张量
+        np.multiply(canvas.transpose(2, 0, 1)[::-1], np.float32(1.0 / 255.0), out=buffers.blob[0],
+                    casting="unsafe")
+        return buffers.blob, geometry
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+自适应检测间隔跟随基准测试工具
+==================================
+
+在同一段视频上对比逐帧检测（`detect_interval=1`，即 `SingleObjectFollower` 的行为）与
+`AdaptiveObjectFollower` 的各检测间隔：
+- CPU：进程 CPU 时间（含 onnxruntime 线程）/ 帧、墙钟时间 / 帧、相对逐帧检测的 CPU 降幅；
+- 锁定：输出有效位置的帧占比、与逐帧检测结果偏差不超过 --tolerance 像素的帧占比（一致率）、
+  平均 / p95 偏差，以及检测帧占比与跟踪失效触发的强制检测次数。
+
+视频先全部读入内存，计时不包含解码与采集。
+
+用法：
+    python example/developer_tools/benchmark_adaptive_follower.py --video data/follow.mp4
+    python example/developer_tools/benchmark_adaptive_follower.py --video 0 --frames 300 --intervals 1 3 5 8
+    python example/developer_tools/benchmark_adaptive_follower.py --video data/follow.mp4 --tracker mosse --output report.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# 添加项目根目录到路径
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(PROJECT_ROOT)
+
+from Horizon_Core.core.arm_core.adaptive_follower import AdaptiveObjectFollower, TRACKER_TYPES
+from Horizon_Core.core.arm_core.model_variants import resolve_detector_model
+from Horizon_Core.core.arm_core.yolo_postprocess import FastYOLODetector
+
+
+def read_frames(source, limit):
+    """读取视频文件或摄像头（数字 ID）的前 limit 帧"""
+    import cv2
+
+    cap = cv2.VideoCapture(int(source) if str(source).isdigit() else source)
+    if not cap.isOpened():
+        raise SystemExit(f"无法打开视频源: {source}")
+    frames = []
+    try:
+        while len(frames) < limit:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            frames.append(frame)
+    finally:
+        cap.release()
+    return frames
+
+
+def run_follower(follower, frames):
+    """
+    Returns:
+        (统计字典, 每帧中心 (N, 2)，无效帧为 NaN)
+    """
+    centers = np.full((len(frames), 2), np.nan)
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    for i, frame in enumerate(frames):
+        ok, center = follower.update(frame)
+        if ok and center is not None:
+            centers[i] = center
+    cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+    stats = follower.stats() if hasattr(follower, "stats") else {}
+    stats["cpu_ms"] = cpu * 1000.0 / len(frames)
+    stats["wall_ms"] = wall * 1000.0 / len(frames)
+    return stats, centers
+
+
+def lock_quality(centers, reference, tolerance):
+    """与逐帧检测结果的一致性"""
+    valid = ~np.isnan(centers[:, 0])
+    both = valid & ~np.isnan(reference[:, 0])
+    error = np.linalg.norm(centers[both] - reference[both], axis=1)
+    return {
+        "locked": float(valid.mean()),
+        "agreement": float(np.mean(error <= tolerance)) if len(error) else float("nan"),
+        "mean_error": float(error.mean()) if len(error) else float("nan"),
+        "p95_error": float(np.percentile(error, 95)) if len(error) else float("nan"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比逐帧检测与自适应检测间隔跟随的 CPU 占用与锁定质量")
+    parser.add_argument("--video", required=True, help="视频文件路径或摄像头 ID")
+    parser.add_argument("--frames", type=int, default=300, help="最多使用的帧数")
+    parser.add_argument("--model", default=os.path.join(PROJECT_ROOT, "config", "yolov8n.onnx"),
+                        help="ONNX 模型（按 config/detector_model.json 选择变体）")
+    parser.add_argument("--target-class", default=None, help="跟随的目标类别（默认得分最高的目标）")
+    parser.add_argument("--conf", type=float, default=0.5, help="检测置信度阈值")
+    parser.add_argument("--intervals", type=int, nargs="+", default=[3, 5, 8], help="对比的检测间隔")
+    parser.add_argument("--tracker", default="kcf", choices=TRACKER_TYPES, help="检测帧之间的跟踪器")
+    parser.add_argument("--tolerance", type=float, default=20.0, help="判定与逐帧检测一致的像素偏差")
+    parser.add_argument("--output", default=None, help="可选，保存 JSON 报告")
+    args = parser.parse_args()
+
+    frames = read_frames(args.video, args.frames)
+    if not frames:
+        raise SystemExit(f"视频源中没有可读取的帧: {args.video}")
+    detector = FastYOLODetector(resolve_detector_model(args.model))
+    print(f"帧 {len(frames)} 张，跟踪器: {args.tracker}，参考: 逐帧检测 (detect_interval=1)\n")
+
+    report = {}
+    reference = None
+    for interval in [1] + [n for n in args.intervals if n != 1]:
+        follower = AdaptiveObjectFollower(detector, conf_thres=args.conf, target_class=args.target_class,
+                                          detect_interval=interval, tracker_type=args.tracker)
+        stats, centers = run_follower(follower, frames)
+        if reference is None:
+            reference = centers
+        stats.update(lock_quality(centers, reference, args.tolerance))
+        report[interval] = stats
+
+    base_cpu = report[1]["cpu_ms"]
+    header = (f"{'间隔':>6}{'CPU ms':>10}{'墙钟 ms':>10}{'CPU 降幅':>10}{'检测占比':>10}{'强制检测':>10}"
+              f"{'锁定':>8}{'一致率':>8}{'平均偏差':>10}{'p95偏差':>10}")
+    print(header)
+    print("-" * len(header))
+    for interval, s in report.items():
+        s["cpu_speedup"] = base_cpu / s["cpu_ms"] if s["cpu_ms"] > 0 else float("nan")
+        print(f"{interval:>6}{s['cpu_ms']:>10.2f}{s['wall_ms']:>10.2f}{s['cpu_speedup']:>9.2f}x"
+              f"{s['detect_ratio']:>10.2f}{s['forced']:>10}{s['locked']:>8.2f}{s['agreement']:>8.2f}"
+              f"{s['mean_error']:>10.1f}{s['p95_error']:>10.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"frames": len(frames), "tracker": args.tracker, "tolerance": args.tolerance,
+                       "intervals": {str(k): v for k, v in report.items()}}, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 报告已保存: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+检测模型变体基准测试工具
+==================================
+
+在固定图像集上对比原始 FP32 模型与各变体（`build_yolo_variants.py` 生成）：
+- 延迟：预处理 / 推理 / 后处理 / 总计（均值、p50、p95，毫秒）与 FPS；
+- 精度偏差：以 FP32 模型的检测结果（score >= --conf）为参考标注，计算各模型的 mAP@0.5 与 mAP@0.5:0.95，
+  FP32 自身约为 1.0，差值即量化 / 缩小尺寸带来的精度损失。
+
+预处理与后处理使用运行时相同的实现（LetterboxPreprocessor / detect_boxes），结果可直接对应部署表现。
+在每台部署设备上运行一次，选择最快且 mAP 偏差可接受的变体写入 `config/detector_model.json`。
+
+用法：
+    python example/developer_tools/benchmark_yolo_variants.py
+    python example/developer_tools/benchmark_yolo_variants.py --images data --runs 20 --threads 4
+    python example/developer_tools/benchmark_yolo_variants.py --models config/yolov8n.onnx config/yolov8n.int8.onnx --output report.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# 添加项目根目录到路径
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(PROJECT_ROOT)
+
+from Horizon_Core.core.arm_core.yolo_preprocess import LetterboxPreprocessor
+from Horizon_Core.core.arm_core.yolo_postprocess import detect_boxes
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+IOU_THRESHOLDS = np.linspace(0.5, 0.95, 10)
+
+
+def find_images(root, limit=None):
+    """递归收集图像（按路径排序，保证每次使用同一组图像）"""
+    paths = sorted(
+        p for p in glob.glob(os.path.join(root, "**", "*"), recursive=True)
+        if p.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    return paths[:limit] if limit else paths
+
+
+def find_models(base_path):
+    """原始模型及同目录下的全部变体（原始模型排在第一位作为参考）"""
+    stem, ext = os.path.splitext(base_path)
+    variants = sorted(p for p in glob.glob(f"{stem}.*{ext}") if p != base_path)
+    return [base_path] + variants
+
+
+# ------------------------------------------------------------------
+# mAP
+# ------------------------------------------------------------------
+
+def box_iou(a, b):
+    """(N, 4) 与 (M, 4) xyxy 框的 IoU 矩阵"""
+    lt = np.maximum(a[:, None, :2], b[None, :, :2])
+    rb = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter = np.prod(np.clip(rb - lt, 0, None), axis=2)
+    area_a = np.prod(a[:, 2:] - a[:, :2], axis=1)
+    area_b = np.prod(b[:, 2:] - b[:, :2], axis=1)
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+
+def average_precision(recall, precision):
+    """COCO 101 点插值 AP"""
+    envelope = np.maximum.accumulate(np.concatenate([precision, [0.0]])[::-1])[::-1]
+    points = np.linspace(0, 1, 101)
+    idx = np.searchsorted(recall, points, side="left")
+    return float(np.mean(np.where(idx < len(recall), envelope[np.minimum(idx, len(envelope) - 1)], 0.0)))
+
+
+def mean_average_precision(predictions, references):
+    """
+    Args:
+        predictions: 每张图像 (boxes, scores, class_ids)
+        references: 每张图像 (boxes, class_ids)
+
+    Returns:
+        (mAP@0.5, mAP@0.5:0.95)
+    """
+    classes = sorted({int(c) for _, cls in references for c in cls})
+    if not classes:
+        return float("nan"), float("nan")
+    ap = np.zeros((len(classes), len(IOU_THRESHOLDS)))
+    for ci, c in enumerate(classes):
+        scores, hits, total = [], [], 0
+        for (p_boxes, p_scores, p_cls), (r_boxes, r_cls) in zip(predictions, references):
+            p_mask, r_mask = p_cls == c, r_cls == c
+            gt = r_boxes[r_mask]
+            total += len(gt)
+            pb, ps = p_boxes[p_mask], p_scores[p_mask]
+            if len(pb) == 0:
+                continue
+            order = np.argsort(-ps, kind="stable")
+            pb, ps = pb[order], ps[order]
+            tp = np.zeros((len(pb), len(IOU_THRESHOLDS)), dtype=bool)
+            if len(gt):
+                iou = box_iou(pb, gt)
+                for ti, t in enumerate(IOU_THRESHOLDS):
+                    matched = np.zeros(len(gt), dtype=bool)
+                    for i in range(len(pb)):
+                        candidates = np.where(~matched & (iou[i] >= t), iou[i], -1.0)
+                        j = int(np.argmax(candidates))
+                        if candidates[j] >= 0:
+                            matched[j] = True
+                            tp[i, ti] = True
+            scores.append(ps)
+            hits.append(tp)
+        if not scores or total == 0:
+            continue
+        order = np.argsort(-np.concatenate(scores), kind="stable")
+        tp = np.concatenate(hits)[order]
+        tp_cum = np.cumsum(tp, axis=0)
+        fp_cum = np.cumsum(~tp, axis=0)
+        for ti in range(len(IOU_THRESHOLDS)):
+            recall = tp_cum[:, ti] / total
+            precision = tp_cum[:, ti] / np.maximum(tp_cum[:, ti] + fp_cum[:, ti], 1)
+            ap[ci, ti] = average_precision(recall, precision)
+    return float(ap[:, 0].mean()), float(ap.mean())
+
+
+# ------------------------------------------------------------------
+# 基准测试
+# ------------------------------------------------------------------
+
+def percentiles(values):
+    values = np.asarray(values) * 1000.0
+    return {"mean": float(values.mean()), "p50": float(np.percentile(values, 50)),
+            "p95": float(np.percentile(values, 95))}
+
+
+def benchmark_model(model_path, images, runs, warmup, threads, conf_thres, iou_thres):
+    """
+    Returns:
+        (统计字典, 每张图像用于 mAP 的检测结果)
+    """
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if threads:
+        options.intra_op_num_threads = threads
+    session = ort.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+    input_name = session.get_inputs()[0].name
+    letterbox = LetterboxPreprocessor.from_session(session)
+    workspace = {}
+
+    timings = {"preprocess": [], "inference": [], "postprocess": [], "total": []}
+    detections = []
+    for bgr in images:
+        for i in range(warmup + runs):
+            t0 = time.perf_counter()
+            blob, geometry = letterbox(bgr)
+            t1 = time.perf_counter()
+            outputs = session.run(None, {input_name: blob})
+            t2 = time.perf_counter()
+            detect_boxes(outputs[0], geometry, conf_thres, iou_thres, workspace=workspace)
+            t3 = time.perf_counter()
+            if i >= warmup:
+                timings["preprocess"].append(t1 - t0)
+                timings["inference"].append(t2 - t1)
+                timings["postprocess"].append(t3 - t2)
+                timings["total"].append(t3 - t0)
+        # 计时用运行时阈值；mAP 用低阈值保留完整的得分排序
+        detections.append(detect_boxes(outputs[0], geometry, 0.001, iou_thres, pre_nms_topk=1000, max_det=300,
+                                       workspace=workspace))
+
+    stats = {name: percentiles(values) for name, values in timings.items()}
+    stats["fps"] = 1000.0 / stats["total"]["mean"]
+    stats["input"] = f"{letterbox.layout} {letterbox.in_w}x{letterbox.in_h}"
+    stats["size_mb"] = os.path.getsize(model_path) / 1e6
+    return stats, detections
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比 YOLO 模型变体的延迟与精度偏差")
+    parser.add_argument("--models", nargs="+", default=None,
+                        help="待测模型，第一个作为 FP32 参考（默认 config/yolov8n.onnx 及其全部变体）")
+    parser.add_argument("--images", default=os.path.join(PROJECT_ROOT, "data"), help="测试图像目录（递归）")
+    parser.add_argument("--limit", type=int, default=100, help="最多使用的图像数")
+    parser.add_argument("--runs", type=int, default=10, help="每张图像的计时次数")
+    parser.add_argument("--warmup", type=int, default=2, help="每张图像的预热次数")
+    parser.add_argument("--threads", type=int, default=None, help="onnxruntime intra-op 线程数")
+    parser.add_argument("--conf", type=float, default=0.25, help="运行时 / 参考标注的置信度阈值")
+    parser.add_argument("--iou", type=float, default=0.45, help="NMS IoU 阈值")
+    parser.add_argument("--output", default=None, help="可选，保存 JSON 报告")
+    args = parser.parse_args()
+
+    import cv2
+
+    models = args.models or find_models(os.path.join(PROJECT_ROOT, "config", "yolov8n.onnx"))
+    models = [m for m in models if os.path.exists(m)]
+    if not models:
+        raise SystemExit("未找到模型文件")
+    paths = find_images(args.images, args.limit)
+    images = [img for img in (cv2.imread(p) for p in paths) if img is not None]
+    if not images:
+        raise SystemExit(f"图像目录中没有可读取的图像: {args.images}")
+    print(f"图像 {len(images)} 张，每张计时 {args.runs} 次，参考模型: {os.path.basename(models[0])}\n")
+
+    report = {}
+    references = None
+    for model_path in models:
+        stats, detections = benchmark_model(model_path, images, args.runs, args.warmup, args.threads,
+                                             args.conf, args.iou)
+        if references is None:
+            references = [(boxes[scores >= args.conf], cls[scores >= args.conf]) for boxes, scores, cls in detections]
+        stats["map50"], stats["map50_95"] = mean_average_precision(detections, references)
+        report[os.path.basename(model_path)] = stats
+
+    header = f"{'模型':<32}{'输入':<20}{'MB':>7}{'推理ms':>9}{'总计ms':>9}{'p95ms':>9}{'FPS':>8}{'mAP50':>8}{'mAP50-95':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, s in report.items():
+        print(f"{name:<32}{s['input']:<20}{s['size_mb']:>7.1f}{s['inference']['mean']:>9.2f}"
+              f"{s['total']['mean']:>9.2f}{s['total']['p95']:>9.2f}{s['fps']:>8.1f}"
+              f"{s['map50']:>8.3f}{s['map50_95']:>10.3f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"images": len(images), "runs": args.runs, "models": report}, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 报告已保存: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+可达性地图生成工具
+==================================
+
+离线采样工作空间，生成 `config/reachability/reachability_map.npy`（及同名 .json 元数据）。
+生成后 MotionSDK.move_cartesian / VisualGraspSDK.grasp_at_pixel 等会在调用 c_a_p 之前
+查表，不可达的目标位姿立即拒绝。
+
+DH 参数或关节限制修改后需要重新生成（旧地图会因摘要不匹配而不再加载）。
+
+用法：
+    python example/developer_tools/build_reachability_map.py
+    python example/developer_tools/build_reachability_map.py --voxel 20 --yaw-step 15
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Horizon_Core.core.arm_core.reachability_map import (
+    DEFAULT_BOUNDS,
+    DEFAULT_VOXEL_SIZE,
+    ReachabilityMap,
+    get_reachability_map_path,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成机械臂工作空间可达性地图")
+    parser.add_argument("--output", default=get_reachability_map_path(), help="输出 .npy 路径")
+    parser.add_argument("--voxel", type=float, default=DEFAULT_VOXEL_SIZE, help="体素边长 (mm)")
+    parser.add_argument("--x", type=float, nargs=2, default=DEFAULT_BOUNDS[0], help="X 范围 (mm)")
+    parser.add_argument("--y", type=float, nargs=2, default=DEFAULT_BOUNDS[1], help="Y 范围 (mm)")
+    parser.add_argument("--z", type=float, nargs=2, default=DEFAULT_BOUNDS[2], help="Z 范围 (mm)")
+    parser.add_argument("--yaw-step", type=float, default=30.0, help="yaw 分箱步长 (度，覆盖整周)")
+    parser.add_argument("--pitch", type=float, nargs=3, default=(-30.0, 30.0, 3),
+                        metavar=("START", "STEP", "COUNT"), help="pitch 分箱")
+    parser.add_argument("--roll", type=float, nargs=3, default=(150.0, 30.0, 3),
+                        metavar=("START", "STEP", "COUNT"), help="roll 分箱")
+    parser.add_argument("--fk-samples", type=int, default=200000, help="补充的随机关节采样数")
+    args = parser.parse_args()
+
+    yaw_count = int(round(360.0 / args.yaw_step))
+    orientation_bins = (
+        (-180.0, 360.0 / yaw_count, yaw_count),
+        (args.pitch[0], args.pitch[1], int(args.pitch[2])),
+        (args.roll[0], args.roll[1], int(args.roll[2])),
+    )
+
+    def progress(ratio):
+        print(f"\r生成中... {ratio * 100:5.1f}%", end="", flush=True)
+
+    start = time.time()
+    reach = ReachabilityMap.build(
+        bounds=(args.x, args.y, args.z),
+        voxel_size=args.voxel,
+        orientation_bins=orientation_bins,
+        fk_samples=args.fk_samples,
+        progress=progress,
+    )
+    path = reach.save(args.output)
+    info = reach.to_dict()
+    print(f"\n✅ 已保存: {path}")
+    print(f"   体素: {info['shape']}，姿态箱: {yaw_count * int(args.pitch[2]) * int(args.roll[2])}")
+    print(f"   可达单元占比: {info['coverage'] * 100:.1f}%，耗时 {time.time() - start:.1f} 秒")
+
+
+if __name__ == "__main__":
+    main()
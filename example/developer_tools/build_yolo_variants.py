@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+检测模型变体生成工具
+==================================
+
+从 `config/yolov8n.onnx` 生成可按 `config/detector_model.json` 选择的模型变体：
+- `--variant int8`：静态 INT8 量化（QDQ 格式，逐通道权重），用 `data/` 下图像校准，默认不量化检测头；
+- `--variant fp16`：权重转 FP16，输入输出保持 float32；
+- `--input-size N`：缩小输入尺寸（需要原始 .pt 权重与 ultralytics，重新导出 ONNX）；
+- `--fuse-preprocess`：在模型前端融合 uint8→float、/255、BGR→RGB、NHWC→NCHW，
+  运行时直接输入 letterbox 画布，省去每帧的 float 拷贝。
+
+生成后用 `benchmark_yolo_variants.py` 对比延迟 / FPS / mAP 偏差，再写入 `config/detector_model.json`。
+
+依赖：onnx、onnxruntime；FP16 需要 onnxconverter-common；缩小输入尺寸需要 ultralytics。
+
+用法：
+    python example/developer_tools/build_yolo_variants.py --variant int8
+    python example/developer_tools/build_yolo_variants.py --variant fp16 --fuse-preprocess
+    python example/developer_tools/build_yolo_variants.py --variant int8 --input-size 416 --pt yolov8n.pt
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+
+# 添加项目根目录到路径
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(PROJECT_ROOT)
+
+from Horizon_Core.core.arm_core.model_variants import VARIANTS, variant_path
+from Horizon_Core.core.arm_core.yolo_preprocess import LetterboxPreprocessor
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def find_images(root, limit=None):
+    """递归收集图像（按路径排序，保证每次使用同一组图像）"""
+    paths = sorted(
+        p for p in glob.glob(os.path.join(root, "**", "*"), recursive=True)
+        if p.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    return paths[:limit] if limit else paths
+
+
+def model_input_size(model_path):
+    """ONNX 模型输入的 (高, 宽)"""
+    import onnx
+    dims = onnx.load(model_path, load_external_data=False).graph.input[0].type.tensor_type.shape.dim
+    return int(dims[2].dim_value or 640), int(dims[3].dim_value or 640)
+
+
+def export_input_size(pt_path, input_size, output_path):
+    """用 ultralytics 以指定输入尺寸重新导出 ONNX"""
+    try:
+        from ultralytics import YOLO
+    except ImportError:
+        raise SystemExit("缩小输入尺寸需要 ultralytics（pip install ultralytics）与原始 .pt 权重")
+    exported = YOLO(pt_path).export(format="onnx", imgsz=int(input_size), dynamic=False, simplify=True)
+    shutil.move(str(exported), output_path)
+    return output_path
+
+
+class _CalibrationReader:
+    """quantize_static 的校准数据读取器：与运行时相同的 letterbox 预处理"""
+
+    def __init__(self, images, input_name, input_size):
+        import cv2
+        self._cv2 = cv2
+        self._images = list(images)
+        self._input_name = input_name
+        self._letterbox = LetterboxPreprocessor(input_size)
+
+    def get_next(self):
+        while self._images:
+            bgr = self._cv2.imread(self._images.pop(0))
+            if bgr is not None:
+                blob, _ = self._letterbox(bgr)
+                return {self._input_name: blob.copy()}
+        return None
+
+
+def quantize_int8(source, output, images, exclude_pattern):
+    """静态 INT8 量化（QDQ）"""
+    import onnx
+    from onnxruntime.quantization import (CalibrationMethod, QuantFormat, QuantType, quantize_static)
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    with tempfile.TemporaryDirectory() as tmp:
+        prepared = os.path.join(tmp, "prepared.onnx")
+        quant_pre_process(source, prepared)
+        model = onnx.load(prepared)
+        input_name = model.graph.input[0].name
+        excluded = [n.name for n in model.graph.node if exclude_pattern and exclude_pattern in n.name]
+        reader = _CalibrationReader(images, input_name, model_input_size(prepared))
+        quantize_static(
+            prepared, output, reader,
+            quant_format=QuantFormat.QDQ,
+            per_channel=True,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            calibrate_method=CalibrationMethod.MinMax,
+            nodes_to_exclude=excluded,
+        )
+    print(f"   校准图像 {len(images)} 张，未量化节点 {len(excluded)} 个（匹配 '{exclude_pattern}'）")
+
+
+def convert_fp16(source, output):
+    """权重转 FP16，输入输出保持 float32"""
+    import onnx
+    try:
+        from onnxconverter_common import float16
+    except ImportError:
+        raise SystemExit("FP16 转换需要 onnxconverter-common（pip install onnxconverter-common）")
+    model = float16.convert_float_to_float16(onnx.load(source), keep_io_types=True)
+    onnx.save(model, output)
+
+
+def fuse_preprocess(source, output):
+    """
+    在模型前端融合预处理：输入改为 uint8 NHWC BGR (N, H, W, 3)，
+    依次 Cast(float) → Mul(1/255) → Gather(通道 2,1,0) → Transpose(NHWC→NCHW) 接到原输入
+    """
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+
+    model = onnx.load(source)
+    graph = model.graph
+    original = graph.input[0]
+    name = original.name
+    dims = original.type.tensor_type.shape.dim
+    batch = dims[0].dim_param or dims[0].dim_value or 1
+    height, width = dims[2].dim_value, dims[3].dim_value
+
+    new_input = helper.make_tensor_value_info(f"{name}_uint8", TensorProto.UINT8, [batch, height, width, 3])
+    graph.initializer.extend([
+        numpy_helper.from_array(np.array(1.0 / 255.0, dtype=np.float32), f"{name}_scale"),
+        numpy_helper.from_array(np.array([2, 1, 0], dtype=np.int64), f"{name}_bgr2rgb"),
+    ])
+    nodes = [
+        helper.make_node("Cast", [new_input.name], [f"{name}_float"], to=TensorProto.FLOAT, name=f"{name}_cast"),
+        helper.make_node("Mul", [f"{name}_float", f"{name}_scale"], [f"{name}_norm"], name=f"{name}_normalize"),
+        helper.make_node("Gather", [f"{name}_norm", f"{name}_bgr2rgb"], [f"{name}_rgb"], axis=3,
+                         name=f"{name}_channel_flip"),
+        helper.make_node("Transpose", [f"{name}_rgb"], [name], perm=[0, 3, 1, 2], name=f"{name}_to_nchw"),
+    ]
+    for node in reversed(nodes):
+        graph.node.insert(0, node)
+    graph.input.remove(original)
+    graph.input.insert(0, new_input)
+    onnx.checker.check_model(model)
+    onnx.save(model, output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成 YOLO 检测模型变体")
+    parser.add_argument("--model", default=os.path.join(PROJECT_ROOT, "config", "yolov8n.onnx"), help="原始 FP32 模型")
+    parser.add_argument("--variant", choices=VARIANTS, default="int8", help="精度变体")
+    parser.add_argument("--input-size", type=int, default=None, help="缩小后的输入边长（如 416 / 320）")
+    parser.add_argument("--pt", default=None, help="缩小输入尺寸时使用的原始 .pt 权重")
+    parser.add_argument("--fuse-preprocess", action="store_true", help="融合预处理，输入改为 uint8 NHWC BGR")
+    parser.add_argument("--calib-dir", default=os.path.join(PROJECT_ROOT, "data"), help="INT8 校准图像目录（递归）")
+    parser.add_argument("--calib-count", type=int, default=200, help="最多使用的校准图像数")
+    parser.add_argument("--exclude-pattern", default="/model.22/",
+                        help="不量化的节点名片段（默认跳过 YOLOv8 检测头，空字符串表示全部量化）")
+    args = parser.parse_args()
+
+    output = variant_path(args.model, args.variant, args.input_size, args.fuse_preprocess)
+    if os.path.abspath(output) == os.path.abspath(args.model):
+        raise SystemExit("fp32 变体需要同时指定 --input-size 或 --fuse-preprocess")
+    with tempfile.TemporaryDirectory() as tmp:
+        source = args.model
+        if args.input_size:
+            if not args.pt:
+                raise SystemExit("缩小输入尺寸需要通过 --pt 指定原始权重")
+            source = export_input_size(args.pt, args.input_size, os.path.join(tmp, "resized.onnx"))
+            print(f"✅ 已按输入尺寸 {args.input_size} 重新导出")
+
+        staged = os.path.join(tmp, "variant.onnx")
+        if args.variant == "int8":
+            images = find_images(args.calib_dir, args.calib_count)
+            if not images:
+                raise SystemExit(f"校准目录中没有图像: {args.calib_dir}")
+            quantize_int8(source, staged, images, args.exclude_pattern)
+        elif args.variant == "fp16":
+            convert_fp16(source, staged)
+        else:
+            shutil.copyfile(source, staged)
+
+        if args.fuse_preprocess:
+            fused = os.path.join(tmp, "fused.onnx")
+            fuse_preprocess(staged, fused)
+            staged = fused
+        shutil.move(staged, output)
+
+    print(f"✅ 已保存: {output}")
+    print(f"   在 config/detector_model.json 中选择："
+          f'{{"variant": "{args.variant}", "input_size": {args.input_size or "null"}, '
+          f'"fused_preprocess": {"true" if args.fuse_preprocess else "false"}}}')
+
+
+if __name__ == "__main__":
+    main()
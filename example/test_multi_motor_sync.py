@@ -33,7 +33,7 @@ from typing import Optional, Dict, List, Any
 # 添加项目根目录到路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from Embodied_SDK import create_motor_controller, setup_logging, close_all_shared_interfaces, get_shared_interface_info
+from Embodied_SDK import create_motor_controller, setup_logging, close_all_shared_interfaces, get_shared_interface_info, read_many
 
 class ZDTMultiMotorSyncTester:
     """ZDT多机同步控制专用测试器"""
@@ -526,23 +526,30 @@ class ZDTMultiMotorSyncTester:
             status_info = []
             all_in_position = True
             
-            for motor_id in self.connected_motor_ids:
-                try:
-                    motor = self.motors[motor_id]
-                    status = motor.read_parameters.get_motor_status()
-                    position = motor.read_parameters.get_position()
-                    target = motor_targets.get(motor_id, 0)
-                    error = abs(position - target)
-                    
-                    status_char = "" if status.in_position else ""
-                    status_info.append(f"ID{motor_id}:{position:.1f}({target:.1f},Δ{error:.1f}){status_char}")
-                    
-                    if not status.in_position:
-                        all_in_position = False
-                        
-                except Exception as e:
+            # 一次批量读取所有电机的位置和状态（共享总线上一个接收窗口）
+            try:
+                states = read_many([self.motors[mid] for mid in self.connected_motor_ids],
+                                   fields=("position", "status"))
+            except Exception as e:
+                print(f"{time.time() - start_time:7.1f}s 批量读取失败: {e}")
+                continue
+            
+            for state in states:
+                motor_id = int(state["motor_id"])
+                if not state["valid"]:
                     status_info.append(f"ID{motor_id}:ERR")
                     all_in_position = False
+                    continue
+                
+                position = float(state["position"])
+                target = motor_targets.get(motor_id, 0)
+                error = abs(position - target)
+                
+                status_char = "" if state["in_position"] else ""
+                status_info.append(f"ID{motor_id}:{position:.1f}({target:.1f},Δ{error:.1f}){status_char}")
+                
+                if not state["in_position"]:
+                    all_in_position = False
             
             elapsed = time.time() - start_time
             print(f"{elapsed:7.1f}s {' | '.join(status_info)}")
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+MultiMotorFrameEncoder 与 Y42 多电机帧的逐字节对照
+
+- 固定的 (角度, 转速, 方向) 用例与已知正确的 Y42 帧逐字节比较；
+- 同一组用例与 ZDTCommandBuilder（position_mode_* + build_y42_multi_motor_frame）逐字节比较。
+
+角度、转速放大 10 倍后按 np.rint 取整（.5 取偶，同 round()）。"midpoint" 用例全部落在 x.x5 中点
+（0.05° → 0、0.15° → 2、12.25 RPM → 122），固定这一取整策略，并与构建器的取整逐字节对照。
+"""
+
+import pytest
+
+from Horizon_Core.Control_SDK.Control_Core import ZDTCommandBuilder
+from Horizon_Core.Control_SDK.Control_Core.frame_encoder import MultiMotorFrameEncoder, build_reference_frame
+
+MOTOR_IDS = [1, 2, 3, 4, 5, 6]
+
+# (名称, 角度, 转速, 已知正确的 Y42 帧)：方向字节 00 为正、01 为负，速度 0.1RPM、位置 0.1° 大端
+DIRECT_CASES = [
+    (
+        "zero",
+        [0, 0, 0, 0, 0, 0],
+        [10, 10, 10, 10, 10, 10],
+        "aa0049"
+        "01fb0000640000000001006b" "02fb0000640000000001006b" "03fb0000640000000001006b"
+        "04fb0000640000000001006b" "05fb0000640000000001006b" "06fb0000640000000001006b"
+        "6b",
+    ),
+    (
+        "mixed",
+        [12.3, -45.6, 90, -0.04, 180.07, -720],
+        [30, 5.5, 100, 1, 0.27, 300],
+        "aa0049"
+        "01fb00012c0000007b01006b" "02fb010037000001c801006b" "03fb0003e80000038401006b"
+        "04fb00000a0000000001006b" "05fb0000030000070901006b" "06fb010bb800001c2001006b"
+        "6b",
+    ),
+    (
+        "large",
+        [36000, -36000, 1234.5, -9876.5, 0.1, -0.1],
+        [3000, 2999.9, 0, 12.34, 60, 60],
+        "aa0049"
+        "01fb00753000057e4001006b" "02fb01752f00057e4001006b" "03fb0000000000303901006b"
+        "04fb01007b000181cd01006b" "05fb0002580000000101006b" "06fb0102580000000101006b"
+        "6b",
+    ),
+    (
+        "midpoint",
+        [0.05, 0.15, -0.15, 0.25, -12.25, 0.35],
+        [12.25, 0.05, 0.15, 2.25, 12.35, 0.45],
+        "aa0049"
+        "01fb00007a0000000001006b" "02fb0000000000000201006b" "03fb0100020000000201006b"
+        "04fb0000160000000201006b" "05fb01007c0000007a01006b" "06fb0000040000000401006b"
+        "6b",
+    ),
+]
+
+TRAPEZOID_CASE = (
+    [12.3, -45.6, 90, -0.04, 180.07, -720],
+    [30, 5.5, 100, 1, 0.27, 300],
+    [100, 200, 300, 400, 500, 600],
+    [50, 100, 150, 200, 250, 300],
+    "aa0061"
+    "01fd0000640032012c0000007b01006b" "02fd0100c800640037000001c801006b"
+    "03fd00012c009603e80000038401006b" "04fd00019000c8000a0000000001006b"
+    "05fd0001f400fa00030000070901006b" "06fd010258012c0bb800001c2001006b"
+    "6b",
+)
+
+
+@pytest.mark.parametrize("name, positions, speeds, expected", DIRECT_CASES, ids=[c[0] for c in DIRECT_CASES])
+def test_direct_matches_known_frames(name, positions, speeds, expected):
+    encoder = MultiMotorFrameEncoder(MOTOR_IDS, mode="direct", verify=False)
+    assert bytes(encoder.encode(positions, speeds)).hex() == expected
+
+
+def test_trapezoid_matches_known_frame():
+    positions, speeds, acceleration, deceleration, expected = TRAPEZOID_CASE
+    encoder = MultiMotorFrameEncoder(MOTOR_IDS, mode="trapezoid", verify=False)
+    assert bytes(encoder.encode(positions, speeds, acceleration, deceleration)).hex() == expected
+
+
+def test_flags_and_single_command():
+    encoder = MultiMotorFrameEncoder(MOTOR_IDS[:3], mode="direct", is_absolute=False, multi_sync=True, verify=False)
+    frame = bytes(encoder.encode([12.3, -45.6, 90], [30, 5.5, 100]))
+    assert frame.hex() == ("aa0025" "01fb00012c0000007b00016b" "02fb010037000001c800016b"
+                           "03fb0003e80000038400016b" "6b")
+    assert bytes(encoder.command(1)).hex() == "fb010037000001c800016b"
+
+
+@pytest.mark.parametrize("name, positions, speeds, expected", DIRECT_CASES, ids=[c[0] for c in DIRECT_CASES])
+def test_direct_matches_command_builder(name, positions, speeds, expected):
+    encoder = MultiMotorFrameEncoder(MOTOR_IDS, mode="direct")
+    reference = build_reference_frame(ZDTCommandBuilder, MOTOR_IDS, positions, speeds, mode="direct")
+    assert bytes(encoder.encode(positions, speeds)) == reference
+    assert reference.hex() == expected
+
+
+def test_trapezoid_matches_command_builder():
+    positions, speeds, acceleration, deceleration, expected = TRAPEZOID_CASE
+    encoder = MultiMotorFrameEncoder(MOTOR_IDS, mode="trapezoid")
+    reference = build_reference_frame(ZDTCommandBuilder, MOTOR_IDS, positions, speeds, mode="trapezoid",
+                                      acceleration=acceleration, deceleration=deceleration)
+    assert bytes(encoder.encode(positions, speeds, acceleration, deceleration)) == reference
+    assert reference.hex() == expected
+
+
+def test_construction_self_check():
+    assert MultiMotorFrameEncoder(MOTOR_IDS, mode="direct", verify=False).verify_against_builder(ZDTCommandBuilder)
+    assert MultiMotorFrameEncoder(MOTOR_IDS, mode="trapezoid", verify=False).verify_against_builder(ZDTCommandBuilder)
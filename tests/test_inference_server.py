@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+create_shared_detector 直接以共享会话代理构造检测器，不再加载检测器自己的 InferenceSession
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from Horizon_Core.core.arm_core import inference_server
+from Horizon_Core.core.arm_core.yolo_onnx_detector import YOLOOnnxDetector
+from Horizon_Core.core.arm_core.yolo_postprocess import FastYOLODetector
+
+
+class FakeServer:
+    """只提供会话元数据的推理服务替身"""
+
+    input_name = "images"
+    output_names = ["output0"]
+
+    def __init__(self):
+        self.session = SimpleNamespace(
+            get_inputs=lambda: [SimpleNamespace(name="images", shape=[1, 3, 480, 640], type="tensor(float)")],
+            get_outputs=lambda: [SimpleNamespace(name="output0", shape=[1, 84, 6300])],
+        )
+
+    def session_proxy(self):
+        return inference_server.SharedSessionProxy(self)
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    server = FakeServer()
+    monkeypatch.setattr(inference_server, "get_inference_server", lambda model_path, **kwargs: server)
+
+    def _no_private_session(self, *args, **kwargs):
+        raise AssertionError("检测器不应自建 InferenceSession")
+
+    monkeypatch.setattr(YOLOOnnxDetector, "__init__", _no_private_session)
+    return server
+
+
+@pytest.mark.parametrize("detector_cls", [None, YOLOOnnxDetector])
+def test_shared_detector_uses_proxy_only(fake_server, detector_cls):
+    detector = inference_server.create_shared_detector("yolov8n.onnx", detector_cls)
+
+    assert isinstance(detector.session, inference_server.SharedSessionProxy)
+    assert (detector.input_name, detector.in_h, detector.in_w, detector.num_classes) == ("images", 480, 640, 80)
+    if detector_cls is None:
+        assert isinstance(detector, FastYOLODetector)
+        assert (detector.pre_nms_topk, detector.max_det) == (300, 100)
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+示教程序 stop_at 参数校验
+
+超出示教点范围的 stop_at 序号应在规划前报出明确的 ValueError，而不是 numpy 的 IndexError
+或在含笛卡尔段时被静默忽略。
+"""
+
+import numpy as np
+import pytest
+
+from Horizon_Core.core.arm_core.lookahead_planner import LookaheadBlendPlanner, plan_teaching_program
+
+
+def make_program(count):
+    return [{"joint_angles": [10.0 * i, 0.0, 0.0, 0.0, 0.0, 0.0]} for i in range(count)]
+
+
+def test_stop_at_inside_program_stops_there():
+    trajectory = plan_teaching_program(make_program(4), stop_at=[2])
+
+    np.testing.assert_allclose(trajectory.knot_velocities[2], 0.0)
+    assert np.any(trajectory.knot_velocities[1] != 0.0)
+
+
+@pytest.mark.parametrize("stop_at", [[4], [-1], [1, 10], [1.5]])
+def test_out_of_range_stop_at_raises_value_error(stop_at):
+    with pytest.raises(ValueError, match="stop_at"):
+        plan_teaching_program(make_program(4), stop_at=stop_at)
+
+
+def test_planner_rejects_out_of_range_stop_at():
+    with pytest.raises(ValueError, match="stop_at"):
+        LookaheadBlendPlanner().plan(np.zeros((3, 6)) + np.arange(3)[:, None], stop_at=[3])
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+MeshCollisionChecker 与网格精确距离的对照
+
+在若干关节角下计算各待检测连杆对的三角网格精确最小距离，检查：
+- 未被报告的连杆对，实际距离不小于 2 × padding（包围球层次是保守的，相交或贴近的连杆对一定被报告）；
+- 被报告的连杆对，实际距离小于 2 × 叶子球半径上限（叶子球足够贴合，不会把相距较远的连杆误判为碰撞）。
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from Horizon_Core.core.arm_core.mesh_collision import (
+    URDF_LINK_NAMES, URDF_UNIT_SCALE, MeshCollisionChecker, get_urdf_dir, load_stl,
+)
+
+MAX_LEAF_RADIUS = 15.0
+PADDING = 2.0
+
+POSES = [
+    [0, 0, 0, 0, 0, 0],
+    [0, 30, 30, 0, 30, 0],
+    [45, 20, 40, 0, 60, 0],
+    [-30, 60, 90, 45, 100, 30],
+    [90, -20, 120, -60, 80, 0],
+    [10, 80, 130, 0, 110, 0],
+    [-10, 65, 40, 115, 130, 65],
+    [85, -65, 65, 95, -10, 25],
+]
+
+
+# ----------------------------------------------------------------------
+# 精确距离
+# ----------------------------------------------------------------------
+
+def _point_segment_distance(p, a, b):
+    ab = b - a
+    t = np.clip(np.einsum("ij,ij->i", p - a, ab) / np.maximum(np.einsum("ij,ij->i", ab, ab), 1e-300), 0.0, 1.0)
+    return np.linalg.norm(p - (a + t[:, None] * ab), axis=1)
+
+
+def _point_triangle_distance(p, tri):
+    """(K, 3) 点到 (K, 3, 3) 三角形的距离"""
+    a, b, c = tri[:, 0], tri[:, 1], tri[:, 2]
+    n = np.cross(b - a, c - a)
+    n /= np.maximum(np.linalg.norm(n, axis=1, keepdims=True), 1e-300)
+    plane = np.einsum("ij,ij->i", p - a, n)
+    proj = p - plane[:, None] * n
+    inside = np.ones(len(p), dtype=bool)
+    for u, v in ((a, b), (b, c), (c, a)):
+        inside &= np.einsum("ij,ij->i", np.cross(v - u, proj - u), n) >= 0
+    edges = np.minimum(np.minimum(_point_segment_distance(p, a, b), _point_segment_distance(p, b, c)),
+                       _point_segment_distance(p, c, a))
+    return np.where(inside, np.abs(plane), edges)
+
+
+def _segment_segment_distance(p1, q1, p2, q2):
+    """(K, 3) 线段两两之间的距离"""
+    d1, d2, r = q1 - p1, q2 - p2, p1 - p2
+    a = np.einsum("ij,ij->i", d1, d1)
+    e = np.einsum("ij,ij->i", d2, d2)
+    f = np.einsum("ij,ij->i", d2, r)
+    c = np.einsum("ij,ij->i", d1, r)
+    b = np.einsum("ij,ij->i", d1, d2)
+    denom = a * e - b * b
+    s = np.where(denom > 1e-12 * a * e, np.clip((b * f - c * e) / np.where(denom > 0, denom, 1.0), 0.0, 1.0), 0.0)
+    t = (b * s + f) / np.maximum(e, 1e-300)
+    a_safe = np.maximum(a, 1e-300)
+    s = np.where(t < 0, np.clip(-c / a_safe, 0.0, 1.0), np.where(t > 1, np.clip((b - c) / a_safe, 0.0, 1.0), s))
+    t = np.clip(t, 0.0, 1.0)
+    return np.linalg.norm((p1 + s[:, None] * d1) - (p2 + t[:, None] * d2), axis=1)
+
+
+def _edges_cross_triangles(tri_a, tri_b):
+    """tri_a 的某条边是否穿过 tri_b，(K,)"""
+    a, b, c = tri_b[:, 0], tri_b[:, 1], tri_b[:, 2]
+    n = np.cross(b - a, c - a)
+    crossed = np.zeros(len(tri_a), dtype=bool)
+    for i in range(3):
+        p, q = tri_a[:, i], tri_a[:, (i + 1) % 3]
+        dp = np.einsum("ij,ij->i", p - a, n)
+        dq = np.einsum("ij,ij->i", q - a, n)
+        straddle = (dp * dq <= 0) & (dp != dq)
+        t = np.where(straddle, dp / np.where(dp != dq, dp - dq, 1.0), 0.0)
+        x = p + t[:, None] * (q - p)
+        inside = straddle.copy()
+        for u, v in ((a, b), (b, c), (c, a)):
+            inside &= np.einsum("ij,ij->i", np.cross(v - u, x - u), n) >= 0
+        crossed |= inside
+    return crossed
+
+
+def triangle_distances(tri_a, tri_b):
+    """(K, 3, 3) 三角形两两之间的精确距离（相交为 0）"""
+    dist = np.full(len(tri_a), np.inf)
+    for i in range(3):
+        dist = np.minimum(dist, _point_triangle_distance(tri_a[:, i], tri_b))
+        dist = np.minimum(dist, _point_triangle_distance(tri_b[:, i], tri_a))
+        for j in range(3):
+            dist = np.minimum(dist, _segment_segment_distance(tri_a[:, i], tri_a[:, (i + 1) % 3],
+                                                              tri_b[:, j], tri_b[:, (j + 1) % 3]))
+    crossed = _edges_cross_triangles(tri_a, tri_b) | _edges_cross_triangles(tri_b, tri_a)
+    return np.where(crossed, 0.0, dist)
+
+
+def _cell_bounds(triangles, cell):
+    """按质心把三角形分到边长 cell 的立方格，返回 (各格三角形下标, 各格包围盒下界, 上界)"""
+    keys = np.floor(triangles.mean(axis=1) / cell).astype(np.int64)
+    _, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    order = np.argsort(inverse, kind="stable")
+    groups = np.split(order, np.flatnonzero(np.diff(inverse[order])) + 1)
+    lo = np.array([triangles[g].min(axis=(0, 1)) for g in groups])
+    hi = np.array([triangles[g].max(axis=(0, 1)) for g in groups])
+    return groups, lo, hi
+
+
+def meshes_within(tri_a, tri_b, distance, cell=10.0):
+    """
+    两个三角网格的精确最小距离是否小于 distance（相交视为 0）
+
+    按包围盒间隙从小到大检查格子对，只有间隙小于 distance 的格子对才精确计算三角形对距离，找到即返回。
+    """
+    groups_a, lo_a, hi_a = _cell_bounds(tri_a, cell)
+    groups_b, lo_b, hi_b = _cell_bounds(tri_b, cell)
+    gap = np.maximum(np.maximum(lo_b[None] - hi_a[:, None], lo_a[:, None] - hi_b[None]), 0.0)
+    gap = np.sqrt(np.einsum("ijk,ijk->ij", gap, gap))
+    ca, cb = np.nonzero(gap < distance)
+    for k in np.argsort(gap[ca, cb]):
+        i, j = ca[k], cb[k]
+        ia = np.repeat(groups_a[i], len(groups_b[j]))
+        ib = np.tile(groups_b[j], len(groups_a[i]))
+        if triangle_distances(tri_a[ia], tri_b[ib]).min() < distance:
+            return True
+    return False
+
+
+# ----------------------------------------------------------------------
+# 测试
+# ----------------------------------------------------------------------
+
+@pytest.fixture(scope="module")
+def checker(tmp_path_factory):
+    return MeshCollisionChecker.from_config(max_leaf_radius=MAX_LEAF_RADIUS, padding=PADDING,
+                                            cache_dir=str(tmp_path_factory.mktemp("collision_cache")))
+
+
+@pytest.fixture(scope="module")
+def link_meshes():
+    urdf_dir = get_urdf_dir()
+    return [load_stl(os.path.join(urdf_dir, f"{name}.STL")) * URDF_UNIT_SCALE for name in URDF_LINK_NAMES]
+
+
+def test_leaf_radius_bounded(checker):
+    leaves = checker.radii[:, 2 ** checker.depth - 1:]
+    assert leaves[np.isfinite(leaves)].max() <= MAX_LEAF_RADIUS + 1e-9
+
+
+@pytest.mark.parametrize("pose", POSES)
+def test_matches_exact_mesh_distance(checker, link_meshes, pose):
+    T = checker.link_transforms(np.asarray(pose, dtype=np.float64)[None])[0]
+    reported = set(checker.colliding_pairs(pose))
+    for a, b in checker.pairs:
+        tri_a = link_meshes[a] @ T[a, :3, :3].T + T[a, :3, 3]
+        tri_b = link_meshes[b] @ T[b, :3, :3].T + T[b, :3, 3]
+        name = (checker.link_names[a], checker.link_names[b])
+        if name in reported:
+            assert meshes_within(tri_a, tri_b, 2 * MAX_LEAF_RADIUS), f"{name} 实际距离不小于 {2 * MAX_LEAF_RADIUS} mm，被误报为碰撞"
+        else:
+            assert not meshes_within(tri_a, tri_b, 2 * PADDING), f"{name} 实际距离小于 {2 * PADDING} mm，未报告碰撞"
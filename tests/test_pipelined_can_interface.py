@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+PipelinedSLCANInterface 的回复路由：超时请求的迟到回复丢弃，回复丢失后的重试不受影响
+
+不打开串口：写入由替身串口吸收，回复直接交给 `_dispatch`。
+"""
+
+import pytest
+
+from Horizon_Core.Control_SDK.Control_Core import PipelinedSLCANInterface, TimeoutException
+
+READ_POSITION = [0x36, 0x6B]
+
+
+class FakeSerial:
+    is_open = True
+
+    def __init__(self):
+        self.written = []
+
+    def write(self, data):
+        self.written.append(data)
+
+
+@pytest.fixture
+def interface():
+    interface = PipelinedSLCANInterface(port="TEST", late_reply_window=0.5)
+    interface.ser = FakeSerial()
+    interface._reader_running = True
+    return interface
+
+
+def reply(value):
+    return [0x36, 0x00, 0x00, 0x00, 0x00, value, 0x6B]
+
+
+def timed_out_request(interface):
+    with interface.submit(1, READ_POSITION) as pending:
+        with pytest.raises(TimeoutException):
+            pending.result(timeout=0.01)
+
+
+def test_retry_after_lost_reply_receives_its_own_reply(interface):
+    timed_out_request(interface)                       # 回复丢失
+
+    for value in (1, 2, 3):                            # 轮询式重试，每次都应拿到自己的回复
+        with interface.submit(1, READ_POSITION) as pending:
+            interface._dispatch(0x100, reply(value))
+            assert pending.result(timeout=0.1) == reply(value)
+    assert not interface._tombstones
+
+
+def test_late_reply_is_dropped_before_next_request(interface):
+    timed_out_request(interface)
+    interface._dispatch(0x100, reply(9))               # 迟到回复：此时没有新请求，直接丢弃
+    assert not interface._unsolicited
+
+    with interface.submit(1, READ_POSITION) as pending:
+        interface._dispatch(0x100, reply(1))
+        assert pending.result(timeout=0.1) == reply(1)
+
+
+def test_late_reply_of_unclosed_request_is_dropped(interface):
+    pending = interface.submit(1, READ_POSITION)
+    with pytest.raises(TimeoutException):
+        pending.result(timeout=0.01)
+    interface._dispatch(0x100, reply(9))               # 已超时、尚未 close
+    pending.close()
+    assert not interface._tombstones and not interface._unsolicited
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+RRT-Connect 批量规划在桌面隔墙场景下的正确性
+
+起止点取在隔墙两侧、直连边被墙阻挡，检查：
+- 规划成功，路径首尾为起止点，逐段以细分辨率复检无碰撞；
+- 先粗检再细检的边检测与直接按细分辨率检测结果一致。
+"""
+
+import numpy as np
+import pytest
+
+from Horizon_Core.core.arm_core.rrt_connect import PrimitiveCollisionChecker, RRTConnectPlanner
+
+WALL = ([100, -20, -50], [400, 20, 400])
+
+
+@pytest.fixture(scope="module")
+def checker():
+    checker = PrimitiveCollisionChecker(table_height=0.0)
+    checker.add_box(*WALL)
+    return checker
+
+
+@pytest.fixture(scope="module")
+def wall_pairs(checker):
+    """墙两侧末端位于桌面上方的无碰撞关节角对"""
+    rng = np.random.default_rng(0)
+    q = rng.uniform([-150, -90, -90, -150, -120, -180], [150, 90, 90, 150, 120, 180], size=(40000, 6))
+    points, _ = checker.link_points(q)
+    tip = points[:, -1]
+    near = checker(q) & (tip[:, 2] > 20) & (tip[:, 2] < 250) & (tip[:, 0] > 120) & (tip[:, 0] < 380)
+    left, right = q[near & (tip[:, 1] < -60)], q[near & (tip[:, 1] > 60)]
+    count = min(len(left), len(right), 5)
+    assert count > 0
+    return list(zip(left[:count], right[:count]))
+
+
+def test_plans_around_wall(checker, wall_pairs):
+    for seed, (start, goal) in enumerate(wall_pairs):
+        planner = RRTConnectPlanner(checker, seed=seed)
+        path = planner.plan(start, goal)
+
+        assert path is not None, planner.last_stats
+        np.testing.assert_allclose(path[0], start)
+        np.testing.assert_allclose(path[-1], goal)
+        assert planner.is_path_collision_free(path)
+        fine = planner._edges_free_at(path[:-1], path[1:], planner.resolution)
+        assert fine.all()
+
+
+def test_coarse_to_fine_matches_fine_check(checker):
+    planner = RRTConnectPlanner(checker)
+    rng = np.random.default_rng(1)
+    starts = rng.uniform(planner.joint_limits[:, 0], planner.joint_limits[:, 1], size=(200, 6))
+    ends = starts + rng.normal(scale=30.0, size=starts.shape)
+    ends = np.clip(ends, planner.joint_limits[:, 0], planner.joint_limits[:, 1])
+
+    expected = planner._edges_free_at(starts, ends, planner.resolution)
+    np.testing.assert_array_equal(planner.edges_collision_free(starts, ends), expected)
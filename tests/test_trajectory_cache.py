@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+预编译作业的端到端执行顺序
+
+以仓库中录制的 config/io_control/jobs_config.json 为夹具编译作业，再用 run_compiled_steps 执行，检查：
+- 运动段与 IO / 等待 / 急停步骤按作业原顺序交替执行，运动段依次衔接并到达录制的关节角；
+- 任一步骤失败后不再执行后续步骤。
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from Horizon_Core.core.arm_core.config_paths import get_config_dir
+from Horizon_Core.core.arm_core.trajectory_cache import TRAJECTORY_STEP_TYPE, TrajectoryCompiler, run_compiled_steps
+
+RECORDED_FILES = ("dh_parameters_config.json", "motor_config.json", os.path.join("io_control", "jobs_config.json"))
+
+
+@pytest.fixture(scope="module")
+def recorded_jobs():
+    with open(os.path.join(get_config_dir(), "io_control", "jobs_config.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def compiler(tmp_path_factory):
+    config_dir = tmp_path_factory.mktemp("config")
+    for relative in RECORDED_FILES:
+        os.makedirs(os.path.dirname(os.path.join(config_dir, relative)), exist_ok=True)
+        shutil.copy(os.path.join(get_config_dir(), relative), os.path.join(config_dir, relative))
+    return TrajectoryCompiler(config_dir=str(config_dir), rate_hz=100.0)
+
+
+class Recorder:
+    """记录执行顺序的运动 / 步骤处理函数"""
+
+    def __init__(self, fail_motion_at=None):
+        self.calls = []
+        self.fail_motion_at = fail_motion_at
+
+    def run_motion(self, compiled, step):
+        positions, _ = compiled.motion(step)
+        self.calls.append(("motion", positions[0].copy(), positions[-1].copy()))
+        motions = sum(1 for call in self.calls if call[0] == "motion")
+        return {"started": True, "completed": motions != self.fail_motion_at}
+
+    def handler(self, step_type):
+        def _handle(step):
+            self.calls.append((step_type, step.get("step_id"), step.get("parameters")))
+            return True
+        return _handle
+
+    def handlers(self, *step_types):
+        return {step_type: self.handler(step_type) for step_type in step_types}
+
+
+def _expected_order(raw_steps):
+    """录制步骤 → 执行顺序：连续的 move_joints 合并为一个运动段"""
+    order = []
+    for step in raw_steps:
+        kind = "motion" if step["type"] == "move_joints" else step["type"]
+        if not (kind == "motion" and order and order[-1] == "motion"):
+            order.append(kind)
+    return order
+
+
+@pytest.mark.parametrize("name", ["test", "zero", "stop"])
+def test_runs_recorded_job_in_order(compiler, recorded_jobs, name):
+    raw_steps = recorded_jobs[name]["steps"]
+    recorder = Recorder()
+    result = run_compiled_steps(compiler.compile_job(name), recorder.run_motion,
+                                recorder.handlers("wait", "io_control", "emergency_stop"))
+
+    assert result["completed"] and result["failed_step"] is None
+    assert [call[0] for call in recorder.calls] == _expected_order(raw_steps)
+
+    # 非运动步骤原样传给处理函数
+    others = [step for step in raw_steps if step["type"] != "move_joints"]
+    assert [(call[1], call[2]) for call in recorder.calls if call[0] != "motion"] == \
+        [(step["step_id"], step["parameters"]) for step in others]
+
+    # 运动段依次衔接，并到达录制的关节角
+    motions = [call for call in recorder.calls if call[0] == "motion"]
+    for previous, current in zip(motions, motions[1:]):
+        np.testing.assert_allclose(current[1], previous[2], atol=1e-9)
+    targets = [step["parameters"]["joint_angles"] for step in raw_steps if step["type"] == "move_joints"]
+    if targets:
+        np.testing.assert_allclose(motions[-1][2], targets[-1], atol=1e-6)
+
+
+def test_stops_after_failed_motion(compiler):
+    recorder = Recorder(fail_motion_at=2)
+    compiled = compiler.compile_job("test")
+    result = run_compiled_steps(compiled, recorder.run_motion, recorder.handlers("wait"))
+
+    assert not result["completed"]
+    assert [call[0] for call in recorder.calls] == ["motion", "wait", "motion"]
+    failed = compiled.steps[result["failed_step"]]
+    assert failed["type"] == TRAJECTORY_STEP_TYPE and result["steps"][-1]["ok"] is False
+
+
+def test_unhandled_step_type_fails(compiler):
+    recorder = Recorder()
+    result = run_compiled_steps(compiler.compile_job("zero"), recorder.run_motion, {})
+
+    assert not result["completed"]
+    assert result["steps"][result["failed_step"]]["type"] == "io_control"
+    assert [call[0] for call in recorder.calls] == ["motion"]
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+TrajectoryStreamer 的发送失败处理：致命异常或连续失败时停止下发，completed 只在全部发送成功时为 True
+"""
+
+import numpy as np
+
+from Horizon_Core.core.arm_core.trajectory_streamer import TrajectoryStreamer
+
+MOTOR_IDS = [1, 2, 3, 4, 5, 6]
+FRAME_LENGTH = 4
+
+
+class BusError(Exception):
+    pass
+
+
+class FakeJointMap:
+    motor_ids = MOTOR_IDS
+
+    def __len__(self):
+        return len(MOTOR_IDS)
+
+
+class FakeEncoder:
+    motor_ids = MOTOR_IDS
+
+    def __len__(self):
+        return FRAME_LENGTH
+
+
+class FakeInterface:
+    """按给定的异常序列依次发送；序列耗尽后一直成功"""
+
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.frames = []
+
+    def send_command_no_response(self, motor_id, data):
+        error = self.errors.pop(0) if self.errors else None
+        if error is not None:
+            raise error
+        self.frames.append(list(data))
+
+
+def stream(interface, count=20, **kwargs):
+    streamer = TrajectoryStreamer(interface, FakeJointMap(), FakeEncoder(), fatal_errors=(BusError,), **kwargs)
+    frames = np.arange(count * FRAME_LENGTH, dtype=np.uint8).reshape(count, FRAME_LENGTH)
+    return streamer.stream_frames(frames, rate_hz=200.0)
+
+
+def test_all_frames_sent():
+    interface = FakeInterface()
+    stats = stream(interface)
+    assert stats.completed and stats.sent == 20 and stats.send_errors == 0 and not stats.error
+
+
+def test_fatal_error_stops_stream():
+    interface = FakeInterface([None, None, BusError("SLCAN未连接")])
+    stats = stream(interface)
+    assert not stats.completed
+    assert (stats.sent, stats.send_errors, stats.error) == (2, 1, "SLCAN未连接")
+    assert len(interface.frames) == 2
+
+
+def test_consecutive_errors_stop_stream():
+    interface = FakeInterface([None] + [OSError("write failed")] * 10)
+    stats = stream(interface, max_consecutive_errors=3)
+    assert not stats.completed
+    assert (stats.sent, stats.send_errors) == (1, 3)
+
+
+def test_isolated_error_is_not_completed():
+    interface = FakeInterface([None, OSError("write failed")])
+    stats = stream(interface)
+    assert stats.sent == 19 and stats.send_errors == 1
+    assert not stats.completed and not stats.error